@@ -0,0 +1,143 @@
+"""Compares exact and pattern origins for `extra_path_metadata`.
+
+The same metadata is configured for every static file, first as one TOML
+table per file and then as a single glob. Each form is timed from parsing the
+TOML to producing the dictionary which Pelican expects. The glob is timed both
+when the content directory is first walked, and when its expansion is reused
+because no file has been added or removed.
+
+Usage:
+    python benchmarks/extra_path_metadata.py [--files 10000] [--repeat 5]
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+import tomllib
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from turbopelican import PelicanConfig
+from turbopelican._utils.config import path_metadata
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _create_content(content_path: Path, files: int) -> list[str]:
+    """Creates static files spread across several directories.
+
+    Args:
+        content_path: The content directory.
+        files: The number of files to be created.
+
+    Returns:
+        The paths of the files, relative to the content directory.
+    """
+    paths = []
+    for index in range(files):
+        path = f"static/images/{index % 100:02}/image{index}.png"
+        (content_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (content_path / path).touch()
+        paths.append(path)
+    return paths
+
+
+def _exact_toml(paths: list[str]) -> str:
+    """Configures the metadata with one table per file.
+
+    Args:
+        paths: The paths of the files, relative to the content directory.
+
+    Returns:
+        The configuration.
+    """
+    return "".join(
+        f'[[extra_path_metadata]]\norigin = "{path}"\n'
+        f'path = "images/{Path(path).name}"\n\n'
+        for path in paths
+    )
+
+
+def _pattern_toml() -> str:
+    """Configures the metadata with a single glob.
+
+    Returns:
+        The configuration.
+    """
+    return (
+        "[[extra_path_metadata]]\n"
+        'origin_glob = "static/images/**/*.png"\n'
+        'path = "images/{name}"\n'
+    )
+
+
+def _clear_caches() -> None:
+    """Forgets every directory listing and expansion of the patterns."""
+    path_metadata._listings.clear()  # noqa: SLF001
+    path_metadata._expansions.clear()  # noqa: SLF001
+
+
+def _time(function: Callable[[], object], repeat: int) -> float:
+    """Times a function, taking the median of several runs.
+
+    Args:
+        function: The function to be timed.
+        repeat: The number of runs.
+
+    Returns:
+        The median number of seconds taken.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results."""
+    parser = argparse.ArgumentParser(
+        description="Compares exact and pattern origins for `extra_path_metadata`."
+    )
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        content_path = Path(directory)
+        paths = _create_content(content_path, args.files)
+        exact_toml = _exact_toml(paths)
+        pattern_toml = _pattern_toml()
+
+        def exact() -> dict[str, dict[str, str]]:
+            pelican_config = PelicanConfig.model_validate(tomllib.loads(exact_toml))
+            return pelican_config.extra_path_metadata
+
+        def pattern() -> dict[str, dict[str, str]]:
+            pelican_config = PelicanConfig.model_validate(tomllib.loads(pattern_toml))
+            pelican_config.expand_extra_path_metadata(content_path)
+            return pelican_config.extra_path_metadata
+
+        if exact() != pattern():
+            raise AssertionError("Both forms should produce the same metadata.")
+
+        exact_seconds = _time(exact, args.repeat)
+        cached_seconds = _time(pattern, args.repeat)
+        cold_seconds = _time(lambda: (_clear_caches(), pattern()), args.repeat)
+
+    print(f"{args.files} files, median of {args.repeat} runs:")
+    print(f"  exact origins ({len(exact_toml)} bytes): {exact_seconds * 1000:.1f} ms")
+    print(f"  pattern origin ({len(pattern_toml)} bytes):")
+    print(f"    first walk: {cold_seconds * 1000:.1f} ms")
+    print(f"    unchanged tree: {cached_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
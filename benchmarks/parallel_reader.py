@@ -0,0 +1,146 @@
+"""Measures how reading content scales with the parallel reader plugin.
+
+A synthetic corpus of articles, each with prose and highlighted code, is built
+with Turbopelican's default Markdown configuration, first in a single process
+and then with a growing number of worker processes. Only the content is
+timed, as the theme renders nothing.
+
+Usage:
+    python benchmarks/parallel_reader.py [--articles 2000] [--workers 1 2 4]
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from pelican import Pelican
+from pelican.settings import read_settings
+
+from turbopelican._utils.config.config import _default_markdown
+from turbopelican.plugins.highlight_cache.highlight_cache import EXTENSION_NAME
+from turbopelican.plugins.parallel_reader.parallel_reader import (
+    PLUGIN_NAME,
+    WORKERS_SETTING,
+)
+
+_ARTICLE = """Title: Article {index}
+Date: 2024-01-01
+Tags: benchmark, python
+Summary: A *synthetic* article.
+
+Some prose with **emphasis**, [a link](https://example.com) and `code`.
+
+| Column | Value |
+| ------ | ----- |
+| index  | {index} |
+
+    :::python
+    def function_{index}(argument: int) -> int:
+        \"\"\"Returns the argument incremented.\"\"\"
+        for value in range(argument):
+            argument += value
+        return argument + {index}
+
+Closing paragraph.[^1]
+
+[^1]: A footnote.
+"""
+
+_TEMPLATES = [
+    "archives.html",
+    "article.html",
+    "author.html",
+    "authors.html",
+    "categories.html",
+    "category.html",
+    "index.html",
+    "page.html",
+    "period_archives.html",
+    "tag.html",
+    "tags.html",
+]
+
+
+def _create_site(root: Path, articles: int) -> None:
+    """Creates the corpus and an empty theme.
+
+    Args:
+        root: The directory of the site.
+        articles: The number of articles to be created.
+    """
+    (root / "theme" / "templates").mkdir(parents=True)
+    for template in _TEMPLATES:
+        (root / "theme" / "templates" / template).touch()
+    (root / "content").mkdir()
+    for index in range(articles):
+        (root / "content" / f"article{index}.md").write_text(
+            _ARTICLE.format(index=index)
+        )
+
+
+def _build(root: Path, workers: int) -> float:
+    """Builds the site.
+
+    Args:
+        root: The directory of the site.
+        workers: The number of processes reading content.
+
+    Returns:
+        The number of seconds taken.
+    """
+    markdown = _default_markdown()
+    # Each build highlights code afresh, rather than reading it from the cache.
+    markdown["extension_configs"][EXTENSION_NAME] = {
+        "cache_path": str(root / f"highlight{workers}")
+    }
+    settings = read_settings(
+        override={
+            "PATH": str(root / "content"),
+            "OUTPUT_PATH": str(root / f"output{workers}"),
+            "THEME": str(root / "theme"),
+            "PLUGINS": [PLUGIN_NAME] if workers > 1 else [],
+            "TIMEZONE": "UTC",
+            "MARKDOWN": markdown,
+            "FEED_ALL_ATOM": None,
+            "CATEGORY_FEED_ATOM": None,
+            WORKERS_SETTING: workers,
+        }
+    )
+    start = time.perf_counter()
+    Pelican(settings).run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results."""
+    parser = argparse.ArgumentParser(
+        description="Measures how reading content scales with the parallel reader."
+    )
+    parser.add_argument("--articles", type=int, default=2_000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        _create_site(root, args.articles)
+        timings = {workers: _build(root, workers) for workers in args.workers}
+
+    print(f"{args.articles} articles on {os.cpu_count()} cores:")
+    baseline = timings[min(timings)]
+    for workers, seconds in timings.items():
+        print(f"  {workers} processes: {seconds:.2f} s ({baseline / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Times `turbopelican restore-mtimes` on a large repository.
+
+A repository is created with the files spread across many commits, and the
+modification times of every tracked file are then restored from its history.
+
+Usage:
+    python benchmarks/restore_mtimes.py [--files 20000] [--commits 200]
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from turbopelican._commands.mtimes.restore import restore_mtimes
+
+
+def _create_repository(directory: Path, files: int, commits: int) -> None:
+    """Creates a repository whose files were added over many commits.
+
+    Args:
+        directory: The directory in which to create the repository.
+        files: The number of files to be created.
+        commits: The number of commits between which the files are split.
+    """
+    git_path = shutil.which("git")
+    if not git_path:
+        raise SystemExit("git must be installed to run this benchmark.")
+    environment = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Benchmark",
+        "GIT_AUTHOR_EMAIL": "benchmark@example.com",
+        "GIT_COMMITTER_NAME": "Benchmark",
+        "GIT_COMMITTER_EMAIL": "benchmark@example.com",
+    }
+    subprocess.run([git_path, "init", "--quiet"], cwd=directory, check=True)
+    subprocess.run([git_path, "config", "gc.auto", "0"], cwd=directory, check=True)
+    per_commit = max(files // commits, 1)
+    for start in range(0, files, per_commit):
+        for index in range(start, min(start + per_commit, files)):
+            path = directory / "content" / f"{index % 100:02}" / f"article{index}.md"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"Title: Article {index}\n")
+        subprocess.run(
+            [git_path, "add", "."], cwd=directory, env=environment, check=True
+        )
+        subprocess.run(
+            [git_path, "commit", "--quiet", "-m", f"Add from {start}"],
+            cwd=directory,
+            env=environment,
+            check=True,
+        )
+    # Cloned repositories are packed, which makes reading the history faster.
+    subprocess.run([git_path, "gc", "--quiet"], cwd=directory, check=True)
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results."""
+    parser = argparse.ArgumentParser(
+        description="Times `turbopelican restore-mtimes` on a large repository."
+    )
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--commits", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        _create_repository(Path(directory), args.files, args.commits)
+        start = time.perf_counter()
+        restored = restore_mtimes(Path(directory))
+        seconds = time.perf_counter() - start
+
+    print(f"{args.files} files in {args.commits} commits:")
+    print(f"  restored {restored} modification times in {seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
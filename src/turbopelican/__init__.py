@@ -4,21 +4,32 @@ Author: Elliot Simpson.
 """
 
 __all__ = [
+    "ConfigSource",
     "Configuration",
+    "FileConfigSource",
+    "MappingConfigSource",
     "PelicanConfig",
     "PelicanConfiguration",
     "PublishConfiguration",
+    "SQLiteConfigSource",
     "TurbopelicanError",
+    "TurbopelicanWarning",
     "config",
+    "config_many",
     "load_config",
 ]
 
 from turbopelican._utils.config import (
+    ConfigSource,
     Configuration,
+    FileConfigSource,
+    MappingConfigSource,
     PelicanConfig,
     PelicanConfiguration,
     PublishConfiguration,
+    SQLiteConfigSource,
     config,
+    config_many,
     load_config,
 )
-from turbopelican._utils.errors import TurbopelicanError
+from turbopelican._utils.errors import TurbopelicanError, TurbopelicanWarning
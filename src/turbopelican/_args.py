@@ -8,7 +8,11 @@ import io
 from contextlib import redirect_stderr
 
 from turbopelican._commands.adorn import adorn
+from turbopelican._commands.build import build
 from turbopelican._commands.init import init
+from turbopelican._commands.merge import merge
+from turbopelican._commands.mtimes import mtimes
+from turbopelican._commands.serve import serve
 
 
 def get_raw_args_without_subcommand(
@@ -79,6 +83,34 @@ def get_raw_args(*, inputs: list[str] | None = None) -> argparse.Namespace:
     )
     adorn.add_options(adorn_parser)
 
+    build_parser = subparsers.add_parser(
+        "build",
+        help="Builds the Pelican website.",
+        description="Builds the website with Pelican, using turbopelican.toml.",
+    )
+    build.add_options(build_parser)
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Serves the Pelican website, rebuilding it on each change.",
+        description="Rebuilds the website as it is edited and reloads browsers.",
+    )
+    serve.add_options(serve_parser)
+
+    merge_parser = subparsers.add_parser(
+        "merge-shards",
+        help="Merges the shards of the Pelican website built with --shard.",
+        description="Combines the shards of the website and renders their listings.",
+    )
+    merge.add_options(merge_parser)
+
+    mtimes_parser = subparsers.add_parser(
+        "restore-mtimes",
+        help="Sets the modification times of files to their last commit times.",
+        description="Restores the modification times of files tracked by git.",
+    )
+    mtimes.add_options(mtimes_parser)
+
     f = io.StringIO()
     try:
         with redirect_stderr(f):
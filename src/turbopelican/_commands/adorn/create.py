@@ -122,6 +122,11 @@ def copy_files(config: AdornConfiguration) -> None:
     if config.install_type == InstallType.MINIMAL_INSTALL:
         with pkg_resources.as_file(src_root.joinpath("_templates", "minimal")) as p:
             shutil.copy(p / "pelicanconf.py", config.directory)
+            # Without Turbopelican installed, the workflow can only use Pelican.
+            shutil.copy(
+                p / ".github" / "workflows" / "turbopelican.yml",
+                config.directory / ".github" / "workflows",
+            )
 
 
 def install_packages(config: AdornConfiguration) -> None:
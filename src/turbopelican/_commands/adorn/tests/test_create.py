@@ -1,4 +1,5 @@
 import os
+import re
 import shutil
 import subprocess
 from collections.abc import Generator
@@ -204,6 +205,15 @@ def test_copy_files(config: AdornConfiguration) -> None:
         assert directory.exists()
 
 
+@pytest.mark.usefixtures("repository")
+def test_copy_files_minimal(config: AdornConfiguration) -> None:
+    """Checks the workflow of a minimal install only runs Pelican."""
+    config.install_type = InstallType.MINIMAL_INSTALL
+    copy_files(config)
+    workflow = config.directory / ".github" / "workflows" / "turbopelican.yml"
+    assert set(re.findall(r"\.venv/bin/([\w-]+)", workflow.read_text())) == {"pelican"}
+
+
 @pytest.mark.usefixtures("repository", "mock_shutil_which_uv")
 def test_install_packages(
     config: AdornConfiguration, mock_subprocess_check_call: mock.Mock
@@ -0,0 +1 @@
+"""This package contains all logic pertinent to building a Pelican site."""
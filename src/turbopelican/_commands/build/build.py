@@ -0,0 +1,157 @@
+"""Builds a Pelican website configured by Turbopelican."""
+
+from __future__ import annotations
+
+from argparse import BooleanOptionalAction
+from typing import TYPE_CHECKING
+
+from turbopelican._commands.build.config import BuildConfiguration
+from turbopelican._commands.build.precompress import FORMATS
+from turbopelican._commands.build.run import report_completion, run_pelican
+from turbopelican._utils.config.config import _DeploymentType
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser, Namespace
+
+
+def add_options(parser: ArgumentParser) -> None:
+    """Adds the options for the build subparser.
+
+    Args:
+        parser: The parser/subparser to be updated.
+    """
+    parser.add_argument(
+        "directory",
+        help="Path to the website to be built.",
+        default=".",
+        nargs="?",
+    )
+    parser.add_argument(
+        "--config-type",
+        help="Whether to build for development or publication.",
+        choices=list(_DeploymentType),
+    )
+    parser.add_argument(
+        "--only",
+        help=(
+            "When previewing, only reads the articles and pages matching this "
+            "glob, relative to the content directory."
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        help="Only re-renders pages affected by changes since the last build.",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--split-by-lang",
+        help=(
+            "Builds each language of a multilingual website in its own "
+            "process, sharing the content cache."
+        ),
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--shard",
+        help=(
+            "Only renders the articles and pages of one of N shards, given as "
+            "i/N, into the shards directory. The shards are combined by "
+            "merge-shards."
+        ),
+    )
+    parser.add_argument(
+        "--shards-dir",
+        help="Where each shard is rendered, in a subdirectory. Defaults to shards.",
+        default="shards",
+    )
+    parser.add_argument(
+        "--inline-css",
+        help=(
+            "Inlines the stylesheets of each page, or the rules each template "
+            "uses from larger stylesheets, loading the rest without blocking "
+            "rendering."
+        ),
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--cache",
+        help=(
+            "Whether to save and restore caches between builds. By default, "
+            "only builds for publication do."
+        ),
+        action=BooleanOptionalAction,
+        default=None,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=(
+            "Where to store the caches between builds. Defaults to "
+            "TURBOPELICAN_CACHE_DIR, or a directory in ~/.cache/turbopelican."
+        ),
+    )
+    parser.add_argument(
+        "--cache-include",
+        help="A generated file or directory, such as thumbnails, to be cached.",
+        action="append",
+        default=[],
+    )
+    add_output_options(parser)
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        help="Suppresses all output.",
+        action="store_true",
+        default=False,
+    )
+    parser.set_defaults(func=command)
+
+
+def add_output_options(parser: ArgumentParser) -> None:
+    """Adds the options for the stages run over the output once it is built.
+
+    Args:
+        parser: The parser/subparser to be updated.
+    """
+    parser.add_argument(
+        "--minify",
+        help=(
+            "Whether to minify the HTML, CSS and SVG outputs. By default, only "
+            "builds for publication do."
+        ),
+        action=BooleanOptionalAction,
+        default=None,
+    )
+    parser.add_argument(
+        "--precompress",
+        help=(
+            "Writes compressed siblings, such as index.html.gz, of each HTML, "
+            "CSS, JavaScript, SVG and XML output."
+        ),
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--precompress-format",
+        help=(
+            "A format in which to precompress outputs, implying --precompress. "
+            "Defaults to gz, and br and zst if brotli and zstandard are "
+            "installed."
+        ),
+        action="append",
+        choices=FORMATS,
+        default=[],
+    )
+
+
+def command(raw_args: Namespace) -> None:
+    """Uses the provided configuration to build the website.
+
+    Args:
+        raw_args: The command-line provided arguments.
+    """
+    config = BuildConfiguration.from_args(raw_args)
+    run_pelican(config)
+    report_completion(config)
@@ -0,0 +1,189 @@
+"""Saves and restores Pelican's caches between builds on different machines.
+
+The cache directory and any other generated files worth keeping, such as
+thumbnails, are stored together as a bundle. Each bundle is keyed by the
+lockfile, the theme and the settings, since a change to any of these may make
+the cache invalid, but not by the content, which Pelican's caches account for
+themselves.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import tarfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from turbopelican._utils.shared.fingerprint import fingerprint, hash_file
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from turbopelican._commands.build.config import BuildConfiguration
+
+_BUNDLE_SUFFIX = ".tar"
+"""The suffix of each bundle stored by a backend."""
+
+
+@dataclass(frozen=True)
+class LocalCacheBackend:
+    """Stores cache bundles in a local directory.
+
+    In GitHub Actions, the directory itself is kept between runs by the
+    `actions/cache` action.
+    """
+
+    directory: Path
+
+    def _bundle(self, key: str) -> Path:
+        """Locates the bundle for a key.
+
+        Args:
+            key: The key of the bundle.
+
+        Returns:
+            The path of the bundle.
+        """
+        return self.directory / f"{key}{_BUNDLE_SUFFIX}"
+
+    def restore(self, key: str, destination: Path) -> bool:
+        """Extracts the bundle for a key, if there is one.
+
+        Args:
+            key: The key of the bundle.
+            destination: The directory into which the bundle is extracted.
+
+        Returns:
+            Whether the bundle was found.
+        """
+        try:
+            bundle = tarfile.open(self._bundle(key))  # noqa: SIM115
+        except (FileNotFoundError, tarfile.TarError):
+            return False
+        with bundle:
+            if hasattr(tarfile, "data_filter"):
+                bundle.extractall(destination, filter="data")
+            else:
+                bundle.extractall(destination)  # noqa: S202
+        return True
+
+    def save(self, key: str, root: Path, paths: Iterable[Path]) -> None:
+        """Stores files as the bundle for a key, replacing any other bundles.
+
+        Args:
+            key: The key of the bundle.
+            root: The directory to which the paths in the bundle are relative.
+            paths: The files and directories to be stored.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        bundle = self._bundle(key)
+        partial = bundle.with_suffix(".partial")
+        with tarfile.open(partial, "w") as archive:
+            for path in paths:
+                if path.exists():
+                    archive.add(path, arcname=path.relative_to(root).as_posix())
+        partial.replace(bundle)
+        for other in self.directory.glob(f"*{_BUNDLE_SUFFIX}"):
+            if other != bundle:
+                other.unlink(missing_ok=True)
+
+
+def default_cache_directory(directory: Path) -> Path:
+    """Chooses where to keep the cache bundles of a website.
+
+    Args:
+        directory: The directory of the website.
+
+    Returns:
+        A directory in the user's cache directory, specific to the website.
+    """
+    user_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(user_cache) / "turbopelican" / fingerprint(str(directory))[:16]
+
+
+def _hash_directory(directory: Path) -> dict[str, str | None]:
+    """Hashes every file in a directory.
+
+    Args:
+        directory: The directory to be hashed.
+
+    Returns:
+        The hash of each file, by its path relative to the directory.
+    """
+    return {
+        path.relative_to(directory).as_posix(): hash_file(path)
+        for path in sorted(directory.rglob("*"))
+        if path.is_file()
+    }
+
+
+def cache_key(directory: Path, settings: dict[str, Any]) -> str:
+    """Derives the key of the cache bundle for a build.
+
+    Args:
+        directory: The directory of the website.
+        settings: Pelican's settings.
+
+    Returns:
+        A key which changes whenever the lockfile, theme or settings change.
+    """
+    return fingerprint(
+        {
+            "lockfile": hash_file(directory / "uv.lock"),
+            "theme": _hash_directory(Path(settings["THEME"])),
+            "settings": fingerprint(settings),
+        }
+    )
+
+
+def _cached_paths(config: BuildConfiguration, settings: dict[str, Any]) -> list[Path]:
+    """Lists the files and directories kept in the cache bundle.
+
+    Args:
+        config: The arguments to configure the build.
+        settings: Pelican's settings.
+
+    Returns:
+        The absolute paths, which are within the website.
+    """
+    directory = config.directory.resolve()
+    paths = [Path(settings["CACHE_PATH"]), *config.cache_include]
+    resolved = [(directory / path).resolve() for path in paths]
+    return [path for path in resolved if path.is_relative_to(directory)]
+
+
+def restore_cache(
+    config: BuildConfiguration, settings: dict[str, Any], key: str
+) -> bool:
+    """Restores the cache bundle for a build, unless a cache already exists.
+
+    Args:
+        config: The arguments to configure the build.
+        settings: Pelican's settings.
+        key: The key of the cache bundle.
+
+    Returns:
+        Whether the cache bundle was restored.
+    """
+    cache_path = config.directory / settings["CACHE_PATH"]
+    if cache_path.is_dir() and any(cache_path.iterdir()):
+        return False
+    backend = LocalCacheBackend(config.cache_directory)
+    return backend.restore(key, config.directory)
+
+
+def save_cache(config: BuildConfiguration, settings: dict[str, Any], key: str) -> None:
+    """Stores the caches of a build as its cache bundle.
+
+    Args:
+        config: The arguments to configure the build.
+        settings: Pelican's settings.
+        key: The key of the cache bundle.
+    """
+    backend = LocalCacheBackend(config.cache_directory)
+    with contextlib.suppress(OSError):
+        backend.save(key, config.directory.resolve(), _cached_paths(config, settings))
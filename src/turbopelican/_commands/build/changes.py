@@ -0,0 +1,279 @@
+"""Detects which files have changed since the last build using git.
+
+Checking out a repository, as in continuous integration, gives every file a
+new modification time, so Pelican's caches would consider every file changed.
+Instead, the commit of the last successful build is recorded alongside the
+modification time of each content file, and files which git reports as
+unchanged since that commit have their recorded modification times restored.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Self
+
+import pydantic
+
+_STATE_FILE = "turbopelican_build.json"
+"""The name of the file in `cache_path` in which the last build is recorded."""
+
+
+class _BuildState(pydantic.BaseModel):
+    """The record of the last successful build."""
+
+    commit: str | None = None
+    stamps: dict[str, int] = {}
+    """The modification time in nanoseconds of each content file unchanged
+    from the commit, relative to the root of the repository."""
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        """Loads the record of the last build.
+
+        Args:
+            path: The file in which the record is stored.
+
+        Returns:
+            The record, or an empty record if it is missing or invalid.
+        """
+        try:
+            return cls.model_validate_json(path.read_bytes())
+        except (OSError, pydantic.ValidationError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Stores the record of the build.
+
+        Args:
+            path: The file in which the record is to be stored.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.model_dump_json())
+
+
+@dataclass(frozen=True)
+class Changes:
+    """The files of the website changed since the last build."""
+
+    commit: str
+    content: frozenset[Path]
+    theme: frozenset[Path]
+    config: frozenset[Path]
+
+    @property
+    def full_build(self) -> bool:
+        """Whether every file must be read again."""
+        return bool(self.theme or self.config)
+
+
+def _git(repository: Path, *args: str) -> str | None:
+    """Runs a git command.
+
+    Args:
+        repository: The directory in which the command is run.
+        args: The arguments to git.
+
+    Returns:
+        The output of the command, or None if git is unavailable or failed.
+    """
+    git_path = shutil.which("git")
+    if not git_path:
+        return None
+    process = subprocess.run(
+        [git_path, *args],
+        cwd=repository,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if process.returncode:
+        return None
+    return process.stdout
+
+
+def _paths(top_level: Path, output: str) -> set[Path]:
+    """Reads the NUL-separated paths output by git.
+
+    Args:
+        top_level: The root of the repository.
+        output: The output of git.
+
+    Returns:
+        The absolute paths.
+    """
+    return {top_level / name for name in output.split("\0") if name}
+
+
+def _changed_since(top_level: Path, commit: str) -> set[Path] | None:
+    """Finds the files changed since a commit, including uncommitted changes.
+
+    Args:
+        top_level: The root of the repository.
+        commit: The commit with which the files are compared.
+
+    Returns:
+        The absolute paths of changed files, or None if this could not be
+        determined.
+    """
+    changed = _git(top_level, "diff", "--name-only", "--no-renames", "-z", commit)
+    untracked = _git(top_level, "ls-files", "--others", "--exclude-standard", "-z")
+    if changed is None or untracked is None:
+        return None
+    return _paths(top_level, changed) | _paths(top_level, untracked)
+
+
+def _top_level(directory: Path) -> Path | None:
+    """Finds the root of the repository containing a directory.
+
+    Args:
+        directory: A directory which may be in a repository.
+
+    Returns:
+        The root of the repository, or None if there is no repository.
+    """
+    output = _git(directory, "rev-parse", "--show-toplevel")
+    if not output:
+        return None
+    return Path(output.strip()).resolve()
+
+
+def detect_changes(
+    directory: Path, settings: dict[str, Any], last_commit: str | None
+) -> Changes | None:
+    """Finds the files changed since the last build.
+
+    Changed files under the content path are content and those under the
+    theme path are the theme. Any other changed file in the website directory,
+    such as `turbopelican.toml` or `pelicanconf.py`, is configuration, except
+    for those in the output and cache directories.
+
+    Args:
+        directory: The directory of the website.
+        settings: Pelican's settings.
+        last_commit: The commit of the last build, if any.
+
+    Returns:
+        The changed files, or None if the website has not been built from a
+        commit in the available history, as with shallow clones.
+    """
+    top_level = _top_level(directory)
+    if last_commit is None or top_level is None:
+        return None
+    if _git(top_level, "cat-file", "-e", f"{last_commit}^{{commit}}") is None:
+        return None
+    changed = _changed_since(top_level, last_commit)
+    if changed is None:
+        return None
+
+    directory = directory.resolve()
+    content_path = Path(settings["PATH"]).resolve()
+    theme_path = Path(settings["THEME"]).resolve()
+    generated = [
+        Path(settings[name]).resolve()
+        for name in ("OUTPUT_PATH", "CACHE_PATH")
+        if name in settings
+    ]
+    content, theme, config = set(), set(), set()
+    for path in changed:
+        if path.is_relative_to(content_path):
+            content.add(path)
+        elif path.is_relative_to(theme_path):
+            theme.add(path)
+        elif path.is_relative_to(directory) and not any(
+            path.is_relative_to(parent) for parent in generated
+        ):
+            config.add(path)
+    return Changes(
+        commit=last_commit,
+        content=frozenset(content),
+        theme=frozenset(theme),
+        config=frozenset(config),
+    )
+
+
+def _restore_stamps(
+    top_level: Path, stamps: dict[str, int], changed: frozenset[Path]
+) -> int:
+    """Restores the recorded modification times of unchanged files.
+
+    Args:
+        top_level: The root of the repository.
+        stamps: The modification time of each file at the last build.
+        changed: The files changed since the last build.
+
+    Returns:
+        The number of files whose modification times were restored.
+    """
+    restored = 0
+    for name, stamp in stamps.items():
+        path = top_level / name
+        if path in changed:
+            continue
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path, ns=(stamp, stamp))
+            restored += 1
+    return restored
+
+
+def prepare_build(directory: Path, settings: dict[str, Any]) -> Changes | None:
+    """Prepares Pelican's caches according to the changes since the last build.
+
+    Unchanged content files have their modification times restored, so that
+    Pelican's caches treat them as unchanged. If the theme or configuration
+    changed, the content cache is not loaded. If the changes are unknown, the
+    modification times are left alone, so every file checked out since the
+    last build is read again.
+
+    Args:
+        directory: The directory of the website.
+        settings: Pelican's settings, which may be updated.
+
+    Returns:
+        The changed files, or None if they are unknown.
+    """
+    state = _BuildState.load(Path(settings["CACHE_PATH"]) / _STATE_FILE)
+    changes = detect_changes(directory, settings, state.commit)
+    top_level = _top_level(directory)
+    if changes is None or top_level is None:
+        return None
+    if changes.full_build:
+        settings["LOAD_CONTENT_CACHE"] = False
+    else:
+        _restore_stamps(top_level, state.stamps, changes.content)
+    return changes
+
+
+def record_build(directory: Path, settings: dict[str, Any]) -> None:
+    """Records the commit from which the website was built.
+
+    Only content files which are tracked and unmodified have their
+    modification times recorded, since only these are known to match the
+    commit.
+
+    Args:
+        directory: The directory of the website.
+        settings: Pelican's settings.
+    """
+    top_level = _top_level(directory)
+    if top_level is None:
+        return
+    head = _git(top_level, "rev-parse", "--verify", "HEAD")
+    content_path = Path(settings["PATH"]).resolve()
+    tracked = _git(top_level, "ls-files", "-z", "--", str(content_path))
+    modified = _changed_since(top_level, "HEAD")
+    if head is None or tracked is None or modified is None:
+        return
+
+    stamps = {}
+    for path in _paths(top_level, tracked) - modified:
+        with contextlib.suppress(FileNotFoundError):
+            stamps[path.relative_to(top_level).as_posix()] = path.stat().st_mtime_ns
+    state = _BuildState(commit=head.strip(), stamps=stamps)
+    state.save(Path(settings["CACHE_PATH"]) / _STATE_FILE)
@@ -0,0 +1,182 @@
+"""Stores configuration specific to building Pelican websites."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from turbopelican._commands.build.cache import default_cache_directory
+from turbopelican._commands.build.precompress import resolve_formats
+from turbopelican._utils.config.config import _DeploymentType
+from turbopelican._utils.errors import TurbopelicanError
+from turbopelican._utils.shared.args import Verbosity
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+
+
+def resolve_config_type(requested: str | None) -> _DeploymentType:
+    """Chooses whether to build for development or publication.
+
+    Args:
+        requested: The configuration type given on the command line, if any.
+
+    Returns:
+        The requested configuration type, or else `TURBOPELICAN_CONFIG_TYPE`,
+        as used by `pelicanconf.py`, or else DEV.
+
+    Raises:
+        TurbopelicanError: The configuration type is not DEV, PREVIEW or
+            PUBLISH.
+    """
+    config_type = requested or os.environ.get(
+        "TURBOPELICAN_CONFIG_TYPE", _DeploymentType.DEV
+    )
+    if config_type not in set(_DeploymentType):
+        raise TurbopelicanError(
+            f"Incorrect config_type: {config_type}. Must be DEV, PREVIEW or PUBLISH."
+        )
+    return _DeploymentType(config_type)
+
+
+def resolve_only(only: str | None, config_type: _DeploymentType) -> str | None:
+    """Checks the glob to which a preview is restricted.
+
+    Args:
+        only: The glob given on the command line, if any.
+        config_type: The configuration type of the build.
+
+    Returns:
+        The glob, if any.
+
+    Raises:
+        TurbopelicanError: The content is restricted other than when previewing.
+    """
+    if only is not None and config_type != _DeploymentType.PREVIEW:
+        raise TurbopelicanError("--only requires --config-type PREVIEW.")
+    return only
+
+
+def resolve_shard(shard: str | None) -> tuple[int, int] | None:
+    """Parses the shard of the website to be built.
+
+    Args:
+        shard: The shard given on the command line as `i/N`, if any.
+
+    Returns:
+        The shard, from 1 to N, and the number of shards N, if any.
+
+    Raises:
+        TurbopelicanError: The shard is not given as `i/N`, with i from 1 to N.
+    """
+    if shard is None:
+        return None
+    index, _, count = shard.partition("/")
+    if not (index.isdigit() and count.isdigit() and 1 <= int(index) <= int(count)):
+        raise TurbopelicanError(
+            f"Incorrect shard: {shard}. Must be i/N, such as 1/4, with i from 1 to N."
+        )
+    return int(index), int(count)
+
+
+def resolve_minify(minify: bool | None, config_type: _DeploymentType) -> bool:  # noqa: FBT001
+    """Chooses whether the outputs are minified.
+
+    Args:
+        minify: Whether minification was requested on the command line, if
+            either way.
+        config_type: The configuration type of the build.
+
+    Returns:
+        The requested choice, or else whether the build is for publication.
+    """
+    if minify is None:
+        return config_type == _DeploymentType.PUBLISH
+    return minify
+
+
+def resolve_precompress(raw_args: Namespace) -> tuple[str, ...]:
+    """Chooses the formats in which the outputs are precompressed.
+
+    Args:
+        raw_args: The command-line provided arguments.
+
+    Returns:
+        The suffixes of the compressed siblings to be written, if any.
+    """
+    if not raw_args.precompress and not raw_args.precompress_format:
+        return ()
+    return resolve_formats(raw_args.precompress_format)
+
+
+@dataclass
+class BuildConfiguration:
+    """The command line arguments to configure the build of the website."""
+
+    directory: Path
+    config_type: _DeploymentType
+    incremental: bool
+    verbosity: Verbosity
+    cache: bool
+    cache_directory: Path
+    cache_include: list[Path]
+    only: str | None = None
+    split_by_lang: bool = False
+    shard: tuple[int, int] | None = None
+    shards_directory: Path = Path("shards")
+    inline_css: bool = False
+    minify: bool = False
+    precompress: tuple[str, ...] = ()
+
+    @classmethod
+    def from_args(cls, raw_args: Namespace) -> Self:
+        """Returns the command-line arguments in a structured object.
+
+        The configuration type defaults to `TURBOPELICAN_CONFIG_TYPE`, as used
+        by `pelicanconf.py`, or DEV if that is not set. Caches are kept
+        between builds, and outputs minified, by default when publishing.
+
+        Returns:
+            The command-line arguments.
+
+        Raises:
+            TurbopelicanError: Languages are built separately in an
+                incremental or sharded build.
+        """
+        if raw_args.split_by_lang and raw_args.incremental:
+            raise TurbopelicanError(
+                "--split-by-lang cannot be combined with --incremental."
+            )
+        if raw_args.split_by_lang and raw_args.shard is not None:
+            raise TurbopelicanError("--split-by-lang cannot be combined with --shard.")
+        config_type = resolve_config_type(raw_args.config_type)
+        directory = Path(raw_args.directory).resolve()
+        cache = raw_args.cache
+        if cache is None:
+            cache = config_type == _DeploymentType.PUBLISH
+        cache_directory = os.environ.get("TURBOPELICAN_CACHE_DIR")
+        if raw_args.cache_dir is not None:
+            cache_directory = raw_args.cache_dir
+
+        return cls(
+            directory=directory,
+            config_type=config_type,
+            incremental=raw_args.incremental,
+            verbosity=Verbosity.QUIET if raw_args.quiet else Verbosity.NORMAL,
+            cache=cache,
+            cache_directory=(
+                Path(cache_directory).expanduser().resolve()
+                if cache_directory
+                else default_cache_directory(directory)
+            ),
+            cache_include=[Path(path) for path in raw_args.cache_include],
+            only=resolve_only(raw_args.only, config_type),
+            split_by_lang=raw_args.split_by_lang,
+            shard=resolve_shard(raw_args.shard),
+            shards_directory=directory / raw_args.shards_dir,
+            inline_css=raw_args.inline_css,
+            minify=resolve_minify(raw_args.minify, config_type),
+            precompress=resolve_precompress(raw_args),
+        )
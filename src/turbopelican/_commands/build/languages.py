@@ -0,0 +1,201 @@
+"""Builds a multilingual website in one process per language.
+
+The content is read once, which fills the content cache, to find the languages
+of the website. Each language is then built by a Pelican build in its own
+process, from the same settings, which loads the content from the cache but
+only writes the outputs in its language. The build of the default language
+also writes the outputs shared between languages. Every build reads all of the
+content, so links between translations are as in a single build, and all of
+them write to the same output directory.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import os
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from turbopelican._commands.build.run import _clean_output, _with_plugin
+from turbopelican._utils.errors import TurbopelicanError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pelican.contents import Content
+
+_LANGUAGE_PLUGIN = "turbopelican.plugins.language_split"
+"""The plugin which writes only the outputs of some languages."""
+
+_LANGUAGES_SETTING = "TURBOPELICAN_LANGUAGES"
+"""The setting for the languages whose outputs a build writes."""
+
+_CONTENT_ATTRIBUTES = {
+    "ArticlesGenerator": (
+        "articles",
+        "translations",
+        "hidden_articles",
+        "hidden_translations",
+        "drafts",
+        "drafts_translations",
+    ),
+    "PagesGenerator": (
+        "pages",
+        "translations",
+        "hidden_pages",
+        "hidden_translations",
+        "draft_pages",
+        "draft_translations",
+    ),
+}
+"""The attributes of each generator holding the content which it read."""
+
+logger = logging.getLogger(__name__)
+
+
+def order_languages(contents: Iterable[Content], default_lang: str) -> list[str]:
+    """Orders the languages of the content by how long they take to build.
+
+    Args:
+        contents: Every article and page of the website.
+        default_lang: The default language of the website.
+
+    Returns:
+        The default language, which is built along with every shared output,
+        followed by the other languages, those with the most content first.
+    """
+    counts = Counter(content.lang for content in contents)
+    counts.pop(default_lang, None)
+    others = sorted(counts, key=lambda language: (-counts[language], language))
+    return [default_lang, *others]
+
+
+def read_languages(settings: dict[str, Any]) -> list[str]:
+    """Reads the content of the website, filling the content cache.
+
+    Args:
+        settings: The settings of the website, with the content cache enabled.
+
+    Returns:
+        The languages of the content, ordered by `order_languages`.
+    """
+    from pelican import Pelican  # noqa: PLC0415
+    from pelican.generators import ArticlesGenerator, PagesGenerator  # noqa: PLC0415
+    from pelican.plugins import signals  # noqa: PLC0415
+
+    pelican = Pelican(settings)
+    context = settings.copy()
+    context["generated_content"] = {}
+    context["static_links"] = set()
+    context["static_content"] = {}
+    context["localsiteurl"] = settings["SITEURL"]
+    generators = [
+        cls(
+            context=context,
+            settings=settings,
+            path=pelican.path,
+            theme=pelican.theme,
+            output_path=pelican.output_path,
+        )
+        for cls in (ArticlesGenerator, PagesGenerator)
+    ]
+    for generator in generators:
+        generator.generate_context()
+    # Plugins which read content in the background stop once it is read.
+    signals.all_generators_finalized.send(generators)
+
+    contents = [
+        content
+        for generator in generators
+        for attribute in _CONTENT_ATTRIBUTES[type(generator).__name__]
+        for content in getattr(generator, attribute)
+    ]
+    return order_languages(contents, settings["DEFAULT_LANG"])
+
+
+def _build_language(settings: dict[str, Any], level: int, quiet: bool) -> list[str]:  # noqa: FBT001
+    """Builds the outputs in some languages, in a process of its own.
+
+    Args:
+        settings: The settings of the build, naming its languages.
+        level: The level of the messages logged by Pelican.
+        quiet: Whether Pelican's summary of the build is suppressed.
+
+    Returns:
+        The pages and feeds written.
+    """
+    from pelican import Pelican, log  # noqa: PLC0415
+
+    from turbopelican.plugins.language_split import pop_written  # noqa: PLC0415
+
+    log.init(level)
+    log.console.quiet = quiet
+    Pelican(settings).run()
+    return pop_written(settings["OUTPUT_PATH"])
+
+
+def build_by_language(
+    settings: dict[str, Any],
+    level: int,
+    *,
+    quiet: bool = False,
+) -> dict[str, list[str]]:
+    """Builds each language of the website in its own process.
+
+    Args:
+        settings: The settings of the website, which must be picklable.
+        level: The level of the messages logged by Pelican.
+        quiet: Whether Pelican's summary of each build is suppressed.
+
+    Returns:
+        The pages and feeds written by the build of each language.
+
+    Raises:
+        TurbopelicanError: A language could not be built, or two languages
+            wrote the same output.
+    """
+    settings = dict(settings)
+    settings["CACHE_CONTENT"] = settings["LOAD_CONTENT_CACHE"] = True
+    languages = read_languages(settings)
+    if settings["DELETE_OUTPUT_DIRECTORY"]:
+        _clean_output(settings)
+    settings["DELETE_OUTPUT_DIRECTORY"] = False
+    settings["PLUGINS"] = _with_plugin(settings.get("PLUGINS"), _LANGUAGE_PLUGIN)
+
+    workers = min(len(languages), os.cpu_count() or 1)
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = {
+            language: pool.submit(
+                _build_language,
+                {**settings, _LANGUAGES_SETTING: [language]},
+                level,
+                quiet,
+            )
+            for language in languages
+        }
+        written: dict[str, list[str]] = {}
+        for language, future in futures.items():
+            try:
+                written[language] = future.result()
+            except Exception as error:
+                raise TurbopelicanError(
+                    f"Could not build the outputs in {language}: {error}"
+                ) from error
+
+    owners: dict[str, str] = {}
+    for language, outputs in written.items():
+        for output in outputs:
+            if (owner := owners.setdefault(output, language)) != language:
+                raise TurbopelicanError(
+                    f"{output} was written in both {owner} and {language}."
+                )
+    logger.info(
+        "Built %d languages in %d processes: %s",
+        len(languages),
+        workers,
+        ", ".join(f"{language} ({len(written[language])})" for language in languages),
+    )
+    return written
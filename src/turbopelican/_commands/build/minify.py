@@ -0,0 +1,489 @@
+"""Minifies the HTML, CSS and SVG outputs of a build.
+
+Once the website has been built, indentation and comments are removed from
+each HTML, CSS and SVG output in a pool of processes. Whitespace is only
+collapsed to a single space, except around elements beside which it is never
+rendered, and the contents of `<pre>`, `<code>`, `<textarea>` and `<script>`
+elements, and of SVG `<text>` elements, are left exactly as they are. SVG
+images also lose the metadata added by editors such as Inkscape. Each output
+is replaced rather than written to, keeping its modification time, so that
+incremental builds still recognise it. The size and modification time of
+each minified output are recorded in a manifest in `cache_path`, and outputs
+which have not been written since are skipped.
+
+Plugins which record the hashes of the static files they copy, such as the
+static manifest and asset fingerprint plugins, would find their copies changed
+once minified. Instead, `minify_file` is passed to them in the settings, with
+which they minify each static file as they copy it, so that this stage then
+finds nothing left to minify.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import pydantic
+
+from turbopelican._commands.build.outputs import (
+    find_outputs,
+    map_in_processes,
+    write_atomically,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from pathlib import Path
+
+_MANIFEST_FILE = "turbopelican_minify.json"
+"""The name of the file in `cache_path` in which the manifest is stored."""
+
+_WHITESPACE = re.compile(r"[ \t\n\r\f]+")
+"""A run of whitespace, excluding non-breaking spaces."""
+
+_HTML_TOKENS = re.compile(
+    r"(?P<comment><!--.*?-->)"
+    r"|(?P<raw><(?P<raw_name>pre|code|textarea|script|style|text)\b"
+    r"""(?:"[^"]*"|'[^']*'|[^'">])*>.*?</(?P=raw_name)[ \t\n\r\f]*>)"""
+    r"|(?P<cdata><!\[CDATA\[.*?\]\]>)"
+    r"|(?P<tag></?(?P<name>[!?]?[a-zA-Z][^ \t\n\r\f/>]*)"
+    r"""(?:"[^"]*"|'[^']*'|[^'">])*>)""",
+    re.IGNORECASE | re.DOTALL,
+)
+"""The comments, elements whose contents are kept, and tags of a document."""
+
+_ATTRIBUTES = re.compile(r"""("[^"]*"|'[^']*')|[ \t\n\r\f]+""")
+"""A quoted attribute value, or the whitespace between attributes."""
+
+_BLOCK_ELEMENTS = frozenset(
+    {
+        "!doctype",
+        "?xml",
+        "address",
+        "article",
+        "aside",
+        "base",
+        "blockquote",
+        "body",
+        "caption",
+        "circle",
+        "clippath",
+        "col",
+        "colgroup",
+        "defs",
+        "desc",
+        "details",
+        "div",
+        "dl",
+        "ellipse",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "filter",
+        "footer",
+        "form",
+        "g",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "head",
+        "header",
+        "hr",
+        "html",
+        "line",
+        "lineargradient",
+        "link",
+        "main",
+        "marker",
+        "mask",
+        "meta",
+        "metadata",
+        "nav",
+        "ol",
+        "p",
+        "path",
+        "pattern",
+        "polygon",
+        "polyline",
+        "pre",
+        "radialgradient",
+        "rect",
+        "script",
+        "section",
+        "stop",
+        "style",
+        "summary",
+        "symbol",
+        "table",
+        "tbody",
+        "tfoot",
+        "thead",
+        "title",
+        "tr",
+        "ul",
+        "use",
+    }
+)
+"""The elements, including those of SVG, beside which whitespace is never
+rendered. List items and table cells are excluded, since they are often
+displayed inline."""
+
+_SVG_EDITOR_DATA = (
+    re.compile(r"<metadata\b[^>]*/>|<metadata\b.*?</metadata>", re.DOTALL),
+    re.compile(
+        r"<(?P<prefix>inkscape|sodipodi):(?P<name>[\w-]+)\b"
+        r"(?:[^>]*/>|.*?</(?P=prefix):(?P=name)>)",
+        re.DOTALL,
+    ),
+    re.compile(r'[ \t\n\r\f]+(?:xmlns:)?(?:inkscape|sodipodi)(?::[\w-]+)?="[^"]*"'),
+)
+"""The metadata, elements and attributes added to SVG images by editors."""
+
+_CSS_TOKENS = re.compile(
+    r"""(?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""
+    r"|(?P<licence>/\*!.*?\*/)|(?P<comment>/\*.*?\*/)",
+    re.DOTALL,
+)
+"""The strings, kept comments and other comments of a stylesheet."""
+
+_CSS_PUNCTUATION = re.compile(r" ?([{};,>]) ?")
+"""Punctuation beside which whitespace is never needed in a stylesheet."""
+
+
+def minify_css(css: str) -> str:
+    """Removes comments and unneeded whitespace from a stylesheet.
+
+    Strings, and comments starting with `/*!`, such as licences, are kept.
+
+    Args:
+        css: The stylesheet.
+
+    Returns:
+        The minified stylesheet.
+    """
+    parts = []
+    code = ""
+    position = 0
+    for match in _CSS_TOKENS.finditer(css):
+        code += css[position : match.start()]
+        position = match.end()
+        if match["comment"]:
+            code += " "
+            continue
+        parts.extend((_minify_css_code(code), match[0]))
+        code = ""
+    parts.append(_minify_css_code(code + css[position:]))
+    # Whitespace is not needed around the comments before the first rule.
+    index = 0
+    while index < len(parts) and (
+        not parts[index].strip() or parts[index].startswith("/*!")
+    ):
+        parts[index] = parts[index].strip()
+        index += 1
+    if index < len(parts):
+        parts[index] = parts[index].lstrip()
+    return "".join(parts).strip()
+
+
+def _minify_css_code(code: str) -> str:
+    """Removes unneeded whitespace from a stylesheet outside its strings.
+
+    Args:
+        code: The part of the stylesheet between two strings.
+
+    Returns:
+        The minified part.
+    """
+    code = _WHITESPACE.sub(" ", code)
+    code = _CSS_PUNCTUATION.sub(r"\1", code)
+    return code.replace(": ", ":").replace(";}", "}")
+
+
+def _minify_tag(tag: str) -> str:
+    """Collapses the whitespace between the attributes of a tag.
+
+    Args:
+        tag: The tag.
+
+    Returns:
+        The tag, with its attribute values unchanged.
+    """
+    tag = _ATTRIBUTES.sub(lambda match: match[1] or " ", tag)
+    return tag[:-2] + ">" if tag.endswith(" >") else tag
+
+
+def _minify_raw(element: str, name: str) -> str:
+    """Minifies an element whose contents are kept as they are.
+
+    Args:
+        element: The element.
+        name: The name of the element.
+
+    Returns:
+        The element, with only the contents of a `<style>` element minified.
+    """
+    if name.lower() != "style":
+        return element
+    start = element.index(">") + 1
+    end = element.rindex("</")
+    return element[:start] + minify_css(element[start:end]) + element[end:]
+
+
+def _tokenise_html(html: str) -> list[tuple[str, str, str]]:
+    """Splits an HTML or SVG document into text, tags and kept elements.
+
+    Comments are dropped, except conditional comments, and the text either
+    side of them is joined.
+
+    Args:
+        html: The document.
+
+    Returns:
+        The kind of each token, its text and, for tags and kept elements,
+        the name of its element.
+    """
+    tokens = [("text", "", "")]
+    position = 0
+    for match in _HTML_TOKENS.finditer(html):
+        tokens.append(("text", html[position : match.start()], ""))
+        position = match.end()
+        if match["raw"]:
+            tokens.append(("raw", match["raw"], match["raw_name"]))
+        elif match["tag"]:
+            tokens.append(("tag", match["tag"], match["name"]))
+        elif not match["comment"] or match[0].startswith(("<!--[", "<!--<!")):
+            tokens.append(("raw", match[0], ""))
+    tokens.append(("text", html[position:], ""))
+
+    merged = tokens[:1]
+    for token in tokens[1:]:
+        if token[0] == merged[-1][0] == "text":
+            merged[-1] = ("text", merged[-1][1] + token[1], "")
+        else:
+            merged.append(token)
+    return merged
+
+
+def minify_html(html: str) -> str:
+    """Removes comments and unneeded whitespace from an HTML or SVG document.
+
+    Conditional comments are kept.
+
+    Args:
+        html: The document.
+
+    Returns:
+        The minified document.
+    """
+    tokens = _tokenise_html(html)
+
+    def is_block(index: int) -> bool:
+        return (
+            not 0 <= index < len(tokens) or tokens[index][2].lower() in _BLOCK_ELEMENTS
+        )
+
+    parts = []
+    for index, (kind, text, name) in enumerate(tokens):
+        if kind == "tag":
+            parts.append(_minify_tag(text))
+        elif kind == "raw":
+            parts.append(_minify_raw(text, name))
+        else:
+            collapsed = _WHITESPACE.sub(" ", text)
+            if is_block(index - 1):
+                collapsed = collapsed.lstrip(" ")
+            if is_block(index + 1):
+                collapsed = collapsed.rstrip(" ")
+            parts.append(collapsed)
+    return "".join(parts)
+
+
+def minify_svg(svg: str) -> str:
+    """Removes editor metadata, comments and unneeded whitespace from an SVG.
+
+    The metadata, elements and attributes which editors such as Inkscape add
+    to the images they save are not rendered.
+
+    Args:
+        svg: The image.
+
+    Returns:
+        The minified image.
+    """
+    for pattern in _SVG_EDITOR_DATA:
+        svg = pattern.sub("", svg)
+    return minify_html(svg)
+
+
+_MINIFIERS: dict[str, Callable[[str], str]] = {
+    ".css": minify_css,
+    ".htm": minify_html,
+    ".html": minify_html,
+    ".svg": minify_svg,
+}
+"""The function which minifies the outputs with each suffix."""
+
+
+def minify_file(path: str, data: bytes) -> bytes:
+    """Minifies the contents of an HTML, CSS or SVG file.
+
+    Args:
+        path: The path to the file, whose suffix identifies its kind.
+        data: The contents of the file.
+
+    Returns:
+        The minified contents, or the contents as they are if the file is of
+        another kind, is not text, or would not be made smaller.
+    """
+    minifier = _MINIFIERS.get(os.path.splitext(path)[1].lower())  # noqa: PTH122
+    if minifier is None:
+        return data
+    try:
+        minified = minifier(data.decode()).encode()
+    except UnicodeDecodeError:
+        return data
+    return minified if len(minified) < len(data) else data
+
+
+class _Manifest(pydantic.BaseModel):
+    """Records the size and modification time of every minified output."""
+
+    version: int = 1
+    outputs: dict[str, tuple[int, int]] = pydantic.Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> _Manifest:
+        """Loads the manifest persisted by the previous build.
+
+        Args:
+            path: The file in which the manifest is stored.
+
+        Returns:
+            The manifest, or an empty manifest if none could be read.
+        """
+        try:
+            return cls.model_validate_json(path.read_bytes())
+        except (OSError, pydantic.ValidationError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Persists the manifest for the next build.
+
+        Args:
+            path: The file in which the manifest is to be stored.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.model_dump_json())
+
+
+def _minify(
+    path: str, previous: tuple[int, int] | None
+) -> tuple[tuple[int, int], bool, int, int]:
+    """Minifies an output, unless it was minified by the previous build.
+
+    Args:
+        path: The path to the output.
+        previous: The size and modification time of the output once it was
+            minified by the previous build, if it was.
+
+    Returns:
+        The size and modification time of the output, whether it was
+        minified, and its size before and after minification.
+    """
+    status = os.stat(path)  # noqa: PTH116
+    if previous == (status.st_size, status.st_mtime_ns):
+        entry = (status.st_size, status.st_mtime_ns)
+        return entry, False, status.st_size, status.st_size
+    with open(path, "rb") as file:  # noqa: PTH123
+        data = file.read()
+    minified = minify_file(path, data)
+    if len(minified) < len(data):
+        write_atomically(path, minified, path)
+        status = os.stat(path)  # noqa: PTH116
+    return (status.st_size, status.st_mtime_ns), True, len(data), len(minified)
+
+
+def _minify_many(
+    items: Sequence[tuple[str, tuple[int, int] | None]],
+) -> list[tuple[tuple[int, int], bool, int, int]]:
+    """Minifies a batch of outputs, in a worker process.
+
+    Args:
+        items: The path to each output and its size and modification time
+            once it was minified by the previous build.
+
+    Returns:
+        The result of minifying each output, as from `_minify`.
+    """
+    return [_minify(path, previous) for path, previous in items]
+
+
+@dataclass
+class MinifyReport:
+    """The outcome of minifying the outputs of a build."""
+
+    minified: int = 0
+    skipped: int = 0
+    original_bytes: int = 0
+    minified_bytes: int = 0
+
+    def __str__(self) -> str:
+        """Summarises the outcome.
+
+        Returns:
+            The numbers of outputs minified and skipped, and the number of
+            bytes saved.
+        """
+        saved = self.original_bytes - self.minified_bytes
+        return (
+            f"Minified {self.minified} outputs, saving {saved / 1024:.1f} KiB, "
+            f"skipping {self.skipped} unchanged"
+        )
+
+
+def minify_output(
+    output_path: Path, cache_path: Path, workers: int | None = None
+) -> MinifyReport:
+    """Minifies the HTML, CSS and SVG outputs of a build.
+
+    Args:
+        output_path: The output directory.
+        cache_path: The directory in which the manifest is stored.
+        workers: The number of processes. Defaults to one per core.
+
+    Returns:
+        The number of outputs minified and skipped, and the total size of
+        those minified before and after minification.
+    """
+    manifest_path = cache_path / _MANIFEST_FILE
+    previous = _Manifest.load(manifest_path)
+    current = _Manifest()
+    report = MinifyReport()
+
+    paths = find_outputs(output_path, _MINIFIERS)
+    relative = [str(path.relative_to(output_path)) for path in paths]
+    items = [
+        (str(path), previous.outputs.get(name))
+        for path, name in zip(paths, relative, strict=True)
+    ]
+    results = map_in_processes(_minify_many, items, workers)
+
+    for name, (entry, minified, size, minified_size) in zip(
+        relative, results, strict=True
+    ):
+        current.outputs[name] = entry
+        if minified:
+            report.minified += 1
+            report.original_bytes += size
+            report.minified_bytes += minified_size
+        else:
+            report.skipped += 1
+    current.save(manifest_path)
+    return report
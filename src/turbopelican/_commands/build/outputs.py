@@ -0,0 +1,97 @@
+"""Provides the utilities for the stages run over the output of a build.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import os
+import shutil
+import tempfile
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Sequence
+    from pathlib import Path
+
+_Item = TypeVar("_Item")
+_Result = TypeVar("_Result")
+
+_MINIMUM_ITEMS = 16
+"""The fewest outputs worth starting a process pool for."""
+
+
+def find_outputs(
+    output_path: Path, extensions: Collection[str], minimum_size: int = 0
+) -> list[Path]:
+    """Finds the outputs which a stage processes.
+
+    Args:
+        output_path: The output directory.
+        extensions: The suffixes of the outputs, in lower case.
+        minimum_size: The smallest output in bytes worth processing.
+
+    Returns:
+        Every output with one of the suffixes and of at least the minimum
+        size, sorted by path.
+    """
+    return sorted(
+        path
+        for path in output_path.rglob("*")
+        if path.suffix.lower() in extensions
+        and path.is_file()
+        and path.stat().st_size >= minimum_size
+    )
+
+
+def map_in_processes(
+    function: Callable[[Sequence[_Item]], list[_Result]],
+    items: Sequence[_Item],
+    workers: int | None = None,
+) -> list[_Result]:
+    """Processes outputs in batches, in a pool of processes.
+
+    Args:
+        function: The picklable function which processes a batch.
+        items: The outputs to be processed.
+        workers: The number of processes. Defaults to one per core. A pool is
+            not started for a single process or a handful of outputs.
+
+    Returns:
+        The result for each output, in order.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(items) < _MINIMUM_ITEMS:
+        return function(items)
+    batch_size = max(len(items) // (workers * 4), 1)
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(function, items[start : start + batch_size])
+            for start in range(0, len(items), batch_size)
+        ]
+        return [result for future in futures for result in future.result()]
+
+
+def write_atomically(path: str, data: bytes, source: str) -> None:
+    """Replaces a file with new contents, dated as its source.
+
+    The file is replaced rather than written to, so that other files hard
+    linked to it are left unchanged.
+
+    Args:
+        path: The path to the file.
+        data: The new contents.
+        source: The file whose modification time is copied.
+    """
+    descriptor, partial = tempfile.mkstemp(dir=os.path.dirname(path))  # noqa: PTH120
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+        shutil.copystat(source, partial)
+        os.replace(partial, path)  # noqa: PTH105
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(partial)  # noqa: PTH108
+        raise
@@ -0,0 +1,303 @@
+"""Writes compressed copies of the outputs, for hosts which serve them.
+
+Static hosts and CDNs can serve a page from a precompressed sibling, such as
+`index.html.gz`, rather than compressing it on each request. Once the website
+has been built, each HTML, CSS, JavaScript, SVG and XML output is compressed
+in a pool of processes, with gzip and, if their packages are installed, with
+Brotli and Zstandard. The hash of each output is recorded in a manifest in
+`cache_path`, and outputs whose siblings were written from the same contents
+are skipped.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import gzip
+import importlib.util
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import pydantic
+
+from turbopelican._commands.build.outputs import (
+    find_outputs,
+    map_in_processes,
+    write_atomically,
+)
+from turbopelican._utils.errors import TurbopelicanError
+from turbopelican._utils.shared import hash_file
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+    from pathlib import Path
+
+FORMATS = ("gz", "br", "zst")
+"""The suffix of each compressed sibling which can be written."""
+
+_PACKAGES = {"br": "brotli", "zst": "zstandard"}
+"""The package which each format needs, besides gzip."""
+
+_EXTENSIONS = frozenset({".html", ".htm", ".css", ".js", ".mjs", ".svg", ".xml"})
+"""The suffixes of the outputs which are compressed."""
+
+_MINIMUM_SIZE = 256
+"""The smallest output in bytes worth compressing."""
+
+_MANIFEST_FILE = "turbopelican_precompress.json"
+"""The name of the file in `cache_path` in which the manifest is stored."""
+
+
+def available_formats() -> list[str]:
+    """Lists the formats whose packages are installed.
+
+    Returns:
+        The suffix of each format, always including gzip.
+    """
+    return [
+        suffix
+        for suffix in FORMATS
+        if suffix not in _PACKAGES or importlib.util.find_spec(_PACKAGES[suffix])
+    ]
+
+
+def resolve_formats(requested: Sequence[str]) -> tuple[str, ...]:
+    """Chooses the formats in which outputs are compressed.
+
+    Args:
+        requested: The formats given on the command line, if any.
+
+    Returns:
+        The requested formats, or else every available format.
+
+    Raises:
+        TurbopelicanError: A requested format's package is not installed.
+    """
+    available = available_formats()
+    for suffix in requested:
+        if suffix not in available:
+            raise TurbopelicanError(
+                f"Compressing outputs as .{suffix} requires {_PACKAGES[suffix]}."
+            )
+    return tuple(dict.fromkeys(requested or available))
+
+
+def _compressor(suffix: str) -> Callable[[bytes], bytes]:
+    """Finds the function which compresses in a format, at its highest level.
+
+    Args:
+        suffix: The suffix of the format.
+
+    Returns:
+        The function. gzip omits the modification time, so that the same
+        output always compresses to the same bytes.
+    """
+    if suffix == "br":
+        import brotli  # type: ignore[import-not-found]  # noqa: PLC0415
+
+        return lambda data: brotli.compress(data, quality=11)
+    if suffix == "zst":
+        import zstandard  # type: ignore[import-not-found]  # noqa: PLC0415
+
+        return zstandard.ZstdCompressor(level=19).compress
+    return lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+
+
+class _Entry(pydantic.BaseModel):
+    """The siblings of an output, as written from its contents."""
+
+    hash: str
+    size: int
+    mtime_ns: int
+    siblings: list[str]
+
+
+class _Manifest(pydantic.BaseModel):
+    """Records the siblings written for every compressed output."""
+
+    version: int = 1
+    formats: list[str] = pydantic.Field(default_factory=list)
+    outputs: dict[str, _Entry] = pydantic.Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> _Manifest:
+        """Loads the manifest persisted by the previous build.
+
+        Args:
+            path: The file in which the manifest is stored.
+
+        Returns:
+            The manifest, or an empty manifest if none could be read.
+        """
+        try:
+            return cls.model_validate_json(path.read_bytes())
+        except (OSError, pydantic.ValidationError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Persists the manifest for the next build.
+
+        Args:
+            path: The file in which the manifest is to be stored.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.model_dump_json())
+
+
+def _compress(
+    path: str, formats: tuple[str, ...], previous: _Entry | None
+) -> tuple[_Entry, bool, int, int]:
+    """Writes the compressed siblings of an output, unless they are up to date.
+
+    Args:
+        path: The path to the output.
+        formats: The suffixes of the siblings.
+        previous: The entry recorded for the output by the previous build, if
+            it was compressed in the same formats.
+
+    Returns:
+        The entry for the output, whether its siblings were written, and its
+        size and that of its smallest sibling, or 0 if it has none.
+    """
+    status = os.stat(path)  # noqa: PTH116
+    unchanged = (
+        previous is not None
+        and previous.size == status.st_size
+        and previous.mtime_ns == status.st_mtime_ns
+    )
+    digest = previous.hash if previous and unchanged else hash_file(path) or ""
+    if (
+        previous is not None
+        and previous.hash == digest
+        and all(os.path.exists(f"{path}.{suffix}") for suffix in previous.siblings)  # noqa: PTH110
+    ):
+        entry = previous.model_copy(
+            update={"size": status.st_size, "mtime_ns": status.st_mtime_ns}
+        )
+        return entry, False, status.st_size, 0
+
+    with open(path, "rb") as file:  # noqa: PTH123
+        data = file.read()
+    siblings = []
+    smallest = 0
+    for suffix in formats:
+        compressed = _compressor(suffix)(data)
+        sibling = f"{path}.{suffix}"
+        if len(compressed) < len(data):
+            write_atomically(sibling, compressed, path)
+            siblings.append(suffix)
+            smallest = min(smallest or len(compressed), len(compressed))
+        else:
+            with contextlib.suppress(OSError):
+                os.unlink(sibling)  # noqa: PTH108
+    entry = _Entry(
+        hash=digest,
+        size=status.st_size,
+        mtime_ns=status.st_mtime_ns,
+        siblings=siblings,
+    )
+    return entry, True, len(data), smallest
+
+
+def _compress_many(
+    items: Sequence[tuple[str, _Entry | None]], formats: tuple[str, ...]
+) -> list[tuple[_Entry, bool, int, int]]:
+    """Compresses a batch of outputs, in a worker process.
+
+    Args:
+        items: The path to each output and the entry recorded for it by the
+            previous build.
+        formats: The suffixes of the siblings.
+
+    Returns:
+        The result of compressing each output, as from `_compress`.
+    """
+    return [_compress(path, formats, entry) for path, entry in items]
+
+
+@dataclass
+class PrecompressReport:
+    """The outcome of compressing the outputs of a build."""
+
+    compressed: int = 0
+    skipped: int = 0
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+
+    def __str__(self) -> str:
+        """Summarises the outcome.
+
+        Returns:
+            The numbers of outputs compressed and skipped, and the proportion
+            of their size to which those compressed were reduced.
+        """
+        ratio = (
+            self.compressed_bytes / self.original_bytes if self.original_bytes else 1
+        )
+        return (
+            f"Precompressed {self.compressed} outputs to {ratio:.0%} of their "
+            f"size, skipping {self.skipped} unchanged"
+        )
+
+
+def precompress_output(
+    output_path: Path,
+    cache_path: Path,
+    formats: Iterable[str],
+    workers: int | None = None,
+) -> PrecompressReport:
+    """Writes compressed siblings for the outputs of a build.
+
+    Siblings of outputs which no longer exist, or which no longer compress,
+    are removed.
+
+    Args:
+        output_path: The output directory.
+        cache_path: The directory in which the manifest is stored.
+        formats: The suffixes of the siblings to be written.
+        workers: The number of processes. Defaults to one per core.
+
+    Returns:
+        The number of outputs compressed and skipped, and the total size of
+        those compressed before and after compression, in their smallest
+        format.
+    """
+    formats = tuple(formats)
+    manifest_path = cache_path / _MANIFEST_FILE
+    previous = _Manifest.load(manifest_path)
+    reusable = previous.outputs if previous.formats == list(formats) else {}
+    current = _Manifest(formats=list(formats))
+    report = PrecompressReport()
+
+    paths = find_outputs(output_path, _EXTENSIONS, _MINIMUM_SIZE)
+    relative = [str(path.relative_to(output_path)) for path in paths]
+    items = [
+        (str(path), reusable.get(name))
+        for path, name in zip(paths, relative, strict=True)
+    ]
+    results = map_in_processes(
+        functools.partial(_compress_many, formats=formats), items, workers
+    )
+
+    for name, (entry, written, size, smallest) in zip(relative, results, strict=True):
+        current.outputs[name] = entry
+        if written:
+            report.compressed += 1
+            report.original_bytes += size
+            report.compressed_bytes += smallest or size
+        else:
+            report.skipped += 1
+
+    # Siblings are left behind by outputs which are no longer produced, and
+    # by formats which are no longer written.
+    for name, entry in previous.outputs.items():
+        kept = current.outputs.get(name)
+        for suffix in entry.siblings:
+            if kept is None or suffix not in kept.siblings:
+                with contextlib.suppress(OSError):
+                    (output_path / f"{name}.{suffix}").unlink()
+    current.save(manifest_path)
+    return report
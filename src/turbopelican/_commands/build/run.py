@@ -0,0 +1,234 @@
+"""Provides the utilities to build the website with Pelican.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from turbopelican._commands.build.cache import cache_key, restore_cache, save_cache
+from turbopelican._commands.build.changes import prepare_build, record_build
+from turbopelican._utils.errors import TurbopelicanError
+from turbopelican._utils.shared.args import Verbosity
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from turbopelican._commands.build.config import BuildConfiguration
+
+_INCREMENTAL_PLUGIN = "turbopelican.plugins.incremental"
+"""The plugin which enables incremental builds."""
+
+_CRITICAL_CSS_PLUGIN = "turbopelican.plugins.critical_css"
+"""The plugin which inlines the stylesheets of each page."""
+
+
+@contextlib.contextmanager
+def _environment_variable(name: str, value: str) -> Iterator[None]:
+    """Sets an environment variable temporarily.
+
+    Args:
+        name: The name of the environment variable.
+        value: The value to which it is set.
+    """
+    previous = os.environ.get(name)
+    os.environ[name] = value
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = previous
+
+
+def _with_plugin(plugins: Iterable[Any] | None, plugin_name: str) -> list[Any]:
+    """Adds a plugin to those configured for Pelican.
+
+    Args:
+        plugins: The configured plugins. If None, Pelican would load every
+            namespace plugin, so these are kept.
+        plugin_name: The module name of the plugin to be added.
+
+    Returns:
+        The plugins, including the new plugin.
+    """
+    if plugins is None:
+        from pelican.plugins._utils import get_namespace_plugins  # noqa: PLC0415
+
+        plugins = get_namespace_plugins()
+    plugins = list(plugins)
+    if plugin_name not in plugins:
+        plugins.append(plugin_name)
+    return plugins
+
+
+def _clean_output(settings: dict[str, Any]) -> None:
+    """Deletes the output directory, unless it contains the content.
+
+    Args:
+        settings: The settings of the website.
+    """
+    from pelican.utils import clean_output_dir  # noqa: PLC0415
+
+    output_path = Path(settings["OUTPUT_PATH"]).resolve()
+    if Path(settings["PATH"]).resolve().is_relative_to(output_path):
+        return
+    clean_output_dir(str(output_path), settings["OUTPUT_RETENTION"])
+
+
+def _report_plugins(settings: dict[str, Any], verbosity: Verbosity) -> None:
+    """Shows the summaries which plugins reported during the build.
+
+    Args:
+        settings: The settings of the build.
+        verbosity: Whether the summaries are shown.
+    """
+    from turbopelican.plugins._utils import pop_reports  # noqa: PLC0415
+
+    for summary in pop_reports(settings["OUTPUT_PATH"]):
+        if verbosity == Verbosity.NORMAL:
+            print(f"⚡ {summary} ⚡")
+
+
+def _minify_static_files(settings: dict[str, Any]) -> None:
+    """Makes plugins which copy static files minify them as they copy them.
+
+    Args:
+        settings: The settings of the build.
+    """
+    from turbopelican._commands.build.minify import minify_file  # noqa: PLC0415
+    from turbopelican.plugins._utils import MINIFY_SETTING  # noqa: PLC0415
+
+    settings[MINIFY_SETTING] = minify_file
+
+
+def finish_output(
+    settings: dict[str, Any],
+    *,
+    minify: bool,
+    precompress: tuple[str, ...],
+    verbosity: Verbosity,
+) -> None:
+    """Runs the stages over the output once every output has been written.
+
+    Args:
+        settings: The settings of the build.
+        minify: Whether the HTML, CSS and SVG outputs are minified.
+        precompress: The formats in which the outputs are precompressed, if
+            any.
+        verbosity: Whether the outcome of each stage is reported.
+    """
+    output_path = Path(settings["OUTPUT_PATH"])
+    cache_path = Path(settings["CACHE_PATH"])
+    # Outputs are minified first, so that their minified forms are compressed.
+    if minify:
+        from turbopelican._commands.build.minify import minify_output  # noqa: PLC0415
+
+        report = minify_output(output_path, cache_path)
+        if verbosity == Verbosity.NORMAL:
+            print(f"⚡ {report} ⚡")
+    if precompress:
+        from turbopelican._commands.build.precompress import (  # noqa: PLC0415
+            precompress_output,
+        )
+
+        report = precompress_output(output_path, cache_path, precompress)
+        if verbosity == Verbosity.NORMAL:
+            print(f"⚡ {report} ⚡")
+
+
+def run_pelican(config: BuildConfiguration) -> None:
+    """Builds the website in-process with Pelican.
+
+    Args:
+        config: The arguments to configure the build.
+
+    Raises:
+        TurbopelicanError: Pelican is not installed, or the website has no
+            `pelicanconf.py`.
+    """
+    try:
+        from pelican import Pelican, log  # noqa: PLC0415
+        from pelican.settings import read_settings  # noqa: PLC0415
+    except ImportError:
+        raise TurbopelicanError(
+            "Pelican must be installed to build the website."
+        ) from None
+
+    settings_file = config.directory / "pelicanconf.py"
+    if not settings_file.exists():
+        raise TurbopelicanError(f"Could not find {settings_file}.")
+
+    quiet = config.verbosity == Verbosity.QUIET
+    log.init(logging.ERROR if quiet else logging.WARNING)
+    previously_quiet = log.console.quiet
+    log.console.quiet = quiet
+    try:
+        with (
+            contextlib.chdir(config.directory),
+            _environment_variable("TURBOPELICAN_CONFIG_TYPE", config.config_type),
+            _environment_variable("TURBOPELICAN_PREVIEW_ONLY", config.only or ""),
+        ):
+            settings = read_settings(str(settings_file))
+            if config.shard is not None:
+                from turbopelican._commands.build.shards import (  # noqa: PLC0415
+                    shard_settings,
+                )
+
+                settings = shard_settings(
+                    settings, config.shard, config.shards_directory
+                )
+            if config.incremental:
+                settings["PLUGINS"] = _with_plugin(
+                    settings.get("PLUGINS"), _INCREMENTAL_PLUGIN
+                )
+            if config.inline_css:
+                settings["PLUGINS"] = _with_plugin(
+                    settings.get("PLUGINS"), _CRITICAL_CSS_PLUGIN
+                )
+            if config.minify:
+                _minify_static_files(settings)
+            key = None
+            if config.cache:
+                settings["CACHE_CONTENT"] = settings["LOAD_CONTENT_CACHE"] = True
+                key = cache_key(config.directory, settings)
+                restore_cache(config, settings, key)
+            prepare_build(config.directory, settings)
+            if config.split_by_lang:
+                from turbopelican._commands.build.languages import (  # noqa: PLC0415
+                    build_by_language,
+                )
+
+                build_by_language(
+                    settings, logging.ERROR if quiet else logging.WARNING, quiet=quiet
+                )
+            else:
+                Pelican(settings).run()
+            _report_plugins(settings, config.verbosity)
+            finish_output(
+                settings,
+                minify=config.minify,
+                precompress=config.precompress,
+                verbosity=config.verbosity,
+            )
+            record_build(config.directory, settings)
+            if key is not None:
+                save_cache(config, settings, key)
+    finally:
+        log.console.quiet = previously_quiet
+
+
+def report_completion(config: BuildConfiguration) -> None:
+    """Reports that Turbopelican has finished building the website.
+
+    Args:
+        config: The arguments to configure the build.
+    """
+    if config.verbosity == Verbosity.NORMAL:
+        print("⚡ Turbopelican built! ⚡")
@@ -0,0 +1,82 @@
+"""Divides the rendering of a website between independent builds.
+
+Each shard is built from the same settings, reading all of the content, but
+only renders its articles and pages into a directory of its own, so that the
+shards can be built by separate jobs, such as those of a CI matrix, or by
+separate processes. `merge-shards` then combines the shards and renders the
+outputs shared between them.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Any
+
+from turbopelican._commands.build.run import _with_plugin
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_SHARD_PLUGIN = "turbopelican.plugins.shard"
+"""The plugin which writes only the outputs of one shard."""
+
+_SHARD_SETTING = "TURBOPELICAN_SHARD"
+"""The setting for the shard written by a build and the number of shards."""
+
+
+def shard_directory(shards_directory: Path, index: int) -> Path:
+    """Locates the output of a shard.
+
+    Args:
+        shards_directory: The directory in which each shard is rendered.
+        index: The shard, from 1.
+
+    Returns:
+        The directory into which the shard is rendered.
+    """
+    return shards_directory / f"shard-{index}"
+
+
+def shard_settings(
+    settings: dict[str, Any], shard: tuple[int, int], shards_directory: Path
+) -> dict[str, Any]:
+    """Configures a build to render only one shard of the website.
+
+    Args:
+        settings: The settings of the website.
+        shard: The shard, from 1, and the number of shards.
+        shards_directory: The directory in which each shard is rendered.
+
+    Returns:
+        The settings of the shard, which is rendered into a directory of its
+        own, with caches of its own, so that shards can be built at once.
+    """
+    index, count = shard
+    settings = dict(settings)
+    settings["OUTPUT_PATH"] = str(shard_directory(shards_directory, index))
+    settings["CACHE_PATH"] = os.path.join(  # noqa: PTH118
+        settings["CACHE_PATH"], f"shard-{index}-of-{count}"
+    )
+    settings["PLUGINS"] = _with_plugin(settings.get("PLUGINS"), _SHARD_PLUGIN)
+    settings[_SHARD_SETTING] = [index, count]
+    return settings
+
+
+def shared_settings(settings: dict[str, Any], count: int) -> dict[str, Any]:
+    """Configures a build to render only the outputs shared between shards.
+
+    Args:
+        settings: The settings of the website.
+        count: The number of shards.
+
+    Returns:
+        The settings of the build, which keeps the shards already combined in
+        the output directory.
+    """
+    settings = dict(settings)
+    settings["DELETE_OUTPUT_DIRECTORY"] = False
+    settings["PLUGINS"] = _with_plugin(settings.get("PLUGINS"), _SHARD_PLUGIN)
+    settings[_SHARD_SETTING] = [0, count]
+    return settings
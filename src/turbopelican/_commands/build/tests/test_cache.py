@@ -0,0 +1,115 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from turbopelican._commands.build.cache import (
+    LocalCacheBackend,
+    cache_key,
+    restore_cache,
+    save_cache,
+)
+from turbopelican._commands.build.config import BuildConfiguration
+from turbopelican._utils.config.config import _DeploymentType
+from turbopelican._utils.shared.args import Verbosity
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> BuildConfiguration:
+    """Provides the configuration to build a website with a cache.
+
+    Args:
+        tmp_path: A temporary directory containing the website and its caches.
+
+    Returns:
+        The configuration.
+    """
+    (tmp_path / "site" / "theme").mkdir(parents=True)
+    (tmp_path / "site" / "theme" / "base.html").write_text("<html>")
+    (tmp_path / "site" / "uv.lock").write_text("version = 1")
+    return BuildConfiguration(
+        directory=tmp_path / "site",
+        config_type=_DeploymentType.PUBLISH,
+        incremental=False,
+        verbosity=Verbosity.QUIET,
+        cache=True,
+        cache_directory=tmp_path / "bundles",
+        cache_include=[Path("thumbnails")],
+    )
+
+
+@pytest.fixture
+def settings(config: BuildConfiguration) -> dict[str, Any]:
+    """Provides the settings which Pelican would use for the website.
+
+    Args:
+        config: The configuration to build the website.
+
+    Returns:
+        The settings.
+    """
+    return {"THEME": str(config.directory / "theme"), "CACHE_PATH": "cache"}
+
+
+def test_local_cache_backend(tmp_path: Path) -> None:
+    """Tests that bundles are restored and that only the latest is kept.
+
+    Args:
+        tmp_path: A temporary directory for the files and bundles.
+    """
+    backend = LocalCacheBackend(tmp_path / "bundles")
+    (tmp_path / "source" / "cache").mkdir(parents=True)
+    (tmp_path / "source" / "cache" / "data").write_text("First")
+    backend.save("first", tmp_path / "source", [tmp_path / "source" / "cache"])
+    (tmp_path / "source" / "cache" / "data").write_text("Second")
+    backend.save("second", tmp_path / "source", [tmp_path / "source" / "cache"])
+
+    assert not backend.restore("first", tmp_path / "destination")
+    assert backend.restore("second", tmp_path / "destination")
+    assert (tmp_path / "destination" / "cache" / "data").read_text() == "Second"
+    assert [path.name for path in (tmp_path / "bundles").iterdir()] == ["second.tar"]
+
+
+def test_cache_key(config: BuildConfiguration, settings: dict[str, Any]) -> None:
+    """Tests that the key changes with the lockfile, theme and settings.
+
+    Args:
+        config: The configuration to build the website.
+        settings: The settings of the website.
+    """
+    keys = {cache_key(config.directory, settings)}
+    (config.directory / "content").mkdir()
+    (config.directory / "content" / "article.md").write_text("Article")
+    assert cache_key(config.directory, settings) in keys
+
+    (config.directory / "uv.lock").write_text("version = 2")
+    keys.add(cache_key(config.directory, settings))
+    (config.directory / "theme" / "base.html").write_text("<body>")
+    keys.add(cache_key(config.directory, settings))
+    settings["SITEURL"] = "https://example.com"
+    keys.add(cache_key(config.directory, settings))
+    assert len(keys) == len(["initial", "lockfile", "theme", "settings"])
+
+
+def test_save_and_restore_cache(
+    config: BuildConfiguration, settings: dict[str, Any]
+) -> None:
+    """Tests that the cache and included paths are restored only if missing.
+
+    Args:
+        config: The configuration to build the website.
+        settings: The settings of the website.
+    """
+    (config.directory / "cache").mkdir()
+    (config.directory / "cache" / "data").write_text("Cached")
+    (config.directory / "thumbnails").mkdir()
+    (config.directory / "thumbnails" / "image.png").write_text("Thumbnail")
+    save_cache(config, settings, "key")
+    assert not restore_cache(config, settings, "key")
+
+    (config.directory / "cache" / "data").unlink()
+    (config.directory / "thumbnails" / "image.png").unlink()
+    assert restore_cache(config, settings, "key")
+    assert (config.directory / "cache" / "data").read_text() == "Cached"
+    assert (config.directory / "thumbnails" / "image.png").exists()
+    assert not restore_cache(config, settings, "other")
@@ -0,0 +1,199 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from turbopelican._commands.build.changes import (
+    _STATE_FILE,
+    _BuildState,
+    detect_changes,
+    prepare_build,
+    record_build,
+)
+
+_OLD_STAMP = 1_000_000_000_000_000_000
+"""A modification time, in nanoseconds, well before any checkout."""
+
+
+def _git(repository: Path, *args: str) -> str:
+    """Runs a git command in a repository.
+
+    Args:
+        repository: The root of the repository.
+        args: The arguments to git.
+
+    Returns:
+        The output of the command.
+    """
+    git_path = shutil.which("git")
+    assert git_path
+    return subprocess.run(
+        [git_path, "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repository,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def website(tmp_path: Path) -> Path:
+    """Creates a website with two articles committed to a repository.
+
+    Args:
+        tmp_path: A temporary directory in which to create the website.
+
+    Returns:
+        The root of the website.
+    """
+    if not shutil.which("git"):
+        pytest.skip("git is not installed")
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "first.md").write_text("First")
+    (tmp_path / "content" / "second.md").write_text("Second")
+    (tmp_path / "theme").mkdir()
+    (tmp_path / "theme" / "base.html").write_text("<html>")
+    (tmp_path / "turbopelican.toml").write_text("[pelican]")
+    _git(tmp_path, "init", "--quiet")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "--quiet", "-m", "Initial commit")
+    return tmp_path
+
+
+@pytest.fixture
+def settings(website: Path) -> dict[str, Any]:
+    """Provides the settings which Pelican would use for the website.
+
+    Args:
+        website: The root of a website in a repository.
+
+    Returns:
+        The settings.
+    """
+    return {
+        "PATH": str(website / "content"),
+        "THEME": str(website / "theme"),
+        "CACHE_PATH": str(website / "cache"),
+        "LOAD_CONTENT_CACHE": True,
+    }
+
+
+def _checkout(website: Path) -> None:
+    """Simulates a checkout, giving every content file a new modification time.
+
+    Args:
+        website: The root of the website.
+    """
+    for path in (website / "content").iterdir():
+        path.touch()
+
+
+def test_record_build(website: Path, settings: dict[str, Any]) -> None:
+    """Tests that the commit and stamps of unmodified files are recorded.
+
+    Args:
+        website: The root of a website in a repository.
+        settings: The settings of the website.
+    """
+    (website / "content" / "second.md").write_text("Uncommitted")
+    record_build(website, settings)
+    state = _BuildState.load(website / "cache" / _STATE_FILE)
+    assert state.commit == _git(website, "rev-parse", "HEAD")
+    assert set(state.stamps) == {"content/first.md"}
+
+
+def test_detect_changes(website: Path, settings: dict[str, Any]) -> None:
+    """Tests that changed files are classified.
+
+    Args:
+        website: The root of a website in a repository.
+        settings: The settings of the website.
+    """
+    last_commit = _git(website, "rev-parse", "HEAD")
+    (website / "content" / "first.md").write_text("Changed")
+    _git(website, "commit", "--quiet", "-am", "Change content")
+    (website / "content" / "third.md").write_text("Untracked")
+    (website / "cache").mkdir()
+    (website / "cache" / "cached.json").write_text("{}")
+    changes = detect_changes(website, settings, last_commit)
+    assert changes is not None
+    assert changes.content == {
+        (website / "content" / "first.md").resolve(),
+        (website / "content" / "third.md").resolve(),
+    }
+    assert not changes.full_build
+
+    (website / "turbopelican.toml").write_text("[pelican]\nsitename = 'a'")
+    changes = detect_changes(website, settings, last_commit)
+    assert changes is not None
+    assert changes.full_build
+
+
+def test_detect_changes_unknown_history(
+    website: Path, settings: dict[str, Any]
+) -> None:
+    """Tests that the changes are unknown for commits not in the history.
+
+    Args:
+        website: The root of a website in a repository.
+        settings: The settings of the website.
+    """
+    assert detect_changes(website, settings, None) is None
+    assert detect_changes(website, settings, "0" * 40) is None
+
+
+def test_prepare_build(website: Path, settings: dict[str, Any]) -> None:
+    """Tests that unchanged files regain their modification times.
+
+    Args:
+        website: The root of a website in a repository.
+        settings: The settings of the website.
+    """
+    for path in (website / "content").iterdir():
+        os.utime(path, ns=(_OLD_STAMP, _OLD_STAMP))
+    record_build(website, settings)
+
+    _checkout(website)
+    (website / "content" / "second.md").write_text("Changed")
+    _git(website, "commit", "--quiet", "-am", "Change content")
+    changes = prepare_build(website, settings)
+    assert changes is not None
+    assert (website / "content" / "first.md").stat().st_mtime_ns == _OLD_STAMP
+    assert (website / "content" / "second.md").stat().st_mtime_ns != _OLD_STAMP
+    assert settings["LOAD_CONTENT_CACHE"]
+
+
+def test_prepare_full_build(website: Path, settings: dict[str, Any]) -> None:
+    """Tests that the content cache is not used if the theme changed.
+
+    Args:
+        website: The root of a website in a repository.
+        settings: The settings of the website.
+    """
+    for path in (website / "content").iterdir():
+        os.utime(path, ns=(_OLD_STAMP, _OLD_STAMP))
+    record_build(website, settings)
+
+    _checkout(website)
+    (website / "theme" / "base.html").write_text("<body>")
+    changes = prepare_build(website, settings)
+    assert changes is not None
+    assert changes.full_build
+    assert (website / "content" / "first.md").stat().st_mtime_ns != _OLD_STAMP
+    assert not settings["LOAD_CONTENT_CACHE"]
+
+
+def test_prepare_build_without_record(website: Path, settings: dict[str, Any]) -> None:
+    """Tests that modification times are untouched without a recorded build.
+
+    Args:
+        website: The root of a website in a repository.
+        settings: The settings of the website.
+    """
+    os.utime(website / "content" / "first.md", ns=(_OLD_STAMP, _OLD_STAMP))
+    assert prepare_build(website, settings) is None
+    assert (website / "content" / "first.md").stat().st_mtime_ns == _OLD_STAMP
+    assert settings["LOAD_CONTENT_CACHE"]
@@ -0,0 +1,226 @@
+import os
+from argparse import Namespace
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from turbopelican import TurbopelicanError
+from turbopelican._commands.build.config import BuildConfiguration, resolve_shard
+from turbopelican._utils.config.config import _DeploymentType
+from turbopelican._utils.shared.args import Verbosity
+
+
+def test_build_configuration_from_args(tmp_path: Path) -> None:
+    """Check namespace is parsed/validated correctly.
+
+    Args:
+        tmp_path: The path to the website to be built. Provided by fixture.
+    """
+    namespace = Namespace(
+        directory=str(tmp_path),
+        config_type="PUBLISH",
+        incremental=True,
+        quiet=True,
+        cache=None,
+        cache_dir=str(tmp_path / "bundles"),
+        cache_include=["thumbnails"],
+        only=None,
+        split_by_lang=False,
+        shard=None,
+        shards_dir="shards",
+        inline_css=True,
+        minify=None,
+        precompress=False,
+        precompress_format=[],
+    )
+    config = BuildConfiguration.from_args(namespace)
+    assert config.directory == tmp_path
+    assert config.config_type == _DeploymentType.PUBLISH
+    assert config.incremental
+    assert config.verbosity == Verbosity.QUIET
+    assert config.cache
+    assert config.cache_directory == tmp_path / "bundles"
+    assert config.cache_include == [Path("thumbnails")]
+    assert config.inline_css
+
+
+def test_build_configuration_from_environment() -> None:
+    """Check the configuration type defaults to the environment variable."""
+    namespace = Namespace(
+        directory=".",
+        config_type=None,
+        incremental=False,
+        quiet=False,
+        cache=None,
+        cache_dir=None,
+        cache_include=[],
+        only=None,
+        split_by_lang=False,
+        shard=None,
+        shards_dir="shards",
+        inline_css=False,
+        minify=None,
+        precompress=False,
+        precompress_format=[],
+    )
+    with mock.patch.dict(os.environ, {"TURBOPELICAN_CONFIG_TYPE": "PUBLISH"}):
+        config = BuildConfiguration.from_args(namespace)
+    assert config.config_type == _DeploymentType.PUBLISH
+    assert config.minify
+    with mock.patch.dict(os.environ, clear=True):
+        config = BuildConfiguration.from_args(namespace)
+    assert config.config_type == _DeploymentType.DEV
+    assert not config.cache
+    assert not config.minify
+    namespace.minify = True
+    with mock.patch.dict(os.environ, clear=True):
+        assert BuildConfiguration.from_args(namespace).minify
+
+
+def test_build_configuration_invalid_config_type() -> None:
+    """Check an error is raised for an unknown configuration type."""
+    namespace = Namespace(
+        directory=".",
+        config_type=None,
+        incremental=False,
+        quiet=False,
+        cache=None,
+        cache_dir=None,
+        cache_include=[],
+        only=None,
+        split_by_lang=False,
+        shard=None,
+        shards_dir="shards",
+        inline_css=False,
+        minify=None,
+        precompress=False,
+        precompress_format=[],
+    )
+    with (
+        mock.patch.dict(os.environ, {"TURBOPELICAN_CONFIG_TYPE": "OTHER"}),
+        pytest.raises(TurbopelicanError, match="Incorrect config_type"),
+    ):
+        BuildConfiguration.from_args(namespace)
+
+
+def test_build_configuration_cache_directory(tmp_path: Path) -> None:
+    """Check the cache directory defaults to the environment variable.
+
+    Args:
+        tmp_path: The directory in which to keep caches. Provided by fixture.
+    """
+    namespace = Namespace(
+        directory=".",
+        config_type="DEV",
+        incremental=False,
+        quiet=False,
+        cache=True,
+        cache_dir=None,
+        cache_include=[],
+        only=None,
+        split_by_lang=False,
+        shard=None,
+        shards_dir="shards",
+        inline_css=False,
+        minify=None,
+        precompress=False,
+        precompress_format=[],
+    )
+    with mock.patch.dict(os.environ, {"TURBOPELICAN_CACHE_DIR": str(tmp_path)}):
+        config = BuildConfiguration.from_args(namespace)
+    assert config.cache
+    assert config.cache_directory == tmp_path
+    with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": str(tmp_path)}, clear=True):
+        config = BuildConfiguration.from_args(namespace)
+    assert config.cache_directory.parent == tmp_path / "turbopelican"
+
+
+def test_build_configuration_only() -> None:
+    """Check the content can only be restricted when previewing."""
+    namespace = Namespace(
+        directory=".",
+        config_type="PREVIEW",
+        incremental=False,
+        quiet=False,
+        cache=None,
+        cache_dir=None,
+        cache_include=[],
+        only="posts/*.md",
+        split_by_lang=False,
+        shard=None,
+        shards_dir="shards",
+        inline_css=False,
+        minify=None,
+        precompress=False,
+        precompress_format=[],
+    )
+    assert BuildConfiguration.from_args(namespace).only == "posts/*.md"
+    namespace.config_type = "DEV"
+    with pytest.raises(TurbopelicanError, match="requires --config-type PREVIEW"):
+        BuildConfiguration.from_args(namespace)
+
+
+def test_build_configuration_split_by_lang() -> None:
+    """Check languages are only built separately in full builds."""
+    namespace = Namespace(
+        directory=".",
+        config_type="PUBLISH",
+        incremental=False,
+        quiet=False,
+        cache=None,
+        cache_dir=None,
+        cache_include=[],
+        only=None,
+        split_by_lang=True,
+        shard=None,
+        shards_dir="shards",
+        inline_css=False,
+        minify=None,
+        precompress=False,
+        precompress_format=[],
+    )
+    assert BuildConfiguration.from_args(namespace).split_by_lang
+    namespace.incremental = True
+    with pytest.raises(TurbopelicanError, match="cannot be combined"):
+        BuildConfiguration.from_args(namespace)
+
+
+def test_resolve_shard() -> None:
+    """Check shards are given as i/N, with i from 1 to N."""
+    assert resolve_shard(None) is None
+    assert resolve_shard("2/4") == (2, 4)
+    for shard in ("0/4", "5/4", "1", "a/b", "-1/4"):
+        with pytest.raises(TurbopelicanError, match="Incorrect shard"):
+            resolve_shard(shard)
+
+
+def test_build_configuration_shard(tmp_path: Path) -> None:
+    """Check shards are rendered into the shards directory of the website.
+
+    Args:
+        tmp_path: The path to the website to be built. Provided by fixture.
+    """
+    namespace = Namespace(
+        directory=str(tmp_path),
+        config_type="PUBLISH",
+        incremental=False,
+        quiet=False,
+        cache=None,
+        cache_dir=None,
+        cache_include=[],
+        only=None,
+        split_by_lang=False,
+        shard="1/2",
+        shards_dir="shards",
+        inline_css=False,
+        minify=None,
+        precompress=False,
+        precompress_format=[],
+    )
+    config = BuildConfiguration.from_args(namespace)
+    assert config.shard == (1, 2)
+    assert config.shards_directory == tmp_path / "shards"
+    namespace.split_by_lang = True
+    with pytest.raises(TurbopelicanError, match="cannot be combined with --shard"):
+        BuildConfiguration.from_args(namespace)
@@ -0,0 +1,110 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from turbopelican._commands.build.languages import order_languages
+
+_ARTICLES = {
+    "hello.md": ("Hello", "hello", "en"),
+    "bonjour.md": ("Bonjour", "hello", "fr"),
+    "hallo.md": ("Hallo", "hello", "de"),
+    "salut.md": ("Salut", "salut", "fr"),
+}
+
+
+@pytest.fixture
+def site(tmp_path: Path) -> Path:
+    """Creates a site with articles in English, French and German.
+
+    Args:
+        tmp_path: A temporary directory in which to store the site.
+
+    Returns:
+        The root of the site.
+    """
+    content = tmp_path / "content"
+    (content / "pages").mkdir(parents=True)
+    for name, (title, slug, lang) in _ARTICLES.items():
+        (content / name).write_text(
+            f"Title: {title}\nDate: 2024-01-01\nSlug: {slug}\nLang: {lang}\n"
+            f"Tags: greeting\n\n{title}, world.\n"
+        )
+    (content / "pages" / "about.md").write_text("Title: About\nLang: fr\n\nÀ propos.\n")
+    return tmp_path
+
+
+def _settings(site: Path, output: str) -> dict[str, object]:
+    """Reads the settings of the site.
+
+    Args:
+        site: The root of the site.
+        output: The name of the output directory.
+
+    Returns:
+        The settings.
+    """
+    from pelican.settings import read_settings  # noqa: PLC0415
+
+    return read_settings(
+        override={
+            "PATH": str(site / "content"),
+            "OUTPUT_PATH": str(site / output),
+            "CACHE_PATH": str(site / "cache"),
+            "TIMEZONE": "UTC",
+            "SITEURL": "https://example.com",
+            "DELETE_OUTPUT_DIRECTORY": True,
+            "TRANSLATION_FEED_ATOM": "feeds/all-{lang}.atom.xml",
+        }
+    )
+
+
+def _tree(directory: Path) -> dict[str, bytes]:
+    """Reads every file in a directory.
+
+    Args:
+        directory: The directory.
+
+    Returns:
+        The contents of each file, keyed by its relative path.
+    """
+    return {
+        str(path.relative_to(directory)): path.read_bytes()
+        for path in directory.rglob("*")
+        if path.is_file()
+    }
+
+
+def test_order_languages() -> None:
+    """Check the default language comes first, then the largest languages."""
+    languages = ["fr", "de", "fr", "en", "es", "de", "fr"]
+    contents = [SimpleNamespace(lang=lang) for lang in languages]
+    assert order_languages(contents, "en") == ["en", "fr", "de", "es"]  # type: ignore[arg-type]
+    assert order_languages([], "en") == ["en"]
+
+
+def test_build_by_language(site: Path) -> None:
+    """Check building each language separately gives the same output.
+
+    Args:
+        site: The root of a multilingual site.
+    """
+    pytest.importorskip("pelican")
+    from pelican import Pelican  # noqa: PLC0415
+
+    from turbopelican._commands.build.languages import build_by_language  # noqa: PLC0415
+
+    Pelican(_settings(site, "serial")).run()
+    (site / "split").mkdir()
+    (site / "split" / "stale.html").touch()
+    written = build_by_language(_settings(site, "split"), 40, quiet=True)
+
+    assert list(written) == ["en", "fr", "de"]
+    assert sorted(written["fr"]) == [
+        "feeds/all-fr.atom.xml",
+        "hello-fr.html",
+        "pages/about-fr.html",
+        "salut-fr.html",
+    ]
+    assert "index.html" in written["en"]
+    assert _tree(site / "split") == _tree(site / "serial")
@@ -0,0 +1,151 @@
+from pathlib import Path
+
+from turbopelican._commands.build.minify import (
+    minify_css,
+    minify_file,
+    minify_html,
+    minify_output,
+    minify_svg,
+)
+
+_PAGE = """<!DOCTYPE html>
+<html>
+    <head>
+        <title>Hello</title>
+        <!-- The stylesheet. -->
+        <style>
+            body {
+                color : red ;
+            }
+        </style>
+    </head>
+    <body>
+        <p>
+            Hello,   <a href="/"   title="a  b">world</a> !
+        </p>
+        <pre>
+    indented
+        code</pre>
+        <p>Some <code>spaced   code</code> inline.</p>
+        <svg width="10">
+            <g>
+                <path d="M 0 0 L 10 10"/>
+            </g>
+        </svg>
+    </body>
+</html>
+"""
+
+
+def test_minify_html() -> None:
+    """Check whitespace is removed, except where it is rendered or preserved."""
+    assert minify_html(_PAGE) == (
+        "<!DOCTYPE html><html><head><title>Hello</title>"
+        "<style>body{color :red}</style></head><body>"
+        '<p>Hello, <a href="/" title="a  b">world</a> !</p>'
+        "<pre>\n    indented\n        code</pre>"
+        "<p>Some <code>spaced   code</code> inline.</p>"
+        '<svg width="10"><g><path d="M 0 0 L 10 10"/></g></svg>'
+        "</body></html>"
+    )
+
+
+def test_minify_html_keeps_inline_whitespace() -> None:
+    """Check whitespace between inline elements is collapsed, not removed."""
+    html = "<li>\n  <a>One</a>\n  <a>Two</a>\n</li>\n<li>Three</li>"
+    assert minify_html(html) == "<li> <a>One</a> <a>Two</a> </li> <li>Three</li>"
+    # Non-breaking spaces are rendered, so are kept.
+    assert minify_html("<p>a&nbsp;\u00a0 b<!--[if IE]>x<![endif]--></p>") == (
+        "<p>a&nbsp;\u00a0 b<!--[if IE]>x<![endif]--></p>"
+    )
+
+
+def test_minify_css() -> None:
+    """Check comments and whitespace are removed from stylesheets, but not strings."""
+    css = """
+    /*! Licence. */
+    /* A comment. */
+    a::before , b > c {
+        content: "  ;}  ";
+        margin : 0  auto;
+        width: calc(100% - 10px);
+    }
+    """
+    assert minify_css(css) == (
+        '/*! Licence. */a::before,b>c{content:"  ;}  ";'
+        "margin :0 auto;width:calc(100% - 10px)}"
+    )
+
+
+def test_minify_svg() -> None:
+    """Check editor metadata is removed from SVG images, but not their text."""
+    svg = """<svg xmlns="http://www.w3.org/2000/svg"
+        xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape"
+        inkscape:version="1.3" width="10" height="10">
+        <sodipodi:namedview id="view">
+            <inkscape:grid id="grid"/>
+        </sodipodi:namedview>
+        <metadata id="metadata"><rdf:RDF/></metadata>
+        <g inkscape:label="Layer">
+            <text x="0">  Spaced  text </text>
+        </g>
+    </svg>"""
+    assert minify_svg(svg) == (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10">'
+        '<g><text x="0">  Spaced  text </text></g></svg>'
+    )
+
+
+def test_minify_file() -> None:
+    """Check files are only minified if they are HTML, CSS or SVG text."""
+    assert minify_file("theme/css/a.CSS", b"a { color: red }") == b"a{color:red}"
+    feed = b"<feed>\n  <title>Hello</title>\n</feed>"
+    assert minify_file("feed.xml", feed) is feed
+    image = b"<svg>\xff  </svg>"
+    assert minify_file("image.svg", image) is image
+    assert minify_file("a.css", b"a{}") == b"a{}"
+
+
+def test_minify_output(tmp_path: Path) -> None:
+    """Check outputs are minified in place, keeping their modification times.
+
+    Args:
+        tmp_path: A temporary directory containing the output and the cache.
+    """
+    output = tmp_path / "output"
+    output.mkdir()
+    page = output / "index.html"
+    page.write_text(_PAGE)
+    (output / "feed.xml").write_text("<feed>\n  <title>Hello</title>\n</feed>")
+    mtime_ns = page.stat().st_mtime_ns
+
+    report = minify_output(output, tmp_path / "cache")
+    assert report.minified == 1
+    assert report.original_bytes == len(_PAGE)
+    assert report.minified_bytes == page.stat().st_size < len(_PAGE)
+    assert page.read_text() == minify_html(_PAGE)
+    assert page.stat().st_mtime_ns == mtime_ns
+    assert "\n" in (output / "feed.xml").read_text()
+
+    report = minify_output(output, tmp_path / "cache")
+    assert report.minified == 0
+    assert report.skipped == 1
+
+    page.write_text(_PAGE)
+    assert minify_output(output, tmp_path / "cache").minified == 1
+    assert page.read_text() == minify_html(_PAGE)
+
+
+def test_minify_output_in_processes(tmp_path: Path) -> None:
+    """Check outputs minified by a pool of processes match those minified inline.
+
+    Args:
+        tmp_path: A temporary directory containing the output and the cache.
+    """
+    for index in range(32):
+        (tmp_path / f"page-{index}.html").write_text(_PAGE.replace("Hello", str(index)))
+    report = minify_output(tmp_path, tmp_path / "cache", workers=2)
+    assert report.minified == 32  # noqa: PLR2004
+    for index in range(32):
+        contents = (tmp_path / f"page-{index}.html").read_text()
+        assert contents == minify_html(_PAGE.replace("Hello", str(index)))
@@ -0,0 +1,137 @@
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from turbopelican._commands.build.precompress import (
+    available_formats,
+    precompress_output,
+    resolve_formats,
+)
+from turbopelican._utils.errors import TurbopelicanError
+
+_PAGE = "<html><body>" + "<p>Hello, world!</p>" * 100 + "</body></html>"
+
+
+@pytest.fixture
+def output(tmp_path: Path) -> Path:
+    """Provides the output directory of a built website.
+
+    Args:
+        tmp_path: A temporary directory containing the output.
+
+    Returns:
+        The output directory.
+    """
+    output = tmp_path / "output"
+    (output / "theme" / "css").mkdir(parents=True)
+    (output / "index.html").write_text(_PAGE)
+    (output / "theme" / "css" / "main.css").write_text("body { margin: 0; }\n" * 50)
+    (output / "small.html").write_text("<html></html>")
+    (output / "image.png").write_bytes(b"\x89PNG" * 100)
+    return output
+
+
+def test_precompress_output_writes_siblings(output: Path, tmp_path: Path) -> None:
+    """Check compressible outputs are given siblings which decompress to them.
+
+    Args:
+        output: The output directory.
+        tmp_path: The temporary directory holding the cache.
+    """
+    report = precompress_output(output, tmp_path / "cache", ["gz"])
+    assert report.compressed == 2  # noqa: PLR2004
+    assert report.skipped == 0
+    assert report.compressed_bytes < report.original_bytes
+    assert gzip.decompress((output / "index.html.gz").read_bytes()) == _PAGE.encode()
+    assert (output / "theme" / "css" / "main.css.gz").exists()
+    assert not (output / "small.html.gz").exists()
+    assert not (output / "image.png.gz").exists()
+
+
+def test_precompress_output_skips_unchanged(output: Path, tmp_path: Path) -> None:
+    """Check outputs are only compressed again if their contents change.
+
+    Args:
+        output: The output directory.
+        tmp_path: The temporary directory holding the cache.
+    """
+    precompress_output(output, tmp_path / "cache", ["gz"])
+    # A rewritten output with the same contents is not compressed again.
+    (output / "index.html").write_text(_PAGE)
+    report = precompress_output(output, tmp_path / "cache", ["gz"])
+    assert report.compressed == 0
+    assert report.skipped == 2  # noqa: PLR2004
+
+    (output / "index.html").write_text(_PAGE.replace("Hello", "Goodbye"))
+    report = precompress_output(output, tmp_path / "cache", ["gz"])
+    assert report.compressed == 1
+    assert report.skipped == 1
+    assert b"Goodbye" in gzip.decompress((output / "index.html.gz").read_bytes())
+
+
+def test_precompress_output_replaces_missing(output: Path, tmp_path: Path) -> None:
+    """Check siblings removed since the previous build are written again.
+
+    Args:
+        output: The output directory.
+        tmp_path: The temporary directory holding the cache.
+    """
+    precompress_output(output, tmp_path / "cache", ["gz"])
+    (output / "index.html.gz").unlink()
+    report = precompress_output(output, tmp_path / "cache", ["gz"])
+    assert report.compressed == 1
+    assert (output / "index.html.gz").exists()
+
+
+def test_precompress_output_removes_stale(output: Path, tmp_path: Path) -> None:
+    """Check siblings of outputs which are no longer built are removed.
+
+    Args:
+        output: The output directory.
+        tmp_path: The temporary directory holding the cache.
+    """
+    precompress_output(output, tmp_path / "cache", ["gz"])
+    (output / "index.html").unlink()
+    precompress_output(output, tmp_path / "cache", ["gz"])
+    assert not (output / "index.html.gz").exists()
+    assert (output / "theme" / "css" / "main.css.gz").exists()
+
+
+def test_precompress_output_incompressible(output: Path, tmp_path: Path) -> None:
+    """Check no sibling is written which is larger than its output.
+
+    Args:
+        output: The output directory.
+        tmp_path: The temporary directory holding the cache.
+    """
+    (output / "random.js").write_bytes(os.urandom(1024))
+    precompress_output(output, tmp_path / "cache", ["gz"])
+    assert not (output / "random.js.gz").exists()
+
+
+def test_precompress_output_in_processes(output: Path, tmp_path: Path) -> None:
+    """Check outputs compressed by a pool of processes match those compressed inline.
+
+    Args:
+        output: The output directory.
+        tmp_path: The temporary directory holding the cache.
+    """
+    for index in range(32):
+        (output / f"page-{index}.html").write_text(_PAGE.replace("world", str(index)))
+    report = precompress_output(output, tmp_path / "cache", ["gz"], workers=2)
+    assert report.compressed == 34  # noqa: PLR2004
+    for index in range(32):
+        contents = (output / f"page-{index}.html").read_bytes()
+        sibling = output / f"page-{index}.html.gz"
+        assert gzip.decompress(sibling.read_bytes()) == contents
+
+
+def test_resolve_formats() -> None:
+    """Check the formats default to those available and must be installed."""
+    assert resolve_formats([]) == tuple(available_formats())
+    assert resolve_formats(["gz", "gz"]) == ("gz",)
+    if "br" not in available_formats():
+        with pytest.raises(TurbopelicanError, match="requires brotli"):
+            resolve_formats(["br"])
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from turbopelican import TurbopelicanError
+from turbopelican._commands.build.config import BuildConfiguration
+from turbopelican._commands.build.run import (
+    _environment_variable,
+    _report_plugins,
+    _with_plugin,
+    run_pelican,
+)
+from turbopelican._commands.init.create import _copy_template
+from turbopelican._utils.config.config import _DeploymentType
+from turbopelican._utils.shared.args import Verbosity
+
+
+@pytest.fixture
+def website(tmp_path: Path) -> Path:
+    """Creates a new website from the template, dated as by `init`.
+
+    Args:
+        tmp_path: A temporary directory in which to create the website.
+
+    Returns:
+        The path to the website.
+    """
+    _copy_template(tmp_path, "newsite")
+    for file in (tmp_path / "content").glob("*.md"):
+        file.write_text(file.read_text().replace("$date", "2024-01-01"))
+    return tmp_path
+
+
+def test_environment_variable() -> None:
+    """Check environment variables are restored afterwards."""
+    os.environ.pop("TURBOPELICAN_TEST_VARIABLE", None)
+    with _environment_variable("TURBOPELICAN_TEST_VARIABLE", "a"):
+        assert os.environ["TURBOPELICAN_TEST_VARIABLE"] == "a"
+    assert "TURBOPELICAN_TEST_VARIABLE" not in os.environ
+
+
+def test_with_plugin() -> None:
+    """Check plugins are added alongside the configured plugins."""
+    assert _with_plugin(["a"], "b") == ["a", "b"]
+    assert _with_plugin({"a": "x"}, "a") == ["a"]
+
+
+def test_report_plugins(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Check the summaries reported by plugins are shown once, unless quiet.
+
+    Args:
+        tmp_path: The output directory of a build.
+        capsys: Captures the summaries shown.
+    """
+    pytest.importorskip("pelican")
+    from turbopelican.plugins._utils import report  # noqa: PLC0415
+
+    settings = {"OUTPUT_PATH": str(tmp_path)}
+    report(settings, "First summary")
+    report(settings, "Second summary")
+    _report_plugins(settings, Verbosity.NORMAL)
+    _report_plugins(settings, Verbosity.NORMAL)
+    assert capsys.readouterr().out == "⚡ First summary ⚡\n⚡ Second summary ⚡\n"
+
+    report(settings, "Quiet summary")
+    _report_plugins(settings, Verbosity.QUIET)
+    _report_plugins(settings, Verbosity.NORMAL)
+    assert not capsys.readouterr().out
+
+
+def test_run_pelican(website: Path, tmp_path_factory: pytest.TempPathFactory) -> None:
+    """Check the website is built with the requested configuration.
+
+    Args:
+        website: The path to a new website.
+        tmp_path_factory: Creates the directory in which caches are kept.
+    """
+    pytest.importorskip("pelican")
+    cache_directory = tmp_path_factory.mktemp("bundles")
+    config = BuildConfiguration(
+        directory=website,
+        config_type=_DeploymentType.PUBLISH,
+        incremental=True,
+        verbosity=Verbosity.QUIET,
+        cache=True,
+        cache_directory=cache_directory,
+        cache_include=[],
+    )
+    run_pelican(config)
+    assert (website / "output" / "index.html").exists()
+    assert (website / "output" / "feeds" / "all.atom.xml").exists()
+    assert list((website / "cache").glob("publish-*/turbopelican_incremental.json"))
+    assert len(list(cache_directory.glob("*.tar"))) == 1
+
+    shutil.rmtree(website / "cache")
+    shutil.rmtree(website / "output")
+    run_pelican(config)
+    assert list((website / "cache").glob("publish-*/turbopelican_incremental.json"))
+    assert (website / "output" / "index.html").exists()
+
+
+def test_run_pelican_minify_static_files(
+    website: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Check static files are minified once, keeping plugins' hashes valid.
+
+    Args:
+        website: The path to a new website.
+        tmp_path_factory: Creates the directory in which caches are kept.
+        capsys: Captures the summaries of the build.
+    """
+    pytest.importorskip("pelican")
+    from turbopelican._commands.build.minify import minify_svg  # noqa: PLC0415
+
+    toml = website / "turbopelican.toml"
+    toml.write_text(
+        toml.read_text().replace(
+            "plugins = [",
+            'plugins = [\n    "turbopelican.plugins.static_manifest",',
+        )
+    )
+    config = BuildConfiguration(
+        directory=website,
+        config_type=_DeploymentType.DEV,
+        incremental=False,
+        verbosity=Verbosity.NORMAL,
+        cache=False,
+        cache_directory=tmp_path_factory.mktemp("bundles"),
+        cache_include=[],
+        minify=True,
+    )
+    output = website / "output"
+    logo = output / "logo.svg"
+    run_pelican(config)
+    minified = minify_svg((website / "content" / "images" / "logo.svg").read_text())
+    assert logo.read_text() == minified
+    # Fingerprinted copies are named by the hash of their minified contents.
+    assets = json.loads((output / "asset-manifest.json").read_text())
+    copy = output / assets["logo.svg"]
+    assert copy.read_text() == minified
+    assert hashlib.sha256(copy.read_bytes()).hexdigest()[:10] in copy.name
+
+    status = logo.stat()
+    capsys.readouterr()
+    run_pelican(config)
+    assert logo.stat().st_ino == status.st_ino
+    assert logo.stat().st_mtime_ns == status.st_mtime_ns
+    assert "⚡ Static files: copied 0, linked 0 and" in capsys.readouterr().out
+
+
+def test_run_pelican_missing_settings(tmp_path: Path) -> None:
+    """Check an error is raised if the website has no `pelicanconf.py`.
+
+    Args:
+        tmp_path: A directory without a website.
+    """
+    pytest.importorskip("pelican")
+    config = BuildConfiguration(
+        directory=tmp_path,
+        config_type=_DeploymentType.DEV,
+        incremental=False,
+        verbosity=Verbosity.QUIET,
+        cache=False,
+        cache_directory=tmp_path,
+        cache_include=[],
+    )
+    with pytest.raises(TurbopelicanError, match="Could not find"):
+        run_pelican(config)
@@ -1,8 +1,14 @@
+import logging
+import re
+import runpy
 import shutil
 import subprocess
 import sys
+import tomllib
 from collections.abc import Generator
+from importlib import metadata
 from pathlib import Path
+from typing import Literal
 from unittest import mock
 
 import pytest
@@ -22,6 +28,7 @@ from turbopelican._utils.shared.args import (
     InstallType,
     Verbosity,
 )
+from turbopelican._utils.shared.create import update_contents, update_website
 
 
 @pytest.fixture
@@ -124,6 +131,171 @@ def test_copy_template(tmp_path: Path) -> None:
     assert (copy_to / "turbopelican.toml").exists()
 
 
+@pytest.mark.parametrize(
+    ("install_type", "templates"),
+    [
+        (InstallType.FULL_INSTALL, ["newsite"]),
+        (InstallType.MINIMAL_INSTALL, ["newsite", "minimal"]),
+    ],
+)
+def test_copy_template_workflow(
+    tmp_path: Path,
+    install_type: InstallType,
+    templates: list[Literal["newsite", "minimal"]],
+) -> None:
+    """Tests that the workflow only runs programs which the website installs.
+
+    Args:
+        tmp_path: A temporary and empty directory.
+        install_type: The kind of website being created.
+        templates: The templates copied, in order, for the kind of website.
+    """
+    for template in templates:
+        _copy_template(tmp_path, template)
+    with (tmp_path / "pyproject.toml").open("rb") as pyproject:
+        dependencies = tomllib.load(pyproject)["project"]["dependencies"]
+    installed = {
+        entry_point.name
+        for dependency in dependencies
+        for entry_point in metadata.distribution(
+            re.split(r"[\[<>=]", dependency)[0]
+        ).entry_points
+        if entry_point.group == "console_scripts"
+    }
+    workflow = (tmp_path / ".github" / "workflows" / "turbopelican.yml").read_text()
+    used = set(re.findall(r"\.venv/bin/([\w-]+)", workflow))
+    assert used <= installed
+    assert ("turbopelican" in used) == (install_type == InstallType.FULL_INSTALL)
+
+
+def test_copy_template_minimal_workflow(tmp_path: Path) -> None:
+    """Tests that minimal websites are generated by Pelican in a single job.
+
+    Args:
+        tmp_path: A temporary and empty directory.
+    """
+    _copy_template(tmp_path, "newsite")
+    _copy_template(tmp_path, "minimal")
+    workflow = (tmp_path / ".github" / "workflows" / "turbopelican.yml").read_text()
+    assert "run: .venv/bin/pelican content\n" in workflow
+    assert "merge-shards" not in workflow
+    assert "needs: build-static-site\n" in workflow
+
+
+def test_copy_template_sharded_workflow(tmp_path: Path) -> None:
+    """Tests that the workflow publishes unsharded builds, and merges shards.
+
+    Args:
+        tmp_path: A temporary and empty directory.
+    """
+    yaml = pytest.importorskip("yaml")
+    _copy_template(tmp_path, "newsite")
+    workflow_path = tmp_path / ".github" / "workflows" / "turbopelican.yml"
+    jobs = yaml.safe_load(workflow_path.read_text())["jobs"]
+    build = jobs["build-static-site"]
+    assert "'[0]'" in build["strategy"]["matrix"]["shard"]
+    steps = {step.get("name"): step for step in build["steps"]}
+
+    # The default shard, 0, builds the whole website and publishes it.
+    generate = steps["Generate content"]["run"]
+    assert generate.startswith(".venv/bin/turbopelican build ")
+    inline_css = "${{ vars.TURBOPELICAN_INLINE_CSS == 'true' && '--inline-css' || '' }}"
+    assert inline_css in generate
+    assert (
+        "${{ matrix.shard && format('--shard {0}/{1}', matrix.shard, "
+        "strategy.job-total) || '' }}"
+    ) in generate
+    pages = steps["Upload the static files as artifact"]
+    assert pages["if"] == "${{ !matrix.shard }}"
+    assert pages["uses"].startswith("actions/upload-pages-artifact@")
+    assert pages["with"]["path"] == "output/"
+    shard = steps["Upload the shard as artifact"]
+    assert shard["if"] == "${{ matrix.shard }}"
+    assert shard["with"]["path"] == "shards/shard-${{ matrix.shard }}/"
+
+    # Shards are only merged, then published, if the website is sharded.
+    merge = jobs["merge-shards"]
+    assert merge["if"] == "${{ vars.TURBOPELICAN_SHARDS }}"
+    assert merge["needs"] == "build-static-site"
+    merge_steps = {step.get("name"): step for step in merge["steps"]}
+    assert merge_steps["Merge the shards"]["run"] == (
+        f".venv/bin/turbopelican merge-shards {inline_css}"
+    )
+    assert merge_steps["Upload the static files as artifact"]["uses"].startswith(
+        "actions/upload-pages-artifact@"
+    )
+    assert jobs["deploy"]["needs"] == ["build-static-site", "merge-shards"]
+
+
+@pytest.mark.parametrize(
+    ("config_type", "error"), [("DEV", False), ("PUBLISH", False), ("PREVIEW", True)]
+)
+def test_copy_template_minimal_config_type(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    config_type: str,
+    *,
+    error: bool,
+) -> None:
+    """Tests that minimal websites reject configuration types they cannot build.
+
+    Args:
+        tmp_path: A temporary and empty directory.
+        monkeypatch: Changes into the website and sets its configuration type.
+        config_type: The configuration type with which the website is built.
+        error: Whether the configuration type is rejected.
+    """
+    _copy_template(tmp_path, "newsite")
+    _copy_template(tmp_path, "minimal")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TURBOPELICAN_CONFIG_TYPE", config_type)
+    if error:
+        with pytest.raises(ValueError, match="Incorrect config type: PREVIEW"):
+            runpy.run_path(str(tmp_path / "pelicanconf.py"))
+    else:
+        settings = runpy.run_path(str(tmp_path / "pelicanconf.py"))
+        assert settings["SITENAME"] == "MySite"
+
+
+def test_build_minimal_website(
+    config: InitConfiguration,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Tests that minimal websites are built by Pelican without Turbopelican.
+
+    Args:
+        config: The configuration for Turbopelican. Suppied via fixture.
+        monkeypatch: Changes into the directory of the website.
+        caplog: Captures any errors building the website.
+    """
+    pytest.importorskip("pelican")
+    from pelican import Pelican  # noqa: PLC0415
+    from pelican.settings import read_settings  # noqa: PLC0415
+
+    config.install_type = InstallType.MINIMAL_INSTALL
+    _copy_template(config.directory, "newsite")
+    _copy_template(config.directory, "minimal")
+    update_website(config)
+    update_contents(config)
+    (config.directory / "content" / "photo.md").write_text(
+        "Title: Photo\nImage: images/logo.svg\n\nA photo.\n"
+    )
+    monkeypatch.chdir(config.directory)
+    settings = read_settings("pelicanconf.py")
+    assert not any(
+        plugin.startswith("turbopelican.") for plugin in settings["PLUGINS"] or []
+    )
+    with caplog.at_level(logging.WARNING):
+        Pelican(settings).run()
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+    index = (config.directory / "output" / "index.html").read_text()
+    assert 'href="/theme/css/styles.css"' in index
+    # Images are shown as they are, without the responsive images plugin.
+    photo = (config.directory / "output" / "photo.html").read_text()
+    assert '<img src="/images/logo.svg" loading="lazy"' in photo
+
+
 def test_generate_repository_bad_directory(config: InitConfiguration) -> None:
     """Tests that the appropriate error is raised when an invalid directory is given.
 
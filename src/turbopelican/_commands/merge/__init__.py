@@ -0,0 +1 @@
+"""This package contains all logic pertinent to merging the shards of a site."""
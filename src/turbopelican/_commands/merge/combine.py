@@ -0,0 +1,143 @@
+"""Provides the utilities to merge the shards of a website.
+
+The outputs of every shard are copied into the output directory, and then
+Pelican renders the outputs shared between shards, such as the index,
+listings, feeds and static files, from all of the content.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import contextlib
+import filecmp
+import logging
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from turbopelican._commands.build.run import (
+    _CRITICAL_CSS_PLUGIN,
+    _clean_output,
+    _environment_variable,
+    _minify_static_files,
+    _with_plugin,
+    finish_output,
+)
+from turbopelican._commands.build.shards import shared_settings
+from turbopelican._utils.errors import TurbopelicanError
+from turbopelican._utils.shared.args import Verbosity
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from turbopelican._commands.merge.config import MergeConfiguration
+
+
+def copy_shards(shards: Iterable[Path], output: Path) -> int:
+    """Copies the outputs of every shard into the output directory.
+
+    Args:
+        shards: The directory of each shard.
+        output: The output directory.
+
+    Returns:
+        The number of files copied.
+
+    Raises:
+        TurbopelicanError: Two shards have different files at the same path.
+    """
+    origins: dict[Path, Path] = {}
+    for shard in shards:
+        for source in sorted(shard.rglob("*")):
+            if source.is_dir():
+                continue
+            relative = source.relative_to(shard)
+            if (origin := origins.get(relative)) is not None:
+                if not filecmp.cmp(origin, source, shallow=False):
+                    raise TurbopelicanError(
+                        f"{relative} differs between {origin} and {source}."
+                    )
+                continue
+            destination = output / relative
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, destination)
+            origins[relative] = source
+    return len(origins)
+
+
+def merge_shards(config: MergeConfiguration) -> int:
+    """Combines the shards of the website and renders their shared outputs.
+
+    Args:
+        config: The arguments to configure merging the shards.
+
+    Returns:
+        The number of shards merged.
+
+    Raises:
+        TurbopelicanError: Pelican is not installed, the website has no
+            `pelicanconf.py`, there are no shards, or two shards conflict.
+    """
+    try:
+        from pelican import Pelican, log  # noqa: PLC0415
+        from pelican.settings import read_settings  # noqa: PLC0415
+    except ImportError:
+        raise TurbopelicanError(
+            "Pelican must be installed to merge the shards."
+        ) from None
+
+    settings_file = config.directory / "pelicanconf.py"
+    if not settings_file.exists():
+        raise TurbopelicanError(f"Could not find {settings_file}.")
+    shards = (
+        sorted(path for path in config.shards_directory.iterdir() if path.is_dir())
+        if config.shards_directory.is_dir()
+        else []
+    )
+    if not shards:
+        raise TurbopelicanError(
+            f"Could not find any shards in {config.shards_directory}."
+        )
+
+    quiet = config.verbosity == Verbosity.QUIET
+    log.init(logging.ERROR if quiet else logging.WARNING)
+    previously_quiet = log.console.quiet
+    log.console.quiet = quiet
+    try:
+        with (
+            contextlib.chdir(config.directory),
+            _environment_variable("TURBOPELICAN_CONFIG_TYPE", config.config_type),
+        ):
+            settings = read_settings(str(settings_file))
+            if settings["DELETE_OUTPUT_DIRECTORY"]:
+                _clean_output(settings)
+            copy_shards(shards, Path(settings["OUTPUT_PATH"]))
+            settings = shared_settings(settings, len(shards))
+            if config.inline_css:
+                settings["PLUGINS"] = _with_plugin(
+                    settings["PLUGINS"], _CRITICAL_CSS_PLUGIN
+                )
+            if config.minify:
+                _minify_static_files(settings)
+            Pelican(settings).run()
+            finish_output(
+                settings,
+                minify=config.minify,
+                precompress=config.precompress,
+                verbosity=config.verbosity,
+            )
+    finally:
+        log.console.quiet = previously_quiet
+    return len(shards)
+
+
+def report_completion(config: MergeConfiguration, merged: int) -> None:
+    """Reports that Turbopelican has finished merging the shards.
+
+    Args:
+        config: The arguments to configure merging the shards.
+        merged: The number of shards merged.
+    """
+    if config.verbosity == Verbosity.NORMAL:
+        print(f"⚡ Turbopelican merged {merged} shards! ⚡")
@@ -0,0 +1,55 @@
+"""Stores configuration specific to merging the shards of Pelican websites."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from turbopelican._commands.build.config import (
+    resolve_config_type,
+    resolve_minify,
+    resolve_precompress,
+)
+from turbopelican._utils.shared.args import Verbosity
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+
+    from turbopelican._utils.config.config import _DeploymentType
+
+
+@dataclass
+class MergeConfiguration:
+    """The command line arguments to configure merging the shards of a website."""
+
+    directory: Path
+    config_type: _DeploymentType
+    shards_directory: Path
+    verbosity: Verbosity
+    inline_css: bool = False
+    minify: bool = False
+    precompress: tuple[str, ...] = ()
+
+    @classmethod
+    def from_args(cls, raw_args: Namespace) -> Self:
+        """Returns the command-line arguments in a structured object.
+
+        The configuration type defaults to `TURBOPELICAN_CONFIG_TYPE`, as for
+        building the website, and should be that with which the shards were
+        built.
+
+        Returns:
+            The command-line arguments.
+        """
+        directory = Path(raw_args.directory).resolve()
+        config_type = resolve_config_type(raw_args.config_type)
+        return cls(
+            directory=directory,
+            config_type=config_type,
+            shards_directory=directory / raw_args.shards_dir,
+            verbosity=Verbosity.QUIET if raw_args.quiet else Verbosity.NORMAL,
+            inline_css=raw_args.inline_css,
+            minify=resolve_minify(raw_args.minify, config_type),
+            precompress=resolve_precompress(raw_args),
+        )
@@ -0,0 +1,69 @@
+"""Merges the shards of a Pelican website built by `build --shard`."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from turbopelican._commands.build.build import add_output_options
+from turbopelican._commands.merge.combine import merge_shards, report_completion
+from turbopelican._commands.merge.config import MergeConfiguration
+from turbopelican._utils.config.config import _DeploymentType
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser, Namespace
+
+
+def add_options(parser: ArgumentParser) -> None:
+    """Adds the options for the merge-shards subparser.
+
+    Args:
+        parser: The parser/subparser to be updated.
+    """
+    parser.add_argument(
+        "directory",
+        help="Path to the website whose shards are to be merged.",
+        default=".",
+        nargs="?",
+    )
+    parser.add_argument(
+        "--config-type",
+        help="The configuration type with which the shards were built.",
+        choices=list(_DeploymentType),
+    )
+    parser.add_argument(
+        "--shards-dir",
+        help=(
+            "The directory containing each shard, in a subdirectory. Defaults "
+            "to shards."
+        ),
+        default="shards",
+    )
+    parser.add_argument(
+        "--inline-css",
+        help=(
+            "Inlines the stylesheets of the shared pages, as for shards built "
+            "with --inline-css."
+        ),
+        action="store_true",
+        default=False,
+    )
+    add_output_options(parser)
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        help="Suppresses all output.",
+        action="store_true",
+        default=False,
+    )
+    parser.set_defaults(func=command)
+
+
+def command(raw_args: Namespace) -> None:
+    """Uses the provided configuration to merge the shards of the website.
+
+    Args:
+        raw_args: The command-line provided arguments.
+    """
+    config = MergeConfiguration.from_args(raw_args)
+    merged = merge_shards(config)
+    report_completion(config, merged)
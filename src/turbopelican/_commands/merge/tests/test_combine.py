@@ -0,0 +1,137 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from turbopelican import TurbopelicanError
+from turbopelican._commands.merge.combine import copy_shards, merge_shards
+from turbopelican._commands.merge.config import MergeConfiguration
+from turbopelican._utils.config.config import _DeploymentType
+from turbopelican._utils.shared.args import Verbosity
+
+_ARTICLES = 8
+
+_SHARDS = 3
+
+_SETTINGS = """\
+PATH = "content"
+TIMEZONE = "UTC"
+SITEURL = "https://example.com"
+DELETE_OUTPUT_DIRECTORY = True
+STATIC_PATHS = ["images"]
+"""
+
+
+@pytest.fixture
+def website(tmp_path: Path) -> Path:
+    """Creates a website whose articles link to one another.
+
+    Args:
+        tmp_path: A temporary directory in which to create the website.
+
+    Returns:
+        The path to the website.
+    """
+    (tmp_path / "pelicanconf.py").write_text(_SETTINGS)
+    content = tmp_path / "content"
+    (content / "pages").mkdir(parents=True)
+    (content / "images").mkdir()
+    (content / "images" / "logo.png").write_bytes(b"Logo")
+    for number in range(_ARTICLES):
+        following = (number + 1) % _ARTICLES
+        (content / f"article-{number}.md").write_text(
+            f"Title: Article {number}\nDate: 2024-01-0{number + 1}\n"
+            f"Tags: tag-{number % 2}\n\n"
+            f"See [the next article]({{filename}}article-{following}.md) and "
+            "![the logo]({static}images/logo.png).\n"
+        )
+    (content / "pages" / "about.md").write_text("Title: About\n\nAbout us.\n")
+    return tmp_path
+
+
+def _tree(directory: Path) -> dict[str, bytes]:
+    """Reads every file in a directory.
+
+    Args:
+        directory: The directory.
+
+    Returns:
+        The contents of each file, keyed by its relative path.
+    """
+    return {
+        str(path.relative_to(directory)): path.read_bytes()
+        for path in directory.rglob("*")
+        if path.is_file()
+    }
+
+
+def _turbopelican(*args: str) -> subprocess.Popen[bytes]:
+    """Starts Turbopelican in a process of its own.
+
+    Args:
+        args: The arguments to Turbopelican.
+
+    Returns:
+        The process.
+    """
+    return subprocess.Popen([sys.executable, "-m", "turbopelican", *args])
+
+
+def test_copy_shards(tmp_path: Path) -> None:
+    """Check shards are combined, unless they conflict.
+
+    Args:
+        tmp_path: A temporary directory in which to store the shards.
+    """
+    first = tmp_path / "shards" / "shard-1"
+    second = tmp_path / "shards" / "shard-2"
+    (first / "posts").mkdir(parents=True)
+    (second / "posts").mkdir(parents=True)
+    (first / "posts" / "a.html").write_text("A")
+    (second / "posts" / "b.html").write_text("B")
+    (second / "posts" / "a.html").write_text("A")
+    assert copy_shards([first, second], tmp_path / "output") == 2  # noqa: PLR2004
+    assert _tree(tmp_path / "output") == {"posts/a.html": b"A", "posts/b.html": b"B"}
+
+    (second / "posts" / "a.html").write_text("Not A")
+    with pytest.raises(TurbopelicanError, match="differs between"):
+        copy_shards([first, second], tmp_path / "output")
+
+
+@pytest.mark.parametrize("inline_css", [False, True])
+def test_merge_shards(website: Path, *, inline_css: bool) -> None:
+    """Check shards built by separate processes merge into the full website.
+
+    Args:
+        website: The path to a website.
+        inline_css: Whether the stylesheets of each page are inlined.
+    """
+    pytest.importorskip("pelican")
+    config = MergeConfiguration(
+        directory=website,
+        config_type=_DeploymentType.DEV,
+        shards_directory=website / "shards",
+        verbosity=Verbosity.QUIET,
+        inline_css=inline_css,
+    )
+    with pytest.raises(TurbopelicanError, match="Could not find any shards"):
+        merge_shards(config)
+
+    options = ["--quiet", "--inline-css"] if inline_css else ["--quiet"]
+    assert not _turbopelican("build", str(website), *options).wait()
+    expected = _tree(website / "output")
+    assert ("</style>" in expected["index.html"].decode()) == inline_css
+
+    processes = [
+        _turbopelican("build", str(website), *options, "--shard", f"{i}/{_SHARDS}")
+        for i in range(1, _SHARDS + 1)
+    ]
+    assert not any(process.wait() for process in processes)
+    shards = [_tree(website / "shards" / f"shard-{i}") for i in range(1, _SHARDS + 1)]
+    assert all(shards)
+    assert sum(len(shard) for shard in shards) == _ARTICLES + 1
+    assert not any("index.html" in shard for shard in shards)
+
+    assert merge_shards(config) == _SHARDS
+    assert _tree(website / "output") == expected
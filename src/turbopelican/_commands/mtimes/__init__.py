@@ -0,0 +1 @@
+"""This package contains all logic pertinent to restoring modification times."""
@@ -0,0 +1,32 @@
+"""Stores configuration specific to restoring modification times."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from turbopelican._utils.shared.args import Verbosity
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+
+
+@dataclass
+class MtimesConfiguration:
+    """The command line arguments to configure restoring modification times."""
+
+    directory: Path
+    verbosity: Verbosity
+
+    @classmethod
+    def from_args(cls, raw_args: Namespace) -> Self:
+        """Returns the command-line arguments in a structured object.
+
+        Returns:
+            The command-line arguments.
+        """
+        return cls(
+            directory=Path(raw_args.directory).resolve(),
+            verbosity=Verbosity.QUIET if raw_args.quiet else Verbosity.NORMAL,
+        )
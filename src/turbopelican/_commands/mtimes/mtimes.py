@@ -0,0 +1,44 @@
+"""Restores the modification times of files from their git history."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from turbopelican._commands.mtimes.config import MtimesConfiguration
+from turbopelican._commands.mtimes.restore import report_completion, restore_mtimes
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser, Namespace
+
+
+def add_options(parser: ArgumentParser) -> None:
+    """Adds the options for the restore-mtimes subparser.
+
+    Args:
+        parser: The parser/subparser to be updated.
+    """
+    parser.add_argument(
+        "directory",
+        help="Path to the files whose modification times are to be restored.",
+        default=".",
+        nargs="?",
+    )
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        help="Suppresses all output.",
+        action="store_true",
+        default=False,
+    )
+    parser.set_defaults(func=command)
+
+
+def command(raw_args: Namespace) -> None:
+    """Uses the provided configuration to restore modification times.
+
+    Args:
+        raw_args: The command-line provided arguments.
+    """
+    config = MtimesConfiguration.from_args(raw_args)
+    restored = restore_mtimes(config.directory)
+    report_completion(config, restored)
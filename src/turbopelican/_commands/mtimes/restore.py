@@ -0,0 +1,170 @@
+"""Provides the utilities to restore modification times from git history.
+
+A fresh checkout gives every file the time of the checkout, which defeats
+any caching based on modification times. Instead, each tracked file is given
+the time of the last commit which changed it, found by reading the output of
+a single `git log` as it is produced, newest commit first.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import subprocess
+from typing import TYPE_CHECKING
+
+from turbopelican._utils.errors import TurbopelicanError
+from turbopelican._utils.shared.args import Verbosity
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+    from turbopelican._commands.mtimes.config import MtimesConfiguration
+
+_COMMIT_MARKER = b"\x01"
+"""Precedes the commit time of each commit in the output of `git log`."""
+
+_CHUNK_SIZE = 1 << 16
+"""The number of bytes read from `git log` at a time."""
+
+
+def _git_path() -> str:
+    """Finds git.
+
+    Returns:
+        The path to the git executable.
+
+    Raises:
+        TurbopelicanError: git is not installed.
+    """
+    git_path = shutil.which("git")
+    if not git_path:
+        raise TurbopelicanError("git must be installed to restore modification times.")
+    return git_path
+
+
+def _tracked_files(git_path: str, directory: Path) -> set[bytes]:
+    """Lists the files tracked by git in a directory.
+
+    Args:
+        git_path: The path to the git executable.
+        directory: The directory whose files are listed.
+
+    Returns:
+        The paths of the files, relative to the directory.
+
+    Raises:
+        TurbopelicanError: The directory is not in a git repository.
+    """
+    process = subprocess.run(
+        [git_path, "ls-files", "-z"],
+        cwd=directory,
+        capture_output=True,
+        check=False,
+    )
+    if process.returncode:
+        raise TurbopelicanError(f"{directory} is not in a git repository.")
+    return {name for name in process.stdout.split(b"\0") if name}
+
+
+def _parse_log(chunks: Iterable[bytes]) -> Iterator[tuple[bytes, int]]:
+    """Reads the files changed by each commit from the output of `git log`.
+
+    Args:
+        chunks: The output of `git log`, in pieces of any size.
+
+    Yields:
+        Each changed file, with the time of the commit which changed it.
+    """
+    commit_time = 0
+    remainder = b""
+    for chunk in chunks:
+        *fields, remainder = (remainder + chunk).split(b"\0")
+        for field in fields:
+            name = field.lstrip(b"\n")
+            if name.startswith(_COMMIT_MARKER):
+                commit_time = int(name[1:])
+            elif name:
+                yield name, commit_time
+
+
+def _read_chunks(process: subprocess.Popen[bytes]) -> Iterator[bytes]:
+    """Reads the output of a process as it is produced.
+
+    Args:
+        process: The process, whose output is piped.
+
+    Yields:
+        Each piece of output.
+    """
+    if process.stdout is None:
+        return
+    while chunk := process.stdout.read(_CHUNK_SIZE):
+        yield chunk
+
+
+def restore_mtimes(directory: Path) -> int:
+    """Sets each tracked file's modification time to its last commit time.
+
+    Files whose last change is not in the available history, as with shallow
+    clones, and files missing from the working tree are left unchanged.
+
+    Args:
+        directory: The directory whose files are to be updated.
+
+    Returns:
+        The number of files whose modification times were set.
+    """
+    git_path = _git_path()
+    remaining = _tracked_files(git_path, directory)
+    restored = 0
+    # Joining bytes avoids constructing a Path for every file.
+    base = os.fsencode(directory) + b"/"
+    follow_symlinks = os.utime not in os.supports_follow_symlinks
+
+    with subprocess.Popen(
+        [
+            git_path,
+            "log",
+            "--format=%x01%ct",
+            "--name-only",
+            "--no-renames",
+            "--relative",
+            "-z",
+            "--",
+            ".",
+        ],
+        cwd=directory,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ) as process:
+        for name, commit_time in _parse_log(_read_chunks(process)):
+            if name not in remaining:
+                continue
+            remaining.remove(name)
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(
+                    base + name,
+                    (commit_time, commit_time),
+                    follow_symlinks=follow_symlinks,
+                )
+                restored += 1
+            if not remaining:
+                process.terminate()
+                break
+    return restored
+
+
+def report_completion(config: MtimesConfiguration, restored: int) -> None:
+    """Reports how many modification times were restored.
+
+    Args:
+        config: The arguments to configure restoring modification times.
+        restored: The number of files whose modification times were set.
+    """
+    if config.verbosity == Verbosity.NORMAL:
+        print(f"⚡ Restored the modification times of {restored} files. ⚡")
@@ -0,0 +1,105 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from turbopelican import TurbopelicanError
+from turbopelican._commands.mtimes.restore import _parse_log, restore_mtimes
+
+_FIRST_COMMIT = 1_600_000_000
+_SECOND_COMMIT = 1_700_000_000
+_CONTENT_FILES = 2
+
+
+def _commit(repository: Path, message: str, commit_time: int) -> None:
+    """Commits every file in a repository at a given time.
+
+    Args:
+        repository: The root of the repository.
+        message: The commit message.
+        commit_time: The time of the commit, in seconds since the epoch.
+    """
+    git_path = shutil.which("git")
+    assert git_path
+    environment = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+        "GIT_AUTHOR_DATE": f"{commit_time} +0000",
+        "GIT_COMMITTER_DATE": f"{commit_time} +0000",
+    }
+    for args in [["add", "."], ["commit", "--quiet", "-m", message]]:
+        subprocess.run([git_path, *args], cwd=repository, env=environment, check=True)
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> Path:
+    """Creates a repository with files changed in two commits.
+
+    Args:
+        tmp_path: A temporary directory in which to create the repository.
+
+    Returns:
+        The root of the repository.
+    """
+    git_path = shutil.which("git")
+    if not git_path:
+        pytest.skip("git is not installed")
+    subprocess.run([git_path, "init", "--quiet"], cwd=tmp_path, check=True)
+    (tmp_path / "content").mkdir()
+    (tmp_path / "content" / "old.md").write_text("Old")
+    (tmp_path / "content" / "new.md").write_text("New")
+    (tmp_path / "deleted.md").write_text("Deleted")
+    _commit(tmp_path, "First commit", _FIRST_COMMIT)
+    (tmp_path / "content" / "new.md").write_text("Newer")
+    (tmp_path / "deleted.md").unlink()
+    _commit(tmp_path, "Second commit", _SECOND_COMMIT)
+    (tmp_path / "untracked.md").write_text("Untracked")
+    return tmp_path
+
+
+def test_parse_log() -> None:
+    """Tests that files are read from output split at any point."""
+    output = b"\x012\0\na\0b c\0\0\x011\0\na\0"
+    chunks = [output[index : index + 3] for index in range(0, len(output), 3)]
+    assert list(_parse_log(chunks)) == [(b"a", 2), (b"b c", 2), (b"a", 1)]
+
+
+def test_restore_mtimes(repository: Path) -> None:
+    """Tests that tracked files are given the time of their last commit.
+
+    Args:
+        repository: A repository with files changed in two commits.
+    """
+    assert restore_mtimes(repository) == _CONTENT_FILES
+    assert (repository / "content" / "old.md").stat().st_mtime == _FIRST_COMMIT
+    assert (repository / "content" / "new.md").stat().st_mtime == _SECOND_COMMIT
+    assert (repository / "untracked.md").stat().st_mtime > _SECOND_COMMIT
+
+
+def test_restore_mtimes_subdirectory(repository: Path) -> None:
+    """Tests that only the files in the given directory are updated.
+
+    Args:
+        repository: A repository with files changed in two commits.
+    """
+    (repository / "other.md").write_text("Other")
+    _commit(repository, "Third commit", _SECOND_COMMIT + 1)
+    assert restore_mtimes(repository / "content") == _CONTENT_FILES
+    assert (repository / "other.md").stat().st_mtime > _SECOND_COMMIT + 1
+
+
+def test_restore_mtimes_not_repository(tmp_path: Path) -> None:
+    """Tests that an error is raised outside of a repository.
+
+    Args:
+        tmp_path: A directory which is not in a repository.
+    """
+    if not shutil.which("git"):
+        pytest.skip("git is not installed")
+    with pytest.raises(TurbopelicanError, match="not in a git repository"):
+        restore_mtimes(tmp_path)
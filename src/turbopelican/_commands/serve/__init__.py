@@ -0,0 +1 @@
+"""This package contains all logic pertinent to serving a site as it is edited."""
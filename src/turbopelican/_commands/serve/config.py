@@ -0,0 +1,66 @@
+"""Stores configuration specific to serving Pelican websites as they are edited."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from turbopelican._commands.build.config import resolve_config_type, resolve_only
+from turbopelican._utils.errors import TurbopelicanError
+from turbopelican._utils.shared.args import Verbosity
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+
+    from turbopelican._utils.config.config import _DeploymentType
+
+
+@dataclass
+class ServeConfiguration:
+    """The command line arguments to configure serving the website."""
+
+    directory: Path
+    config_type: _DeploymentType
+    bind: str | None
+    port: int | None
+    debounce: float
+    in_memory: bool
+    flush_on_exit: bool
+    verbosity: Verbosity
+    only: str | None = None
+
+    @classmethod
+    def from_args(cls, raw_args: Namespace) -> Self:
+        """Returns the command-line arguments in a structured object.
+
+        The configuration type defaults as for `turbopelican build`. The
+        address and port default to the `bind` and `port` of the website's
+        configuration.
+
+        Returns:
+            The command-line arguments.
+
+        Raises:
+            TurbopelicanError: The debounce interval is negative, outputs are
+                to be flushed to disk without being kept in memory, or the
+                content is restricted other than when previewing.
+        """
+        if raw_args.flush_on_exit and not raw_args.in_memory:
+            raise TurbopelicanError("--flush-on-exit requires --in-memory.")
+        if raw_args.debounce < 0:
+            raise TurbopelicanError(
+                f"Incorrect debounce: {raw_args.debounce}. Must not be negative."
+            )
+        config_type = resolve_config_type(raw_args.config_type)
+        return cls(
+            directory=Path(raw_args.directory).resolve(),
+            config_type=config_type,
+            bind=raw_args.bind,
+            port=raw_args.port,
+            debounce=raw_args.debounce,
+            in_memory=raw_args.in_memory,
+            flush_on_exit=raw_args.flush_on_exit,
+            verbosity=Verbosity.QUIET if raw_args.quiet else Verbosity.NORMAL,
+            only=resolve_only(raw_args.only, config_type),
+        )
@@ -0,0 +1,86 @@
+"""Serves a Pelican website configured by Turbopelican as it is edited."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from turbopelican._commands.serve.config import ServeConfiguration
+from turbopelican._commands.serve.session import serve_website
+from turbopelican._utils.config.config import _DeploymentType
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser, Namespace
+
+
+def add_options(parser: ArgumentParser) -> None:
+    """Adds the options for the serve subparser.
+
+    Args:
+        parser: The parser/subparser to be updated.
+    """
+    parser.add_argument(
+        "directory",
+        help="Path to the website to be served.",
+        default=".",
+        nargs="?",
+    )
+    parser.add_argument(
+        "--config-type",
+        help="Whether to build for development or publication.",
+        choices=list(_DeploymentType),
+    )
+    parser.add_argument(
+        "--only",
+        help=(
+            "When previewing, only reads the articles and pages matching this "
+            "glob, relative to the content directory."
+        ),
+    )
+    parser.add_argument(
+        "--bind",
+        help="The address on which to serve. Defaults to `bind` in the config.",
+    )
+    parser.add_argument(
+        "--port",
+        help="The port on which to serve. Defaults to `port` in the config.",
+        type=int,
+    )
+    parser.add_argument(
+        "--debounce",
+        help="Seconds without further changes to wait before rebuilding.",
+        type=float,
+        default=0.1,
+    )
+    parser.add_argument(
+        "--in-memory",
+        help=(
+            "Keeps pages in memory and serves them from there, rather than "
+            "writing them to the output directory."
+        ),
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--flush-on-exit",
+        help="Writes the pages kept in memory to the output directory on exit.",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        help="Suppresses all output.",
+        action="store_true",
+        default=False,
+    )
+    parser.set_defaults(func=command)
+
+
+def command(raw_args: Namespace) -> None:
+    """Uses the provided configuration to serve the website.
+
+    Args:
+        raw_args: The command-line provided arguments.
+    """
+    config = ServeConfiguration.from_args(raw_args)
+    serve_website(config)
@@ -0,0 +1,257 @@
+"""Serves the output of a website, reloading browsers once it is rebuilt.
+
+Every HTML page served has a script added which listens for server-sent
+events, so that each page open in a browser reloads when the website has
+been rebuilt. Outputs kept in memory are served in preference to those on
+disk, and can be written to disk by a POST request to the flush endpoint.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote, urlsplit
+
+if TYPE_CHECKING:
+    import socket
+
+    from turbopelican.plugins.memory_output import OutputStore
+
+EVENTS_PATH = "/__turbopelican__/events"
+"""The path at which browsers listen for the website to be rebuilt."""
+
+FLUSH_PATH = "/__turbopelican__/flush"
+"""The path to which outputs kept in memory are flushed to disk by POST."""
+
+_RELOAD_SCRIPT = (
+    "<script>"
+    f'new EventSource("{EVENTS_PATH}").onmessage = () => location.reload();'
+    "</script>"
+).encode()
+"""The script added to each page, which reloads it when the website is rebuilt."""
+
+_KEEPALIVE_INTERVAL = 15.0
+"""The number of seconds after which an idle event stream is sent a comment."""
+
+
+class ReloadBroadcaster:
+    """Notifies every listening browser that the website has been rebuilt."""
+
+    def __init__(self) -> None:
+        """Creates the broadcaster, before any rebuild."""
+        self.generation = 0
+        self.closed = False
+        self._condition = threading.Condition()
+
+    def publish(self) -> None:
+        """Tells every listening browser to reload."""
+        with self._condition:
+            self.generation += 1
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Stops every browser from listening, such as when the server stops."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def wait(self, generation: int, timeout: float) -> int:
+        """Waits for the website to be rebuilt.
+
+        Args:
+            generation: The number of rebuilds already known to the listener.
+            timeout: The number of seconds after which to stop waiting.
+
+        Returns:
+            The number of rebuilds so far.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.closed or self.generation != generation, timeout
+            )
+            return self.generation
+
+
+class _ReloadingHandler(SimpleHTTPRequestHandler):
+    """Serves the output, adding the reload script to each page."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        request: socket.socket,
+        client_address: Any,  # noqa: ANN401
+        server: ThreadingHTTPServer,
+        *,
+        directory: str,
+        broadcaster: ReloadBroadcaster,
+        store: OutputStore | None,
+    ) -> None:
+        """Handles a request.
+
+        Args:
+            request: The connection of the request.
+            client_address: The address of the browser.
+            server: The server.
+            directory: The directory of the output.
+            broadcaster: Notifies the browser when to reload.
+            store: The outputs kept in memory, if any.
+        """
+        self.broadcaster = broadcaster
+        self.store = store
+        super().__init__(request, client_address, server, directory=directory)
+
+    def do_GET(self) -> None:
+        """Serves a file or page, or the stream of rebuilds."""
+        url_path = unquote(urlsplit(self.path).path)
+        if url_path == EVENTS_PATH:
+            self._stream_events()
+            return
+        if self.store is not None and self._send_stored(self.store, url_path):
+            return
+        path = Path(self.translate_path(self.path))
+        if path.is_dir() and self.path.endswith("/"):
+            path /= "index.html"
+        if path.suffix.lower() in {".html", ".htm"} and path.is_file():
+            try:
+                page = path.read_bytes()
+            except OSError:
+                self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+                return
+            self._send_page(page)
+            return
+        super().do_GET()
+
+    def do_POST(self) -> None:
+        """Writes the outputs kept in memory to disk."""
+        if urlsplit(self.path).path != FLUSH_PATH or self.store is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+        written = self.store.flush(Path(self.directory))
+        self._send(f"Flushed {written} outputs.\n".encode(), "text/plain")
+
+    def end_headers(self) -> None:
+        """Prevents the browser from caching outputs which are being edited."""
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Keeps each request from being logged.
+
+        Args:
+            format: The format of the message.
+            args: The values in the message.
+        """
+
+    def _send_stored(self, store: OutputStore, url_path: str) -> bool:
+        """Sends an output kept in memory, if there is one at a path.
+
+        Args:
+            store: The outputs kept in memory.
+            url_path: The path of the request.
+
+        Returns:
+            Whether a response was sent.
+        """
+        relative = url_path.lstrip("/")
+        if not relative or relative.endswith("/"):
+            relative += "index.html"
+        data = store.get(relative)
+        if data is None:
+            if store.get(f"{relative}/index.html") is None:
+                return False
+            self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+            self.send_header("Location", f"{url_path}/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return True
+        content_type = self.guess_type(relative)
+        if content_type == "text/html":
+            self._send_page(data)
+        else:
+            self._send(data, content_type)
+        return True
+
+    def _send_page(self, page: bytes) -> None:
+        """Sends a page, with the reload script added.
+
+        Args:
+            page: The page.
+        """
+        position = page.lower().rfind(b"</body")
+        if position < 0:
+            position = len(page)
+        page = page[:position] + _RELOAD_SCRIPT + page[position:]
+        self._send(page, "text/html; charset=utf-8")
+
+    def _send(self, data: bytes, content_type: str) -> None:
+        """Sends a response.
+
+        Args:
+            data: The body of the response.
+            content_type: The type of the body.
+        """
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream_events(self) -> None:
+        """Sends an event each time the website is rebuilt."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self.close_connection = True
+        generation = self.broadcaster.generation
+        try:
+            self.wfile.write(b"retry: 500\n\n")
+            self.wfile.flush()
+            while not self.broadcaster.closed:
+                latest = self.broadcaster.wait(generation, _KEEPALIVE_INTERVAL)
+                if self.broadcaster.closed:
+                    break
+                if latest == generation:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    self.wfile.write(b"data: reload\n\n")
+                generation = latest
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start_server(
+    directory: Path,
+    bind: str,
+    port: int,
+    broadcaster: ReloadBroadcaster,
+    store: OutputStore | None = None,
+) -> ThreadingHTTPServer:
+    """Serves the output in a background thread.
+
+    Args:
+        directory: The directory of the output.
+        bind: The address on which to serve.
+        port: The port on which to serve, or 0 for any free port.
+        broadcaster: Notifies browsers when to reload.
+        store: The outputs kept in memory, if any, which are served in
+            preference to those in the directory.
+
+    Returns:
+        The server, which is stopped with `shutdown`.
+    """
+    handler = functools.partial(
+        _ReloadingHandler,
+        directory=str(directory),
+        broadcaster=broadcaster,
+        store=store,
+    )
+    server = ThreadingHTTPServer((bind, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,229 @@
+"""Rebuilds the website in one process each time its sources change.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from turbopelican._commands.build.run import (
+    _INCREMENTAL_PLUGIN,
+    _environment_variable,
+    _with_plugin,
+)
+from turbopelican._commands.serve.server import ReloadBroadcaster, start_server
+from turbopelican._commands.serve.watch import Watcher
+from turbopelican._utils.errors import TurbopelicanError
+from turbopelican._utils.shared.args import Verbosity
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from turbopelican._commands.serve.config import ServeConfiguration
+
+_MEMORY_PLUGIN = "turbopelican.plugins.memory_output"
+"""The plugin which keeps outputs in memory rather than writing them."""
+
+_CONFIGURATION_SUFFIXES = {".py", ".toml"}
+"""The suffixes of files which may configure the website, outside its sources."""
+
+logger = logging.getLogger(__name__)
+
+
+class BuildSession:
+    """Rebuilds the website, keeping its settings until they change.
+
+    Each rebuild enables the incremental plugin and the content cache, so
+    only the outputs affected by a change are rendered again, and the memory
+    output plugin if outputs are kept in memory. The settings are
+    only read again, running `config()` through `pelicanconf.py`, if a file
+    outside the content and theme which may configure the website changes.
+    The working directory must be that of the website.
+    """
+
+    def __init__(self, config: ServeConfiguration) -> None:
+        """Prepares to build the website.
+
+        Args:
+            config: The arguments to configure serving the website.
+        """
+        self.config = config
+        self.settings: dict[str, Any] | None = None
+        self._watcher: Watcher | None = None
+        self._watched_settings: dict[str, Any] | None = None
+
+    def _read_settings(self) -> dict[str, Any]:
+        """Reads the settings of the website, as configured for rebuilding.
+
+        Returns:
+            The settings.
+        """
+        from pelican.settings import read_settings  # noqa: PLC0415
+
+        settings = read_settings(str(self.config.directory / "pelicanconf.py"))
+        settings["PLUGINS"] = _with_plugin(settings.get("PLUGINS"), _INCREMENTAL_PLUGIN)
+        if self.config.in_memory:
+            settings["PLUGINS"] = _with_plugin(settings["PLUGINS"], _MEMORY_PLUGIN)
+        settings["CACHE_CONTENT"] = settings["LOAD_CONTENT_CACHE"] = True
+        return settings
+
+    def _configures(self, path: Path) -> bool:
+        """Checks whether a changed file may change the settings.
+
+        Args:
+            path: The changed file.
+
+        Returns:
+            Whether the file is a Python or TOML file outside the content and
+            theme.
+        """
+        if path.suffix not in _CONFIGURATION_SUFFIXES:
+            return False
+        if self.settings is None:
+            return True
+        sources = (Path(self.settings["PATH"]), Path(self.settings["THEME"]))
+        return not any(path.is_relative_to(source) for source in sources)
+
+    def build(self, changed: Collection[Path] = ()) -> bool:
+        """Builds the website, reporting rather than raising any errors.
+
+        Args:
+            changed: The files which have changed since the previous build.
+
+        Returns:
+            Whether the website was built.
+        """
+        from pelican import Pelican  # noqa: PLC0415
+
+        start = time.perf_counter()
+        try:
+            if self.settings is None or any(map(self._configures, changed)):
+                self.settings = None
+                self.settings = self._read_settings()
+            Pelican(dict(self.settings)).run()
+        except Exception:
+            logger.exception("Could not build the website")
+            return False
+        if self.config.verbosity == Verbosity.NORMAL:
+            print(f"⚡ Built in {time.perf_counter() - start:.2f}s ⚡")
+        return True
+
+    def watched_paths(self) -> tuple[list[Path], list[Path]]:
+        """Locates the sources of the website, as last configured.
+
+        Returns:
+            The paths to be watched, being the website and its theme, and the
+            paths beneath them not to be watched, being the output and caches.
+        """
+        directory = self.config.directory
+        paths = [directory]
+        excluded = [directory / ".venv"]
+        if self.settings is not None:
+            theme = Path(self.settings["THEME"])
+            if not theme.is_relative_to(directory):
+                paths.append(theme)
+            excluded.append(Path(self.settings["OUTPUT_PATH"]))
+            cache = Path(self.settings["CACHE_PATH"])
+            # Caches are namespaced, but others share their root directory.
+            if cache.is_relative_to(directory) and cache != directory:
+                excluded.append(directory / cache.relative_to(directory).parts[0])
+            else:
+                excluded.append(cache)
+        return paths, excluded
+
+    def watcher(self) -> Watcher:
+        """Watches the sources of the website, as last configured.
+
+        The watcher is created again whenever the settings are read again,
+        since they may move the content, theme or output.
+
+        Returns:
+            The watcher.
+        """
+        if self._watcher is None or self._watched_settings is not self.settings:
+            self._watcher = Watcher(*self.watched_paths())
+            self._watched_settings = self.settings
+        return self._watcher
+
+
+def serve_website(
+    config: ServeConfiguration,
+    stop: threading.Event | None = None,
+    ready: threading.Event | None = None,
+) -> None:
+    """Serves the website, rebuilding it and reloading browsers on each change.
+
+    Args:
+        config: The arguments to configure serving the website.
+        stop: An event which stops serving when set. Otherwise, the website is
+            served until interrupted.
+        ready: An event which is set once the website has first been built,
+            and is being served and watched.
+
+    Raises:
+        TurbopelicanError: Pelican is not installed, or the website has no
+            `pelicanconf.py` or its settings could not be read.
+    """
+    try:
+        from pelican import log  # noqa: PLC0415
+
+        from turbopelican.plugins.memory_output import get_store  # noqa: PLC0415
+    except ImportError:
+        raise TurbopelicanError(
+            "Pelican must be installed to serve the website."
+        ) from None
+
+    settings_file = config.directory / "pelicanconf.py"
+    if not settings_file.exists():
+        raise TurbopelicanError(f"Could not find {settings_file}.")
+
+    quiet = config.verbosity == Verbosity.QUIET
+    log.init(logging.ERROR if quiet else logging.WARNING)
+    stop = stop or threading.Event()
+    ready = ready or threading.Event()
+    with (
+        contextlib.chdir(config.directory),
+        _environment_variable("TURBOPELICAN_CONFIG_TYPE", config.config_type),
+        _environment_variable("TURBOPELICAN_PREVIEW_ONLY", config.only or ""),
+    ):
+        session = BuildSession(config)
+        session.build()
+        if session.settings is None:
+            raise TurbopelicanError("Could not read the settings of the website.")
+
+        output_path = Path(session.settings["OUTPUT_PATH"])
+        store = get_store(output_path) if config.in_memory else None
+        broadcaster = ReloadBroadcaster()
+        server = start_server(
+            output_path,
+            config.bind or session.settings.get("BIND") or "127.0.0.1",
+            session.settings.get("PORT", 8000) if config.port is None else config.port,
+            broadcaster,
+            store,
+        )
+        session.watcher()
+        if not quiet:
+            host, port = server.server_address[:2]
+            print(f"⚡ Serving at http://{host}:{port}/ ⚡")
+        ready.set()
+        try:
+            while not stop.is_set():
+                changed = session.watcher().wait(config.debounce, stop)
+                if changed and session.build(changed):
+                    broadcaster.publish()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            broadcaster.close()
+            server.shutdown()
+            server.server_close()
+            if store is not None and config.flush_on_exit:
+                written = store.flush(output_path)
+                if not quiet:
+                    print(f"⚡ Flushed {written} pages to {output_path} ⚡")
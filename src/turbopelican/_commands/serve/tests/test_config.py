@@ -0,0 +1,63 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from turbopelican import TurbopelicanError
+from turbopelican._commands.serve.config import ServeConfiguration
+from turbopelican._utils.config.config import _DeploymentType
+from turbopelican._utils.shared.args import Verbosity
+
+_PORT = 8080
+
+
+def _raw_args(**overrides: object) -> Namespace:
+    """Provides the arguments of `turbopelican serve`.
+
+    Args:
+        overrides: Arguments other than the defaults.
+
+    Returns:
+        The arguments.
+    """
+    defaults = {
+        "directory": ".",
+        "config_type": None,
+        "bind": None,
+        "port": None,
+        "debounce": 0.1,
+        "in_memory": False,
+        "flush_on_exit": False,
+        "quiet": False,
+        "only": None,
+    }
+    return Namespace(**(defaults | overrides))
+
+
+def test_from_args(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check the arguments are structured, with defaults as for building.
+
+    Args:
+        monkeypatch: Unsets the configuration type of the environment.
+    """
+    monkeypatch.delenv("TURBOPELICAN_CONFIG_TYPE", raising=False)
+    config = ServeConfiguration.from_args(_raw_args(port=_PORT, quiet=True))
+    assert config.directory == Path.cwd()
+    assert config.config_type == _DeploymentType.DEV
+    assert config.bind is None
+    assert config.port == _PORT
+    assert config.verbosity == Verbosity.QUIET
+
+
+def test_from_args_negative_debounce() -> None:
+    """Check a negative debounce interval is rejected."""
+    with pytest.raises(TurbopelicanError, match="debounce"):
+        ServeConfiguration.from_args(_raw_args(debounce=-1.0))
+
+
+def test_from_args_flush_without_memory() -> None:
+    """Check outputs cannot be flushed unless they are kept in memory."""
+    with pytest.raises(TurbopelicanError, match="requires --in-memory"):
+        ServeConfiguration.from_args(_raw_args(flush_on_exit=True))
+    config = ServeConfiguration.from_args(_raw_args(in_memory=True, flush_on_exit=True))
+    assert config.flush_on_exit
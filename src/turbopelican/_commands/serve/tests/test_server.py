@@ -0,0 +1,135 @@
+import http.client
+from collections.abc import Iterator
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from turbopelican._commands.serve.server import (
+    _RELOAD_SCRIPT,
+    EVENTS_PATH,
+    FLUSH_PATH,
+    ReloadBroadcaster,
+    start_server,
+)
+
+_PAGE = b"<html><body><p>Page</p></body></html>"
+
+
+@pytest.fixture
+def broadcaster() -> ReloadBroadcaster:
+    """Creates the broadcaster of rebuilds.
+
+    Returns:
+        The broadcaster.
+    """
+    return ReloadBroadcaster()
+
+
+@pytest.fixture
+def server(
+    tmp_path: Path, broadcaster: ReloadBroadcaster
+) -> Iterator[ThreadingHTTPServer]:
+    """Serves a page and a stylesheet on any free port.
+
+    Args:
+        tmp_path: A temporary directory for the output.
+        broadcaster: Notifies browsers of rebuilds.
+
+    Yields:
+        The server.
+    """
+    (tmp_path / "index.html").write_bytes(_PAGE)
+    (tmp_path / "style.css").write_bytes(b"p {}")
+    server = start_server(tmp_path, "127.0.0.1", 0, broadcaster)
+    yield server
+    broadcaster.close()
+    server.shutdown()
+    server.server_close()
+
+
+def _connect(server: ThreadingHTTPServer) -> http.client.HTTPConnection:
+    """Connects to the server.
+
+    Args:
+        server: The server.
+
+    Returns:
+        The connection.
+    """
+    host, port = server.server_address[:2]
+    return http.client.HTTPConnection(str(host), int(port), timeout=5)
+
+
+def test_reload_script_added(server: ThreadingHTTPServer) -> None:
+    """Check pages, but no other files, have the reload script added.
+
+    Args:
+        server: Serves a page and a stylesheet.
+    """
+    connection = _connect(server)
+    connection.request("GET", "/")
+    response = connection.getresponse()
+    assert response.read() == _PAGE.replace(b"</body>", _RELOAD_SCRIPT + b"</body>")
+    assert response.getheader("Cache-Control") == "no-store"
+
+    connection.request("GET", "/style.css")
+    assert connection.getresponse().read() == b"p {}"
+
+
+def test_reload_event(
+    server: ThreadingHTTPServer, broadcaster: ReloadBroadcaster
+) -> None:
+    """Check listening browsers are told to reload once the site is rebuilt.
+
+    Args:
+        server: Serves the output.
+        broadcaster: Notifies browsers of rebuilds.
+    """
+    connection = _connect(server)
+    connection.request("GET", EVENTS_PATH)
+    response = connection.getresponse()
+    assert response.getheader("Content-Type") == "text/event-stream"
+    assert response.readline() == b"retry: 500\n"
+    assert response.readline() == b"\n"
+
+    broadcaster.publish()
+    assert response.readline() == b"data: reload\n"
+
+
+def test_memory_output(tmp_path: Path, broadcaster: ReloadBroadcaster) -> None:
+    """Check outputs in memory are served first, and can be flushed to disk.
+
+    Args:
+        tmp_path: A temporary directory for the output.
+        broadcaster: Notifies browsers of rebuilds.
+    """
+    pytest.importorskip("pelican")
+    from turbopelican.plugins.memory_output import OutputStore  # noqa: PLC0415
+
+    (tmp_path / "style.css").write_bytes(b"p {}")
+    store = OutputStore()
+    store.put("blog/index.html", _PAGE)
+    store.put("feeds/all.atom.xml", b"<feed/>")
+    server = start_server(tmp_path, "127.0.0.1", 0, broadcaster, store)
+    try:
+        connection = _connect(server)
+        connection.request("GET", "/blog/")
+        assert _RELOAD_SCRIPT in connection.getresponse().read()
+        connection.request("GET", "/blog")
+        response = connection.getresponse()
+        response.read()
+        assert response.getheader("Location") == "/blog/"
+        connection.request("GET", "/feeds/all.atom.xml")
+        assert connection.getresponse().read() == b"<feed/>"
+        connection.request("GET", "/style.css")
+        assert connection.getresponse().read() == b"p {}"
+        assert not (tmp_path / "blog").exists()
+
+        connection.request("POST", FLUSH_PATH)
+        assert connection.getresponse().read() == b"Flushed 2 outputs.\n"
+        assert (tmp_path / "blog" / "index.html").read_bytes() == _PAGE
+    finally:
+        broadcaster.close()
+        server.shutdown()
+        server.server_close()
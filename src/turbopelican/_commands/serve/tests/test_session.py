@@ -0,0 +1,271 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from turbopelican import TurbopelicanError
+from turbopelican._commands.build.run import _environment_variable
+from turbopelican._commands.init.create import _copy_template
+from turbopelican._commands.serve.config import ServeConfiguration
+from turbopelican._commands.serve.session import BuildSession, serve_website
+from turbopelican._utils.config.config import _DeploymentType
+from turbopelican._utils.shared.args import Verbosity
+
+_TIMEOUT = 30.0
+
+_RELOADED = 2
+
+
+@pytest.fixture
+def website(tmp_path: Path) -> Path:
+    """Creates a new website from the template, dated as by `init`.
+
+    Args:
+        tmp_path: A temporary directory in which to create the website.
+
+    Returns:
+        The path to the website.
+    """
+    _copy_template(tmp_path, "newsite")
+    for file in (tmp_path / "content").glob("*.md"):
+        file.write_text(file.read_text().replace("$date", "2024-01-01"))
+    return tmp_path
+
+
+@pytest.fixture
+def session(website: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[BuildSession]:
+    """Prepares to rebuild a website from its directory.
+
+    Args:
+        website: The path to a new website.
+        monkeypatch: Changes into the directory of the website.
+
+    Yields:
+        The session.
+    """
+    pytest.importorskip("pelican")
+    monkeypatch.chdir(website)
+    config = _config(website)
+    with _environment_variable("TURBOPELICAN_CONFIG_TYPE", config.config_type):
+        yield BuildSession(config)
+
+
+def _config(
+    website: Path, port: int | None = None, *, in_memory: bool = False
+) -> ServeConfiguration:
+    """Configures serving a website quietly.
+
+    Args:
+        website: The path to the website.
+        port: The port on which to serve it.
+        in_memory: Whether to keep pages in memory and flush them on exit.
+
+    Returns:
+        The configuration.
+    """
+    return ServeConfiguration(
+        directory=website,
+        config_type=_DeploymentType.DEV,
+        bind="127.0.0.1",
+        port=port,
+        debounce=0.05,
+        in_memory=in_memory,
+        flush_on_exit=in_memory,
+        verbosity=Verbosity.QUIET,
+    )
+
+
+def _touch(path: Path, content: str) -> None:
+    """Rewrites a file, moving its modification time forward by a second.
+
+    Args:
+        path: The file.
+        content: Its new content.
+    """
+    mtime = path.stat().st_mtime_ns + 10**9
+    path.write_text(content)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_build_reads_settings_once(website: Path, session: BuildSession) -> None:
+    """Check settings are only read again when the configuration changes.
+
+    Args:
+        website: The path to a new website.
+        session: Rebuilds the website.
+    """
+    from pelican import settings  # noqa: PLC0415
+
+    with mock.patch.object(
+        settings, "read_settings", wraps=settings.read_settings
+    ) as read_settings:
+        assert session.build()
+        assert read_settings.call_count == 1
+        assert session.settings is not None
+        assert "turbopelican.plugins.incremental" in session.settings["PLUGINS"]
+
+        page = website / "content" / "index.md"
+        _touch(page, page.read_text().replace("\n\n", "\n\nEdited.\n\n", 1))
+        assert session.build({page})
+        assert read_settings.call_count == 1
+        assert "Edited." in (website / "output" / "index.html").read_text()
+
+        toml = website / "turbopelican.toml"
+        _touch(toml, toml.read_text().replace('"MySite"', '"Renamed"'))
+        assert session.build({toml})
+        assert read_settings.call_count == _RELOADED
+    assert session.settings["SITENAME"] == "Renamed"
+
+
+def test_build_reports_errors(
+    website: Path, session: BuildSession, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Check an invalid configuration is reported, then read once fixed.
+
+    Args:
+        website: The path to a new website.
+        session: Rebuilds the website.
+        caplog: Captures the report.
+    """
+    toml = website / "turbopelican.toml"
+    original = toml.read_text()
+    _touch(toml, original + "\nunknown = [")
+    with caplog.at_level(logging.ERROR):
+        assert not session.build({toml})
+    assert "Could not build the website" in caplog.text
+
+    _touch(toml, original)
+    assert session.build({toml})
+    assert session.settings is not None
+
+
+def test_watched_paths(website: Path, session: BuildSession) -> None:
+    """Check the output and every cache are not watched.
+
+    Args:
+        website: The path to a new website.
+        session: Rebuilds the website.
+    """
+    assert session.build()
+    paths, excluded = session.watched_paths()
+    assert paths == [website]
+    assert website / "output" in excluded
+    assert website / "cache" in excluded
+
+
+def test_serve_website(website: Path) -> None:
+    """Check the website is rebuilt when served and edited, until stopped.
+
+    Args:
+        website: The path to a new website.
+    """
+    pytest.importorskip("pelican")
+    stop = threading.Event()
+    thread = threading.Thread(target=serve_website, args=(_config(website, 0), stop))
+    thread.start()
+    try:
+        output = website / "output" / "index.html"
+        deadline = time.monotonic() + _TIMEOUT
+        while not output.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        page = website / "content" / "index.md"
+        edited = page.read_text().replace("\n\n", "\n\nServed.\n\n", 1)
+        # The page is edited again, in case the watcher started afterwards.
+        while "Served." not in output.read_text() and time.monotonic() < deadline:
+            _touch(page, edited)
+            time.sleep(0.5)
+        assert "Served." in output.read_text()
+    finally:
+        stop.set()
+        thread.join(_TIMEOUT)
+    assert not thread.is_alive()
+
+
+def test_serve_website_moved_theme(
+    website: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    """Check a theme is watched once the settings move it outside the website.
+
+    Args:
+        website: The path to a new website.
+        tmp_path_factory: Creates a directory outside the website for the theme.
+    """
+    pytest.importorskip("pelican")
+    theme = tmp_path_factory.mktemp("theme") / "plain-theme"
+    shutil.copytree(website / "themes" / "plain-theme", theme)
+    template = theme / "templates" / "base.html"
+    original = template.read_text()
+    template.write_text(original.replace("<body>", "<body>Moved.", 1))
+    stop = threading.Event()
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=serve_website, args=(_config(website, 0), stop, ready)
+    )
+    thread.start()
+    try:
+        assert ready.wait(_TIMEOUT)
+        output = website / "output" / "index.html"
+        configuration = website / "turbopelican.toml"
+        moved = configuration.read_text().replace(
+            'theme = "themes/plain-theme"', f'theme = "{theme.as_posix()}"'
+        )
+        _touch(configuration, moved)
+        deadline = time.monotonic() + _TIMEOUT
+        while "Moved." not in output.read_text() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert "Moved." in output.read_text()
+        edited = original.replace("<body>", "<body>Rethemed.", 1)
+        # The theme is edited again, in case the watcher was created afterwards.
+        while "Rethemed." not in output.read_text() and time.monotonic() < deadline:
+            _touch(template, edited)
+            time.sleep(0.5)
+        assert "Rethemed." in output.read_text()
+    finally:
+        stop.set()
+        thread.join(_TIMEOUT)
+    assert not thread.is_alive()
+
+
+def test_serve_website_in_memory(website: Path) -> None:
+    """Check pages are kept in memory while served, and flushed on exit.
+
+    Args:
+        website: The path to a new website.
+    """
+    pytest.importorskip("pelican")
+    from turbopelican.plugins.memory_output import get_store  # noqa: PLC0415
+
+    store = get_store(website / "output")
+    stop = threading.Event()
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=serve_website, args=(_config(website, 0, in_memory=True), stop, ready)
+    )
+    thread.start()
+    try:
+        # Static files are copied after the pages, so the whole build is awaited.
+        assert ready.wait(_TIMEOUT)
+        assert store.get("index.html") is not None
+        assert not (website / "output" / "index.html").exists()
+        assert (website / "output" / "logo.svg").exists()
+    finally:
+        stop.set()
+        thread.join(_TIMEOUT)
+    assert (website / "output" / "index.html").read_bytes() == store.get("index.html")
+
+
+def test_serve_website_missing_settings(tmp_path: Path) -> None:
+    """Check an error is raised if the website has no `pelicanconf.py`.
+
+    Args:
+        tmp_path: A directory without a website.
+    """
+    pytest.importorskip("pelican")
+    with pytest.raises(TurbopelicanError, match="Could not find"):
+        serve_website(_config(tmp_path))
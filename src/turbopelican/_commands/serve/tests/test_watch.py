@@ -0,0 +1,63 @@
+import os
+import threading
+from pathlib import Path
+
+from turbopelican._commands.serve.watch import Watcher
+
+_DEBOUNCE = 0.05
+
+
+def _touch(path: Path) -> None:
+    """Moves the modification time of a file forward by a second.
+
+    Args:
+        path: The file.
+    """
+    mtime = path.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_poll(tmp_path: Path) -> None:
+    """Check added, changed and removed files are found, except those excluded.
+
+    Args:
+        tmp_path: A temporary directory to be watched.
+    """
+    (tmp_path / "content").mkdir()
+    (tmp_path / "output").mkdir()
+    (tmp_path / ".git").mkdir()
+    page = tmp_path / "content" / "page.md"
+    page.write_text("Title: Page")
+    removed = tmp_path / "content" / "removed.md"
+    removed.write_text("Title: Removed")
+    watcher = Watcher([tmp_path, tmp_path / "missing"], [tmp_path / "output"])
+    assert not watcher.poll()
+
+    _touch(page)
+    removed.unlink()
+    added = tmp_path / "turbopelican.toml"
+    added.write_text("[pelican]")
+    (tmp_path / "output" / "page.html").write_text("<p>Page</p>")
+    (tmp_path / ".git" / "index").write_text("")
+    (tmp_path / "content" / "page.md~").write_text("")
+    assert watcher.poll() == {page, removed, added}
+    assert not watcher.poll()
+
+
+def test_wait(tmp_path: Path) -> None:
+    """Check changes are reported together, or not at all once stopped.
+
+    Args:
+        tmp_path: A temporary directory to be watched.
+    """
+    first = tmp_path / "first.md"
+    second = tmp_path / "second.md"
+    watcher = Watcher([tmp_path])
+    first.write_text("First")
+    second.write_text("Second")
+    assert watcher.wait(_DEBOUNCE) == {first, second}
+
+    stop = threading.Event()
+    stop.set()
+    _touch(first)
+    assert not watcher.wait(_DEBOUNCE, stop)
@@ -0,0 +1,147 @@
+"""Watches the sources of a website for changes.
+
+The sources are polled rather than watched through the operating system, so
+that no further dependency is needed. Each poll only reads the status of each
+file, which takes milliseconds even for thousands of pages.
+
+Author: Elliot Simpson
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_POLL_INTERVAL = 0.05
+"""The number of seconds between polls of the sources."""
+
+_IGNORED_DIRECTORIES = {"__pycache__", "node_modules"}
+"""Directories which never contain sources, besides hidden directories."""
+
+
+def _is_ignored(name: str) -> bool:
+    """Checks whether a file or directory is never a source.
+
+    Args:
+        name: The name of the file or directory.
+
+    Returns:
+        Whether it is hidden, a cache or an editor's temporary file.
+    """
+    return name.startswith(".") or name.endswith("~") or name in _IGNORED_DIRECTORIES
+
+
+class Watcher:
+    """Detects files which are added, changed or removed beneath some paths."""
+
+    def __init__(self, paths: Iterable[Path], excluded: Iterable[Path] = ()) -> None:
+        """Records the current state of the paths.
+
+        Args:
+            paths: The files and directories to be watched. They need not
+                exist yet.
+            excluded: Directories beneath these paths not to be watched, such
+                as the output.
+        """
+        self.paths = [path.absolute() for path in paths]
+        self.excluded = {str(path.absolute()) for path in excluded}
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        """Reads the status of every file beneath the watched paths.
+
+        Returns:
+            The modification time and size of each file, keyed by its path.
+        """
+        snapshot: dict[str, tuple[int, int]] = {}
+        pending = []
+        for path in self.paths:
+            try:
+                status = path.stat()
+            except OSError:
+                continue
+            if stat.S_ISDIR(status.st_mode):
+                pending.append(str(path))
+            else:
+                snapshot[str(path)] = (status.st_mtime_ns, status.st_size)
+
+        while pending:
+            pending.extend(self._scan_directory(pending.pop(), snapshot))
+        return snapshot
+
+    def _scan_directory(
+        self, directory: str, snapshot: dict[str, tuple[int, int]]
+    ) -> list[str]:
+        """Reads the status of every file directly within a directory.
+
+        Args:
+            directory: The directory.
+            snapshot: The status of each file, to which these are added.
+
+        Returns:
+            The subdirectories of the directory, to be scanned in turn.
+        """
+        if directory in self.excluded:
+            return []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return []
+        subdirectories = []
+        for entry in entries:
+            if _is_ignored(entry.name):
+                continue
+            try:
+                if entry.is_dir():
+                    subdirectories.append(entry.path)
+                else:
+                    status = entry.stat()
+                    snapshot[entry.path] = (status.st_mtime_ns, status.st_size)
+            except OSError:
+                continue
+        return subdirectories
+
+    def poll(self) -> set[Path]:
+        """Finds the files which have changed since the previous poll.
+
+        Returns:
+            The paths of every file added, changed or removed.
+        """
+        previous, self.snapshot = self.snapshot, self._scan()
+        changed = {
+            path for path, state in self.snapshot.items() if previous.get(path) != state
+        }
+        changed.update(previous.keys() - self.snapshot.keys())
+        return {Path(path) for path in changed}
+
+    def wait(self, debounce: float, stop: threading.Event | None = None) -> set[Path]:
+        """Waits for files to change, until no more change for a while.
+
+        Saving a file in an editor, or switching branches, changes several
+        files in quick succession, which are reported together.
+
+        Args:
+            debounce: The number of seconds without a change after which the
+                changes are reported.
+            stop: An event which stops waiting when set.
+
+        Returns:
+            The paths of every file changed, or none if stopped first.
+        """
+        stop = stop or threading.Event()
+        changed: set[Path] = set()
+        last_change = 0.0
+        while not stop.wait(_POLL_INTERVAL):
+            if latest := self.poll():
+                changed |= latest
+                last_change = time.monotonic()
+            elif changed and time.monotonic() - last_change >= debounce:
+                return changed
+        return set()
@@ -218,6 +218,11 @@ def _parse_sentinels(data: object, meta_config: dict) -> object:
 
 
 _turbopelican_config_type = os.environ.get("TURBOPELICAN_CONFIG_TYPE", "DEV")
+if _turbopelican_config_type not in {"DEV", "PUBLISH"}:
+    raise ValueError(
+        f"Incorrect config type: {_turbopelican_config_type}. Websites without "
+        "Turbopelican installed must be built for DEV or PUBLISH."
+    )
 
 with Path("turbopelican.toml").open("rb") as config:
     _complete_config = tomllib.load(config)
@@ -421,7 +426,7 @@ PAGINATION_PATTERNS: list[tuple[int, str, str]] = _get(
 PATH: str = _get("path", ".")
 PATH_METADATA: str = _get("path_metadata", "")
 PLUGIN_PATHS: list[str] = _get("plugin_paths", [])
-PLUGINS: dict[str, Callable | str] = _get("plugins", {})
+PLUGINS: list[str] | dict[str, Callable | str] = _get("plugins", {})
 PORT: int = _get("port", 8000)
 PYGMENTS_RST_OPTIONS: dict = _get("pygments_rst_options", {})
 READERS: dict[str, Callable | None] = _get("readers", {})
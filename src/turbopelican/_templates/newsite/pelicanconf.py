@@ -170,12 +170,16 @@ from typing import Literal
 
 from turbopelican import config
 
-if os.environ.get("TURBOPELICAN_CONFIG_TYPE", "DEV") == "PUBLISH":
+_config_type: Literal["DEV", "PREVIEW", "PUBLISH"] = "DEV"
+if os.environ.get("TURBOPELICAN_CONFIG_TYPE") == "PUBLISH":
     _config_type = "PUBLISH"
-else:
-    _config_type = "DEV"
+elif os.environ.get("TURBOPELICAN_CONFIG_TYPE") == "PREVIEW":
+    _config_type = "PREVIEW"
 
-_config = config(_config_type)
+_config = config(
+    _config_type,
+    only=os.environ.get("TURBOPELICAN_PREVIEW_ONLY") or None,
+)
 
 ANALYTICS: str | None = _config.analytics
 ARCHIVES_SAVE_AS: str = _config.archives_save_as
@@ -285,7 +289,7 @@ PAGINATED_TEMPLATES: dict[str, int | None] = _config.paginated_templates
 PAGINATION_PATTERNS: list[tuple[int, str, str]] = _config.pagination_patterns
 PATH: str = _config.path
 PATH_METADATA: str = _config.path_metadata
-PLUGINS: dict[str, Callable | str] = _config.plugins
+PLUGINS: list[str] | dict[str, Callable | str] = _config.plugins
 PLUGIN_PATHS: list[str] = _config.plugin_paths
 PORT: int = _config.port
 PYGMENTS_RST_OPTIONS: dict = _config.pygments_rst_options
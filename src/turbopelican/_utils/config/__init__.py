@@ -4,18 +4,29 @@ Author: Elliot Simpson.
 """
 
 __all__ = [
+    "ConfigSource",
     "Configuration",
+    "FileConfigSource",
+    "MappingConfigSource",
     "PelicanConfig",
     "PelicanConfiguration",
     "PublishConfiguration",
+    "SQLiteConfigSource",
     "config",
+    "config_many",
     "load_config",
 ]
 
-from turbopelican._utils.config.config import PelicanConfig, config
+from turbopelican._utils.config.config import PelicanConfig, config, config_many
 from turbopelican._utils.config.legacy import (
     Configuration,
     PelicanConfiguration,
     PublishConfiguration,
     load_config,
 )
+from turbopelican._utils.config.sources import (
+    ConfigSource,
+    FileConfigSource,
+    MappingConfigSource,
+    SQLiteConfigSource,
+)
@@ -8,21 +8,41 @@ from __future__ import annotations
 __all__ = [
     "PelicanConfig",
     "config",
+    "config_many",
 ]
 
 import importlib
 import logging
-from collections.abc import Callable
+import posixpath
+import re
+import shutil
+import sys
+import warnings
+from collections.abc import Callable, Iterable
 from enum import StrEnum
+from pathlib import Path
 from typing import TYPE_CHECKING, Annotated, Any, Literal, NoReturn, TypeVar
 
 import pydantic
 
-from turbopelican._utils.errors.errors import TurbopelicanError
-from turbopelican._utils.shared import Toml, find_config
+from turbopelican._utils.config.includes import (
+    fragment_path,
+    fragment_sources,
+    layer_fragments,
+)
+from turbopelican._utils.config.path_metadata import (
+    PathMetadataMatcher,
+    compile_path_metadata_patterns,
+    is_pattern_entry,
+    match_content,
+)
+from turbopelican._utils.config.regex import compile_regex, find_pathological_input
+from turbopelican._utils.config.sources import ConfigSource, shared_file_source
+from turbopelican._utils.errors.errors import TurbopelicanError, TurbopelicanWarning
+from turbopelican._utils.shared import Toml, fingerprint
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Hashable
 
 T = TypeVar("T", bound=Toml)
 
@@ -33,6 +53,7 @@ class _DeploymentType(StrEnum):
     """The deployment settings to be used."""
 
     DEV = "DEV"
+    PREVIEW = "PREVIEW"
     PUBLISH = "PUBLISH"
 
 
@@ -91,7 +112,10 @@ def _validate_twice_nested_dict(value: dict) -> dict[str, dict[str, str]]:
 
 
 def _validate_list_of_regex_substitutions(value: list) -> list[tuple[str, str]]:
-    """Raises an error if field is not a list of tuples, each containing two strings.
+    """Raises an error if field is not a list of regular expression substitutions.
+
+    Each substitution must be a tuple containing a valid regular expression and
+    its replacement.
 
     Args:
         value: The provided field to be validated.
@@ -100,6 +124,35 @@ def _validate_list_of_regex_substitutions(value: list) -> list[tuple[str, str]]:
         The value unchanged.
     """
     pydantic.RootModel[list[tuple[str, str]]].model_validate(value)
+    for pattern, _replacement in value:
+        compile_regex(pattern, re.IGNORECASE)
+    return value
+
+
+def _validate_regex(value: str) -> str:
+    """Raises an error if the field is not a valid regular expression.
+
+    Args:
+        value: The provided field to be validated.
+
+    Returns:
+        The value unchanged.
+    """
+    compile_regex(value)
+    return value
+
+
+def _validate_intrasite_link_regex(value: str) -> str:
+    """Raises an error if the field is not a valid intrasite link expression.
+
+    Args:
+        value: The provided field to be validated.
+
+    Returns:
+        The value unchanged.
+    """
+    if "what" not in compile_regex(value, re.VERBOSE).groupindex:
+        raise ValueError(f"Expected group named 'what' in {value!r}")
     return value
 
 
@@ -256,6 +309,10 @@ _ListOfRegexSubstitutions = Annotated[
     list[tuple[str, str]],
     pydantic.AfterValidator(_validate_list_of_regex_substitutions),
 ]
+_Regex = Annotated[str, pydantic.AfterValidator(_validate_regex)]
+_IntrasiteLinkRegex = Annotated[
+    str, pydantic.AfterValidator(_validate_intrasite_link_regex)
+]
 _Datetime = Annotated[
     str | tuple[int, ...] | None, pydantic.AfterValidator(_validate_datetime)
 ]
@@ -286,6 +343,91 @@ _DictOfFunctionsAndNames = Annotated[
 ]
 
 
+def _compile_regex_substitutions(
+    substitutions: list[tuple[str, str]],
+) -> list[tuple[re.Pattern[str], str]]:
+    """Compiles regular expression substitutions as Pelican's slugify does.
+
+    Args:
+        substitutions: The regular expressions and their replacements.
+
+    Returns:
+        The compiled regular expressions and their replacements.
+    """
+    return [
+        (compile_regex(pattern, re.IGNORECASE), replacement)
+        for pattern, replacement in substitutions
+    ]
+
+
+_HIGHLIGHT_CACHE_EXTENSION = "turbopelican.plugins.highlight_cache"
+"""The Markdown extension which caches highlighted code."""
+
+_CACHING_SETTINGS = frozenset({"cache_path", "cache_content", "load_content_cache"})
+"""Settings which control caching, without affecting what is cached."""
+
+_PREVIEW_SKIPPED_FEEDS = (
+    "author_feed_atom",
+    "author_feed_rss",
+    "category_feed_atom",
+    "category_feed_rss",
+    "feed_all_atom",
+    "feed_all_rss",
+    "feed_atom",
+    "feed_rss",
+    "tag_feed_atom",
+    "tag_feed_rss",
+    "translation_feed_atom",
+    "translation_feed_rss",
+)
+"""The feeds which are not generated when previewing."""
+
+_PREVIEW_SKIPPED_LISTINGS = (
+    "archives_save_as",
+    "author_save_as",
+    "authors_save_as",
+    "categories_save_as",
+    "category_save_as",
+    "day_archive_save_as",
+    "month_archive_save_as",
+    "tag_save_as",
+    "tags_save_as",
+    "year_archive_save_as",
+)
+"""The listings of content which are not generated when previewing."""
+
+_PREVIEW_DRAFT_LOCATIONS = {
+    "draft_lang_save_as": "article_lang_save_as",
+    "draft_lang_url": "article_lang_url",
+    "draft_page_lang_save_as": "page_lang_save_as",
+    "draft_page_lang_url": "page_lang_url",
+    "draft_page_save_as": "page_save_as",
+    "draft_page_url": "page_url",
+    "draft_save_as": "article_save_as",
+    "draft_url": "article_url",
+}
+"""The setting giving each location of drafts its published location instead."""
+
+
+def _within(path: str, directories: Iterable[str]) -> bool:
+    """Checks whether a path is beneath any of several directories.
+
+    Args:
+        path: The POSIX path, relative to the content directory.
+        directories: The directories, relative to the content directory, where
+            an empty string is the content directory itself.
+
+    Returns:
+        Whether the path is, or is beneath, any of the directories.
+    """
+    return any(
+        not directory.strip("/")
+        or path == directory.strip("/")
+        or path.startswith(directory.strip("/") + "/")
+        for directory in directories
+    )
+
+
 class PelicanConfig(pydantic.BaseModel):
     """The configuration passed to Turbopelican."""
 
@@ -374,13 +516,13 @@ class PelicanConfig(pydantic.BaseModel):
     feed_max_items: int | None = 100
     feed_rss: str | None = None
     feed_rss_url: str | None = None
-    filename_metadata: str = r"(?P<date>\d{4}-\d{2}-\d{2})_(?P<slug>.*)"
+    filename_metadata: _Regex = r"(?P<date>\d{4}-\d{2}-\d{2})_(?P<slug>.*)"
     formatted_fields: _ListOfStrings = pydantic.Field(default_factory=["summary"].copy)
     github_url: str | None = None
     gzip_cache: bool = True
     ignore_files: _ListOfStrings = pydantic.Field(default_factory=["**/.*"].copy)
     index_save_as: str = "index.html"
-    intrasite_link_regex: str = "[{|](?P<what>.*?)[|}]"
+    intrasite_link_regex: _IntrasiteLinkRegex = "[{|](?P<what>.*?)[|}]"
     jinja_environment: dict = pydantic.Field(
         default_factory={
             "extensions": [],
@@ -423,8 +565,10 @@ class PelicanConfig(pydantic.BaseModel):
         ].copy
     )
     path: str = "."
-    path_metadata: str = ""
-    plugins: _DictOfFunctionsAndNames = pydantic.Field(default_factory=dict)
+    path_metadata: _Regex = ""
+    plugins: _ListOfStrings | _DictOfFunctionsAndNames = pydantic.Field(
+        default_factory=dict
+    )
     plugin_paths: _ListOfStrings = pydantic.Field(default_factory=list)
     port: int = 8000
     pygments_rst_options: dict = pydantic.Field(default_factory=dict)
@@ -492,6 +636,67 @@ class PelicanConfig(pydantic.BaseModel):
     year_archive_save_as: str = ""
     year_archive_url: str = ""
 
+    _path_metadata_matcher: PathMetadataMatcher = pydantic.PrivateAttr(
+        default_factory=PathMetadataMatcher
+    )
+
+    @property
+    def slug_regex_patterns(self) -> list[tuple[re.Pattern[str], str]]:
+        """The compiled `slug_regex_substitutions`, as Pelican uses them."""
+        return _compile_regex_substitutions(self.slug_regex_substitutions)
+
+    @property
+    def author_regex_patterns(self) -> list[tuple[re.Pattern[str], str]]:
+        """The compiled `author_regex_substitutions`, as Pelican uses them."""
+        return _compile_regex_substitutions(self.author_regex_substitutions)
+
+    @property
+    def category_regex_patterns(self) -> list[tuple[re.Pattern[str], str]]:
+        """The compiled `category_regex_substitutions`, as Pelican uses them."""
+        return _compile_regex_substitutions(self.category_regex_substitutions)
+
+    @property
+    def tag_regex_patterns(self) -> list[tuple[re.Pattern[str], str]]:
+        """The compiled `tag_regex_substitutions`, as Pelican uses them."""
+        return _compile_regex_substitutions(self.tag_regex_substitutions)
+
+    @property
+    def filename_metadata_pattern(self) -> re.Pattern[str]:
+        """The compiled `filename_metadata`."""
+        return compile_regex(self.filename_metadata)
+
+    @property
+    def path_metadata_pattern(self) -> re.Pattern[str]:
+        """The compiled `path_metadata`."""
+        return compile_regex(self.path_metadata)
+
+    @property
+    def intrasite_link_pattern(self) -> re.Pattern[str]:
+        """The compiled `intrasite_link_regex`, as Pelican embeds it."""
+        return compile_regex(self.intrasite_link_regex, re.VERBOSE)
+
+    def regex_settings(self) -> list[tuple[str, str, int]]:
+        """Lists every regular expression used to configure Pelican.
+
+        Returns:
+            For each regular expression, the name of its setting, the regular
+            expression, and the flags with which Pelican compiles it.
+        """
+        regexes: list[tuple[str, str, int]] = [
+            (name, pattern, re.IGNORECASE)
+            for name, substitutions in [
+                ("slug_regex_substitutions", self.slug_regex_substitutions),
+                ("author_regex_substitutions", self.author_regex_substitutions),
+                ("category_regex_substitutions", self.category_regex_substitutions),
+                ("tag_regex_substitutions", self.tag_regex_substitutions),
+            ]
+            for pattern, _replacement in substitutions
+        ]
+        regexes.append(("filename_metadata", self.filename_metadata, 0))
+        regexes.append(("path_metadata", self.path_metadata, 0))
+        regexes.append(("intrasite_link_regex", self.intrasite_link_regex, re.VERBOSE))
+        return regexes
+
     @pydantic.field_validator("links", mode="before")
     @classmethod
     def _transform_links(cls, value: list[list[str]]) -> tuple[tuple[str, str], ...]:
@@ -592,6 +797,152 @@ class PelicanConfig(pydantic.BaseModel):
 
         return transformed
 
+    @pydantic.model_validator(mode="wrap")
+    @classmethod
+    def _split_extra_path_metadata_patterns(
+        cls, data: object, handler: pydantic.ModelWrapValidatorHandler[PelicanConfig]
+    ) -> PelicanConfig:
+        """Compiles any extra path metadata which matches patterns of paths.
+
+        Items with `origin_glob` or `origin_regex` cannot be known until the
+        content directory is read, so they are compiled into a single matcher
+        and expanded later by `expand_extra_path_metadata`.
+
+        Args:
+            data: The complete unvalidated data.
+            handler: Validates the data without the pattern items.
+
+        Returns:
+            The validated configuration.
+        """
+        matcher = PathMetadataMatcher()
+        value = data.get("extra_path_metadata") if isinstance(data, dict) else None
+        if isinstance(data, dict) and isinstance(value, list):
+            patterns = [metadata for metadata in value if is_pattern_entry(metadata)]
+            if patterns:
+                pydantic.RootModel[list[dict[str, str]]].model_validate(patterns)
+                matcher = compile_path_metadata_patterns(patterns)
+                data = {
+                    **data,
+                    "extra_path_metadata": [
+                        metadata for metadata in value if not is_pattern_entry(metadata)
+                    ],
+                }
+        validated = handler(data)
+        validated._path_metadata_matcher = matcher  # noqa: SLF001
+        return validated
+
+    def expand_extra_path_metadata(self, content_path: Path | str) -> None:
+        """Expands the patterns in `extra_path_metadata` against the content.
+
+        Every file in the content directory matching a pattern is given an
+        entry in `extra_path_metadata`, unless it already has an exact entry.
+        Where several patterns match the same file, the first takes precedence.
+
+        Args:
+            content_path: The directory containing the content.
+        """
+        if self._path_metadata_matcher:
+            self.extra_path_metadata = self._path_metadata_matcher.expand(
+                Path(content_path), self.extra_path_metadata
+            )
+
+    def namespace_cache_path(self, profile: str) -> None:
+        """Moves the cache into a directory specific to the profile and settings.
+
+        Builds with different settings, such as those for development and
+        publication, would otherwise share a cache, each invalidating it for
+        the other.
+
+        Args:
+            profile: The name of the profile, such as DEV or PUBLISH.
+        """
+        settings = self.model_dump(exclude=set(_CACHING_SETTINGS))
+        namespace = f"{profile.lower()}-{fingerprint(settings)[:12]}"
+        self.cache_path = posixpath.join(self.cache_path, namespace)
+
+    def preview(self) -> None:
+        """Skips everything not needed to preview the content.
+
+        Feeds, tag, category and author pages and archives are not generated.
+        Drafts, including articles dated in the future, are rendered where
+        they will be published, so that they can be previewed in place.
+        """
+        for name in _PREVIEW_SKIPPED_FEEDS:
+            setattr(self, name, None)
+        for name in _PREVIEW_SKIPPED_LISTINGS:
+            setattr(self, name, "")
+        for name, published in _PREVIEW_DRAFT_LOCATIONS.items():
+            setattr(self, name, getattr(self, published))
+        self.with_future_dates = True
+        self.delete_output_directory = False
+
+    def restrict_content(self, glob: str, content_path: Path) -> None:
+        """Reads only the articles and pages matching a glob.
+
+        Args:
+            glob: The glob, relative to the content directory.
+            content_path: The directory containing the content.
+        """
+        matched = match_content(content_path, glob)
+        articles = [
+            path
+            for path in matched
+            if _within(path, self.article_paths)
+            and not _within(path, self.article_excludes)
+        ]
+        pages = [
+            path
+            for path in matched
+            if _within(path, self.page_paths)
+            and not _within(path, self.page_excludes)
+            and path not in articles
+        ]
+        self.article_paths = articles
+        self.page_paths = pages
+
+    def cache_jinja_bytecode(self, directory: Path) -> None:
+        """Stores compiled templates in a directory between builds.
+
+        Args:
+            directory: The directory in which compiled templates are stored.
+        """
+        from turbopelican._utils.config.jinja import (  # noqa: PLC0415
+            TemplateBytecodeCache,
+        )
+
+        self.jinja_environment = {
+            "bytecode_cache": TemplateBytecodeCache(directory),
+            **self.jinja_environment,
+        }
+
+    def cache_highlighted_code(self, directory: Path, *, enable: bool) -> None:
+        """Stores highlighted code in a directory between builds.
+
+        The directory is only used if the highlight cache extension is enabled,
+        either in `markdown` without a directory of its own, or by `enable`.
+
+        Args:
+            directory: The directory in which highlighted code is stored.
+            enable: Whether to add the extension to `markdown` if it is missing.
+        """
+        extension_configs = self.markdown.get("extension_configs", {})
+        extension_config = extension_configs.get(_HIGHLIGHT_CACHE_EXTENSION)
+        if extension_config is None and enable:
+            extension_config = {}
+        if extension_config is None or "cache_path" in extension_config:
+            return
+        self.markdown = {
+            **self.markdown,
+            "extension_configs": {
+                **extension_configs,
+                _HIGHLIGHT_CACHE_EXTENSION: {
+                    **extension_config,
+                    "cache_path": str(directory),
+                },
+            },
+        }
+
     @classmethod
     def _default_regex_substitutions(cls, data: object) -> object:
         """Enforces correct defaults for regular expression substitutions.
@@ -653,6 +1004,34 @@ class _MetaConfig(pydantic.BaseModel):
         default_factory=lambda: _ModulePrefixConfigList([]),
     )
     null_sentinel: str | int | float = "None"
+    include: _ListOfStrings = pydantic.Field(default_factory=list)
+    namespace_cache: bool = True
+    jinja_bytecode_cache: bool = False
+    highlight_cache: bool = False
+
+
+def _remove_stale_namespaces(cache_path: Path) -> None:
+    """Removes the caches of a profile for settings no longer in use.
+
+    Only the siblings of the cache which belong to the same profile are
+    removed, so that the caches of other profiles are kept warm.
+
+    Args:
+        cache_path: The cache namespaced by `namespace_cache_path`.
+    """
+    profile, _, _ = cache_path.name.rpartition("-")
+    pattern = re.compile(rf"{re.escape(profile)}-[0-9a-f]{{12}}")
+    try:
+        siblings = list(cache_path.parent.iterdir())
+    except OSError:
+        return
+    for sibling in siblings:
+        if (
+            sibling != cache_path
+            and pattern.fullmatch(sibling.name)
+            and sibling.is_dir()
+        ):
+            shutil.rmtree(sibling, ignore_errors=True)
 
 
 def _parse_sentinel_as_function(data: str, meta_config: _MetaConfig) -> str | Callable:
@@ -699,6 +1078,7 @@ def _parse_sentinels(data: object, meta_config: _MetaConfig) -> object:
 class _CombinedConfig(pydantic.BaseModel):
     """The complete configuration for both development and publication."""
 
+    meta: _MetaConfig = pydantic.Field(default_factory=_MetaConfig)
     pelican: PelicanConfig = pydantic.Field(default_factory=PelicanConfig)
     publish: PelicanConfig
 
@@ -735,7 +1115,10 @@ class _CombinedConfig(pydantic.BaseModel):
         return data
 
 
-def _handle_validation_error(exc: pydantic.ValidationError) -> NoReturn:
+def _handle_validation_error(
+    exc: pydantic.ValidationError,
+    locate: Callable[[tuple[str | int, ...]], Path | None] | None = None,
+) -> NoReturn:
     """Ensures that only the first configuration error is shown.
 
     The error is also made more user-friendly for those unfamiliar with
@@ -743,6 +1126,8 @@ def _handle_validation_error(exc: pydantic.ValidationError) -> NoReturn:
 
     Args:
         exc: The validation exception thrown by Pydantic.
+        locate: Finds the included fragment from which the value at a
+            location came, if any, to be named in the error.
 
     Raises:
         TurbopelicanError: The configuration is incorrectly formed.
@@ -750,38 +1135,219 @@ def _handle_validation_error(exc: pydantic.ValidationError) -> NoReturn:
     first_error = exc.errors()[0]
     address = ".".join(map(str, first_error["loc"]))
     message = first_error["msg"]
+    path = None if locate is None else locate(first_error["loc"])
+    where = "" if path is None else f" in {path}"
     raise TurbopelicanError(
-        f"Unexpected configuration at: {address}: {message!r}."
+        f"Unexpected configuration{where} at: {address}: {message!r}."
     ) from None
 
 
+def _caller_stacklevel() -> int:
+    """Finds how far up the stack the configuration was first requested.
+
+    Returns:
+        The `stacklevel` with which a warning issued by the caller of this
+        function is attributed to the code outside this package which loaded
+        the configuration, rather than to the loading machinery itself.
+    """
+    package = Path(__file__).parent
+    frame = sys._getframe(1)  # noqa: SLF001
+    stacklevel = 1
+    while frame is not None and Path(frame.f_code.co_filename).parent == package:
+        frame = frame.f_back
+        stacklevel += 1
+    return stacklevel
+
+
+def _warn_pathological_regexes(config: _CombinedConfig) -> None:
+    """Warns about regular expressions liable to catastrophic backtracking.
+
+    Args:
+        config: The configuration containing the regular expressions.
+    """
+    warned = set()
+    for section, section_config in [
+        ("pelican", config.pelican),
+        ("publish", config.publish),
+    ]:
+        for name, pattern, flags in section_config.regex_settings():
+            if (name, pattern) in warned:
+                continue
+            pathological = find_pathological_input(pattern, flags)
+            if pathological is None:
+                continue
+            warned.add((name, pattern))
+            length, seconds = pathological
+            warnings.warn(
+                f"Regular expression {pattern!r} at {section}.{name} may backtrack "
+                f"catastrophically: searching {length} characters took "
+                f"{seconds:.2f} seconds.",
+                TurbopelicanWarning,
+                stacklevel=_caller_stacklevel(),
+            )
+
+
+def _validate_combined_config(
+    raw_config: dict[str, Toml],
+    locate: Callable[[tuple[str | int, ...]], Path | None] | None = None,
+) -> _CombinedConfig:
+    """Validates the complete raw configuration.
+
+    Args:
+        raw_config: The configuration as read from its source.
+        locate: Finds the included fragment from which the value at a
+            location came, if any.
+
+    Returns:
+        The validated configuration for both development and publication.
+    """
+    try:
+        config = _CombinedConfig.model_validate(raw_config)
+    except pydantic.ValidationError as exc:
+        _handle_validation_error(exc, locate)
+
+    _warn_pathological_regexes(config)
+    return config
+
+
+def _load_layered_config(source: ConfigSource) -> tuple[Hashable, dict[str, Toml]]:
+    """Obtains the raw configuration with any included fragments layered beneath.
+
+    Args:
+        source: Where to read the configuration from.
+
+    Returns:
+        A tuple containing:
+        * The version of the included fragments, which together with the
+          source's fingerprint identifies the layered configuration.
+        * The layered configuration, cached until either the configuration or
+          any of the fragments it includes change.
+    """
+    fragments = fragment_sources(source.load(), source.base_path)
+    version = tuple(fragment.fingerprint() for fragment in fragments)
+    layered = source.memoize(
+        "layered",
+        lambda raw_config: layer_fragments(raw_config, fragments),
+        version=version,
+    )
+    return version, layered
+
+
+def _load_combined_config(source: ConfigSource) -> _CombinedConfig:
+    """Obtains the validated configuration, with any included fragments.
+
+    Args:
+        source: Where to read the configuration from.
+
+    Returns:
+        The validated configuration, cached until either the configuration or
+        any of the fragments it includes change.
+    """
+    version, layered = _load_layered_config(source)
+    fragments = fragment_sources(source.load(), source.base_path)
+    return source.memoize(
+        "config",
+        lambda raw_config: _validate_combined_config(
+            layered,
+            lambda location: fragment_path(location, layered, raw_config, fragments),
+        ),
+        version=version,
+    )
+
+
 def config(
-    config_type: _DeploymentType | Literal["DEV", "PUBLISH"] = _DeploymentType.DEV,
+    config_type: _DeploymentType
+    | Literal["DEV", "PREVIEW", "PUBLISH"] = _DeploymentType.DEV,
     /,
     *,
     start_path: Path | str = ".",
+    source: ConfigSource | None = None,
+    only: str | None = None,
 ) -> PelicanConfig:
     """Loads the configuration into a single reusable structure.
 
+    The configuration is validated once for each version of its source, so
+    repeated calls are cheap. Unless `namespace_cache` is disabled in `[meta]`,
+    the cache path is a subdirectory specific to the configuration type and
+    settings, and the subdirectories of the configuration type for other
+    settings are removed. If `jinja_bytecode_cache` is enabled in `[meta]`, compiled
+    templates are stored in the `jinja` subdirectory of the cache path itself,
+    so that both configuration types share them. Likewise, if `highlight_cache`
+    is enabled, highlighted code is stored in its `highlight` subdirectory.
+
+    PREVIEW uses the `[pelican]` section, without the feeds and listings of
+    content which are not needed to preview the content itself, and with
+    drafts rendered where they will be published.
+
     Args:
-        config_type: Either DEV or PUBLISH.
+        config_type: Either DEV, PREVIEW or PUBLISH.
         start_path: The path at which to start searching for `pyproject.toml`.
+            Ignored if a source is provided.
+        source: Where to read the configuration from. Defaults to the
+            configuration file found from `start_path`.
+        only: When previewing, a glob relative to the content directory, such
+            that only the articles and pages matching it are read.
 
     Returns:
         An instance of the configuration in the appropriate structure.
+
+    Raises:
+        TurbopelicanError: The configuration type is not recognised, or the
+            content is restricted other than when previewing.
     """
-    raw_config = find_config(start_path)
-    try:
-        config = _CombinedConfig.model_validate(raw_config)
-    except pydantic.ValidationError as exc:
-        _handle_validation_error(exc)
+    if source is None:
+        source = shared_file_source(start_path)
+    config = _load_combined_config(source)
 
     if config_type in {_DeploymentType.DEV, "DEV"}:
-        return config.pelican
+        section_config = config.pelican.model_copy(deep=True)
+    elif config_type in {_DeploymentType.PREVIEW, "PREVIEW"}:
+        section_config = config.pelican.model_copy(deep=True)
+        section_config.preview()
+    elif config_type in {_DeploymentType.PUBLISH, "PUBLISH"}:
+        section_config = config.publish.model_copy(deep=True)
+    else:
+        raise TurbopelicanError(
+            f"Incorrect config_type: {config_type}. Must be DEV, PREVIEW or PUBLISH."
+        )
+    if only is not None and config_type not in {_DeploymentType.PREVIEW, "PREVIEW"}:
+        raise TurbopelicanError("Content can only be restricted when previewing.")
+
+    if config.meta.jinja_bytecode_cache:
+        section_config.cache_jinja_bytecode(
+            source.base_path / section_config.cache_path / "jinja"
+        )
+    # Highlighted code is keyed by the options which affect it, so that every
+    # profile shares it, and it does not affect the name of the namespace.
+    highlight_path = source.base_path / section_config.cache_path / "highlight"
+    if config.meta.namespace_cache:
+        section_config.namespace_cache_path(config_type)
+        _remove_stale_namespaces(source.base_path / section_config.cache_path)
+    section_config.cache_highlighted_code(
+        highlight_path, enable=config.meta.highlight_cache
+    )
+    if only is not None:
+        section_config.restrict_content(only, source.base_path / section_config.path)
+    section_config.expand_extra_path_metadata(source.base_path / section_config.path)
+    return section_config
 
-    if config_type in {_DeploymentType.PUBLISH, "PUBLISH"}:
-        return config.publish
 
-    raise TurbopelicanError(
-        f"Incorrect config_type: {config_type}. Must be DEV or PUBLISH."
-    )
+def config_many(
+    start_paths: Iterable[Path | str],
+    config_type: _DeploymentType
+    | Literal["DEV", "PREVIEW", "PUBLISH"] = _DeploymentType.DEV,
+    /,
+) -> list[PelicanConfig]:
+    """Loads the configuration of several sites at once.
+
+    Any fragments which the sites include are parsed and validated only once.
+
+    Args:
+        start_paths: For each site, the path at which to start searching for
+            `pyproject.toml`.
+        config_type: Either DEV, PREVIEW or PUBLISH.
+
+    Returns:
+        The configuration of each site, in the same order as the paths.
+    """
+    return [config(config_type, start_path=path) for path in start_paths]
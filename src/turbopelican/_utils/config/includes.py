@@ -0,0 +1,250 @@
+"""This module allows shared configuration fragments to be included by sites.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "fragment_path",
+    "fragment_sources",
+    "layer_fragments",
+]
+
+import tomllib
+from typing import TYPE_CHECKING
+
+import pydantic
+
+from turbopelican._utils.config.sources import ConfigSource
+from turbopelican._utils.errors.errors import TurbopelicanError
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
+    from pathlib import Path
+
+    from turbopelican._utils.shared import Toml
+
+
+class _Fragment(pydantic.BaseModel, extra="forbid"):
+    """A shared fragment of configuration."""
+
+    meta: dict = pydantic.Field(default_factory=dict)
+    pelican: dict = pydantic.Field(default_factory=dict)
+    publish: dict = pydantic.Field(default_factory=dict)
+
+
+class _FragmentSource(ConfigSource):
+    """Reads a shared fragment of configuration from a TOML file."""
+
+    def __init__(self, path: Path) -> None:
+        """Creates the source.
+
+        Args:
+            path: The resolved path to the fragment.
+        """
+        super().__init__()
+        self.path = path
+
+    def fingerprint(self) -> Hashable:
+        """Identifies the fragment along with its last modification.
+
+        Returns:
+            The modification time and size of the fragment.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            raise TurbopelicanError(
+                f"Could not find included file: {self.path}"
+            ) from None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read(self) -> dict[str, Toml]:
+        """Parses and validates the fragment, bypassing the cache.
+
+        Returns:
+            The raw fragment.
+        """
+        with self.path.open("rb") as fragment_file:
+            contents = tomllib.load(fragment_file)
+        try:
+            fragment = _Fragment.model_validate(contents)
+        except pydantic.ValidationError as exc:
+            first_error = exc.errors()[0]
+            address = ".".join(map(str, first_error["loc"]))
+            raise TurbopelicanError(
+                f"Unexpected configuration in {self.path} at: {address}: "
+                f"{first_error['msg']!r}."
+            ) from None
+        if "include" in fragment.meta:
+            raise TurbopelicanError(
+                f"Included file cannot include other files: {self.path}"
+            )
+        return contents
+
+
+_fragment_source_cache: dict[Path, _FragmentSource] = {}
+
+
+def fragment_sources(
+    raw_config: dict[str, Toml], base_path: Path
+) -> list[_FragmentSource]:
+    """Obtains the sources of the fragments included by a configuration.
+
+    Every fragment has a single source throughout the process, so that it is
+    parsed and validated only once no matter how many sites include it.
+
+    Args:
+        raw_config: The configuration, which may list fragments in `meta.include`.
+        base_path: The directory against which to resolve relative paths.
+
+    Returns:
+        The sources in the order they are included.
+    """
+    meta = raw_config.get("meta")
+    if not isinstance(meta, dict):
+        return []
+    include = meta.get("include")
+    if not isinstance(include, list):
+        return []
+
+    sources = []
+    for fragment in include:
+        if not isinstance(fragment, str):
+            continue
+        path = (base_path / fragment).resolve()
+        if path not in _fragment_source_cache:
+            _fragment_source_cache[path] = _FragmentSource(path)
+        sources.append(_fragment_source_cache[path])
+    return sources
+
+
+def _origin(metadata: Toml) -> tuple[str, str] | None:
+    """Obtains the origin of an item of extra path metadata.
+
+    Args:
+        metadata: The item of extra path metadata.
+
+    Returns:
+        The key identifying the origin, which is one of `origin`,
+        `origin_glob` or `origin_regex`, along with its value. None if the item
+        does not have an origin.
+    """
+    if isinstance(metadata, dict):
+        for key in ("origin", "origin_glob", "origin_regex"):
+            origin = metadata.get(key)
+            if isinstance(origin, str):
+                return key, origin
+    return None
+
+
+def _layer(base: dict[str, Toml], override: dict[str, Toml]) -> dict[str, Toml]:
+    """Layers one configuration over another.
+
+    Tables are merged recursively and other values are replaced, except for
+    `extra_path_metadata`, where the items of both are kept unless the
+    overriding configuration has an item with the same origin.
+
+    Args:
+        base: The configuration beneath.
+        override: The configuration which takes precedence.
+
+    Returns:
+        The combined configuration.
+    """
+    layered = dict(base)
+    for key, value in override.items():
+        beneath = layered.get(key)
+        if isinstance(beneath, dict) and isinstance(value, dict):
+            layered[key] = _layer(beneath, value)
+        elif (
+            key == "extra_path_metadata"
+            and isinstance(beneath, list)
+            and isinstance(value, list)
+        ):
+            overridden = {_origin(metadata) for metadata in value}
+            kept = [item for item in beneath if _origin(item) not in overridden]
+            layered[key] = kept + value
+        else:
+            layered[key] = value
+    return layered
+
+
+def layer_fragments(
+    raw_config: dict[str, Toml], sources: list[_FragmentSource]
+) -> dict[str, Toml]:
+    """Layers the included fragments beneath the configuration.
+
+    Later fragments take precedence over earlier fragments, and the
+    configuration itself takes precedence over all of them.
+
+    Args:
+        raw_config: The configuration which includes the fragments.
+        sources: The sources of the included fragments.
+
+    Returns:
+        The complete configuration.
+    """
+    layered: dict[str, Toml] = {}
+    for source in sources:
+        layered = _layer(layered, source.load())
+    return _layer(layered, raw_config)
+
+
+def fragment_path(
+    location: Sequence[str | int],
+    layered: dict[str, Toml],
+    raw_config: dict[str, Toml],
+    sources: list[_FragmentSource],
+) -> Path | None:
+    """Finds the included fragment from which a value of the configuration came.
+
+    Settings missing from `publish` are looked up in `pelican`, since they
+    fall back to those.
+
+    Args:
+        location: The keys and indices leading to the value, as reported by a
+            validation error.
+        layered: The complete configuration, as layered by `layer_fragments`.
+        raw_config: The configuration which includes the fragments.
+        sources: The sources of the included fragments.
+
+    Returns:
+        The path to the fragment, or None if the value came from the
+        configuration itself.
+    """
+    publish = layered.get("publish")
+    if (
+        len(location) > 1
+        and location[0] == "publish"
+        and not (isinstance(publish, dict) and location[1] in publish)
+    ):
+        location = ("pelican", *location[1:])
+
+    layers: list[tuple[Path | None, Toml]] = [
+        *((source.path, source.load()) for source in sources),
+        (None, raw_config),
+    ]
+    node: Toml = layered
+    for key in location:
+        if isinstance(node, dict) and isinstance(key, str) and key in node:
+            node = node[key]
+            layers = [
+                (path, layer[key])
+                for path, layer in layers
+                if isinstance(layer, dict) and key in layer
+            ]
+        elif isinstance(node, list) and isinstance(key, int) and key < len(node):
+            # Lists such as `extra_path_metadata` keep the items of every layer.
+            node = node[key]
+            layers = [
+                (path, item)
+                for path, layer in layers
+                if isinstance(layer, list)
+                for item in layer
+                if item is node
+            ]
+        else:
+            break
+    return layers[-1][0] if layers else None
@@ -0,0 +1,95 @@
+"""This module caches the bytecode of compiled Jinja templates between builds.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "TemplateBytecodeCache",
+]
+
+import contextlib
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+from turbopelican._utils.shared.fingerprint import fingerprint
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+_COMPILER_OPTIONS = (
+    "block_start_string",
+    "block_end_string",
+    "variable_start_string",
+    "variable_end_string",
+    "comment_start_string",
+    "comment_end_string",
+    "line_statement_prefix",
+    "line_comment_prefix",
+    "trim_blocks",
+    "lstrip_blocks",
+    "newline_sequence",
+    "keep_trailing_newline",
+    "optimized",
+    "autoescape",
+    "finalize",
+    "is_async",
+)
+"""The options of an environment which change how templates are compiled."""
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Stores compiled templates in a directory, keyed by their source.
+
+    Unlike Jinja's own cache, the key does not depend on where the template
+    was loaded from, but does depend on the options of the environment, so
+    that the cache can be shared between builds with different settings.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        """Creates the cache.
+
+        Args:
+            directory: The directory in which compiled templates are stored.
+                It is created when the first template is stored.
+        """
+        super().__init__(str(directory), "%s.cache")
+
+    def get_bucket(
+        self,
+        environment: Environment,
+        name: str,
+        filename: str | None,
+        source: str,
+    ) -> Bucket:
+        """Loads the compiled template for some source, if it has been stored.
+
+        Args:
+            environment: The environment compiling the template.
+            name: The name of the template.
+            filename: The path to the template, which is ignored.
+            source: The source of the template.
+
+        Returns:
+            The bucket, containing the compiled template if found.
+        """
+        del filename
+        checksum = self.get_source_checksum(source)
+        options = {option: getattr(environment, option) for option in _COMPILER_OPTIONS}
+        key = fingerprint([name, checksum, options, sorted(environment.extensions)])
+        bucket = Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """Stores a compiled template, if possible.
+
+        Args:
+            bucket: The bucket containing the compiled template.
+        """
+        with contextlib.suppress(OSError):
+            Path(self.directory).mkdir(parents=True, exist_ok=True)
+            super().dump_bytecode(bucket)
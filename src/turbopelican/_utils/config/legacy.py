@@ -12,16 +12,27 @@ __all__ = [
     "load_config",
 ]
 
+import dataclasses
 import warnings
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Protocol, TypeVar
+from typing import TYPE_CHECKING, TypeVar
 
+import pydantic
+
+from turbopelican._utils.config.config import (
+    _handle_validation_error,
+    _load_combined_config,
+    _load_layered_config,
+)
+from turbopelican._utils.config.sources import shared_file_source
 from turbopelican._utils.errors.errors import TurbopelicanError
-from turbopelican._utils.shared import Toml, find_config
+from turbopelican._utils.shared import Toml
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from turbopelican._utils.config.config import PelicanConfig, _CombinedConfig
+
 T = TypeVar("T", bound=Toml)
 
 
@@ -101,174 +112,162 @@ def _access_setting_cluster(
     return section
 
 
-def _access_setting(expect_type: type[T], config: dict[str, Toml], *keys: str) -> T:
-    """Extracts the setting from the settings with the expected type checked.
+def _access_setting(
+    expect_type: type[T],
+    section: dict[str, Toml],
+    validated: PelicanConfig,
+    key: str,
+) -> T:
+    """Extracts a validated setting which was explicitly configured.
 
     Deprecated.
 
     Args:
         expect_type: The type of the value to be returned.
-        config: The configuration to be introspected.
-        keys: The combination of keys to be used to divide the configuration.
+        section: The raw section of the configuration containing the setting.
+        validated: The validated configuration for the same section.
+        key: The name of the setting.
 
     Returns:
-        The value in the configuration matching the provided keys.
-    """
-    subset = config
-
-    for key in keys[:-1]:
-        if key not in subset:
-            raise TurbopelicanError(f"Could not find key: {'.'.join(keys)}")
-        value = subset[key]
-        if not isinstance(value, dict):
-            raise TurbopelicanError(f"Could not find key: {'.'.join(keys)}")
-        subset = value
-
-    final_key = keys[-1]
-    if final_key not in subset:
-        raise TurbopelicanError(f"Could not find key: {'.'.join(keys)}")
-
-    section = subset[final_key]
-    if not isinstance(section, expect_type):
-        raise TurbopelicanError(
-            f"Incorrect type {type(section)} for key: {'.'.join(keys)}"
-        )
-    return section
-
-
-class SettingGetter(Protocol):
-    """A generic function for getting configuration.
-
-    Deprecated.
+        The validated value of the setting.
     """
+    if key not in section:
+        raise TurbopelicanError(f"Could not find key: {key}")
 
-    def __call__(self, expect_type: type[T], *keys: str) -> T: ...
+    value = getattr(validated, key)
+    if not isinstance(value, expect_type):
+        raise TurbopelicanError(f"Incorrect type {type(value)} for key: {key}")
+    return value
 
 
-class SettingGetterWithFallback(Protocol):
-    """A generic function for getting configuration, or failing that, None.
-
-    Deprecated.
-    """
-
-    def __call__(self, expect_type: type[T], *keys: str) -> T | None: ...
-
-
-def _setting_getter(
-    config: dict[str, Toml], section_key: str
-) -> tuple[SettingGetter, SettingGetterWithFallback]:
-    """Creates and returns two functions for obtaining settings.
+def _build_configuration(
+    raw_config: dict[str, Toml], combined: _CombinedConfig
+) -> Configuration:
+    """Adapts the validated configuration into the deprecated structures.
 
     Deprecated.
 
     Args:
-        config: The configuration to be introspected.
-        section_key: The key for the configuration subsection.
+        raw_config: The raw configuration, used to check which settings were
+            explicitly configured.
+        combined: The validated configuration.
 
     Returns:
-        A tuple containing:
-        * A function for getting configuration normally.
-        * A function for getting confiugration, or failing that, returning
-          None.
+        The configuration in the deprecated structures.
     """
-    section = _access_setting_cluster(config, section_key)
+    pelican_section = _access_setting_cluster(raw_config, "pelican")
+    publish_section = _access_setting_cluster(raw_config, "publish")
+    pelican = combined.pelican
+    publish = combined.publish
 
-    def _access_setting_as(expect_type: type[T], *keys: str) -> T:
-        """Returns the expected setting.
+    def pelican_get(expect_type: type[T], key: str) -> T:
+        """Returns the expected setting from the `pelican` section.
 
         Args:
             expect_type: The type of the value to be returned.
-            keys: The combination of keys to be used to divide the configuration.
+            key: The name of the setting.
 
         Returns:
-            The value from the settings.
+            The validated value of the setting.
         """
-        return _access_setting(expect_type, section, *keys)
+        return _access_setting(expect_type, pelican_section, pelican, key)
 
-    def _access_setting_as_with_fallback(expect_type: type[T], *keys: str) -> T | None:
-        """Returns the expected setting, or failing that, returns None.
+    def publish_get(expect_type: type[T], key: str) -> T:
+        """Returns the expected setting from the `publish` section.
 
         Args:
             expect_type: The type of the value to be returned.
-            keys: The combination of keys to be used to divide the configuration.
+            key: The name of the setting.
 
         Returns:
-            The value from the settings or if the configuration does not
-            exist, None.
+            The validated value of the setting.
         """
-        try:
-            return _access_setting(expect_type, section, *keys)
-        except TurbopelicanError:
-            return None
+        return _access_setting(expect_type, publish_section, publish, key)
 
-    return _access_setting_as, _access_setting_as_with_fallback
+    return Configuration(
+        pelican=PelicanConfiguration(
+            author=pelican_get(str, "author"),
+            sitename=pelican_get(str, "sitename"),
+            timezone=pelican_get(str, "timezone"),
+            default_lang=pelican_get(str, "default_lang"),
+            path=pelican_get(str, "path"),
+            links=pelican.links,
+            social=pelican.social,
+            default_pagination=pelican_get(bool, "default_pagination"),
+            theme=pelican_get(str, "theme"),
+            article_paths=pelican_get(list, "article_paths"),
+            page_paths=pelican_get(list, "page_paths"),
+            page_save_as=pelican_get(str, "page_save_as"),
+            static_paths=pelican_get(list, "static_paths"),
+            extra_path_metadata=pelican_get(dict, "extra_path_metadata"),
+            index_save_as=pelican_get(str, "index_save_as"),
+        ),
+        publish=PublishConfiguration(
+            site_url=publish_get(str, "site_url"),
+            relative_urls=publish_get(bool, "relative_urls"),
+            feed_all_atom=publish_get(str, "feed_all_atom"),
+            category_feed_atom=publish_get(str, "category_feed_atom"),
+            delete_output_directory=publish_get(bool, "delete_output_directory"),
+        ),
+    )
 
 
-def _get_extract_path_metadata(getter: SettingGetter) -> dict[str, dict[str, str]]:
-    """Converts the path metadata into a form acceptable for Pelican.
+def _detach(configuration: Configuration) -> Configuration:
+    """Copies the mutable settings of a cached configuration.
 
     Deprecated.
 
     Args:
-        getter: The function to obtain settings.
+        configuration: The configuration, as cached.
 
     Returns:
-        The EXTRACT_PATH_METADATA setting.
+        The configuration, whose lists and dictionaries may be modified
+        without affecting the cache.
     """
-    return {
-        metadata["origin"]: {
-            key: value for (key, value) in metadata.items() if key != "origin"
-        }
-        for metadata in getter(list, "extra_path_metadata")
-    }
+    pelican = configuration.pelican
+    return dataclasses.replace(
+        configuration,
+        pelican=dataclasses.replace(
+            pelican,
+            article_paths=list(pelican.article_paths),
+            page_paths=list(pelican.page_paths),
+            static_paths=list(pelican.static_paths),
+            extra_path_metadata={
+                origin: dict(metadata)
+                for origin, metadata in pelican.extra_path_metadata.items()
+            },
+        ),
+    )
 
 
 def load_config(start_path: Path | str = ".") -> Configuration:
     """Loads the configuration into reusable structures.
 
-    Deprecated.
+    Deprecated. The configuration is read and validated by the same engine as
+    `turbopelican.config`, and cached in the same way.
 
     Args:
         start_path: The path at which to start searching for `pyproject.toml`.
 
     Returns:
         An instance of the configuration in the appropriate structure.
+
+    Raises:
+        TurbopelicanError: The configuration is incorrectly formed.
     """
     warnings.warn(
         "Use `turbopelican.config` instead of `turbopelican.load_config`.",
         DeprecationWarning,
         stacklevel=2,
     )
-    config = find_config(start_path)
-    pelican_conf_get, pelican_conf_get_fallback = _setting_getter(config, "pelican")
-    publish_conf_get, _publish_conf_get_fallback = _setting_getter(config, "publish")
-
-    pelican_links = tuple(map(tuple, pelican_conf_get_fallback(list, "links") or []))
-    pelican_social = tuple(map(tuple, pelican_conf_get_fallback(list, "social") or []))
-
-    return Configuration(
-        pelican=PelicanConfiguration(
-            author=pelican_conf_get(str, "author"),
-            sitename=pelican_conf_get(str, "sitename"),
-            timezone=pelican_conf_get(str, "timezone"),
-            default_lang=pelican_conf_get(str, "default_lang"),
-            path=pelican_conf_get(str, "path"),
-            links=pelican_links,
-            social=pelican_social,
-            default_pagination=pelican_conf_get(bool, "default_pagination"),
-            theme=pelican_conf_get(str, "theme"),
-            article_paths=pelican_conf_get(list, "article_paths"),
-            page_paths=pelican_conf_get(list, "page_paths"),
-            page_save_as=pelican_conf_get(str, "page_save_as"),
-            static_paths=pelican_conf_get(list, "static_paths"),
-            extra_path_metadata=_get_extract_path_metadata(pelican_conf_get),
-            index_save_as=pelican_conf_get(str, "index_save_as"),
-        ),
-        publish=PublishConfiguration(
-            site_url=publish_conf_get(str, "site_url"),
-            relative_urls=publish_conf_get(bool, "relative_urls"),
-            feed_all_atom=publish_conf_get(str, "feed_all_atom"),
-            category_feed_atom=publish_conf_get(str, "category_feed_atom"),
-            delete_output_directory=publish_conf_get(bool, "delete_output_directory"),
-        ),
-    )
+    source = shared_file_source(start_path)
+    version, layered = _load_layered_config(source)
+    try:
+        configuration = source.memoize(
+            "legacy",
+            lambda _: _build_configuration(layered, _load_combined_config(source)),
+            version=version,
+        )
+    except pydantic.ValidationError as exc:
+        _handle_validation_error(exc)
+    return _detach(configuration)
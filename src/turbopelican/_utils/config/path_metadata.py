@@ -0,0 +1,376 @@
+"""This module allows extra path metadata to be configured for patterns of paths.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "PathMetadataMatcher",
+    "compile_path_metadata_patterns",
+    "is_pattern_entry",
+    "match_content",
+]
+
+import os
+import posixpath
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from turbopelican._utils.config.regex import compile_regex
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from pathlib import Path
+
+_PATTERN_KEYS = ("origin_glob", "origin_regex")
+"""The keys which can be used instead of `origin` to match several paths."""
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+"""A placeholder in the metadata of a pattern.
+
+Only the components of the matched path and the named groups of the pattern
+are substituted, so that other braces, such as those of Pelican's own `{slug}`
+placeholders, are left for Pelican.
+"""
+
+_listings: dict[Path, tuple[int, tuple[str, ...], tuple[str, ...]]] = {}
+"""For each directory walked, its modification time, files and subdirectories."""
+
+_expansions: dict[tuple[PathMetadataMatcher, Path], tuple[Hashable, dict]] = {}
+"""For each matcher and content directory, the latest expansion of the patterns.
+
+Each expansion is stored with the fingerprint of the tree it was made from, so
+that it is reused until a file is added to or removed from the tree.
+"""
+
+
+def is_pattern_entry(metadata: object) -> bool:
+    """Checks whether an item of extra path metadata matches a pattern of paths.
+
+    Args:
+        metadata: The item of extra path metadata.
+
+    Returns:
+        Whether the item has either `origin_glob` or `origin_regex`.
+    """
+    return isinstance(metadata, dict) and any(key in metadata for key in _PATTERN_KEYS)
+
+
+def _translate_glob(glob: str) -> str:
+    """Translates a glob into a regular expression matching whole paths.
+
+    A `*` matches within a single directory, while `**` matches across any
+    number of directories.
+
+    Args:
+        glob: The glob, relative to the content directory.
+
+    Returns:
+        The equivalent regular expression.
+    """
+    translated = []
+    index = 0
+    while index < len(glob):
+        if glob.startswith("**/", index):
+            translated.append("(?:.*/)?")
+            index += 3
+        elif glob.startswith("**", index):
+            translated.append(".*")
+            index += 2
+        elif glob[index] == "*":
+            translated.append("[^/]*")
+            index += 1
+        elif glob[index] == "?":
+            translated.append("[^/]")
+            index += 1
+        elif glob[index] == "[" and "]" in glob[index + 2 :]:
+            end = glob.index("]", index + 2)
+            contents = glob[index + 1 : end]
+            if contents.startswith("!"):
+                contents = "^" + contents[1:]
+            contents = contents.replace("\\", "\\\\")
+            translated.append(f"[{contents}]")
+            index = end + 1
+        else:
+            translated.append(re.escape(glob[index]))
+            index += 1
+    return "".join(translated)
+
+
+def _glob_suffix(glob: str) -> str | None:
+    """Obtains the file extension which every path matched by a glob must have.
+
+    Args:
+        glob: The glob, relative to the content directory.
+
+    Returns:
+        The extension, or None if the glob does not require a single extension.
+    """
+    suffix = posixpath.splitext(glob)[1]
+    if not suffix or any(char in suffix for char in "*?["):
+        return None
+    return suffix
+
+
+@dataclass(frozen=True)
+class _OriginPattern:
+    """A pattern of paths which share extra path metadata."""
+
+    origin: str
+    regex: re.Pattern[str]
+    metadata: dict[str, str] = field(hash=False)
+
+    def apply(self, relative_path: str) -> dict[str, str] | None:
+        """Obtains the metadata for a path, if the path matches the pattern.
+
+        Args:
+            relative_path: The POSIX path, relative to the content directory.
+
+        Returns:
+            The metadata with placeholders filled, or None if there is no match.
+        """
+        match = self.regex.fullmatch(relative_path)
+        if match is None:
+            return None
+        parent, name = posixpath.split(relative_path)
+        stem, suffix = posixpath.splitext(name)
+        values = {
+            "origin": relative_path,
+            "name": name,
+            "stem": stem,
+            "suffix": suffix,
+            "parent": parent or ".",
+            **{key: value or "" for key, value in match.groupdict().items()},
+        }
+        return {
+            key: _PLACEHOLDER.sub(
+                lambda placeholder: values.get(
+                    placeholder.group(1), placeholder.group()
+                ),
+                value,
+            )
+            for key, value in self.metadata.items()
+        }
+
+
+@dataclass(frozen=True)
+class PathMetadataMatcher:
+    """Matches paths against every pattern of extra path metadata at once.
+
+    Patterns are indexed by the file extension they require, so that a path is
+    only tested against the patterns which could match it. Where several
+    patterns match, the one configured first takes precedence.
+    """
+
+    patterns: tuple[_OriginPattern, ...] = ()
+    by_suffix: dict[str, tuple[int, ...]] = field(default_factory=dict, hash=False)
+    unindexed: tuple[int, ...] = ()
+
+    def __bool__(self) -> bool:
+        """Checks whether there are any patterns to match against.
+
+        Returns:
+            True if there are any patterns.
+        """
+        return bool(self.patterns)
+
+    def match(self, relative_path: str) -> dict[str, str] | None:
+        """Obtains the metadata of the first pattern matching a path.
+
+        Args:
+            relative_path: The POSIX path, relative to the content directory.
+
+        Returns:
+            The metadata, or None if no pattern matches.
+        """
+        suffix = posixpath.splitext(relative_path)[1]
+        for index in self.by_suffix.get(suffix, self.unindexed):
+            metadata = self.patterns[index].apply(relative_path)
+            if metadata is not None:
+                return metadata
+        return None
+
+    def expand(
+        self,
+        content_path: Path,
+        exact: dict[str, dict[str, str]],
+    ) -> dict[str, dict[str, str]]:
+        """Expands the patterns against every file in the content directory.
+
+        The expansion is cached until a file is added to or removed from the
+        content directory, so that repeatedly loading the configuration only
+        checks the modification time of each directory.
+
+        Args:
+            content_path: The content directory.
+            exact: The metadata configured with exact origins, which takes
+                precedence over any pattern.
+
+        Returns:
+            The extra path metadata in the form expected by Pelican.
+        """
+        relative_paths, tree = _walk(content_path)
+        cached = _expansions.get((self, content_path))
+        if cached is not None and cached[0] == tree:
+            expanded = cached[1]
+        else:
+            expanded = {}
+            for relative_path in relative_paths:
+                metadata = self.match(relative_path)
+                if metadata is not None:
+                    expanded[relative_path] = metadata
+            _expansions[self, content_path] = (tree, expanded)
+        return {
+            **{
+                relative_path: dict(metadata)
+                for relative_path, metadata in expanded.items()
+                if relative_path not in exact
+            },
+            **exact,
+        }
+
+
+def _list_directory(directory: Path) -> tuple[int, tuple[str, ...], tuple[str, ...]]:
+    """Lists the files and subdirectories of a directory.
+
+    The listing is cached until the directory is modified. Symbolic links to
+    directories are neither followed nor listed, so that a link to one of its
+    ancestors cannot make a walk endless.
+
+    Args:
+        directory: The directory to be listed.
+
+    Returns:
+        The modification time of the directory, the names of its files and the
+        names of its subdirectories.
+
+    Raises:
+        FileNotFoundError: The directory does not exist.
+    """
+    modified = directory.stat().st_mtime_ns
+    cached = _listings.get(directory)
+    if cached is not None and cached[0] == modified:
+        return cached
+    files = []
+    subdirectories = []
+    for entry in os.scandir(directory):
+        if not entry.is_dir():
+            files.append(entry.name)
+        elif not entry.is_symlink():
+            subdirectories.append(entry.name)
+    listing = (modified, tuple(files), tuple(subdirectories))
+    _listings[directory] = listing
+    return listing
+
+
+def _walk(directory: Path) -> tuple[list[str], Hashable]:
+    """Lists every file beneath a directory.
+
+    Args:
+        directory: The directory to be walked.
+
+    Returns:
+        A tuple containing:
+        * The POSIX path of each file, relative to the directory.
+        * A fingerprint of the tree, which changes whenever a file or
+          directory is added to or removed from it.
+    """
+    relative_paths = []
+    tree = []
+    pending = [(directory, "")]
+    while pending:
+        path, prefix = pending.pop()
+        try:
+            modified, files, subdirectories = _list_directory(path)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        tree.append((prefix, modified))
+        relative_paths.extend(f"{prefix}{name}" for name in files)
+        pending.extend(
+            (path / name, f"{prefix}{name}/") for name in reversed(subdirectories)
+        )
+    return relative_paths, tuple(tree)
+
+
+def match_content(content_path: Path, glob: str) -> list[str]:
+    """Lists the files in the content directory matching a glob.
+
+    Args:
+        content_path: The directory containing the content.
+        glob: The glob, relative to the content directory.
+
+    Returns:
+        The POSIX path of each matching file, relative to the content directory.
+    """
+    pattern = re.compile(_translate_glob(glob.strip("/")))
+    relative_paths, _tree = _walk(content_path)
+    return sorted(path for path in relative_paths if pattern.fullmatch(path))
+
+
+def _compile_pattern(metadata: dict[str, str]) -> _OriginPattern:
+    """Compiles a single item of extra path metadata with a pattern origin.
+
+    Args:
+        metadata: The item of extra path metadata.
+
+    Returns:
+        The compiled pattern.
+
+    Raises:
+        ValueError: The item is incorrectly configured.
+    """
+    keys = [key for key in ("origin", *_PATTERN_KEYS) if key in metadata]
+    if len(keys) != 1:
+        raise ValueError(
+            f"Expected only one of `origin`, `origin_glob` or `origin_regex` in "
+            f"`extra_path_metadata`, got: {', '.join(keys)}"
+        )
+    (key,) = keys
+    origin = metadata[key]
+
+    if key == "origin_glob":
+        regex = compile_regex(_translate_glob(origin))
+    else:
+        regex = compile_regex(origin)
+
+    values = {name: value for name, value in metadata.items() if name != key}
+    return _OriginPattern(origin=origin, regex=regex, metadata=values)
+
+
+def compile_path_metadata_patterns(
+    entries: list[dict[str, str]],
+) -> PathMetadataMatcher:
+    """Compiles the items of extra path metadata which have pattern origins.
+
+    Args:
+        entries: The items of extra path metadata, in order of precedence.
+
+    Returns:
+        A matcher for all of the patterns.
+
+    Raises:
+        ValueError: An item is incorrectly configured.
+    """
+    patterns = tuple(_compile_pattern(metadata) for metadata in entries)
+
+    unindexed = []
+    indexed: dict[str, list[int]] = {}
+    for index, metadata in enumerate(entries):
+        glob = metadata.get("origin_glob")
+        suffix = None if glob is None else _glob_suffix(glob)
+        if suffix is None:
+            unindexed.append(index)
+        else:
+            indexed.setdefault(suffix, []).append(index)
+
+    # Each extension is checked against its own patterns as well as those
+    # which do not require an extension, preserving the order of precedence.
+    by_suffix = {
+        suffix: tuple(sorted([*indices, *unindexed]))
+        for suffix, indices in indexed.items()
+    }
+    return PathMetadataMatcher(
+        patterns=patterns, by_suffix=by_suffix, unindexed=tuple(unindexed)
+    )
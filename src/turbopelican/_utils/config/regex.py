@@ -0,0 +1,90 @@
+"""This module validates the regular expressions used to configure Pelican.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "compile_regex",
+    "find_pathological_input",
+]
+
+import functools
+import re
+import time
+
+_PROBE_PUMPS = ("a", "A", "0", " ", "-", "_", ".", "/", "a ", "a-")
+"""Strings which are repeated to construct inputs which may cause backtracking."""
+
+_PROBE_SUFFIXES = ("!", "\n", "\x00")
+"""Characters which are appended to inputs to prevent them from matching."""
+
+_PROBE_LENGTHS = range(8, 34, 2)
+"""The number of repetitions to try, in increasing order."""
+
+_PROBE_BUDGET = 0.05
+"""The number of seconds after which a single match is considered pathological."""
+
+
+@functools.cache
+def compile_regex(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """Compiles a regular expression, only once per process.
+
+    Args:
+        pattern: The regular expression.
+        flags: The flags with which to compile the regular expression.
+
+    Returns:
+        The compiled regular expression.
+
+    Raises:
+        ValueError: The regular expression is invalid.
+    """
+    try:
+        return re.compile(pattern, flags)
+    except re.error as exc:
+        raise ValueError(f"Invalid regular expression {pattern!r}: {exc}") from None
+
+
+def _probe_inputs(pattern: str) -> list[str]:
+    """Obtains the strings to be repeated when probing a regular expression.
+
+    Args:
+        pattern: The regular expression to be probed.
+
+    Returns:
+        Generic strings, along with any alphanumeric characters in the pattern.
+    """
+    literals = sorted({char for char in pattern if char.isalnum()})
+    return list(dict.fromkeys([*_PROBE_PUMPS, *literals]))
+
+
+@functools.cache
+def find_pathological_input(pattern: str, flags: int = 0) -> tuple[int, float] | None:
+    """Times a regular expression against inputs known to cause backtracking.
+
+    The inputs are short, and grow slowly, so that the probe stops soon after
+    the first input which takes longer than the budget. Because the time taken
+    by catastrophic backtracking grows exponentially, such patterns are caught
+    long before the inputs are long enough to affect other patterns.
+
+    Args:
+        pattern: The regular expression to be probed.
+        flags: The flags with which Pelican compiles the regular expression.
+
+    Returns:
+        If the pattern is pathological, the length of the input and the number
+        of seconds taken to search it. Otherwise, None.
+    """
+    compiled = compile_regex(pattern, flags)
+    for pump in _probe_inputs(pattern):
+        for suffix in _PROBE_SUFFIXES:
+            for length in _PROBE_LENGTHS:
+                text = pump * length + suffix
+                start = time.perf_counter()
+                compiled.search(text)
+                elapsed = time.perf_counter() - start
+                if elapsed > _PROBE_BUDGET:
+                    return len(text), elapsed
+    return None
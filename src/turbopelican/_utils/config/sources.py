@@ -0,0 +1,289 @@
+"""This module allows the turbopelican configuration to be read from anywhere.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "ConfigSource",
+    "FileConfigSource",
+    "MappingConfigSource",
+    "SQLiteConfigSource",
+    "shared_file_source",
+]
+
+import copy
+import hashlib
+import sqlite3
+import tomllib
+from abc import ABC, abstractmethod
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar, cast
+
+from turbopelican._utils.errors.errors import TurbopelicanError
+from turbopelican._utils.shared.shared import _find_config_file, _read_config_file
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Mapping
+
+    from turbopelican._utils.shared import Toml
+
+T = TypeVar("T")
+
+
+class ConfigSource(ABC):
+    """A location from which the turbopelican configuration can be read.
+
+    Every source keeps its own cache. The raw configuration, and anything
+    derived from it with `memoize`, is reused until the fingerprint of the
+    source changes.
+    """
+
+    def __init__(self, base_path: Path | str = ".") -> None:
+        """Creates the source with an empty cache.
+
+        Args:
+            base_path: The directory against which relative paths in the
+                configuration are resolved.
+        """
+        self._base_path = Path(base_path).resolve()
+        self._fingerprint: Hashable | None = None
+        self._contents: dict[str, Toml] | None = None
+        self._derived: dict[Hashable, tuple[Hashable, object]] = {}
+
+    @property
+    def base_path(self) -> Path:
+        """The directory against which relative paths are resolved."""
+        return self._base_path
+
+    @abstractmethod
+    def fingerprint(self) -> Hashable:
+        """Cheaply identifies the current version of the configuration.
+
+        Returns:
+            A value which changes whenever the configuration changes.
+        """
+
+    @abstractmethod
+    def _read(self) -> dict[str, Toml]:
+        """Reads the configuration, bypassing the cache.
+
+        Returns:
+            The raw configuration.
+        """
+
+    def _refresh(self) -> None:
+        """Empties the cache if the configuration has changed since last read."""
+        fingerprint = self.fingerprint()
+        if self._contents is not None and fingerprint == self._fingerprint:
+            return
+        self._contents = self._read()
+        self._fingerprint = fingerprint
+        self._derived = {}
+
+    def load(self) -> dict[str, Toml]:
+        """Obtains the raw configuration, reading it only if it has changed.
+
+        Returns:
+            The raw configuration. It must not be modified by the caller.
+        """
+        self._refresh()
+        if self._contents is None:
+            raise TurbopelicanError("turbopelican has not been configured.")
+        return self._contents
+
+    def memoize(
+        self,
+        name: Hashable,
+        factory: Callable[[dict[str, Toml]], T],
+        *,
+        version: Hashable = None,
+    ) -> T:
+        """Obtains a value derived from the configuration, computing it only once.
+
+        Only the latest version of each value is kept, so that a long-running
+        process does not accumulate a value for every edit of the files it
+        depends on.
+
+        Args:
+            name: The name under which the derived value is cached.
+            factory: Derives the value from the raw configuration.
+            version: Identifies anything else the value is derived from, such
+                as included files. The value is derived again once it changes.
+
+        Returns:
+            The derived value, cached until the configuration or its version
+            changes.
+        """
+        contents = self.load()
+        cached = self._derived.get(name)
+        if cached is None or cached[0] != version:
+            cached = (version, factory(contents))
+            self._derived[name] = cached
+        return cast("T", cached[1])
+
+    def clear_cache(self) -> None:
+        """Forgets the cached configuration, so that it is read again when used."""
+        self._fingerprint = None
+        self._contents = None
+        self._derived = {}
+
+
+class FileConfigSource(ConfigSource):
+    """Reads `turbopelican.toml`, or `[tool.turbopelican]` in `pyproject.toml`."""
+
+    def __init__(self, start_path: Path | str = ".") -> None:
+        """Creates the source.
+
+        Args:
+            start_path: The path at which to start searching for `pyproject.toml`.
+        """
+        super().__init__()
+        self.start_path = Path(start_path).resolve()
+        self._config_file: Path | None = None
+
+    @property
+    def base_path(self) -> Path:
+        """The directory containing the configuration file."""
+        return _find_config_file(self.start_path).parent
+
+    def fingerprint(self) -> Hashable:
+        """Identifies the configuration file along with its last modification.
+
+        Returns:
+            The path, modification time and size of the configuration file.
+        """
+        self._config_file = _find_config_file(self.start_path)
+        stat = self._config_file.stat()
+        return (self._config_file, stat.st_mtime_ns, stat.st_size)
+
+    def _read(self) -> dict[str, Toml]:
+        """Reads the configuration file, bypassing the cache.
+
+        Returns:
+            The raw configuration.
+        """
+        if self._config_file is None:
+            self._config_file = _find_config_file(self.start_path)
+        return _read_config_file(self._config_file)
+
+
+class MappingConfigSource(ConfigSource):
+    """Uses configuration which is already held in memory."""
+
+    def __init__(
+        self, mapping: Mapping[str, Toml], *, base_path: Path | str = "."
+    ) -> None:
+        """Creates the source from a snapshot of the provided mapping.
+
+        Args:
+            mapping: The configuration, structured as it would be in TOML.
+            base_path: The directory against which relative paths in the
+                configuration are resolved.
+        """
+        super().__init__(base_path)
+        self._mapping = copy.deepcopy(dict(mapping))
+
+    def fingerprint(self) -> Hashable:
+        """Identifies the configuration, which never changes once snapshotted.
+
+        Returns:
+            The identity of the snapshot.
+        """
+        return id(self._mapping)
+
+    def _read(self) -> dict[str, Toml]:
+        """Returns the snapshot of the configuration.
+
+        Returns:
+            The raw configuration.
+        """
+        return self._mapping
+
+
+class SQLiteConfigSource(ConfigSource):
+    """Reads the TOML configuration of a single site from a SQLite table.
+
+    The table must have a `site` column identifying each site and a `config`
+    column containing the TOML text, as it would be written in
+    `turbopelican.toml`.
+    """
+
+    def __init__(
+        self,
+        database: Path | str | sqlite3.Connection,
+        site: str,
+        *,
+        table: str = "turbopelican_config",
+        base_path: Path | str = ".",
+    ) -> None:
+        """Creates the source.
+
+        Args:
+            database: Either the path to the database or an open connection.
+            site: The value of the `site` column for the site to be configured.
+            table: The name of the table containing the configuration.
+            base_path: The directory against which relative paths in the
+                configuration are resolved.
+        """
+        super().__init__(base_path)
+        if not table.isidentifier():
+            raise TurbopelicanError(f"Invalid SQLite table name: {table!r}.")
+        self.database = database
+        self.site = site
+        self.table = table
+        self._text: str | None = None
+
+    def _fetch_text(self) -> str:
+        """Queries the database for the site's configuration.
+
+        Returns:
+            The TOML text for the site.
+        """
+        query = f"SELECT config FROM {self.table} WHERE site = ?"  # noqa: S608
+        if isinstance(self.database, sqlite3.Connection):
+            row = self.database.execute(query, (self.site,)).fetchone()
+        else:
+            with closing(sqlite3.connect(self.database)) as connection:
+                row = connection.execute(query, (self.site,)).fetchone()
+        if row is None:
+            raise TurbopelicanError(f"No configuration for site: {self.site!r}.")
+        return row[0]
+
+    def fingerprint(self) -> Hashable:
+        """Identifies the site's configuration by a digest of its text.
+
+        Returns:
+            The SHA-256 digest of the TOML text.
+        """
+        self._text = self._fetch_text()
+        return hashlib.sha256(self._text.encode()).hexdigest()
+
+    def _read(self) -> dict[str, Toml]:
+        """Parses the TOML text most recently fetched from the database.
+
+        Returns:
+            The raw configuration.
+        """
+        text = self._fetch_text() if self._text is None else self._text
+        return tomllib.loads(text)
+
+
+_shared_file_sources: dict[Path, FileConfigSource] = {}
+
+
+def shared_file_source(start_path: Path | str = ".") -> FileConfigSource:
+    """Obtains the file source used for a path throughout the process.
+
+    Args:
+        start_path: The path at which to start searching for `pyproject.toml`.
+
+    Returns:
+        The same source whenever it is called with the same path.
+    """
+    resolved = Path(start_path).resolve()
+    if resolved not in _shared_file_sources:
+        _shared_file_sources[resolved] = FileConfigSource(resolved)
+    return _shared_file_sources[resolved]
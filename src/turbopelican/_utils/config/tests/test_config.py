@@ -8,9 +8,16 @@ from pathlib import Path
 import pydantic
 import pytest
 
-from turbopelican import PelicanConfig, TurbopelicanError, config
+from turbopelican import (
+    MappingConfigSource,
+    PelicanConfig,
+    TurbopelicanError,
+    TurbopelicanWarning,
+    config,
+)
 from turbopelican._utils.config.config import (
     _CombinedConfig,
+    _DeploymentType,
     _handle_validation_error,
     _MetaConfig,
     _ModulePrefixConfig,
@@ -22,12 +29,14 @@ from turbopelican._utils.config.config import (
     _validate_dict_of_functions,
     _validate_dict_of_functions_and_names,
     _validate_dict_of_nullable_functions,
+    _validate_intrasite_link_regex,
     _validate_list_of_regex_substitutions,
     _validate_list_of_strings,
     _validate_locale,
     _validate_log_filter,
     _validate_paginated_templates,
     _validate_pagination_patterns,
+    _validate_regex,
     _validate_string_dict,
     _validate_tuple_of_title_url_pairs,
     _validate_twice_nested_dict,
@@ -100,6 +109,26 @@ def test_pelicanconfig_validate_list_of_regex_substitutions() -> None:
     _validate_list_of_regex_substitutions([("a", "b"), ("c", "d")])
 
 
+def test_pelicanconfig_validate_list_of_regex_substitutions_invalid_regex() -> None:
+    """Tests that regular expression substitutions must be valid."""
+    with pytest.raises(ValueError, match="Invalid regular expression"):
+        _validate_list_of_regex_substitutions([("(a", "b")])
+
+
+def test_pelicanconfig_validate_regex() -> None:
+    """Tests the validator for regular expressions."""
+    with pytest.raises(ValueError, match="Invalid regular expression"):
+        _validate_regex("(?P<date>")
+    _validate_regex("(?P<date>.*)")
+
+
+def test_pelicanconfig_validate_intrasite_link_regex() -> None:
+    """Tests the validator for the intrasite link regular expression."""
+    with pytest.raises(ValueError, match="Expected group named 'what'"):
+        _validate_intrasite_link_regex("[{|](?P<which>.*?)[|}]")
+    _validate_intrasite_link_regex("[{|](?P<what>.*?)[|}]")
+
+
 def test_pelicanconfig_validate_datetime() -> None:
     """Tests the validator for datetimes."""
     with pytest.raises(
@@ -202,6 +231,57 @@ def test_pelicanconfig() -> None:
     assert PelicanConfig.model_validate({}) == PelicanConfig()
 
 
+def test_pelicanconfig_plugins() -> None:
+    """Tests that plugins can be listed by name, as Pelican expects."""
+    plugins = ["turbopelican.plugins.incremental"]
+    assert PelicanConfig.model_validate({"plugins": plugins}).plugins == plugins
+    with pytest.raises(pydantic.ValidationError):
+        PelicanConfig.model_validate({"plugins": [1]})
+
+
+def test_pelicanconfig_regex_patterns() -> None:
+    """Tests that the compiled regular expressions are exposed."""
+    config = PelicanConfig(
+        slug_regex_substitutions=[("[ab]", "-")], filename_metadata="(?P<slug>.*)"
+    )
+    ((pattern, replacement),) = config.slug_regex_patterns
+    assert pattern.sub(replacement, "cAb") == "c--"
+    match = config.filename_metadata_pattern.match("x")
+    assert match is not None
+    assert match.groupdict() == {"slug": "x"}
+    assert "what" in config.intrasite_link_pattern.groupindex
+
+
+def test_pelicanconfig_invalid_regex() -> None:
+    """Tests that invalid regular expressions are reported with their location."""
+    with pytest.raises(TurbopelicanError, match=r"publish\.filename_metadata"):
+        config(
+            "DEV", source=MappingConfigSource({"publish": {"filename_metadata": "("}})
+        )
+
+
+def test_pelicanconfig_pathological_regex() -> None:
+    """Tests that catastrophically backtracking expressions issue a warning."""
+    source = MappingConfigSource(
+        {"pelican": {"slug_regex_substitutions": [["(a+)+$", ""]]}}
+    )
+    with pytest.warns(
+        TurbopelicanWarning, match=r"pelican\.slug_regex_substitutions"
+    ) as record:
+        config("DEV", source=source)
+    assert record[0].filename == __file__
+
+
+def test_pelicanconfig_intrasite_link_regex_case() -> None:
+    """Tests that intrasite links are matched case-sensitively, as by Pelican."""
+    source = MappingConfigSource(
+        {"pelican": {"intrasite_link_regex": r"\{(?P<what>static)\}"}}
+    )
+    pattern = config("DEV", source=source).intrasite_link_pattern
+    assert pattern.fullmatch("{static}")
+    assert not pattern.fullmatch("{STATIC}")
+
+
 def test_pelicanconfig_transform_social() -> None:
     """Tests that social can be transformed for use by Pelican."""
     assert PelicanConfig._transform_social([["a", "b"], ["c", "d"]]) == (
@@ -346,3 +426,144 @@ def test_config(tmp_path: Path) -> None:
     assert publish_config.author == "Fred"
     assert publish_config.sitename == "The site"
     assert publish_config.site_url == "https://mysitename.github.io"
+
+
+def test_config_cache_namespace(tmp_path: Path) -> None:
+    """Tests that each profile and its settings have their own cache.
+
+    The cache of a profile for previous settings is removed.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    (tmp_path / "pyproject.toml").touch()
+    configuration = tmp_path / "turbopelican.toml"
+    configuration.write_text('[publish]\nsite_url = "https://example.com"\n')
+
+    dev_cache = config("DEV", start_path=tmp_path).cache_path
+    publish_cache = config("PUBLISH", start_path=tmp_path).cache_path
+    assert dev_cache.startswith("cache/dev-")
+    assert publish_cache.startswith("cache/publish-")
+
+    configuration.write_text(
+        '[pelican]\ncache_content = true\n\n[publish]\nsite_url = "https://example.com"\n'
+    )
+    assert config("PUBLISH", start_path=tmp_path).cache_path == publish_cache
+    (tmp_path / dev_cache).mkdir(parents=True)
+    (tmp_path / publish_cache).mkdir(parents=True)
+    configuration.write_text('[publish]\nsite_url = "https://example.org"\n')
+    new_publish_cache = config("PUBLISH", start_path=tmp_path).cache_path
+    assert new_publish_cache != publish_cache
+    assert not (tmp_path / publish_cache).exists()
+    assert (tmp_path / dev_cache).is_dir()
+
+    configuration.write_text("[meta]\nnamespace_cache = false\n")
+    assert config("PUBLISH", start_path=tmp_path).cache_path == "cache"
+
+
+def test_config_jinja_bytecode_cache(tmp_path: Path) -> None:
+    """Tests that compiled templates are cached outside each profile's cache.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    (tmp_path / "pyproject.toml").touch()
+    configuration = tmp_path / "turbopelican.toml"
+    configuration.write_text('[publish]\nsite_url = "https://example.com"\n')
+    assert "bytecode_cache" not in config("DEV", start_path=tmp_path).jinja_environment
+
+    configuration.write_text(
+        '[meta]\njinja_bytecode_cache = true\n\n[publish]\nsite_url = "https://example.com"\n'
+    )
+    dev = config("DEV", start_path=tmp_path).jinja_environment["bytecode_cache"]
+    publish = config("PUBLISH", start_path=tmp_path).jinja_environment["bytecode_cache"]
+    directories = {dev.directory, publish.directory}
+    assert directories == {str(tmp_path.resolve() / "cache" / "jinja")}
+
+
+def test_config_highlight_cache(tmp_path: Path) -> None:
+    """Tests that highlighted code is cached in the cache path once enabled.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    extension = "turbopelican.plugins.highlight_cache"
+    source = MappingConfigSource(
+        {"pelican": {"cache_path": "build-cache"}}, base_path=tmp_path
+    )
+    markdown = config("DEV", source=source).markdown
+    assert extension not in markdown["extension_configs"]
+
+    source = MappingConfigSource(
+        {"meta": {"highlight_cache": True}, "pelican": {"cache_path": "build-cache"}},
+        base_path=tmp_path,
+    )
+    expected = {"cache_path": str(tmp_path.resolve() / "build-cache" / "highlight")}
+    for config_type in [_DeploymentType.DEV, _DeploymentType.PUBLISH]:
+        markdown = config(config_type, source=source).markdown
+        assert markdown["extension_configs"][extension] == expected
+
+    source = MappingConfigSource(
+        {
+            "pelican": {
+                "markdown": {
+                    "extension_configs": {extension: {"cache_path": "elsewhere"}}
+                }
+            }
+        }
+    )
+    markdown = config("DEV", source=source).markdown
+    assert markdown["extension_configs"][extension] == {"cache_path": "elsewhere"}
+
+
+def test_config_preview(tmp_path: Path) -> None:
+    """Tests that previews skip feeds and listings, and render drafts in place.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    (tmp_path / "pyproject.toml").touch()
+    (tmp_path / "turbopelican.toml").write_text(
+        '[pelican]\narticle_save_as = "posts/{slug}.html"\n\n'
+        '[publish]\nsite_url = "https://example.com"\n'
+    )
+    dev = config("DEV", start_path=tmp_path)
+    preview = config("PREVIEW", start_path=tmp_path)
+    assert dev.feed_all_atom == "feeds/all.atom.xml"
+    assert preview.feed_all_atom is None
+    assert preview.translation_feed_atom is None
+    assert dev.tags_save_as == "tags.html"
+    assert not preview.tags_save_as
+    assert not preview.category_save_as
+    assert not preview.archives_save_as
+    assert preview.draft_save_as == "posts/{slug}.html"
+    assert preview.draft_page_url == dev.page_url
+    assert preview.cache_path.startswith("cache/preview-")
+
+
+def test_config_preview_only(tmp_path: Path) -> None:
+    """Tests that previews can be restricted to the content matching a glob.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    (tmp_path / "pyproject.toml").touch()
+    (tmp_path / "turbopelican.toml").write_text(
+        '[pelican]\npath = "content"\narticle_paths = ["posts"]\n'
+        'page_paths = ["pages"]\n\n[publish]\nsite_url = "https://example.com"\n'
+    )
+    for path in ["posts/2024/a.md", "posts/2025/b.md", "pages/about.md"]:
+        (tmp_path / "content" / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / "content" / path).touch()
+
+    preview = config("PREVIEW", start_path=tmp_path, only="**/2024/*.md")
+    assert preview.article_paths == ["posts/2024/a.md"]
+    assert preview.page_paths == []
+    preview = config("PREVIEW", start_path=tmp_path, only="pages/*")
+    assert preview.article_paths == []
+    assert preview.page_paths == ["pages/about.md"]
+    unrestricted = config("PREVIEW", start_path=tmp_path)
+    assert preview.cache_path == unrestricted.cache_path
+
+    with pytest.raises(TurbopelicanError, match="only be restricted when previewing"):
+        config("DEV", start_path=tmp_path, only="pages/*")
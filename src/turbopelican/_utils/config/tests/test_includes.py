@@ -0,0 +1,272 @@
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from turbopelican import TurbopelicanError, config_many
+from turbopelican._utils.config.includes import (
+    _FragmentSource,
+    _layer,
+    fragment_path,
+    fragment_sources,
+    layer_fragments,
+)
+from turbopelican._utils.config.sources import shared_file_source
+
+if TYPE_CHECKING:
+    from turbopelican._utils.shared import Toml
+
+
+@pytest.fixture
+def monorepo(tmp_path: Path) -> Path:
+    """Creates a monorepo with two sites sharing a fragment of configuration.
+
+    Args:
+        tmp_path: A temporary directory in which to store the monorepo.
+
+    Returns:
+        The root of the monorepo.
+    """
+    (tmp_path / "shared.toml").write_text(
+        """
+        [pelican]
+        author = "Fred"
+        timezone = "GMT"
+
+        [[pelican.extra_path_metadata]]
+        origin = "static/favicon.ico"
+        path = "favicon.ico"
+        """
+    )
+    for site in ["first", "second"]:
+        (tmp_path / site).mkdir()
+        (tmp_path / site / "pyproject.toml").touch()
+        (tmp_path / site / "turbopelican.toml").write_text(
+            f"""
+            [meta]
+            include = ["../shared.toml"]
+
+            [pelican]
+            sitename = "{site}"
+            """
+        )
+    return tmp_path
+
+
+def test_layer() -> None:
+    """Tests that tables are merged recursively, while other values are replaced."""
+    base: dict[str, Toml] = {"pelican": {"author": "Fred", "links": [["a", "b"]]}}
+    override: dict[str, Toml] = {"pelican": {"links": [["c", "d"]]}, "x": 2}
+    assert _layer(base, override) == {
+        "pelican": {"author": "Fred", "links": [["c", "d"]]},
+        "x": 2,
+    }
+
+
+def test_layer_extra_path_metadata() -> None:
+    """Tests that extra path metadata is only overridden for the same origin."""
+    base: dict[str, Toml] = {
+        "extra_path_metadata": [
+            {"origin": "a", "path": "b"},
+            {"origin": "c", "path": "d"},
+        ]
+    }
+    override: dict[str, Toml] = {"extra_path_metadata": [{"origin": "a", "path": "e"}]}
+    assert _layer(base, override) == {
+        "extra_path_metadata": [
+            {"origin": "c", "path": "d"},
+            {"origin": "a", "path": "e"},
+        ]
+    }
+
+
+def test_layer_extra_path_metadata_patterns() -> None:
+    """Tests that pattern origins are overridden separately from exact origins."""
+    base: dict[str, Toml] = {
+        "extra_path_metadata": [
+            {"origin_glob": "*.png", "path": "a"},
+            {"origin": "*.png", "path": "b"},
+        ]
+    }
+    override: dict[str, Toml] = {
+        "extra_path_metadata": [{"origin_glob": "*.png", "path": "c"}]
+    }
+    assert _layer(base, override) == {
+        "extra_path_metadata": [
+            {"origin": "*.png", "path": "b"},
+            {"origin_glob": "*.png", "path": "c"},
+        ]
+    }
+
+
+def test_fragment_sources_shared(tmp_path: Path) -> None:
+    """Tests that a fragment has the same source wherever it is included from.
+
+    Args:
+        tmp_path: A temporary directory in which to store the fragments.
+    """
+    (tmp_path / "child").mkdir()
+    first = fragment_sources({"meta": {"include": ["a.toml"]}}, tmp_path)
+    second = fragment_sources({"meta": {"include": ["../a.toml"]}}, tmp_path / "child")
+    assert first == second
+    assert first[0].path == tmp_path / "a.toml"
+
+
+def test_fragment_sources_without_include(tmp_path: Path) -> None:
+    """Tests that no fragments are included unless requested.
+
+    Args:
+        tmp_path: A temporary directory in which to store the fragments.
+    """
+    assert fragment_sources({}, tmp_path) == []
+    assert fragment_sources({"meta": {"null_sentinel": -1}}, tmp_path) == []
+
+
+def test_fragment_source_missing(tmp_path: Path) -> None:
+    """Tests that an error is raised if an included fragment is missing.
+
+    Args:
+        tmp_path: A temporary directory in which to store the fragments.
+    """
+    with pytest.raises(TurbopelicanError, match="Could not find included file"):
+        _FragmentSource(tmp_path / "missing.toml").load()
+
+
+def test_fragment_source_invalid(tmp_path: Path) -> None:
+    """Tests that fragments with unexpected sections are rejected.
+
+    Args:
+        tmp_path: A temporary directory in which to store the fragments.
+    """
+    (tmp_path / "invalid.toml").write_text("[pelicn]\nauthor = 'Fred'")
+    with pytest.raises(TurbopelicanError, match="at: pelicn"):
+        _FragmentSource(tmp_path / "invalid.toml").load()
+
+
+def test_fragment_source_nested(tmp_path: Path) -> None:
+    """Tests that fragments cannot include other fragments.
+
+    Args:
+        tmp_path: A temporary directory in which to store the fragments.
+    """
+    (tmp_path / "nested.toml").write_text("[meta]\ninclude = ['other.toml']")
+    with pytest.raises(TurbopelicanError, match="cannot include other files"):
+        _FragmentSource(tmp_path / "nested.toml").load()
+
+
+def test_layer_fragments(tmp_path: Path) -> None:
+    """Tests that later fragments and the configuration take precedence.
+
+    Args:
+        tmp_path: A temporary directory in which to store the fragments.
+    """
+    (tmp_path / "a.toml").write_text("[pelican]\nauthor = 'A'\nsitename = 'A'")
+    (tmp_path / "b.toml").write_text("[pelican]\nauthor = 'B'")
+    raw_config = {"meta": {"include": ["a.toml", "b.toml"]}, "publish": {}}
+    sources = fragment_sources(raw_config, tmp_path)
+    assert layer_fragments(raw_config, sources) == {
+        "meta": {"include": ["a.toml", "b.toml"]},
+        "pelican": {"author": "B", "sitename": "A"},
+        "publish": {},
+    }
+
+
+def test_fragment_path(tmp_path: Path) -> None:
+    """Tests that values are traced back to the fragment which set them.
+
+    Args:
+        tmp_path: A temporary directory in which to store the fragments.
+    """
+    (tmp_path / "a.toml").write_text(
+        "[pelican]\nauthor = 'A'\n\n[[pelican.extra_path_metadata]]\n"
+        "origin = 'a.txt'\npath = 'a.txt'"
+    )
+    (tmp_path / "b.toml").write_text("[pelican]\nsitename = 'B'")
+    raw_config: dict[str, Toml] = {
+        "meta": {"include": ["a.toml", "b.toml"]},
+        "pelican": {
+            "sitename": "Site",
+            "extra_path_metadata": [{"origin": "b.txt", "path": "b.txt"}],
+        },
+    }
+    sources = fragment_sources(raw_config, tmp_path)
+    layered = layer_fragments(raw_config, sources)
+
+    a_path = (tmp_path / "a.toml").resolve()
+    assert fragment_path(("pelican", "author"), layered, raw_config, sources) == a_path
+    assert fragment_path(("publish", "author"), layered, raw_config, sources) == a_path
+    assert fragment_path(("pelican", "sitename"), layered, raw_config, sources) is None
+    metadata = ("pelican", "extra_path_metadata")
+    assert fragment_path((*metadata, 0), layered, raw_config, sources) == a_path
+    assert fragment_path((*metadata, 1), layered, raw_config, sources) is None
+
+
+def test_config_many_fragment_invalid(monorepo: Path) -> None:
+    """Tests that errors in a fragment name the fragment.
+
+    Args:
+        monorepo: The root of a monorepo containing two sites.
+    """
+    (monorepo / "shared.toml").write_text("[pelican]\nlinks = [1]")
+    fragment = re.escape(str(monorepo / "shared.toml"))
+    with pytest.raises(TurbopelicanError, match=f"in {fragment} at: pelican.links"):
+        config_many([monorepo / "first"])
+
+    (monorepo / "shared.toml").write_text("[pelican]\nauthor = 'Fred'")
+    (monorepo / "first" / "turbopelican.toml").write_text(
+        "[meta]\ninclude = ['../shared.toml']\n\n[pelican]\nlinks = [1]"
+    )
+    with pytest.raises(TurbopelicanError, match="configuration at: pelican.links"):
+        config_many([monorepo / "first"])
+
+
+def test_config_many(monorepo: Path) -> None:
+    """Tests that several sites can be loaded while parsing shared fragments once.
+
+    Args:
+        monorepo: The root of a monorepo containing two sites.
+    """
+    with mock.patch.object(
+        _FragmentSource, "_read", autospec=True, side_effect=_FragmentSource._read
+    ) as read:
+        first, second = config_many(
+            [monorepo / "first", monorepo / "second"], "PUBLISH"
+        )
+    read.assert_called_once()
+    assert first.sitename == "first"
+    assert second.sitename == "second"
+    for site_config in (first, second):
+        assert site_config.author == "Fred"
+        assert site_config.extra_path_metadata == {
+            "static/favicon.ico": {"path": "favicon.ico"}
+        }
+
+
+def test_config_many_fragment_changed(monorepo: Path) -> None:
+    """Tests that changes to a shared fragment are picked up by every site.
+
+    Args:
+        monorepo: The root of a monorepo containing two sites.
+    """
+    config_many([monorepo / "first"])
+    (monorepo / "shared.toml").write_text("[pelican]\nauthor = 'Joseph'")
+    (first,) = config_many([monorepo / "first"])
+    assert first.author == "Joseph"
+
+
+def test_config_many_fragment_changed_repeatedly(monorepo: Path) -> None:
+    """Tests that only the latest version of a site's configuration is cached.
+
+    Args:
+        monorepo: The root of a monorepo containing two sites.
+    """
+    config_many([monorepo / "first"])
+    source = shared_file_source(monorepo / "first")
+    cached = len(source._derived)
+    for author in ["Joseph", "Mary", "Anne"]:
+        (monorepo / "shared.toml").write_text(f"[pelican]\nauthor = '{author}'")
+        (first,) = config_many([monorepo / "first"])
+        assert first.author == author
+    assert len(source._derived) == cached
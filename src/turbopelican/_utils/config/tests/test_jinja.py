@@ -0,0 +1,56 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+import jinja2
+
+from turbopelican._utils.config.jinja import TemplateBytecodeCache
+
+_TEMPLATES = {"page.html": "{% if title %}{{ title }}{% endif %}\n"}
+
+
+def _render(environment: jinja2.Environment) -> tuple[str, bool]:
+    """Renders a template, noting whether it had to be compiled.
+
+    Args:
+        environment: The environment in which to render the template.
+
+    Returns:
+        The rendered template, and whether it was compiled.
+    """
+    with mock.patch.object(
+        environment, "compile", wraps=environment.compile
+    ) as compile_template:
+        rendered = environment.get_template("page.html").render(title="Title")
+    return rendered, compile_template.called
+
+
+def test_template_bytecode_cache(tmp_path: Path) -> None:
+    """Tests that templates are compiled once for each source and set of options.
+
+    Args:
+        tmp_path: A temporary directory for the cache.
+    """
+    cache = TemplateBytecodeCache(tmp_path / "jinja")
+
+    def environment(
+        templates: dict[str, str], *, keep_trailing_newline: bool = False
+    ) -> jinja2.Environment:
+        return jinja2.Environment(
+            loader=jinja2.DictLoader(templates),
+            bytecode_cache=cache,
+            autoescape=True,
+            keep_trailing_newline=keep_trailing_newline,
+        )
+
+    assert _render(environment(_TEMPLATES)) == ("Title", True)
+    assert len(list((tmp_path / "jinja").iterdir())) == 1
+    assert _render(environment(_TEMPLATES)) == ("Title", False)
+    assert _render(environment(_TEMPLATES, keep_trailing_newline=True)) == (
+        "Title\n",
+        True,
+    )
+    assert _render(environment({"page.html": "{{ title }}!"})) == ("Title!", True)
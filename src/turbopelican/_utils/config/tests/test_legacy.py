@@ -1,21 +1,47 @@
 from pathlib import Path
 from unittest import mock
 
+import pydantic
 import pytest
 
 from turbopelican import (
     Configuration,
+    PelicanConfig,
     PelicanConfiguration,
     PublishConfiguration,
     TurbopelicanError,
+    config,
     load_config,
 )
-from turbopelican._utils.config.legacy import (
-    _access_setting,
-    _access_setting_cluster,
-    _get_extract_path_metadata,
-    _setting_getter,
-)
+from turbopelican._utils.config.config import _CombinedConfig
+from turbopelican._utils.config.legacy import _access_setting, _access_setting_cluster
+
+_CONFIG = """\
+[pelican]
+author = "Fred"
+sitename = "Fred's site"
+timezone = "Antarctica/Troll"
+default_lang = "en"
+path = "content"
+default_pagination = false
+theme = "themes/my-theme"
+article_paths = []
+page_paths = [""]
+page_save_as = "{slug}.html"
+static_paths = ["static"]
+index_save_as = ""
+
+[[pelican.extra_path_metadata]]
+origin = "static/myasset.png"
+path = "myasset.png"
+
+[publish]
+site_url = "https://mysitename.github.io"
+relative_urls = false
+feed_all_atom = "feeds/all.atom.xml"
+category_feed_atom = "feeds/{slug}.atom.xml"
+delete_output_directory = true
+"""
 
 
 def test_access_setting_cluster() -> None:
@@ -36,48 +62,24 @@ def test_access_setting_cluster_non_dict() -> None:
 
 
 def test_access_setting() -> None:
-    """Checks that settings can be accessed."""
-    assert _access_setting(dict, {"x": {"y": {}}}, "x", "y") == {}
+    """Checks that validated settings can be accessed."""
+    validated = PelicanConfig(author="Fred")
+    assert _access_setting(str, {"author": "Fred"}, validated, "author") == "Fred"
 
 
 def test_access_setting_missing() -> None:
-    """Checks error is raised when settings' parents are missing."""
-    with pytest.raises(TurbopelicanError):
-        _access_setting(dict, {"x": {}}, "x", "y")
-
-
-def test_access_setting_non_dict() -> None:
-    """Checks error is raised when configuration parents are not instances of `dict`."""
-    with pytest.raises(TurbopelicanError):
-        _access_setting(dict, {"x": 1}, "x", "y")
-
-
-def test_access_setting_missing_final() -> None:
-    """Checks error is raised when settings are missing."""
-    with pytest.raises(TurbopelicanError):
-        _access_setting(dict, {"x": {"y": 1}}, "x", "z")
+    """Checks error is raised when settings were not explicitly configured."""
+    with pytest.raises(TurbopelicanError, match="Could not find key: author"):
+        _access_setting(str, {}, PelicanConfig(), "author")
 
 
 def test_access_setting_final_mismatch() -> None:
     """Checks error is raised when settings are unexpected type."""
-    with pytest.raises(TurbopelicanError):
-        _access_setting(int, {"x": {"y": "a"}}, "x", "y")
-
-
-def test_setting_getter() -> None:
-    """Checks a function which retrieves settings can be generated."""
-    setting_getter, setting_getter_fallback = _setting_getter({"x": {"y": 1}}, "x")
-    assert setting_getter(int, "y") == 1
-    assert setting_getter_fallback(int, "y") == 1
-    with pytest.raises(TurbopelicanError):
-        setting_getter(int, "z")
-    assert setting_getter_fallback(int, "z") is None
-
-
-def test_get_extract_path_metadata() -> None:
-    """Checks extract path metadata can be transformed for use by Pelican."""
-    getter = mock.Mock(return_value=[{"origin": "a", "path": "b"}])
-    assert _get_extract_path_metadata(getter) == {"a": {"path": "b"}}
+    validated = PelicanConfig(default_pagination=2)
+    with pytest.raises(TurbopelicanError, match="Incorrect type"):
+        _access_setting(
+            bool, {"default_pagination": 2}, validated, "default_pagination"
+        )
 
 
 def test_load_config(tmp_path: Path) -> None:
@@ -87,34 +89,7 @@ def test_load_config(tmp_path: Path) -> None:
         tmp_path: A temporary directory in which to store the project.
     """
     (tmp_path / "pyproject.toml").touch()
-    (tmp_path / "turbopelican.toml").write_text(
-        """
-        [pelican]
-        author = "Fred"
-        sitename = "Fred's site"
-        timezone = "Antarctica/Troll"
-        default_lang = "en"
-        path = "content"
-        default_pagination = false
-        theme = "themes/my-theme"
-        article_paths = []
-        page_paths = [""]
-        page_save_as = "{slug}.html"
-        static_paths = ["static"]
-        index_save_as = ""
-
-        [[pelican.extra_path_metadata]]
-        origin = "static/myasset.png"
-        path = "myasset.png"
-
-        [publish]
-        site_url = "https://mysitename.github.io"
-        relative_urls = false
-        feed_all_atom = "feeds/all.atom.xml"
-        category_feed_atom = "feeds/{slug}.atom.xml"
-        delete_output_directory = true
-        """
-    )
+    (tmp_path / "turbopelican.toml").write_text(_CONFIG)
     with pytest.warns(DeprecationWarning, match="Use `turbopelican.config`"):
         config = load_config(tmp_path)
     assert config == Configuration(
@@ -143,3 +118,74 @@ def test_load_config(tmp_path: Path) -> None:
             delete_output_directory=True,
         ),
     )
+
+
+def test_load_config_shares_validation(tmp_path: Path) -> None:
+    """Checks that the legacy and current APIs share a single validation.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    (tmp_path / "pyproject.toml").touch()
+    (tmp_path / "turbopelican.toml").write_text(
+        """
+        [pelican]
+        author = "Fred"
+        sitename = "Fred's site"
+
+        [publish]
+        site_url = "https://mysitename.github.io"
+        """
+    )
+    with mock.patch.object(
+        _CombinedConfig, "model_validate", wraps=_CombinedConfig.model_validate
+    ) as model_validate:
+        assert config("DEV", start_path=tmp_path).author == "Fred"
+        with (
+            pytest.warns(DeprecationWarning, match="Use `turbopelican.config`"),
+            pytest.raises(TurbopelicanError, match="Could not find key: timezone"),
+        ):
+            load_config(tmp_path)
+    model_validate.assert_called_once()
+
+
+def test_load_config_copies_lists(tmp_path: Path) -> None:
+    """Checks that modifying the loaded configuration does not modify the cache.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    (tmp_path / "pyproject.toml").touch()
+    (tmp_path / "turbopelican.toml").write_text(_CONFIG)
+    with pytest.warns(DeprecationWarning, match="Use `turbopelican.config`"):
+        loaded = load_config(tmp_path)
+    loaded.pelican.static_paths.append("images")
+    loaded.pelican.extra_path_metadata["static/myasset.png"]["path"] = "x.png"
+    with pytest.warns(DeprecationWarning, match="Use `turbopelican.config`"):
+        reloaded = load_config(tmp_path)
+    assert reloaded.pelican.static_paths == ["static"]
+    assert reloaded.pelican.extra_path_metadata == {
+        "static/myasset.png": {"path": "myasset.png"}
+    }
+    assert config("DEV", start_path=tmp_path).static_paths == ["static"]
+
+
+def test_load_config_validation_error(tmp_path: Path) -> None:
+    """Checks that validation errors are reported as turbopelican errors.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    (tmp_path / "pyproject.toml").touch()
+    (tmp_path / "turbopelican.toml").write_text(_CONFIG)
+    with pytest.raises(pydantic.ValidationError) as error:
+        pydantic.TypeAdapter(int).validate_python("x")
+    with (
+        mock.patch(
+            "turbopelican._utils.config.legacy._build_configuration",
+            side_effect=error.value,
+        ),
+        pytest.warns(DeprecationWarning, match="Use `turbopelican.config`"),
+        pytest.raises(TurbopelicanError, match="Unexpected configuration"),
+    ):
+        load_config(tmp_path)
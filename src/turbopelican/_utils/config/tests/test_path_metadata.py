@@ -0,0 +1,225 @@
+import re
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from turbopelican import MappingConfigSource, PelicanConfig, TurbopelicanError, config
+from turbopelican._utils.config import path_metadata
+from turbopelican._utils.config.path_metadata import (
+    _translate_glob,
+    compile_path_metadata_patterns,
+    is_pattern_entry,
+)
+
+
+@pytest.fixture
+def content(tmp_path: Path) -> Path:
+    """Creates a content directory containing static files and articles.
+
+    Args:
+        tmp_path: A temporary directory in which to store the content.
+
+    Returns:
+        The content directory.
+    """
+    for path in [
+        "static/favicon.ico",
+        "static/images/cat.png",
+        "static/images/2024/dog.png",
+        "static/robots.txt",
+        "articles/first.md",
+    ]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).touch()
+    return tmp_path
+
+
+def test_is_pattern_entry() -> None:
+    """Tests that only items with pattern origins are recognised as patterns."""
+    assert is_pattern_entry({"origin_glob": "*.png"})
+    assert is_pattern_entry({"origin_regex": ".*"})
+    assert not is_pattern_entry({"origin": "a.png"})
+    assert not is_pattern_entry("origin_glob")
+
+
+@pytest.mark.parametrize(
+    ("glob", "matches", "non_matches"),
+    [
+        ("static/*.png", ["static/a.png"], ["static/a/b.png", "other/a.png"]),
+        ("static/**/*.png", ["static/a.png", "static/a/b/c.png"], ["static/a.jpg"]),
+        ("**", ["a", "a/b/c"], []),
+        ("a?c.txt", ["abc.txt"], ["a/c.txt", "ac.txt"]),
+        ("[!a]b", ["cb"], ["ab"]),
+        ("a.b", ["a.b"], ["axb"]),
+    ],
+)
+def test_translate_glob(glob: str, matches: list[str], non_matches: list[str]) -> None:
+    """Tests that globs are translated into regular expressions matching paths.
+
+    Args:
+        glob: The glob to be translated.
+        matches: Paths which the glob should match.
+        non_matches: Paths which the glob should not match.
+    """
+    regex = _translate_glob(glob)
+    for path in matches:
+        assert re.fullmatch(regex, path)
+    for path in non_matches:
+        assert not re.fullmatch(regex, path)
+
+
+def test_matcher_precedence() -> None:
+    """Tests that the first matching pattern wins, whether indexed or not."""
+    matcher = compile_path_metadata_patterns(
+        [
+            {"origin_regex": r"static/special\..*", "path": "special"},
+            {"origin_glob": "static/*.png", "path": "{name}"},
+            {"origin_glob": "static/**", "path": "other/{name}"},
+        ]
+    )
+    assert matcher.match("static/special.png") == {"path": "special"}
+    assert matcher.match("static/a.png") == {"path": "a.png"}
+    assert matcher.match("static/a.txt") == {"path": "other/a.txt"}
+    assert matcher.match("articles/a.md") is None
+    assert matcher.by_suffix == {".png": (0, 1, 2)}
+
+
+def test_matcher_placeholders() -> None:
+    """Tests that path components and named groups fill the metadata."""
+    matcher = compile_path_metadata_patterns(
+        [
+            {
+                "origin_regex": r"images/(?P<year>\d{4})/.*",
+                "path": "{year}/{stem}{suffix}",
+                "status": "{parent}:{origin}",
+            }
+        ]
+    )
+    assert matcher.match("images/2024/dog.png") == {
+        "path": "2024/dog.png",
+        "status": "images/2024:images/2024/dog.png",
+    }
+
+
+def test_matcher_other_braces() -> None:
+    """Tests that braces other than the placeholders are left for Pelican."""
+    matcher = compile_path_metadata_patterns(
+        [{"origin_glob": "*.png", "save_as": "{slug}/{name}", "css": "a {b: c}"}]
+    )
+    assert matcher.match("dog.png") == {"save_as": "{slug}/dog.png", "css": "a {b: c}"}
+
+
+@pytest.mark.parametrize(
+    ("metadata", "message"),
+    [
+        ({"origin": "a", "origin_glob": "*"}, "Expected only one of"),
+        ({"origin_regex": "("}, "Invalid regular expression"),
+    ],
+)
+def test_matcher_invalid(metadata: dict[str, str], message: str) -> None:
+    """Tests that incorrectly configured patterns are rejected.
+
+    Args:
+        metadata: The incorrectly configured item of extra path metadata.
+        message: Part of the expected error message.
+    """
+    with pytest.raises(ValueError, match=message):
+        compile_path_metadata_patterns([metadata])
+
+
+def test_expand_extra_path_metadata(content: Path) -> None:
+    """Tests that patterns are expanded against files, with exact origins winning.
+
+    Args:
+        content: A content directory containing static files and articles.
+    """
+    pelican_config = PelicanConfig.model_validate(
+        {
+            "extra_path_metadata": [
+                {"origin_glob": "static/**/*.png", "path": "img/{name}"},
+                {"origin": "static/images/cat.png", "path": "cat.png"},
+                {"origin_regex": r"static/[^/]+\.(ico|txt)", "path": "{name}"},
+            ]
+        }
+    )
+    assert pelican_config.extra_path_metadata == {
+        "static/images/cat.png": {"path": "cat.png"}
+    }
+    pelican_config.expand_extra_path_metadata(content)
+    assert pelican_config.extra_path_metadata == {
+        "static/images/cat.png": {"path": "cat.png"},
+        "static/images/2024/dog.png": {"path": "img/dog.png"},
+        "static/favicon.ico": {"path": "favicon.ico"},
+        "static/robots.txt": {"path": "robots.txt"},
+    }
+
+
+def test_expand_cached(content: Path) -> None:
+    """Tests that the expansion is reused until the tree of files changes.
+
+    Args:
+        content: A content directory containing static files and articles.
+    """
+    matcher = compile_path_metadata_patterns(
+        [{"origin_glob": "static/**/*.png", "path": "img/{name}"}]
+    )
+    expanded = matcher.expand(content, {})
+    with mock.patch.object(path_metadata.os, "scandir") as scandir:
+        assert matcher.expand(content, {}) == expanded
+    scandir.assert_not_called()
+
+    (content / "static" / "images" / "2024" / "bird.png").touch()
+    assert matcher.expand(content, {}) == {
+        **expanded,
+        "static/images/2024/bird.png": {"path": "img/bird.png"},
+    }
+
+
+def test_expand_symlink_loop(content: Path) -> None:
+    """Tests that symbolic links to directories are not followed.
+
+    Args:
+        content: A content directory containing static files and articles.
+    """
+    (content / "static" / "images" / "loop").symlink_to(content / "static")
+    matcher = compile_path_metadata_patterns(
+        [{"origin_glob": "static/**/*.png", "path": "img/{name}"}]
+    )
+    assert set(matcher.expand(content, {})) == {
+        "static/images/cat.png",
+        "static/images/2024/dog.png",
+    }
+
+
+def test_config_expands_patterns(content: Path) -> None:
+    """Tests that patterns are expanded relative to the configuration.
+
+    Args:
+        content: A content directory containing static files and articles.
+    """
+    source = MappingConfigSource(
+        {
+            "pelican": {
+                "path": "static",
+                "extra_path_metadata": [{"origin_glob": "*.ico", "path": "{name}"}],
+            },
+            "publish": {},
+        },
+        base_path=content,
+    )
+    assert config("PUBLISH", source=source).extra_path_metadata == {
+        "favicon.ico": {"path": "favicon.ico"}
+    }
+
+
+def test_config_invalid_pattern() -> None:
+    """Tests that invalid patterns are reported when loading the configuration."""
+    source = MappingConfigSource(
+        {
+            "pelican": {"extra_path_metadata": [{"origin_regex": "(", "path": "a"}]},
+            "publish": {},
+        }
+    )
+    with pytest.raises(TurbopelicanError, match="Invalid regular expression"):
+        config("DEV", source=source)
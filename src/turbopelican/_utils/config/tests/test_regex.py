@@ -0,0 +1,41 @@
+import re
+
+import pytest
+
+from turbopelican._utils.config.regex import compile_regex, find_pathological_input
+
+
+def test_compile_regex() -> None:
+    """Tests that regular expressions are compiled only once."""
+    pattern = compile_regex("[a-z]+", re.IGNORECASE)
+    assert pattern.flags & re.IGNORECASE
+    assert compile_regex("[a-z]+", re.IGNORECASE) is pattern
+
+
+def test_compile_regex_invalid() -> None:
+    """Tests that invalid regular expressions are reported."""
+    with pytest.raises(ValueError, match="Invalid regular expression '\\[a-z'"):
+        compile_regex("[a-z")
+
+
+@pytest.mark.parametrize("pattern", [r"(a+)+$", r"(\w+\s?)+$", r"(x+x+)+y"])
+def test_find_pathological_input(pattern: str) -> None:
+    """Tests that regular expressions prone to catastrophic backtracking are found.
+
+    Args:
+        pattern: A regular expression prone to catastrophic backtracking.
+    """
+    assert find_pathological_input(pattern) is not None
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"[^\w\s-]", r"(?u)\A\s*", r"(?u)\s*\Z", r"[-\s]+", "[{|](?P<what>.*?)[|}]"],
+)
+def test_find_pathological_input_safe(pattern: str) -> None:
+    """Tests that ordinary regular expressions are not reported.
+
+    Args:
+        pattern: A regular expression which does not backtrack catastrophically.
+    """
+    assert find_pathological_input(pattern, re.IGNORECASE) is None
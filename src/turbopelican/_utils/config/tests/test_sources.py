@@ -0,0 +1,166 @@
+import sqlite3
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from turbopelican import (
+    FileConfigSource,
+    MappingConfigSource,
+    SQLiteConfigSource,
+    TurbopelicanError,
+    config,
+)
+from turbopelican._utils.config.sources import shared_file_source
+
+if TYPE_CHECKING:
+    from turbopelican._utils.shared import Toml
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Path:
+    """Creates a SQLite database holding the configuration of a single site.
+
+    Args:
+        tmp_path: A temporary directory in which to store the database.
+
+    Returns:
+        The path to the database.
+    """
+    path = tmp_path / "sites.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE turbopelican_config (site, config)")
+        connection.execute(
+            "INSERT INTO turbopelican_config VALUES (?, ?)",
+            ("mysite", '[pelican]\nauthor = "Fred"\n\n[publish]\n'),
+        )
+    return path
+
+
+def test_file_config_source(tmp_path: Path) -> None:
+    """Checks that the file source reads the file again only after it changes.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    (tmp_path / "pyproject.toml").touch()
+    turbopelican_toml = tmp_path / "turbopelican.toml"
+    turbopelican_toml.write_text("hello = 1")
+    source = FileConfigSource(tmp_path)
+    with mock.patch.object(source, "_read", wraps=source._read) as read:
+        assert source.load() == {"hello": 1}
+        assert source.load() == {"hello": 1}
+        read.assert_called_once()
+        read.reset_mock()
+        turbopelican_toml.write_text("hello = 22")
+        assert source.load() == {"hello": 22}
+        read.assert_called_once()
+
+
+def test_mapping_config_source() -> None:
+    """Checks that the mapping source snapshots the provided mapping."""
+    pelican: dict[str, Toml] = {"author": "Fred"}
+    source = MappingConfigSource({"pelican": pelican})
+    pelican["author"] = "Joe"
+    assert source.load() == {"pelican": {"author": "Fred"}}
+
+
+def test_sqlite_config_source(database: Path) -> None:
+    """Checks that the SQLite source only parses the configuration when it changes.
+
+    Args:
+        database: The path to a database containing the configuration of a site.
+    """
+    source = SQLiteConfigSource(database, "mysite")
+    with mock.patch.object(source, "_read", wraps=source._read) as read:
+        assert source.load() == {"pelican": {"author": "Fred"}, "publish": {}}
+        assert source.load() == {"pelican": {"author": "Fred"}, "publish": {}}
+        read.assert_called_once()
+        read.reset_mock()
+        with sqlite3.connect(database) as connection:
+            connection.execute("UPDATE turbopelican_config SET config = 'a = 1'")
+        assert source.load() == {"a": 1}
+        read.assert_called_once()
+
+
+def test_sqlite_config_source_connection(database: Path) -> None:
+    """Checks that the SQLite source can use an existing connection.
+
+    Args:
+        database: The path to a database containing the configuration of a site.
+    """
+    with sqlite3.connect(database) as connection:
+        source = SQLiteConfigSource(connection, "mysite")
+        assert source.load()["pelican"] == {"author": "Fred"}
+
+
+def test_sqlite_config_source_missing_site(database: Path) -> None:
+    """Checks that an error is raised when the site is not in the database.
+
+    Args:
+        database: The path to a database containing the configuration of a site.
+    """
+    with pytest.raises(TurbopelicanError, match="No configuration for site"):
+        SQLiteConfigSource(database, "othersite").load()
+
+
+def test_sqlite_config_source_invalid_table(database: Path) -> None:
+    """Checks that table names cannot be used to inject SQL.
+
+    Args:
+        database: The path to a database containing the configuration of a site.
+    """
+    with pytest.raises(TurbopelicanError, match="Invalid SQLite table name"):
+        SQLiteConfigSource(database, "mysite", table="a; DROP TABLE b")
+
+
+def test_memoize() -> None:
+    """Checks that derived values are cached until the configuration is cleared."""
+    source = MappingConfigSource({"a": 1})
+    factory = mock.Mock(return_value="derived")
+    assert source.memoize("value", factory) == "derived"
+    assert source.memoize("value", factory) == "derived"
+    factory.assert_called_once_with({"a": 1})
+    factory.reset_mock()
+    source.clear_cache()
+    assert source.memoize("value", factory) == "derived"
+    factory.assert_called_once_with({"a": 1})
+
+
+def test_memoize_version() -> None:
+    """Checks that only the latest version of a derived value is kept."""
+    source = MappingConfigSource({"a": 1})
+    assert source.memoize("value", lambda _: 1, version=1) == 1
+    assert source.memoize("value", lambda _: 2, version=1) == 1
+    assert source.memoize("value", lambda _: 2, version=2) == 2  # noqa: PLR2004
+    assert len(source._derived) == 1
+
+
+def test_shared_file_source(tmp_path: Path) -> None:
+    """Checks that the same file source is shared for the same path.
+
+    Args:
+        tmp_path: A temporary directory in which to store the project.
+    """
+    assert shared_file_source(tmp_path) is shared_file_source(tmp_path / ".")
+    assert shared_file_source(tmp_path) is not shared_file_source(tmp_path.parent)
+
+
+def test_config_source(database: Path) -> None:
+    """Checks that the configuration can be validated from any source.
+
+    Args:
+        database: The path to a database containing the configuration of a site.
+    """
+    mapping_source = MappingConfigSource({"pelican": {"author": "Fred"}})
+    assert config("PUBLISH", source=mapping_source).author == "Fred"
+    sqlite_source = SQLiteConfigSource(database, "mysite")
+    assert config("DEV", source=sqlite_source).author == "Fred"
+
+
+def test_config_source_copies() -> None:
+    """Checks that changes to a loaded configuration do not affect the cache."""
+    source = MappingConfigSource({"pelican": {"author": "Fred"}})
+    config("DEV", source=source).author = "Joe"
+    assert config("DEV", source=source).author == "Fred"
@@ -1,3 +1,3 @@
-__all__ = ["TurbopelicanError"]
+__all__ = ["TurbopelicanError", "TurbopelicanWarning"]
 
-from turbopelican._utils.errors.errors import TurbopelicanError
+from turbopelican._utils.errors.errors import TurbopelicanError, TurbopelicanWarning
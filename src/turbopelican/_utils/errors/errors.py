@@ -3,8 +3,12 @@
 Author: Elliot Simpson
 """
 
-__all__ = ["TurbopelicanError"]
+__all__ = ["TurbopelicanError", "TurbopelicanWarning"]
 
 
 class TurbopelicanError(ValueError):
     """Error to be raised when turbopelican raises any generic error."""
+
+
+class TurbopelicanWarning(UserWarning):
+    """Warning to be issued when turbopelican detects a likely problem."""
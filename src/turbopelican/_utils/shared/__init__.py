@@ -6,6 +6,10 @@ Author: Elliot Simpson.
 __all__ = [
     "Toml",
     "find_config",
+    "fingerprint",
+    "hash_file",
+    "stable_repr",
 ]
 
+from turbopelican._utils.shared.fingerprint import fingerprint, hash_file, stable_repr
 from turbopelican._utils.shared.shared import Toml, find_config
@@ -7,7 +7,30 @@ from zoneinfo import ZoneInfo
 import tomlkit
 import tomlkit.items
 
-from turbopelican._utils.shared.args import CreateConfiguration
+from turbopelican._utils.shared.args import CreateConfiguration, InstallType
+
+_TURBOPELICAN_PLUGINS = "turbopelican."
+"""The prefix of the plugins which only websites installing Turbopelican load."""
+
+
+def _remove_turbopelican_plugins(pelican: tomlkit.items.Table) -> None:
+    """Removes the plugins of Turbopelican, which minimal installs cannot load.
+
+    Args:
+        pelican: The Pelican settings of the website.
+    """
+    plugins = pelican.get("plugins")
+    if not isinstance(plugins, list):
+        return
+    kept = [
+        plugin
+        for plugin in plugins
+        if not str(plugin).startswith(_TURBOPELICAN_PLUGINS)
+    ]
+    if kept:
+        pelican["plugins"] = kept
+    else:
+        del pelican["plugins"]
 
 
 def update_website(config: CreateConfiguration) -> None:
@@ -29,6 +52,8 @@ def update_website(config: CreateConfiguration) -> None:
     pelican["timezone"] = config.timezone
     pelican["default_lang"] = config.default_lang
     publish["site_url"] = config.site_url
+    if config.install_type == InstallType.MINIMAL_INSTALL:
+        _remove_turbopelican_plugins(pelican)
 
     with turbopelican_conf.open("w", encoding="utf8") as configuration:
         tomlkit.dump(toml, configuration)
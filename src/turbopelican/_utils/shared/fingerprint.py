@@ -0,0 +1,76 @@
+"""Identifies values by content, consistently between processes.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "fingerprint",
+    "hash_file",
+    "stable_repr",
+]
+
+import hashlib
+import re
+import types
+from pathlib import Path
+
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+"""Memory addresses, which differ between processes for the same object."""
+
+
+def stable_repr(value: object) -> str:
+    """Represents a value such that equal values are represented the same.
+
+    Dictionaries and sets are sorted, functions and classes are represented by
+    their qualified names, and memory addresses are removed.
+
+    Args:
+        value: The value to be represented.
+
+    Returns:
+        The representation.
+    """
+    if isinstance(value, dict):
+        items = sorted(
+            (stable_repr(key), stable_repr(item)) for key, item in value.items()
+        )
+        return "{" + ", ".join(f"{key}: {item}" for key, item in items) + "}"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(stable_repr(item) for item in value)) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(stable_repr(item) for item in value) + "]"
+    if isinstance(value, types.ModuleType):
+        return f"<module {value.__name__}>"
+    if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+        return f"<{value.__module__}.{value.__qualname__}>"
+    return _ADDRESS.sub("", repr(value))
+
+
+def fingerprint(value: object) -> str:
+    """Hashes the stable representation of a value.
+
+    Args:
+        value: The value to be hashed.
+
+    Returns:
+        The hexadecimal SHA-256 digest.
+    """
+    return hashlib.sha256(stable_repr(value).encode()).hexdigest()
+
+
+def hash_file(path: Path | str) -> str | None:
+    """Hashes the contents of a file.
+
+    Args:
+        path: The path to the file.
+
+    Returns:
+        The hexadecimal SHA-256 digest, or None if the file does not exist.
+    """
+    try:
+        with Path(path).open("rb") as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
@@ -61,7 +61,18 @@ def find_config(start_path: Path | str = ".") -> dict[str, Toml]:
     Returns:
         The configuration contained in the configuration file.
     """
-    config_file = _find_config_file(start_path)
+    return _read_config_file(_find_config_file(start_path))
+
+
+def _read_config_file(config_file: Path) -> dict[str, Toml]:
+    """Parses the turbopelican configuration out of a configuration file.
+
+    Args:
+        config_file: Either `turbopelican.toml` or `pyproject.toml`.
+
+    Returns:
+        The configuration contained in the configuration file.
+    """
     with config_file.open("rb") as config:
         contents = tomllib.load(config)
     if config_file.name == "turbopelican.toml":
@@ -1,3 +1,5 @@
+import shutil
+from importlib import resources
 from pathlib import Path
 
 import pytest
@@ -75,6 +77,74 @@ def test_update_website(config: CreateConfiguration) -> None:
     assert toml.get("publish", {}).get("site_url") == "https://hellothere.github.io"
 
 
+def test_update_website_minimal(config: CreateConfiguration) -> None:
+    """Checks that minimal installs do not load the plugins of Turbopelican.
+
+    Args:
+        config: The configuration for Turbopelican. Suppied via fixture.
+    """
+    config.install_type = InstallType.MINIMAL_INSTALL
+    path_to_toml = config.directory / "turbopelican.toml"
+    path_to_toml.write_text(
+        """
+        [pelican]
+        plugins = ["turbopelican.plugins.asset_fingerprint", "pelican.plugins.x"]
+
+        [publish]
+        """,
+        encoding="utf8",
+    )
+    update_website(config)
+    toml = tomlkit.loads(path_to_toml.read_text(encoding="utf8"))
+    assert toml.get("pelican", {}).get("plugins") == ["pelican.plugins.x"]
+
+    path_to_toml.write_text(
+        """
+        [pelican]
+        plugins = ["turbopelican.plugins.responsive_images"]
+
+        [publish]
+        """,
+        encoding="utf8",
+    )
+    update_website(config)
+    toml = tomlkit.loads(path_to_toml.read_text(encoding="utf8"))
+    assert "plugins" not in toml.get("pelican", {})
+
+
+@pytest.mark.parametrize(
+    ("install_type", "plugins"),
+    [
+        (
+            InstallType.FULL_INSTALL,
+            [
+                "turbopelican.plugins.asset_fingerprint",
+                "turbopelican.plugins.responsive_images",
+            ],
+        ),
+        (InstallType.MINIMAL_INSTALL, None),
+    ],
+)
+def test_update_website_template_plugins(
+    config: CreateConfiguration, install_type: InstallType, plugins: list[str] | None
+) -> None:
+    """Checks that only full installs enable the plugins of new websites.
+
+    Args:
+        config: The configuration for Turbopelican. Suppied via fixture.
+        install_type: The kind of website being created.
+        plugins: The plugins which the website enables.
+    """
+    config.install_type = install_type
+    template = resources.files("turbopelican").joinpath("_templates", "newsite")
+    with resources.as_file(template) as path:
+        shutil.copy(path / "turbopelican.toml", config.directory)
+    update_website(config)
+    path_to_toml = config.directory / "turbopelican.toml"
+    toml = tomlkit.loads(path_to_toml.read_text(encoding="utf8"))
+    assert toml.get("pelican", {}).get("plugins") == plugins
+
+
 @freeze_time("2011-11-11")
 def test_update_contents(config: CreateConfiguration) -> None:
     """Checks that the website contents can be updated appropriately.
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from turbopelican._utils.shared import fingerprint, hash_file, stable_repr
+
+
+def test_stable_repr() -> None:
+    """Tests that equal values are represented the same, whatever their order."""
+    assert stable_repr({"b": {2, 1}, "a": (1,)}) == stable_repr({"a": [1], "b": {1, 2}})
+    assert stable_repr(stable_repr) == (
+        "<turbopelican._utils.shared.fingerprint.stable_repr>"
+    )
+    assert "0x" not in stable_repr(object())
+
+
+def test_fingerprint() -> None:
+    """Tests that fingerprints only differ for different values."""
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_hash_file(tmp_path: Path) -> None:
+    """Tests that files are hashed by their contents.
+
+    Args:
+        tmp_path: A temporary directory in which to store the files.
+    """
+    (tmp_path / "a").write_text("same")
+    (tmp_path / "b").write_text("same")
+    assert hash_file(tmp_path / "a") == hash_file(tmp_path / "b")
+    assert hash_file(tmp_path / "missing") is None
@@ -0,0 +1,8 @@
+"""This package contains the Pelican plugins shipped with Turbopelican.
+
+Each plugin is enabled by adding its module name to `plugins`, for example
+`"turbopelican.plugins.incremental"`. The highlight cache is instead a Markdown
+extension, enabled in `markdown`.
+
+Author: Elliot Simpson.
+"""
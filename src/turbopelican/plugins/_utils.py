@@ -0,0 +1,162 @@
+"""Provides utilities shared by the Pelican plugins shipped with Turbopelican.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "MINIFY_SETTING",
+    "copy_static_file",
+    "is_enabled",
+    "minified_static_file",
+    "pop_reports",
+    "report",
+    "static_sources",
+]
+
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pelican.generators import StaticGenerator
+
+if TYPE_CHECKING:
+    from pelican.generators import Generator
+
+MINIFY_SETTING = "TURBOPELICAN_MINIFY"
+"""The setting for the function with which static files are minified as they
+are copied, taking the path to a file and its contents, which builds with
+`--minify` set."""
+
+logger = logging.getLogger(__name__)
+
+_reports: dict[str, list[str]] = {}
+"""The summaries reported by plugins during each build, keyed by output directory."""
+
+
+def is_enabled(settings: dict[str, Any], plugin_name: str) -> bool:
+    """Checks whether a plugin is enabled for a particular Pelican build.
+
+    Signal receivers remain connected for the rest of the process once a
+    plugin is registered, so each receiver checks that its plugin is enabled
+    for the build which sent the signal.
+
+    Args:
+        settings: The settings of the Pelican build.
+        plugin_name: The module name of the plugin.
+
+    Returns:
+        Whether the plugin is listed in the `PLUGINS` setting.
+    """
+    return plugin_name in (settings.get("PLUGINS") or [])
+
+
+def _theme_static_files(settings: dict[str, Any]) -> dict[str, str]:
+    """Finds the static files of the theme.
+
+    Args:
+        settings: The settings of the Pelican build.
+
+    Returns:
+        The source of each file, keyed by its path in the output directory.
+    """
+    sources: dict[str, str] = {}
+    destination = Path(settings["THEME_STATIC_DIR"])
+    for static_path in settings["THEME_STATIC_PATHS"]:
+        source = Path(settings["THEME"], static_path)
+        if source.is_file():
+            sources[(destination / source.name).as_posix()] = str(source)
+            continue
+        for path in sorted(source.rglob("*")):
+            if path.is_file():
+                relative = destination / path.relative_to(source)
+                sources[relative.as_posix()] = str(path)
+    return sources
+
+
+def static_sources(
+    settings: dict[str, Any], generators: list[Generator]
+) -> dict[str, str]:
+    """Finds the static files of the theme and of the content.
+
+    Args:
+        settings: The settings of the Pelican build.
+        generators: The generators of the build, once the content has been
+            read.
+
+    Returns:
+        The source of each file, keyed by its path in the output directory.
+    """
+    sources = _theme_static_files(settings)
+    for generator in generators:
+        if isinstance(generator, StaticGenerator):
+            for staticfile in generator.staticfiles:
+                source = os.path.join(settings["PATH"], str(staticfile.source_path))  # noqa: PTH118
+                sources[staticfile.save_as] = source
+    return sources
+
+
+def minified_static_file(settings: dict[str, Any], path: str) -> bytes | None:
+    """Minifies a static file, if the build minifies its outputs.
+
+    Args:
+        settings: The settings of the Pelican build.
+        path: The path to the static file.
+
+    Returns:
+        The minified contents, or None if the file is copied as it is.
+    """
+    minify = settings.get(MINIFY_SETTING)
+    if minify is None:
+        return None
+    with open(path, "rb") as file:  # noqa: PTH123
+        data = file.read()
+    minified = minify(path, data)
+    return minified if len(minified) < len(data) else None
+
+
+def copy_static_file(source: str, destination: str, minified: bytes | None) -> None:
+    """Copies a static file into the output, keeping its modification time.
+
+    Args:
+        source: The path to the static file.
+        destination: The path to its copy.
+        minified: The minified contents of the file, if it is minified.
+    """
+    if minified is None:
+        shutil.copy2(source, destination)
+        return
+    with open(destination, "wb") as file:  # noqa: PTH123
+        file.write(minified)
+    shutil.copystat(source, destination)
+
+
+def report(settings: dict[str, Any], summary: str) -> None:
+    """Records a summary of a plugin's work, for the build command to show.
+
+    Pelican only shows warnings unless run verbosely, so the summary is logged
+    for those running Pelican themselves, and kept for `turbopelican build`,
+    which shows it alongside its own summary of the build.
+
+    Args:
+        settings: The settings of the Pelican build.
+        summary: A single line describing the plugin's work.
+    """
+    logger.info("%s", summary)
+    output_path = os.path.abspath(settings["OUTPUT_PATH"])  # noqa: PTH100
+    _reports.setdefault(output_path, []).append(summary)
+
+
+def pop_reports(output_path: str) -> list[str]:
+    """Collects the summaries reported by plugins during the last build.
+
+    Args:
+        output_path: The output directory of the build.
+
+    Returns:
+        Each summary, in the order in which they were reported.
+    """
+    return _reports.pop(os.path.abspath(output_path), [])  # noqa: PTH100
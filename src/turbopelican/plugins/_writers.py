@@ -0,0 +1,271 @@
+"""Provides the writers shared by the Pelican plugins shipped with Turbopelican.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "DeferredFile",
+    "DeferringWriter",
+    "OutputFilter",
+    "file_matches",
+    "restrict_outputs",
+]
+
+import io
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from pelican.generators import ArticlesGenerator, PagesGenerator
+from pelican.writers import FileOverwriteFailedError, Writer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pelican.contents import Content
+    from pelican.generators import Generator
+
+logger = logging.getLogger(__name__)
+
+
+def file_matches(path: str, data: bytes) -> bool:
+    """Checks whether a file already contains some bytes.
+
+    Args:
+        path: The path to the file.
+        data: The bytes to be written.
+
+    Returns:
+        Whether the file exists with exactly those bytes.
+    """
+    try:
+        with open(path, "rb") as existing:  # noqa: PTH123
+            if os.fstat(existing.fileno()).st_size != len(data):
+                return False
+            return existing.read() == data
+    except OSError:
+        return False
+
+
+class DeferredFile(io.StringIO):
+    """Collects an output in memory, then hands it to its writer once closed."""
+
+    def __init__(self, writer: DeferringWriter, name: str, encoding: str) -> None:
+        """Creates the file.
+
+        Args:
+            writer: The writer which stores the output.
+            name: The path to the output, which is `os.devnull` if discarded.
+            encoding: The encoding with which to write the output.
+        """
+        super().__init__()
+        self.name = name
+        self._writer = writer
+        self._encoding = encoding
+
+    def close(self) -> None:
+        """Hands the output to the writer."""
+        if self.closed:
+            return
+        text = self.getvalue()
+        super().close()
+        if self.name == os.devnull:
+            return
+        if os.linesep != "\n":
+            text = text.replace("\n", os.linesep)
+        self._writer.submit(self.name, text.encode(self._encoding))
+
+
+class DeferringWriter(Writer, ABC):
+    """Renders outputs into memory, leaving subclasses to store them."""
+
+    def _open_w(self, filename: str, encoding: str, override: bool = False) -> Any:  # noqa: ANN401, FBT001, FBT002
+        """Opens a file in memory, which is stored once closed.
+
+        The file on disk is not opened, so that it is left as it is until the
+        output is stored, but Pelican's checks against writing the same file
+        twice are kept.
+
+        Args:
+            filename: The path to the file.
+            encoding: The encoding with which to write the file.
+            override: Whether the file may overwrite another output.
+
+        Returns:
+            The file in memory.
+
+        Raises:
+            FileOverwriteFailedError: The file has already been written.
+        """
+        name = filename
+        if filename in self._overridden_files:
+            if override:
+                raise FileOverwriteFailedError(
+                    f'Failed to overwrite "{filename}" a second time '
+                    "(was previously overwritten)"
+                )
+            logger.info('Skipping "%s", not overwriting', filename)
+            name = os.devnull
+        elif filename in self._written_files:
+            if not override:
+                raise FileOverwriteFailedError(
+                    f'Failed to overwrite "{filename}" as Pelican has already '
+                    "written to it previously (set `override=True` if intended)"
+                )
+            logger.info('Overwriting "%s"', filename)
+        if override:
+            self._overridden_files.add(filename)
+        self._written_files.add(filename)
+        return DeferredFile(self, name, encoding)
+
+    @abstractmethod
+    def submit(self, path: str, data: bytes) -> None:
+        """Stores an output once it has been rendered.
+
+        Args:
+            path: The path to the output.
+            data: The bytes of the output.
+        """
+
+
+class OutputFilter:
+    """Passes on to a writer only the outputs which a build writes.
+
+    Several builds of the same website, each reading all of its content, can
+    split its outputs between them. Each output is either rendered from a
+    single article or page, or shared, such as the index and listings.
+    """
+
+    def __init__(
+        self,
+        writer: Writer,
+        writes: Callable[[Content | None], bool],
+        writes_feed: Callable[[list[Content]], bool],
+        written: list[str],
+    ) -> None:
+        """Wraps the writer of the build.
+
+        Args:
+            writer: The writer of the build.
+            writes: Checks whether the build writes the output of an article
+                or page, or a shared output if given None.
+            writes_feed: Checks whether the build writes a feed of articles.
+            written: The list to which each output written is added.
+        """
+        self.writer = writer
+        self.writes = writes
+        self.writes_feed = writes_feed
+        self.written = written
+
+    def write_file(self, name: str, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Writes a page, if the build writes it.
+
+        Args:
+            name: The path of the page, relative to the output directory.
+            args: The other arguments of the writer.
+            kwargs: The keyword arguments of the writer, including the article
+                or page rendered, if any.
+        """
+        if self.writes(kwargs.get("article") or kwargs.get("page")):
+            self.written.append(name)
+            self.writer.write_file(name, *args, **kwargs)
+
+    def write_feed(
+        self,
+        elements: list[Content],
+        context: dict[str, Any],
+        path: str | None = None,
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Writes a feed, if the build writes it.
+
+        Args:
+            elements: The articles in the feed.
+            context: The context of the build.
+            path: The path of the feed, relative to the output directory.
+            args: The other arguments of the writer.
+            kwargs: The keyword arguments of the writer.
+        """
+        if self.writes_feed(elements):
+            if path is not None:
+                self.written.append(path)
+            self.writer.write_feed(elements, context, path, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Provides the other attributes of the writer.
+
+        Args:
+            name: The name of the attribute.
+
+        Returns:
+            The attribute of the writer.
+        """
+        return getattr(self.writer, name)
+
+
+def _skipped(writer: Writer) -> None:
+    """Writes nothing, in place of a generator whose outputs are shared.
+
+    Args:
+        writer: The writer of the build, which is not used.
+    """
+
+
+def _filtered(
+    generate_output: Callable[[Writer], None],
+    writes: Callable[[Content | None], bool],
+    writes_feed: Callable[[list[Content]], bool],
+    written: list[str],
+) -> Callable[[Writer], None]:
+    """Makes a generator pass its outputs through an `OutputFilter`.
+
+    Args:
+        generate_output: The method by which the generator writes its outputs.
+        writes: Checks whether the build writes the output of an article or
+            page, or a shared output if given None.
+        writes_feed: Checks whether the build writes a feed of articles.
+        written: The list to which each output written is added.
+
+    Returns:
+        The replacement for the method.
+    """
+
+    def generate_filtered_output(writer: Writer) -> None:
+        output_filter = OutputFilter(writer, writes, writes_feed, written)
+        generate_output(output_filter)  # type: ignore[arg-type]
+
+    return generate_filtered_output
+
+
+def restrict_outputs(
+    generators: list[Generator],
+    writes: Callable[[Content | None], bool],
+    writes_feed: Callable[[list[Content]], bool],
+    written: list[str],
+) -> None:
+    """Makes the generators of a build write only some of their outputs.
+
+    The articles and pages generators pass their outputs through an
+    `OutputFilter`. Every other generator, such as that of static files, only
+    writes its outputs if the build writes shared outputs.
+
+    Args:
+        generators: The generators of the build, once they have read the
+            content.
+        writes: Checks whether the build writes the output of an article or
+            page, or a shared output if given None.
+        writes_feed: Checks whether the build writes a feed of articles.
+        written: The list to which each page and feed written is added.
+    """
+    shared = writes(None)
+    for generator in generators:
+        if isinstance(generator, (ArticlesGenerator, PagesGenerator)):
+            generator.generate_output = _filtered(  # type: ignore[method-assign]
+                generator.generate_output, writes, writes_feed, written
+            )
+        elif not shared:
+            generator.generate_output = _skipped  # type: ignore[method-assign]
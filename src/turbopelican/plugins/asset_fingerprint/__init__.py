@@ -0,0 +1,16 @@
+"""A Pelican plugin which copies static files to fingerprinted paths.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "ASSETS_SETTING",
+    "MANIFEST_FILE",
+    "register",
+]
+
+from turbopelican.plugins.asset_fingerprint.asset_fingerprint import (
+    ASSETS_SETTING,
+    MANIFEST_FILE,
+    register,
+)
@@ -0,0 +1,300 @@
+"""Copies static files to fingerprinted paths, which may be cached forever.
+
+Browsers and CDNs cannot cache `theme/css/styles.css` for long, since it may
+change with the next build. Instead, each static file of the theme and of the
+content is hashed, and copied to a path containing its hash, such as
+`theme/css/styles.1a2b3c4d5e.css`. Templates link to the copy with the
+`asset_url` global, such as `{{ asset_url('theme/css/styles.css') }}`, and
+the mapping from each path to its copy is written to `asset-manifest.json`
+in the output directory. The hashes are recorded in `cache_path`, and files
+are only hashed again once their size or modification time changes. Builds
+with `--minify` minify each file as it is copied, and name the copy by the
+hash of the minified file.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "ASSETS_SETTING",
+    "MANIFEST_FILE",
+    "PLUGIN_NAME",
+    "AssetGenerator",
+    "fingerprinted",
+    "register",
+]
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pydantic
+from jinja2 import pass_context
+from pelican.generators import Generator
+from pelican.plugins import signals
+
+from turbopelican._utils.shared import hash_file
+from turbopelican.plugins._utils import (
+    MINIFY_SETTING,
+    copy_static_file,
+    is_enabled,
+    minified_static_file,
+    static_sources,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from jinja2.runtime import Context
+    from pelican import Pelican
+    from pelican.writers import Writer
+
+PLUGIN_NAME = "turbopelican.plugins.asset_fingerprint"
+"""The name by which the plugin is enabled in `plugins`."""
+
+ASSETS_SETTING = "TURBOPELICAN_ASSETS"
+"""The setting for the fingerprinted path of each static file, so that every
+output is rendered again by incremental builds once a static file changes."""
+
+MANIFEST_FILE = "asset-manifest.json"
+"""The name of the file in the output directory mapping each static file to
+its fingerprinted copy."""
+
+_CACHE_FILE = "turbopelican_assets.json"
+"""The name of the file in `cache_path` in which the hashes are stored."""
+
+_HASH_LENGTH = 10
+"""The number of hexadecimal digits of the hash in a fingerprinted path."""
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry(pydantic.BaseModel):
+    """The hash of a file, as of its last known size and modification time."""
+
+    hash: str
+    size: int
+    mtime_ns: int
+    minified: str | None = None
+    """The hash of the file once minified, if a build minified it."""
+
+
+class _Cache(pydantic.BaseModel):
+    """Records the hash of every static file."""
+
+    version: int = 1
+    sources: dict[str, _Entry] = pydantic.Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> _Cache:
+        """Loads the hashes recorded by the previous build.
+
+        Args:
+            path: The file in which the hashes are stored.
+
+        Returns:
+            The hashes, or none if they could not be read.
+        """
+        try:
+            return cls.model_validate_json(path.read_bytes())
+        except (OSError, pydantic.ValidationError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Persists the hashes for the next build.
+
+        Args:
+            path: The file in which the hashes are to be stored.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.model_dump_json())
+
+    def hash(self, path: str, previous: _Cache, settings: dict[str, Any]) -> str | None:
+        """Hashes a file, unless it is unchanged since the previous build.
+
+        Args:
+            path: The path to the file.
+            previous: The hashes recorded by the previous build.
+            settings: The settings of the build, which may minify the file.
+
+        Returns:
+            The hash of the file, once minified if the build minifies it, or
+            None if the file does not exist.
+        """
+        try:
+            status = os.stat(path)  # noqa: PTH116
+        except OSError:
+            return None
+        entry = previous.sources.get(path)
+        if entry is None or (entry.size, entry.mtime_ns) != (
+            status.st_size,
+            status.st_mtime_ns,
+        ):
+            digest = hash_file(path)
+            if digest is None:
+                return None
+            entry = _Entry(
+                hash=digest, size=status.st_size, mtime_ns=status.st_mtime_ns
+            )
+        self.sources[path] = entry
+        if settings.get(MINIFY_SETTING) is None:
+            return entry.hash
+        if entry.minified is None:
+            minified = minified_static_file(settings, path)
+            entry.minified = (
+                entry.hash if minified is None else hashlib.sha256(minified).hexdigest()
+            )
+        return entry.minified
+
+
+def fingerprinted(path: str, digest: str) -> str:
+    """Names the fingerprinted copy of a static file.
+
+    Args:
+        path: The path to the file in the output directory.
+        digest: The hash of the file.
+
+    Returns:
+        The path, with the start of the hash before its suffix.
+    """
+    directory, slash, name = path.rpartition("/")
+    stem, _, suffix = name.rpartition(".")
+    fingerprint = digest[:_HASH_LENGTH]
+    # Files without a suffix, such as `.htaccess`, are given one.
+    if not stem:
+        return f"{path}.{fingerprint}"
+    return f"{directory}{slash}{stem}.{fingerprint}.{suffix}"
+
+
+def _asset_url(assets: dict[str, str]) -> Callable[..., str]:
+    """Makes the `asset_url` global of the templates.
+
+    Args:
+        assets: The fingerprinted path of each static file, keyed by its path.
+
+    Returns:
+        The global, which links to the fingerprinted copy of a static file,
+        or to the file itself if it has no copy.
+    """
+    missing: set[str] = set()
+
+    @pass_context
+    def asset_url(context: Context, path: str) -> str:
+        path = path.lstrip("/")
+        if path not in assets and path not in missing:
+            logger.warning("asset_url: %s is not a static file", path)
+            missing.add(path)
+        return f"{context.get('SITEURL', '')}/{assets.get(path, path)}"
+
+    return asset_url
+
+
+class AssetGenerator(Generator):
+    """Copies each static file to its fingerprinted path."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Creates the generator, loading the hashes of the previous build.
+
+        Args:
+            args: The positional arguments of every generator.
+            kwargs: The keyword arguments of every generator.
+        """
+        super().__init__(*args, **kwargs)
+        self.cache_path = Path(self.settings["CACHE_PATH"]) / _CACHE_FILE
+        self.previous = _Cache.load(self.cache_path)
+        self.current = _Cache()
+        self.sources: dict[str, str] = {}
+        self.assets: dict[str, str] = {}
+
+    def fingerprint(self, generators: list[Generator]) -> None:
+        """Hashes every static file, once the content has been read.
+
+        Args:
+            generators: The generators of the build.
+        """
+        self.sources = static_sources(self.settings, generators)
+        for path, source in sorted(self.sources.items()):
+            digest = self.current.hash(source, self.previous, self.settings)
+            if digest is not None:
+                self.assets[path] = fingerprinted(path, digest)
+
+    def generate_output(self, writer: Writer) -> None:  # noqa: ARG002
+        """Copies the static files and writes the manifest.
+
+        Copies from previous builds which are no longer needed are removed.
+
+        Args:
+            writer: The writer of the build, which is not used.
+        """
+        manifest_path = Path(self.output_path, MANIFEST_FILE)
+        try:
+            previous = json.loads(manifest_path.read_text())
+        except (OSError, ValueError):
+            previous = {}
+        copied = 0
+        for path, copy in self.assets.items():
+            destination = Path(self.output_path, copy)
+            # The name of the copy changes with its contents, so an existing
+            # copy is up to date.
+            if not destination.exists():
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                source = self.sources[path]
+                minified = minified_static_file(self.settings, source)
+                copy_static_file(source, str(destination), minified)
+                copied += 1
+        for copy in set(previous.values()) - set(self.assets.values()):
+            Path(self.output_path, copy).unlink(missing_ok=True)
+
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(self.assets, indent=2, sort_keys=True))
+        self.current.save(self.cache_path)
+        logger.info(
+            "Fingerprinted %d static files, copying %d", len(self.assets), copied
+        )
+
+
+def _get_generators(pelican: Pelican) -> type[Generator] | None:
+    """Adds the generator which copies the static files, if enabled.
+
+    Args:
+        pelican: The Pelican build.
+
+    Returns:
+        The generator class, or None if the plugin is not enabled.
+    """
+    if not is_enabled(pelican.settings, PLUGIN_NAME):
+        return None
+    return AssetGenerator
+
+
+def _fingerprint_assets(generators: list[Generator]) -> None:
+    """Hashes the static files and adds `asset_url` to every template.
+
+    Args:
+        generators: The generators of the build.
+    """
+    asset_generator = next(
+        (
+            generator
+            for generator in generators
+            if isinstance(generator, AssetGenerator)
+        ),
+        None,
+    )
+    if asset_generator is None:
+        return
+    asset_generator.fingerprint(generators)
+    asset_generator.settings[ASSETS_SETTING] = asset_generator.assets
+    asset_url = _asset_url(asset_generator.assets)
+    for generator in generators:
+        generator.env.globals["asset_url"] = asset_url
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.get_generators.connect(_get_generators)
+    signals.all_generators_finalized.connect(_fingerprint_assets)
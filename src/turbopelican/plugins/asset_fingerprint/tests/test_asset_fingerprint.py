@@ -0,0 +1,103 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from turbopelican._utils.shared import hash_file
+from turbopelican.plugins.asset_fingerprint.asset_fingerprint import (
+    MANIFEST_FILE,
+    PLUGIN_NAME,
+    fingerprinted,
+)
+
+
+@pytest.fixture
+def site(site: Path) -> Path:
+    """Creates a site whose index links to a stylesheet of its theme.
+
+    Args:
+        site: The root of a site without content.
+
+    Returns:
+        The root of the site.
+    """
+    (site / "theme" / "templates" / "index.html").write_text(
+        "<link href=\"{{ asset_url('theme/css/styles.css') }}\">\n"
+        "<img src=\"{{ asset_url('/images/logo.svg') }}\">"
+    )
+    (site / "theme" / "static" / "css").mkdir(parents=True)
+    (site / "theme" / "static" / "css" / "styles.css").write_text("body {}")
+    (site / "content" / "images").mkdir()
+    (site / "content" / "images" / "logo.svg").write_text("<svg></svg>")
+    return site
+
+
+@pytest.fixture
+def settings() -> dict[str, Any]:
+    """Provides the settings with which the site is built.
+
+    Returns:
+        The settings enabling the plugin.
+    """
+    return {
+        "PLUGINS": [PLUGIN_NAME],
+        "SITEURL": "https://example.com",
+        "STATIC_PATHS": ["images"],
+    }
+
+
+def test_fingerprinted() -> None:
+    """Check the hash is inserted before the suffix of a path."""
+    digest = "0123456789abcdef"
+    assert fingerprinted("theme/css/styles.css", digest) == (
+        "theme/css/styles.0123456789.css"
+    )
+    assert fingerprinted("js/app.min.js", digest) == "js/app.min.0123456789.js"
+    assert fingerprinted("LICENSE", digest) == "LICENSE.0123456789"
+    assert fingerprinted(".htaccess", digest) == ".htaccess.0123456789"
+
+
+def test_asset_url(site: Path, build: Callable[..., None]) -> None:
+    """Check templates link to fingerprinted copies of static files.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+    """
+    build()
+    output = site / "output"
+    digest = hash_file(site / "theme" / "static" / "css" / "styles.css") or ""
+    stylesheet = f"theme/css/styles.{digest[:10]}.css"
+    manifest = json.loads((output / MANIFEST_FILE).read_text())
+    assert manifest["theme/css/styles.css"] == stylesheet
+    assert (output / stylesheet).read_text() == "body {}"
+    assert (output / "theme" / "css" / "styles.css").exists()
+    logo = manifest["images/logo.svg"]
+    assert (output / logo).read_text() == "<svg></svg>"
+    index = (output / "index.html").read_text()
+    assert f'href="https://example.com/{stylesheet}"' in index
+    assert f'src="https://example.com/{logo}"' in index
+
+
+def test_asset_url_changed(site: Path, build: Callable[..., None]) -> None:
+    """Check a changed static file is copied again, and its old copy removed.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+    """
+    build()
+    output = site / "output"
+    previous = json.loads((output / MANIFEST_FILE).read_text())
+    (site / "theme" / "static" / "css" / "styles.css").write_text("main {}")
+    build()
+    current = json.loads((output / MANIFEST_FILE).read_text())
+    assert current["theme/css/styles.css"] != previous["theme/css/styles.css"]
+    assert current["images/logo.svg"] == previous["images/logo.svg"]
+    assert not (output / previous["theme/css/styles.css"]).exists()
+    assert (output / current["theme/css/styles.css"]).read_text() == "main {}"
+    assert current["theme/css/styles.css"] in (output / "index.html").read_text()
@@ -0,0 +1,14 @@
+"""A Pelican plugin which writes outputs to disk in a pool of threads.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "ConcurrentWriter",
+    "register",
+]
+
+from turbopelican.plugins.concurrent_writer.concurrent_writer import (
+    ConcurrentWriter,
+    register,
+)
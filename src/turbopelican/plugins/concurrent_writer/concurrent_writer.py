@@ -0,0 +1,215 @@
+"""Writes the outputs of Pelican to disk in a pool of threads.
+
+Pelican writes each output as soon as it has been rendered, so rendering waits
+on the disk, which can be slow on network-backed disks such as those of CI
+runners. Outputs are instead rendered into memory and handed to a bounded pool
+of threads, which writes them while Pelican renders the next. Outputs whose
+bytes are the same as those already on disk are not written again, leaving
+their modification times as they were.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "PLUGIN_NAME",
+    "ConcurrentWriter",
+    "register",
+]
+
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from pelican.plugins import signals
+
+from turbopelican.plugins._utils import is_enabled, report
+from turbopelican.plugins._writers import DeferringWriter, file_matches
+
+if TYPE_CHECKING:
+    from pelican import Pelican
+    from pelican.writers import Writer
+
+PLUGIN_NAME = "turbopelican.plugins.concurrent_writer"
+"""The name by which the plugin is enabled in `plugins`."""
+
+WORKERS_SETTING = "TURBOPELICAN_WRITE_WORKERS"
+"""The setting for the number of threads writing outputs."""
+
+_INCREMENTAL_PLUGIN = "turbopelican.plugins.incremental"
+"""The plugin whose writer also writes in a pool of threads, if enabled."""
+
+_MEMORY_PLUGIN = "turbopelican.plugins.memory_output"
+"""The plugin whose writer keeps outputs in memory instead, if enabled."""
+
+_QUEUED_PER_WORKER = 4
+"""How many rendered outputs may wait for each thread before rendering waits."""
+
+_MEBIBYTE = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def _default_workers() -> int:
+    """Chooses the number of threads, as Python's own thread pools do.
+
+    Returns:
+        The number of threads.
+    """
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class ConcurrentWriter(DeferringWriter):
+    """Writes outputs in a bounded pool of threads."""
+
+    def __init__(
+        self, output_path: str, settings: dict[str, Any] | None = None
+    ) -> None:
+        """Creates the writer and starts its threads.
+
+        Args:
+            output_path: The directory in which to write the outputs.
+            settings: The settings of the Pelican build.
+        """
+        super().__init__(output_path, settings=settings)
+        self.workers: int = self.settings.get(WORKERS_SETTING) or _default_workers()
+        self.files_written = 0
+        self.files_unchanged = 0
+        self.bytes_written = 0
+        self.busy_seconds = 0.0
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="turbopelican-writer"
+        )
+        self._slots = threading.BoundedSemaphore(self.workers * _QUEUED_PER_WORKER)
+        self._lock = threading.Lock()
+        self._pending: dict[str, concurrent.futures.Future[None]] = {}
+        self._directories: set[str] = set()
+        self._active = 0
+        self._busy_since = 0.0
+        self._finished = False
+        _active_writers[str(output_path)] = self
+
+    def submit(self, path: str, data: bytes) -> None:
+        """Writes an output in the pool, waiting if too many are queued.
+
+        Args:
+            path: The path to the output.
+            data: The bytes of the output.
+        """
+        previous = self._pending.pop(path, None)
+        if previous is not None:
+            # An output written twice must be written in order.
+            previous.result()
+        self._slots.acquire()
+        try:
+            self._pending[path] = self._executor.submit(self._write, path, data)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _write(self, path: str, data: bytes) -> None:
+        """Writes an output in one of the threads.
+
+        Args:
+            path: The path to the output.
+            data: The bytes of the output.
+        """
+        with self._lock:
+            if not self._active:
+                self._busy_since = time.perf_counter()
+            self._active += 1
+        try:
+            directory = os.path.dirname(path)  # noqa: PTH120
+            if directory not in self._directories:
+                os.makedirs(directory, exist_ok=True)  # noqa: PTH103
+                self._directories.add(directory)
+            if file_matches(path, data):
+                with self._lock:
+                    self.files_unchanged += 1
+                return
+            with open(path, "wb") as output:  # noqa: PTH123
+                output.write(data)
+            with self._lock:
+                self.files_written += 1
+                self.bytes_written += len(data)
+        finally:
+            with self._lock:
+                self._active -= 1
+                if not self._active:
+                    self.busy_seconds += time.perf_counter() - self._busy_since
+            self._slots.release()
+
+    def flush(self) -> None:
+        """Waits for every queued output to be written.
+
+        Raises:
+            OSError: An output could not be written.
+        """
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.result()
+
+    def finish(self) -> None:
+        """Writes every queued output, stops the threads and reports on them."""
+        if self._finished:
+            return
+        self._finished = True
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            _active_writers.pop(str(self.output_path), None)
+        throughput = self.bytes_written / self.busy_seconds if self.busy_seconds else 0
+        report(
+            self.settings,
+            f"Concurrent writing: wrote {self.files_written} files "
+            f"({self.bytes_written / _MEBIBYTE:.1f} MiB at "
+            f"{throughput / _MEBIBYTE:.1f} MiB/s) in {self.workers} threads, "
+            f"skipped {self.files_unchanged} unchanged",
+        )
+
+
+_active_writers: dict[str, ConcurrentWriter] = {}
+"""The writer of each build in progress, keyed by output directory."""
+
+
+def _get_writer(pelican: Pelican) -> type[Writer] | None:
+    """Provides the concurrent writer to Pelican.
+
+    Args:
+        pelican: The Pelican build.
+
+    Returns:
+        The writer class, if the plugin is enabled and neither the incremental
+        plugin, which then provides a writer which is both, nor the memory
+        output plugin, which writes nothing to disk, is.
+    """
+    settings = pelican.settings
+    if not is_enabled(settings, PLUGIN_NAME):
+        return None
+    if is_enabled(settings, _INCREMENTAL_PLUGIN) or is_enabled(
+        settings, _MEMORY_PLUGIN
+    ):
+        return None
+    return ConcurrentWriter
+
+
+def _finish(pelican: Pelican) -> None:
+    """Finishes writing once Pelican has rendered every output.
+
+    Args:
+        pelican: The Pelican build.
+    """
+    writer = _active_writers.get(str(pelican.output_path))
+    if writer is not None:
+        writer.finish()
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.get_writer.connect(_get_writer)
+    signals.finalized.connect(_finish)
@@ -0,0 +1,176 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from turbopelican.plugins._utils import pop_reports
+from turbopelican.plugins.concurrent_writer.concurrent_writer import (
+    PLUGIN_NAME,
+    WORKERS_SETTING,
+    ConcurrentWriter,
+)
+from turbopelican.plugins.incremental.incremental import (
+    PLUGIN_NAME as INCREMENTAL_PLUGIN_NAME,
+)
+from turbopelican.plugins.incremental.incremental import IncrementalWriter
+
+_ARTICLES = 8
+
+
+@pytest.fixture
+def site(site: Path) -> Path:
+    """Creates a site with several articles and a minimal theme.
+
+    Args:
+        site: The root of a site without content.
+
+    Returns:
+        The root of the site.
+    """
+    templates = site / "theme" / "templates"
+    (templates / "article.html").write_text("<p>{{ article.content }}</p>\n")
+    (templates / "index.html").write_text(
+        "{% for article in articles %}{{ article.title }}\n{% endfor %}"
+    )
+    for index in range(_ARTICLES):
+        (site / "content" / f"article{index}.md").write_text(
+            f"Title: Article {index}\nDate: 2024-01-01\nTags: shared\n\n"
+            f"Body of article {index}.\n"
+        )
+    return site
+
+
+@pytest.fixture
+def settings() -> dict[str, Any]:
+    """Provides the settings with which the site is built.
+
+    Returns:
+        The settings shared by every build, whichever plugins are enabled.
+    """
+    return {
+        "ARTICLE_SAVE_AS": "{slug}/index.html",
+        "FEED_ALL_ATOM": "feeds/all.atom.xml",
+        WORKERS_SETTING: 4,
+    }
+
+
+def _build(
+    build: Callable[..., None], output: Path, plugins: list[str]
+) -> ConcurrentWriter | None:
+    """Builds the site.
+
+    Args:
+        build: Builds the site.
+        output: The output directory.
+        plugins: The plugins to be enabled.
+
+    Returns:
+        The concurrent writer which built the site, if there was one.
+    """
+    with mock.patch.object(
+        ConcurrentWriter,
+        "finish",
+        autospec=True,
+        side_effect=ConcurrentWriter.finish,
+    ) as finish:
+        build(OUTPUT_PATH=str(output), PLUGINS=plugins)
+    return finish.call_args.args[0] if finish.called else None
+
+
+def _outputs(directory: Path) -> dict[str, bytes]:
+    """Reads every file in an output directory.
+
+    Args:
+        directory: The output directory.
+
+    Returns:
+        The bytes of each file, by its path relative to the directory.
+    """
+    return {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in directory.rglob("*")
+        if path.is_file()
+    }
+
+
+def test_same_output(site: Path, build: Callable[..., None]) -> None:
+    """Tests that outputs written in threads are the same as when written directly.
+
+    Args:
+        site: The root of a site with several articles.
+        build: Builds the site.
+    """
+    assert _build(build, site / "sequential", []) is None
+    writer = _build(build, site / "concurrent", [PLUGIN_NAME])
+    assert writer is not None
+
+    sequential = _outputs(site / "sequential")
+    assert _outputs(site / "concurrent") == sequential
+    assert writer.files_written == len(sequential)
+    assert writer.bytes_written == sum(map(len, sequential.values()))
+    assert not writer.files_unchanged
+    assert writer.busy_seconds > 0
+    (summary,) = pop_reports(str(site / "concurrent"))
+    assert summary.startswith(f"Concurrent writing: wrote {writer.files_written} files")
+    assert summary.endswith("in 4 threads, skipped 0 unchanged")
+
+
+def test_unchanged_outputs(site: Path, build: Callable[..., None]) -> None:
+    """Tests that outputs whose bytes are unchanged are not written again.
+
+    Args:
+        site: The root of a site with several articles.
+        build: Builds the site.
+    """
+    first = _build(build, site / "output", [PLUGIN_NAME])
+    assert first is not None
+    article = site / "output" / "article-0" / "index.html"
+    modified = article.stat().st_mtime_ns
+    (site / "content" / "article1.md").write_text(
+        "Title: Article 1\nDate: 2024-01-01\nTags: shared\n\nChanged.\n"
+    )
+
+    second = _build(build, site / "output", [PLUGIN_NAME])
+    assert second is not None
+    assert second.files_written < first.files_written
+    assert second.files_written + second.files_unchanged == first.files_written
+    assert article.stat().st_mtime_ns == modified
+    assert "Changed." in (site / "output" / "article-1" / "index.html").read_text()
+
+
+def test_with_incremental(site: Path, build: Callable[..., None]) -> None:
+    """Tests that incremental builds also write in threads.
+
+    Args:
+        site: The root of a site with several articles.
+        build: Builds the site.
+    """
+    plugins = [INCREMENTAL_PLUGIN_NAME, PLUGIN_NAME]
+    writer = _build(build, site / "output", plugins)
+    assert isinstance(writer, IncrementalWriter)
+    assert writer.files_written == len(_outputs(site / "output"))
+
+    (site / "content" / "article0.md").write_text(
+        "Title: Article 0\nDate: 2024-01-01\nTags: shared\n\nChanged.\n"
+    )
+    writer = _build(build, site / "output", plugins)
+    assert isinstance(writer, IncrementalWriter)
+    assert writer.skipped
+    assert "Changed." in (site / "output" / "article-0" / "index.html").read_text()
+    assert (site / "cache" / "turbopelican_incremental.json").exists()
+
+
+def test_write_error(site: Path, build: Callable[..., None]) -> None:
+    """Tests that the build fails if an output cannot be written.
+
+    Args:
+        site: The root of a site with several articles.
+        build: Builds the site.
+    """
+    (site / "output" / "article-0" / "index.html").mkdir(parents=True)
+    with pytest.raises(IsADirectoryError):
+        _build(build, site / "output", [PLUGIN_NAME])
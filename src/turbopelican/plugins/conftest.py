@@ -0,0 +1,101 @@
+"""Fixtures shared by the tests of the plugins.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+_TEMPLATES = [
+    "archives.html",
+    "article.html",
+    "author.html",
+    "authors.html",
+    "categories.html",
+    "category.html",
+    "index.html",
+    "page.html",
+    "period_archives.html",
+    "tag.html",
+    "tags.html",
+]
+"""The templates which Pelican requires of every theme."""
+
+
+@pytest.fixture
+def site(tmp_path: Path) -> Path:
+    """Creates a site without content, whose theme renders every page empty.
+
+    Tests add their own content, and replace whichever templates they need.
+
+    Args:
+        tmp_path: A temporary directory in which to store the site.
+
+    Returns:
+        The root of the site.
+    """
+    templates = tmp_path / "theme" / "templates"
+    templates.mkdir(parents=True)
+    for template in _TEMPLATES:
+        (templates / template).touch()
+    (tmp_path / "content").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def settings() -> dict[str, Any]:
+    """Provides the settings with which every site of a test module is built.
+
+    Test modules override this fixture to enable the plugin they test.
+
+    Returns:
+        The settings, beyond those of the site itself.
+    """
+    return {}
+
+
+@pytest.fixture
+def build(site: Path, settings: dict[str, Any]) -> Callable[..., None]:
+    """Provides a function which builds the site with Pelican.
+
+    Args:
+        site: The root of the site.
+        settings: The settings with which the site is built.
+
+    Returns:
+        A function taking any further settings for a single build. The site is
+        built from `content` into `output`, with its own theme and cache, and
+        without feeds, unless the settings say otherwise.
+    """
+    pytest.importorskip("pelican")
+
+    from pelican import Pelican  # noqa: PLC0415
+    from pelican.settings import read_settings  # noqa: PLC0415
+
+    def build(**overrides: Any) -> None:  # noqa: ANN401
+        """Builds the site with Pelican.
+
+        Args:
+            overrides: The settings specific to this build.
+        """
+        override = {
+            "PATH": str(site / "content"),
+            "OUTPUT_PATH": str(site / "output"),
+            "CACHE_PATH": str(site / "cache"),
+            "THEME": str(site / "theme"),
+            "TIMEZONE": "UTC",
+            "FEED_ALL_ATOM": None,
+            "CATEGORY_FEED_ATOM": None,
+            **settings,
+            **overrides,
+        }
+        Pelican(read_settings(override=override)).run()
+
+    return build
@@ -0,0 +1,16 @@
+"""A Pelican plugin which inlines the stylesheets each page uses.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "LIMIT_SETTING",
+    "STYLESHEETS_SETTING",
+    "register",
+]
+
+from turbopelican.plugins.critical_css.critical_css import (
+    LIMIT_SETTING,
+    STYLESHEETS_SETTING,
+    register,
+)
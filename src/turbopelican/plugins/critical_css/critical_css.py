@@ -0,0 +1,540 @@
+"""Inlines the stylesheets of each page, so that rendering does not wait on them.
+
+A `<link rel="stylesheet">` in the `<head>` of a page blocks rendering until
+the stylesheet has been downloaded. Stylesheets no larger than
+`TURBOPELICAN_INLINE_CSS_LIMIT` bytes are instead copied into a `<style>`
+element. Larger stylesheets are reduced to the rules whose selectors could
+match an element of the page, which are inlined, and the whole stylesheet is
+loaded without blocking rendering. The rules are chosen once per template and
+stylesheet, from the first page rendered with that template, so that each
+other page only has its `<link>` replaced. Relative URLs in the inlined rules
+are rewritten to be relative to the page.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "LIMIT_SETTING",
+    "PLUGIN_NAME",
+    "STYLESHEETS_SETTING",
+    "CssInliner",
+    "register",
+]
+
+import logging
+import posixpath
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote, urljoin, urlsplit
+
+from jinja2 import Template
+from pelican.plugins import signals
+
+from turbopelican._utils.shared import hash_file
+from turbopelican.plugins._utils import is_enabled, static_sources
+from turbopelican.plugins.asset_fingerprint import ASSETS_SETTING
+
+if TYPE_CHECKING:
+    from pelican.generators import Generator
+
+PLUGIN_NAME = "turbopelican.plugins.critical_css"
+"""The name by which the plugin is enabled in `plugins`."""
+
+LIMIT_SETTING = "TURBOPELICAN_INLINE_CSS_LIMIT"
+"""The setting for the size in bytes up to which a stylesheet is inlined in
+full."""
+
+STYLESHEETS_SETTING = "TURBOPELICAN_STYLESHEETS"
+"""The setting for the hash of each stylesheet, so that every output is
+rendered again by incremental builds once a stylesheet changes."""
+
+_DEFAULT_LIMIT = 8 * 1024
+"""The size in bytes up to which a stylesheet is inlined in full, by default."""
+
+_CSS_TOKENS = re.compile(
+    r"""(?P<comment>/\*.*?(?:\*/|$))"""
+    r"""|(?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""
+    r"""|(?P<open>\{)|(?P<close>\})|(?P<semicolon>;)""",
+    re.DOTALL,
+)
+"""Matches the parts of a stylesheet which delimit its rules."""
+
+_CSS_URL = re.compile(
+    r"""(?P<prefix>url\(\s*|@import\s+)(?P<quote>["']?)(?P<url>[^"')\s]*)(?P=quote)""",
+    re.IGNORECASE,
+)
+"""Matches a URL in a stylesheet."""
+
+_GROUPING_RULES = frozenset({"@container", "@layer", "@media", "@supports"})
+"""The at-rules containing other rules, which are reduced in turn."""
+
+_HTML_TAG = re.compile(r"<([a-zA-Z][^\s/>]*)([^>]*)>")
+"""Matches the opening tag of an HTML element."""
+
+_HTML_ATTRIBUTE = re.compile(
+    r"""([^\s"'=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?"""
+)
+"""Matches an attribute of an HTML element, and its value."""
+
+_LINK = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+"""Matches a `<link>` tag."""
+
+_HEAD_END = re.compile(r"</head\s*>|<body\b", re.IGNORECASE)
+"""Matches the end of the `<head>` of a page."""
+
+_SELECTOR_ATTRIBUTE = re.compile(r"\[\s*(?:[\w*-]*\|)?([\w-]+)[^\]]*\]")
+"""Matches an attribute selector, capturing the name of the attribute."""
+
+_SELECTOR_ARGUMENTS = re.compile(r"\([^()]*\)")
+"""Matches the innermost arguments of a pseudo-class, such as `:not(.a)`."""
+
+_SELECTOR_PSEUDO = re.compile(r"(?<!\\)::?[\w-]+")
+"""Matches a pseudo-class or pseudo-element, such as `:hover`."""
+
+_SELECTOR_NAME = re.compile(r"([.#]?)((?:\\.|[\w-])+)")
+"""Matches a class, an ID or a type in a selector."""
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _Inlined:
+    """What replaces the `<link>` tag of a stylesheet in a template's pages."""
+
+    # The rules copied into a `<style>` element, if any.
+    rules: str
+    # Whether the whole stylesheet is still loaded, without blocking rendering.
+    deferred: bool
+
+
+@dataclass
+class _Page:
+    """The names an element of a page could be selected by."""
+
+    types: set[str] = field(default_factory=set)
+    classes: set[str] = field(default_factory=set)
+    ids: set[str] = field(default_factory=set)
+    attributes: set[str] = field(default_factory=set)
+
+    @classmethod
+    def scan(cls, html: str) -> _Page:
+        """Finds the elements of a page.
+
+        Args:
+            html: The page.
+
+        Returns:
+            The names of the elements.
+        """
+        page = cls()
+        for tag in _HTML_TAG.finditer(html):
+            page.types.add(tag[1].lower())
+            for attribute in _HTML_ATTRIBUTE.finditer(tag[2]):
+                name = attribute[1].lower()
+                value = attribute[2] or attribute[3] or attribute[4] or ""
+                page.attributes.add(name)
+                if name == "class":
+                    page.classes.update(value.split())
+                elif name == "id":
+                    page.ids.add(value)
+        return page
+
+    def could_match(self, selector: str) -> bool:
+        """Checks whether a selector could match an element of the page.
+
+        Only the names in the selector are compared, without regard to how
+        they are combined, so a selector may be wrongly thought to match, but
+        never wrongly thought not to.
+
+        Args:
+            selector: A complex selector, such as `nav > a.active:hover`.
+
+        Returns:
+            Whether the page has every name in the selector.
+        """
+        names = selector
+        for attribute in _SELECTOR_ATTRIBUTE.finditer(selector):
+            if attribute[1].lower() not in self.attributes:
+                return False
+        names = _SELECTOR_ATTRIBUTE.sub(" ", names)
+        while "(" in names:
+            reduced = _SELECTOR_ARGUMENTS.sub("", names)
+            if reduced == names:
+                return True
+            names = reduced
+        names = _SELECTOR_PSEUDO.sub(" ", names)
+        for kind, escaped in _SELECTOR_NAME.findall(names):
+            name = escaped.replace("\\", "")
+            if kind == ".":
+                found = name in self.classes
+            elif kind == "#":
+                found = name in self.ids
+            else:
+                found = name.lower() in self.types
+            if not found:
+                return False
+        return True
+
+
+def _split_rules(css: str) -> list[tuple[str, str | None]]:
+    """Splits a stylesheet into its rules, without comments.
+
+    Args:
+        css: The stylesheet.
+
+    Returns:
+        The prelude and block of each rule, or its prelude alone for
+        statements such as `@import`.
+    """
+    rules: list[tuple[str, str | None]] = []
+    prelude: list[str] = []
+    depth = 0
+    position = 0
+    block_start = 0
+    for match in _CSS_TOKENS.finditer(css):
+        if depth == 0:
+            prelude.append(css[position : match.start()])
+        kind = match.lastgroup
+        if kind == "string" and depth == 0:
+            prelude.append(match[0])
+        elif kind == "open":
+            if depth == 0:
+                block_start = match.end()
+            depth += 1
+        elif kind == "close" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                rules.append(
+                    ("".join(prelude).strip(), css[block_start : match.start()])
+                )
+                prelude = []
+        elif kind == "semicolon" and depth == 0:
+            rules.append(("".join(prelude).strip(), None))
+            prelude = []
+        position = match.end()
+    return rules
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    """Splits a selector list into its selectors.
+
+    Args:
+        prelude: The selector list, such as `h1, h2:is(.a, .b)`.
+
+    Returns:
+        Each selector of the list.
+    """
+    selectors: list[str] = []
+    depth = 0
+    start = 0
+    for index, character in enumerate(prelude):
+        if character in "([":
+            depth += 1
+        elif character in ")]":
+            depth -= 1
+        elif character == "," and depth == 0:
+            selectors.append(prelude[start:index])
+            start = index + 1
+    selectors.append(prelude[start:])
+    return selectors
+
+
+def _strip_comments(css: str) -> str:
+    """Removes the comments from a block of declarations.
+
+    Args:
+        css: The declarations.
+
+    Returns:
+        The declarations, without comments.
+    """
+    return _CSS_TOKENS.sub(
+        lambda match: "" if match.lastgroup == "comment" else match[0], css
+    ).strip()
+
+
+def _critical_rules(css: str, page: _Page) -> str:
+    """Reduces a stylesheet to the rules which could apply to a page.
+
+    At-rules such as `@font-face` are kept, while statements such as
+    `@import` are left to the whole stylesheet.
+
+    Args:
+        css: The stylesheet.
+        page: The elements of the page.
+
+    Returns:
+        The rules which could apply to the page.
+    """
+    rules: list[str] = []
+    for prelude, block in _split_rules(css):
+        if block is None:
+            continue
+        if prelude.startswith("@"):
+            keyword = re.split(r"[\s(]", prelude, maxsplit=1)[0].lower()
+            if keyword in _GROUPING_RULES:
+                inner = _critical_rules(block, page)
+                if inner:
+                    rules.append(f"{prelude}{{{inner}}}")
+            elif keyword != "@page":
+                rules.append(f"{prelude}{{{_strip_comments(block)}}}")
+        elif any(page.could_match(selector) for selector in _split_selectors(prelude)):
+            rules.append(f"{prelude}{{{_strip_comments(block)}}}")
+    return "".join(rules)
+
+
+def _rebase(css: str, href: str) -> str:
+    """Rewrites the relative URLs of a stylesheet to be relative to a page.
+
+    Args:
+        css: The stylesheet.
+        href: The URL of the stylesheet, relative to the page.
+
+    Returns:
+        The stylesheet, with each relative URL rewritten.
+    """
+
+    def rebase(match: re.Match[str]) -> str:
+        url = match["url"]
+        if not url or url.startswith(("/", "#")) or urlsplit(url).scheme:
+            return match[0]
+        if urlsplit(href).scheme or href.startswith("/"):
+            url = urljoin(href, url)
+        else:
+            url = posixpath.normpath(posixpath.join(posixpath.dirname(href), url))
+        quote = match["quote"]
+        return f"{match['prefix']}{quote}{url}{quote}"
+
+    return _CSS_URL.sub(rebase, css)
+
+
+def _attributes(tag: str) -> dict[str, str]:
+    """Reads the attributes of an HTML tag.
+
+    Args:
+        tag: The tag, such as `<link rel="stylesheet">`.
+
+    Returns:
+        The value of each attribute, keyed by its name.
+    """
+    attributes: dict[str, str] = {}
+    for attribute in _HTML_ATTRIBUTE.finditer(tag[1:-1].rstrip("/")):
+        value = attribute[2] or attribute[3] or attribute[4] or ""
+        attributes[attribute[1].lower()] = value
+    return attributes
+
+
+def _deferred(tag: str) -> str:
+    """Loads a stylesheet without blocking rendering.
+
+    Args:
+        tag: The `<link>` tag of the stylesheet.
+
+    Returns:
+        The tag, which only applies once the stylesheet has loaded, followed
+        by the tag itself for browsers without JavaScript.
+    """
+    opening = tag[:-1].rstrip("/ ")
+    return (
+        f'{opening} media="print" onload="this.media=\'all\'">'
+        f"<noscript>{tag}</noscript>"
+    )
+
+
+class CssInliner:
+    """Inlines the stylesheets of each page, choosing rules once per template."""
+
+    def __init__(self, settings: dict[str, Any], sources: dict[str, str]) -> None:
+        """Creates the inliner.
+
+        Args:
+            settings: The settings of the build.
+            sources: The source of each static file, keyed by its path in the
+                output directory.
+        """
+        self.settings = settings
+        self.sources = sources
+        self.limit = settings.get(LIMIT_SETTING, _DEFAULT_LIMIT)
+        self._stylesheets: dict[str, str | None] = {}
+        self._inlined: dict[tuple[str | None, str], _Inlined | None] = {}
+        self._fingerprints_read = False
+
+    def _stylesheet(self, path: str) -> str | None:
+        """Reads a stylesheet of the website.
+
+        Args:
+            path: The path to the stylesheet in the output directory.
+
+        Returns:
+            The stylesheet, or None if it is not a static file.
+        """
+        if not self._fingerprints_read:
+            # The fingerprinted copies are only known once every plugin has
+            # seen the generators, so they are found on the first render.
+            for original, copy in (self.settings.get(ASSETS_SETTING) or {}).items():
+                if original in self.sources:
+                    self.sources.setdefault(copy, self.sources[original])
+            self._fingerprints_read = True
+        if path not in self._stylesheets:
+            source = self.sources.get(path)
+            try:
+                css = None if source is None else Path(source).read_text("utf-8")
+            except (OSError, UnicodeDecodeError):
+                css = None
+            if source is None or css is None:
+                logger.warning("critical_css: %s is not a static file", path)
+            self._stylesheets[path] = css
+        return self._stylesheets[path]
+
+    def _output_path(self, href: str, siteurl: str) -> str | None:
+        """Finds the path to a stylesheet in the output directory.
+
+        Args:
+            href: The URL of the stylesheet.
+            siteurl: The URL of the website, as seen by the page.
+
+        Returns:
+            The path, or None if the stylesheet is hosted elsewhere.
+        """
+        if siteurl and href.startswith(f"{siteurl}/"):
+            path = href[len(siteurl) + 1 :]
+        elif urlsplit(href).scheme or href.startswith("//"):
+            return None
+        else:
+            path = href.lstrip("/")
+        return posixpath.normpath(unquote(urlsplit(path).path))
+
+    def _inline(
+        self, template: str | None, tag: str, html: str, siteurl: str
+    ) -> str | None:
+        """Chooses what replaces the `<link>` tag of a stylesheet.
+
+        Args:
+            template: The name of the template of the page.
+            tag: The `<link>` tag.
+            html: The page, from which rules are chosen for its template.
+            siteurl: The URL of the website, as seen by the page.
+
+        Returns:
+            The replacement, or None if the tag is kept.
+        """
+        attributes = _attributes(tag)
+        href = attributes.get("href")
+        if (
+            not href
+            or "stylesheet" not in attributes.get("rel", "").lower().split()
+            or "alternate" in attributes.get("rel", "").lower().split()
+            or attributes.get("media", "all").strip().lower() != "all"
+        ):
+            return None
+        key = (template, href)
+        if key not in self._inlined:
+            self._inlined[key] = self._choose(href, html, siteurl)
+        inlined = self._inlined[key]
+        if inlined is None:
+            return None
+        style = f"<style>{inlined.rules}</style>" if inlined.rules else ""
+        return style + _deferred(tag) if inlined.deferred else style
+
+    def _choose(self, href: str, html: str, siteurl: str) -> _Inlined | None:
+        """Chooses the rules of a stylesheet to be inlined for a template.
+
+        Args:
+            href: The URL of the stylesheet.
+            html: The first page rendered with the template.
+            siteurl: The URL of the website, as seen by the page.
+
+        Returns:
+            The rules to be inlined, or None if the tag is kept.
+        """
+        path = self._output_path(href, siteurl)
+        css = None if path is None else self._stylesheet(path)
+        if css is None or re.search(r"</style", css, re.IGNORECASE):
+            return None
+        if len(css.encode()) <= self.limit:
+            return _Inlined(rules=_rebase(css, href).strip(), deferred=False)
+        rules = _critical_rules(css, _Page.scan(html))
+        return _Inlined(rules=_rebase(rules, href), deferred=True)
+
+    def inline(self, html: str, template: str | None, siteurl: str) -> str:
+        """Inlines the stylesheets linked from the `<head>` of a page.
+
+        Args:
+            html: The page.
+            template: The name of the template of the page.
+            siteurl: The URL of the website, as seen by the page.
+
+        Returns:
+            The page, with its stylesheets inlined.
+        """
+        end = _HEAD_END.search(html)
+        if end is None:
+            return html
+        head = html[: end.start()]
+
+        def replace(match: re.Match[str]) -> str:
+            inlined = self._inline(template, match[0], html, siteurl)
+            return match[0] if inlined is None else inlined
+
+        return _LINK.sub(replace, head) + html[end.start() :]
+
+
+def _template_class(inliner: CssInliner) -> type[Template]:
+    """Makes a class of template whose pages have their stylesheets inlined.
+
+    Args:
+        inliner: The inliner of the build.
+
+    Returns:
+        The class of template.
+    """
+
+    class InliningTemplate(Template):
+        def render(self, *args: Any, **kwargs: Any) -> str:  # noqa: ANN401
+            html = super().render(*args, **kwargs)
+            siteurl = dict(*args, **kwargs).get("SITEURL") or ""
+            return inliner.inline(html, self.name, siteurl)
+
+    return InliningTemplate
+
+
+def _hash_stylesheets(sources: dict[str, str]) -> dict[str, str | None]:
+    """Hashes every stylesheet of the website.
+
+    Args:
+        sources: The source of each static file, keyed by its path in the
+            output directory.
+
+    Returns:
+        The hash of each stylesheet, keyed by its path.
+    """
+    return {
+        path: hash_file(source)
+        for path, source in sorted(sources.items())
+        if path.endswith(".css")
+    }
+
+
+def _inline_stylesheets(generators: list[Generator]) -> None:
+    """Has every template inline the stylesheets of its pages.
+
+    Args:
+        generators: The generators of the build.
+    """
+    if not generators or not is_enabled(generators[0].settings, PLUGIN_NAME):
+        return
+    settings = generators[0].settings
+    sources = static_sources(settings, generators)
+    settings[STYLESHEETS_SETTING] = _hash_stylesheets(sources)
+    template_class = _template_class(CssInliner(settings, sources))
+    for generator in generators:
+        generator.env.template_class = template_class
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.all_generators_finalized.connect(_inline_stylesheets)
@@ -0,0 +1,145 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from turbopelican.plugins.critical_css.critical_css import (
+    LIMIT_SETTING,
+    PLUGIN_NAME,
+    _critical_rules,
+    _Page,
+    _rebase,
+)
+
+_STYLESHEET = """/*! Licence */
+@import "print.css" print;
+body { margin: 0 }
+.unused, nav > a.active:hover { color: red; /* Highlighted */ }
+.note { background: url("../images/note.png") }
+@media (min-width: 40em) { .note { padding: 1em } .unused { padding: 0 } }
+@font-face { font-family: Body; src: url(fonts/body.woff2) }
+"""
+
+
+@pytest.fixture
+def site(site: Path) -> Path:
+    """Creates a site whose pages link to a stylesheet of its theme.
+
+    Args:
+        site: The root of a site without content.
+
+    Returns:
+        The root of the site.
+    """
+    (site / "theme" / "templates" / "page.html").write_text(
+        "<html><head>"
+        '<link rel="stylesheet" href="{{ SITEURL }}/theme/css/styles.css">'
+        "</head><body>{{ page.content }}</body></html>"
+    )
+    (site / "theme" / "static" / "css").mkdir(parents=True)
+    (site / "theme" / "static" / "css" / "styles.css").write_text(_STYLESHEET)
+    content = site / "content"
+    (content / "first.html").write_text(
+        '<html><head><title>First</title></head><body><p class="note">'
+        "</p></body></html>"
+    )
+    (content / "second.html").write_text(
+        "<html><head><title>Second</title></head><body><nav>"
+        '<a class="active"></a></nav></body></html>'
+    )
+    return site
+
+
+@pytest.fixture
+def settings() -> dict[str, Any]:
+    """Provides the settings with which the site is built.
+
+    Returns:
+        The settings enabling the plugin, with every page read from the content.
+    """
+    return {
+        "PLUGINS": [PLUGIN_NAME],
+        "SITEURL": "https://example.com",
+        "ARTICLE_PATHS": [],
+        "PAGE_PATHS": [""],
+    }
+
+
+def test_could_match() -> None:
+    """Check selectors are compared with the names of elements in a page."""
+    page = _Page.scan(
+        '<nav id="top"><a class="active md:wide" href="/">Home</a></nav><P>'
+    )
+    assert page.could_match("nav > a.active:hover")
+    assert page.could_match("#top a[href^='/']::after")
+    assert page.could_match("p:not(.lead)")
+    assert page.could_match(".md\\:wide")
+    assert page.could_match(":root")
+    assert not page.could_match("nav .inactive")
+    assert not page.could_match("a[title]")
+    assert not page.could_match("main p")
+
+
+def test_critical_rules() -> None:
+    """Check a stylesheet is reduced to the rules which could apply to a page."""
+    page = _Page.scan('<body><p class="note"></p></body>')
+    assert _critical_rules(_STYLESHEET, page) == (
+        "body{margin: 0}"
+        '.note{background: url("../images/note.png")}'
+        "@media (min-width: 40em){.note{padding: 1em}}"
+        "@font-face{font-family: Body; src: url(fonts/body.woff2)}"
+    )
+
+
+def test_rebase() -> None:
+    """Check relative URLs are rewritten to be relative to the page."""
+    css = "a{background:url('../i/a.png')}b{background:url(data:x)}"
+    assert _rebase(css, "../theme/css/styles.css") == (
+        "a{background:url('../theme/i/a.png')}b{background:url(data:x)}"
+    )
+    assert _rebase('@import "print.css";', "https://example.com/css/a.css") == (
+        '@import "https://example.com/css/print.css";'
+    )
+
+
+def test_inline_whole_stylesheet(site: Path, build: Callable[..., None]) -> None:
+    """Check a small stylesheet is inlined in full.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+    """
+    build(**{LIMIT_SETTING: 4096})
+    first = (site / "output" / "pages" / "first.html").read_text()
+    assert "<link" not in first
+    assert "nav > a.active:hover" in first
+    assert "url(https://example.com/theme/css/fonts/body.woff2)" in first
+
+
+def test_inline_critical_rules(site: Path, build: Callable[..., None]) -> None:
+    """Check the rules of a large stylesheet are chosen once per template.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+    """
+    build(**{LIMIT_SETTING: 64})
+    pages = site / "output" / "pages"
+    first = (pages / "first.html").read_text()
+    second = (pages / "second.html").read_text()
+    # The rules are chosen from the first page, and reused by the second.
+    assert first.replace("First", "Second") == second.replace(
+        '<nav><a class="active"></a></nav>', '<p class="note"></p>'
+    )
+    head = first.split("</head>")[0]
+    assert "https://example.com/theme/images/note.png" in head
+    assert "nav > a.active" not in head
+    assert "@import" not in head
+    assert (
+        '<link rel="stylesheet" href="https://example.com/theme/css/styles.css" '
+        'media="print" onload="this.media=\'all\'">'
+    ) in head
+    assert "<noscript><link" in head
@@ -0,0 +1,14 @@
+"""A Markdown extension which caches the code highlighted by `codehilite`.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "HighlightCacheExtension",
+    "makeExtension",
+]
+
+from turbopelican.plugins.highlight_cache.highlight_cache import (
+    HighlightCacheExtension,
+    makeExtension,
+)
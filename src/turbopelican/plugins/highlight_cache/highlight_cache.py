@@ -0,0 +1,321 @@
+"""Caches the code highlighted by `codehilite` between builds.
+
+Highlighting code with Pygments is the slowest part of reading content with
+many code blocks, and Pelican does it again for every block on every build.
+This Markdown extension stores the HTML of each highlighted block in a
+directory, named by a hash of the code, its language, the options of
+`codehilite` and the versions of Pygments and Markdown, so that unchanged
+blocks are never highlighted twice. It is enabled in the `markdown` setting,
+after `codehilite` and `extra`.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "EXTENSION_NAME",
+    "HighlightCacheExtension",
+    "makeExtension",
+]
+
+import contextlib
+import functools
+import logging
+import tempfile
+import types
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import markdown
+import pygments
+from markdown.extensions import Extension, codehilite, fenced_code
+from pelican.plugins import signals
+
+from turbopelican._utils.shared import fingerprint
+from turbopelican.plugins._utils import report
+
+if TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
+    from collections.abc import Callable
+
+    from pelican import Pelican
+
+EXTENSION_NAME = "turbopelican.plugins.highlight_cache"
+"""The name by which the extension is enabled in `markdown`."""
+
+_DEFAULT_CACHE_PATH = "cache/highlight"
+"""The directory of the cache, relative to the working directory.
+
+`turbopelican.config` instead places the cache in the `highlight` subdirectory
+of the configured `cache_path`.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _HighlightCache:
+    """Stores highlighted code in a directory, one file per block."""
+
+    directory: Path
+    hits: int = 0
+    misses: int = 0
+
+    def _path(self, key: str) -> Path:
+        """Locates the file for a block.
+
+        Args:
+            key: The hash identifying the block.
+
+        Returns:
+            The path to the file.
+        """
+        return self.directory / key[:2] / f"{key}.html"
+
+    def get(self, key: str) -> str | None:
+        """Provides the highlighted code of a block, if it has been cached.
+
+        Args:
+            key: The hash identifying the block.
+
+        Returns:
+            The HTML, or None if the block is not in the cache.
+        """
+        try:
+            html = self._path(key).read_text(encoding="utf-8")
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return html
+
+    def put(self, key: str, html: str) -> None:
+        """Stores the highlighted code of a block, if possible.
+
+        Args:
+            key: The hash identifying the block.
+            html: The HTML of the block.
+        """
+        path = self._path(key)
+        with contextlib.suppress(OSError):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, delete=False
+            ) as partial:
+                partial.write(html)
+            Path(partial.name).replace(path)
+
+
+_caches: dict[Path, _HighlightCache] = {}
+"""The cache in each directory used by this process."""
+
+
+def _get_cache(cache_path: str) -> _HighlightCache:
+    """Provides the cache in a directory, shared by every Markdown instance.
+
+    Args:
+        cache_path: The directory of the cache.
+
+    Returns:
+        The cache.
+    """
+    directory = Path(cache_path).absolute()
+    if directory not in _caches:
+        _caches[directory] = _HighlightCache(directory)
+    return _caches[directory]
+
+
+class _CachedCodeHilite(codehilite.CodeHilite):
+    """Highlights a block of code, unless it has already been highlighted."""
+
+    def __init__(self, src: str, *, cache: _HighlightCache, **options: Any) -> None:  # noqa: ANN401
+        """Prepares to highlight the code.
+
+        Args:
+            src: The code.
+            cache: The cache of highlighted code.
+            options: The options of `codehilite`, and of the block itself.
+        """
+        # Fenced code blocks pass every option of the extension on.
+        options.pop("cache_path", None)
+        super().__init__(src, **options)
+        self._cache = cache
+
+    def hilite(self, shebang: bool = True) -> str:  # noqa: FBT001, FBT002
+        """Highlights the code, or provides it from the cache.
+
+        Args:
+            shebang: Whether the language may be given by the first line.
+
+        Returns:
+            The HTML of the block.
+        """
+        if not self.use_pygments:
+            return super().hilite(shebang)
+        key = fingerprint(
+            [
+                self.src,
+                self.lang,
+                self.guess_lang,
+                self.lang_prefix,
+                self.pygments_formatter,
+                self.options,
+                shebang,
+                pygments.__version__,
+                markdown.__version__,
+            ]
+        )
+        html = self._cache.get(key)
+        if html is None:
+            html = super().hilite(shebang)
+            self._cache.put(key, html)
+        return html
+
+
+def _highlighting_through(
+    cache: _HighlightCache, run: Callable[..., Any]
+) -> Callable[..., Any]:
+    """Copies the method of a processor, such that it highlights through a cache.
+
+    Python-Markdown's processors create `CodeHilite` from the globals of their
+    own modules. Rather than replacing it in the module, which would affect
+    every other Markdown instance converting at the same time, the method is
+    copied with globals of its own, in which `CodeHilite` is cached.
+
+    Args:
+        cache: The cache of highlighted code.
+        run: The method of the processor.
+
+    Returns:
+        The copy of the method.
+    """
+    namespace = {
+        **run.__globals__,
+        "CodeHilite": functools.partial(_CachedCodeHilite, cache=cache),
+    }
+    return types.FunctionType(
+        run.__code__, namespace, run.__name__, run.__defaults__, run.__closure__
+    )
+
+
+class _CachedHiliteTreeprocessor(codehilite.HiliteTreeprocessor):
+    """Highlights indented code blocks through the cache."""
+
+    def __init__(self, md: markdown.Markdown, cache: _HighlightCache) -> None:
+        """Creates the processor.
+
+        Args:
+            md: The Markdown instance.
+            cache: The cache of highlighted code.
+        """
+        super().__init__(md)
+        self._run = _highlighting_through(cache, codehilite.HiliteTreeprocessor.run)
+
+    def run(self, root: ET.Element) -> None:
+        """Highlights the code blocks of a document.
+
+        Args:
+            root: The root of the document.
+        """
+        self._run(self, root)
+
+
+class _CachedFencedBlockPreprocessor(fenced_code.FencedBlockPreprocessor):
+    """Highlights fenced code blocks through the cache."""
+
+    def __init__(
+        self, md: markdown.Markdown, config: dict[str, Any], cache: _HighlightCache
+    ) -> None:
+        """Creates the processor.
+
+        Args:
+            md: The Markdown instance.
+            config: The configuration of `fenced_code`.
+            cache: The cache of highlighted code.
+        """
+        super().__init__(md, config)
+        self._run = _highlighting_through(
+            cache, fenced_code.FencedBlockPreprocessor.run
+        )
+
+    def run(self, lines: list[str]) -> list[str]:
+        """Highlights the fenced code blocks of a document.
+
+        Args:
+            lines: The lines of the document.
+
+        Returns:
+            The lines, with each block replaced by a placeholder.
+        """
+        return self._run(self, lines)
+
+
+def _report(pelican: Pelican) -> None:
+    """Reports how often the cache was used during a build.
+
+    Args:
+        pelican: The Pelican build.
+    """
+    for cache in _caches.values():
+        if cache.hits or cache.misses:
+            report(
+                pelican.settings,
+                f"Highlight cache: {cache.hits} hits and {cache.misses} misses "
+                f"in {cache.directory}",
+            )
+        cache.hits = cache.misses = 0
+
+
+class HighlightCacheExtension(Extension):
+    """Caches the code highlighted by `codehilite` and `fenced_code`."""
+
+    def __init__(self, **kwargs: Any) -> None:  # noqa: ANN401
+        """Creates the extension.
+
+        Args:
+            kwargs: The configuration of the extension.
+        """
+        self.config = {
+            "cache_path": [
+                _DEFAULT_CACHE_PATH,
+                "The directory in which highlighted code is stored.",
+            ],
+        }
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md: markdown.Markdown) -> None:  # noqa: N802
+        """Replaces the processors which highlight code with cached ones.
+
+        Args:
+            md: The Markdown instance.
+        """
+        cache = _get_cache(self.getConfig("cache_path"))
+        if "hilite" not in md.treeprocessors:
+            logger.warning(
+                "%s must be enabled after markdown.extensions.codehilite",
+                EXTENSION_NAME,
+            )
+            return
+        hiliter = _CachedHiliteTreeprocessor(md, cache)
+        hiliter.config = md.treeprocessors["hilite"].config  # type: ignore[attr-defined]
+        md.treeprocessors.register(hiliter, "hilite", 30)
+
+        if "fenced_code_block" in md.preprocessors:
+            original = md.preprocessors["fenced_code_block"]
+            fenced = _CachedFencedBlockPreprocessor(md, original.config, cache)  # type: ignore[attr-defined]
+            md.preprocessors.register(fenced, "fenced_code_block", 25)
+        signals.finalized.connect(_report)
+
+
+def makeExtension(**kwargs: Any) -> HighlightCacheExtension:  # noqa: ANN401, N802
+    """Creates the extension, as Python-Markdown expects.
+
+    Args:
+        kwargs: The configuration of the extension.
+
+    Returns:
+        The extension.
+    """
+    return HighlightCacheExtension(**kwargs)
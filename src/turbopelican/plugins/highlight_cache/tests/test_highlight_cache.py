@@ -0,0 +1,135 @@
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from markdown import Markdown
+
+from turbopelican.plugins._utils import pop_reports
+from turbopelican.plugins.highlight_cache.highlight_cache import (
+    EXTENSION_NAME,
+    _CachedCodeHilite,
+    _get_cache,
+    _report,
+)
+
+_DOCUMENT = """Some text.
+
+    :::python
+    print("Indented")
+
+```python
+print("Fenced")
+```
+"""
+
+_BLOCKS = 2
+
+
+def _markdown(cache_path: Path | None, **codehilite: Any) -> Markdown:  # noqa: ANN401
+    """Creates a Markdown instance which highlights code.
+
+    Args:
+        cache_path: The directory of the cache, or None if not cached.
+        codehilite: The configuration of `codehilite`.
+
+    Returns:
+        The Markdown instance.
+    """
+    extension_configs: dict[str, dict[str, Any]] = {
+        "markdown.extensions.codehilite": {"css_class": "highlight", **codehilite},
+        "markdown.extensions.extra": {},
+    }
+    if cache_path is not None:
+        extension_configs[EXTENSION_NAME] = {"cache_path": str(cache_path)}
+    return Markdown(
+        extensions=list(extension_configs), extension_configs=extension_configs
+    )
+
+
+def test_same_html(tmp_path: Path) -> None:
+    """Tests that code from the cache is the same as when highlighted directly.
+
+    Args:
+        tmp_path: A temporary directory for the cache.
+    """
+    expected = _markdown(None).convert(_DOCUMENT)
+    assert 'class="highlight"' in expected
+
+    assert _markdown(tmp_path).convert(_DOCUMENT) == expected
+    cache = _get_cache(str(tmp_path))
+    assert (cache.hits, cache.misses) == (0, _BLOCKS)
+    assert len(list(tmp_path.rglob("*.html"))) == _BLOCKS
+
+    assert _markdown(tmp_path).convert(_DOCUMENT) == expected
+    assert (cache.hits, cache.misses) == (_BLOCKS, _BLOCKS)
+
+
+def test_options_in_key(tmp_path: Path) -> None:
+    """Tests that code is highlighted again if the options of codehilite change.
+
+    Args:
+        tmp_path: A temporary directory for the cache.
+    """
+    _markdown(tmp_path).convert(_DOCUMENT)
+    html = _markdown(tmp_path, linenums=True).convert(_DOCUMENT)
+    assert html == _markdown(None, linenums=True).convert(_DOCUMENT)
+    cache = _get_cache(str(tmp_path))
+    assert (cache.hits, cache.misses) == (0, 2 * _BLOCKS)
+
+
+def test_nested_markdown(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that other Markdown instances do not highlight through the cache.
+
+    Args:
+        tmp_path: A temporary directory for the cache.
+        monkeypatch: Converts another document while code is being cached.
+    """
+    plain = _markdown(None)
+    expected = plain.convert(_DOCUMENT)
+    hilite = _CachedCodeHilite.hilite
+
+    def nested_hilite(self: _CachedCodeHilite, shebang: bool = True) -> str:  # noqa: FBT001, FBT002
+        assert plain.convert(_DOCUMENT) == expected
+        return hilite(self, shebang)
+
+    monkeypatch.setattr(_CachedCodeHilite, "hilite", nested_hilite)
+    _markdown(tmp_path).convert(_DOCUMENT)
+    assert _get_cache(str(tmp_path)).misses == _BLOCKS
+    assert len(list(tmp_path.rglob("*.html"))) == _BLOCKS
+
+
+def test_report(tmp_path: Path) -> None:
+    """Tests that the use of the cache is reported at the end of a build.
+
+    Args:
+        tmp_path: A temporary directory for the cache and output.
+    """
+    _markdown(tmp_path / "cache").convert(_DOCUMENT)
+    pelican = SimpleNamespace(settings={"OUTPUT_PATH": str(tmp_path / "output")})
+    _report(pelican)  # type: ignore[arg-type]
+    assert (
+        f"Highlight cache: 0 hits and {_BLOCKS} misses in {tmp_path / 'cache'}"
+        in pop_reports(str(tmp_path / "output"))
+    )
+    assert not _get_cache(str(tmp_path / "cache")).misses
+
+
+def test_without_codehilite(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Tests that a warning is given if codehilite is not enabled first.
+
+    Args:
+        tmp_path: A temporary directory for the cache.
+        caplog: Captures the warning.
+    """
+    with caplog.at_level(logging.WARNING):
+        md = Markdown(
+            extensions=[EXTENSION_NAME],
+            extension_configs={EXTENSION_NAME: {"cache_path": str(tmp_path)}},
+        )
+    assert "must be enabled after" in caplog.text
+    assert md.convert("Text") == "<p>Text</p>"
@@ -0,0 +1,11 @@
+"""A Pelican plugin which only re-renders outputs affected by changes.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "IncrementalWriter",
+    "register",
+]
+
+from turbopelican.plugins.incremental.incremental import IncrementalWriter, register
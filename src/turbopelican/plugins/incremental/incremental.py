@@ -0,0 +1,587 @@
+"""Re-renders only the outputs affected by changes since the previous build.
+
+Every output written by Pelican is recorded in a dependency graph alongside the
+content and templates it was rendered from. On the next build, an output is
+only rendered again if any of these have changed, and outputs which are no
+longer produced are removed.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "PLUGIN_NAME",
+    "IncrementalWriter",
+    "register",
+]
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pydantic
+from jinja2 import TemplateNotFound, meta
+from pelican.contents import Content
+from pelican.plugins import signals
+from pelican.urlwrappers import URLWrapper
+from pelican.utils import sanitised_join
+from pelican.writers import Writer
+
+from turbopelican._utils.shared import fingerprint, hash_file
+from turbopelican.plugins._utils import is_enabled
+from turbopelican.plugins.concurrent_writer.concurrent_writer import (
+    PLUGIN_NAME as CONCURRENT_PLUGIN_NAME,
+)
+from turbopelican.plugins.concurrent_writer.concurrent_writer import (
+    ConcurrentWriter,
+)
+from turbopelican.plugins.memory_output.memory_output import (
+    PLUGIN_NAME as MEMORY_PLUGIN_NAME,
+)
+from turbopelican.plugins.memory_output.memory_output import MemoryWriter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from jinja2 import Template
+    from pelican import Pelican
+
+PLUGIN_NAME = "turbopelican.plugins.incremental"
+"""The name by which the plugin is enabled in `plugins`."""
+
+_GRAPH_FILE = "turbopelican_incremental.json"
+"""The name of the file in `cache_path` in which the graph is stored."""
+
+logger = logging.getLogger(__name__)
+
+
+class _Unit(pydantic.BaseModel):
+    """The outputs written by a single call to the writer."""
+
+    signature: str
+    dependencies: dict[str, str | None]
+    outputs: list[str] = pydantic.Field(default_factory=list)
+    stamps: dict[str, int] = pydantic.Field(default_factory=dict)
+    """The modification time in nanoseconds of each output once written."""
+
+
+class _DependencyGraph(pydantic.BaseModel):
+    """Maps every unit of output to what it was rendered from."""
+
+    version: int = 2
+    output_path: str = ""
+    fingerprint: str = ""
+    units: dict[str, _Unit] = pydantic.Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> _DependencyGraph:
+        """Loads the graph persisted by the previous build.
+
+        Args:
+            path: The file in which the graph is stored.
+
+        Returns:
+            The graph, or an empty graph if none could be read.
+        """
+        try:
+            return cls.model_validate_json(path.read_bytes())
+        except (OSError, pydantic.ValidationError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Persists the graph for the next build.
+
+        Args:
+            path: The file in which the graph is to be stored.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.model_dump_json())
+
+    def outputs(self) -> set[str]:
+        """Lists every output in the graph.
+
+        Returns:
+            The paths of the outputs, relative to the output directory.
+        """
+        return {output for unit in self.units.values() for output in unit.outputs}
+
+
+def _describe(value: object, sources: set[str]) -> object:
+    """Describes a value passed to a template, noting any content it refers to.
+
+    Args:
+        value: The value passed to the template.
+        sources: The source paths of any content found, which is updated.
+
+    Returns:
+        A description of the value, which only changes if the value changes.
+    """
+    if isinstance(value, Content):
+        source_path = str(value.source_path)
+        sources.add(source_path)
+        return f"content:{source_path}"
+    if isinstance(value, URLWrapper):
+        return f"{type(value).__name__}:{value.slug}"
+    if isinstance(value, dict):
+        return {str(key): _describe(item, sources) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_describe(item, sources) for item in value]
+    return value
+
+
+def _content_metadata(content: Content) -> list[object]:
+    """Describes everything about content which may appear on other pages.
+
+    Args:
+        content: The content to be described.
+
+    Returns:
+        The description, excluding the body of the content.
+    """
+    return [
+        str(content.source_path),
+        getattr(content, "url", None),
+        getattr(content, "save_as", None),
+        content.metadata,
+    ]
+
+
+class IncrementalWriter(Writer):
+    """Writes only the outputs whose dependencies have changed."""
+
+    def __init__(
+        self, output_path: str, settings: dict[str, Any] | None = None
+    ) -> None:
+        """Creates the writer, loading the graph from the previous build.
+
+        Args:
+            output_path: The directory in which to write the outputs.
+            settings: The settings of the Pelican build.
+        """
+        super().__init__(output_path, settings=settings)
+        self.graph_path = Path(self.settings.get("CACHE_PATH", "cache")) / _GRAPH_FILE
+        self.previous = _DependencyGraph.load(self.graph_path)
+        if self.previous.output_path != str(output_path):
+            self.previous = _DependencyGraph()
+        self.current = _DependencyGraph(output_path=str(output_path))
+        self.rendered: list[str] = []
+        self.skipped: list[str] = []
+        self._outputs: list[str] | None = None
+        self._source_hashes: dict[str, str | None] = {}
+        self._template_hashes: dict[str, dict[str, str | None]] = {}
+        _active_writers[str(output_path)] = self
+
+    def _open_w(self, filename: str, encoding: str, override: bool = False) -> Any:  # noqa: ANN401, FBT001, FBT002
+        """Opens a file for writing, recording it as an output.
+
+        Args:
+            filename: The path to the file.
+            encoding: The encoding with which to write the file.
+            override: Whether the file may overwrite another output.
+
+        Returns:
+            The opened file.
+        """
+        opened = super()._open_w(filename, encoding, override)
+        if self._outputs is not None and opened.name != os.devnull:
+            relative = Path(os.path.relpath(filename, self.output_path)).as_posix()
+            self._outputs.append(relative)
+        return opened
+
+    def _site_fingerprint(self, context: dict[str, Any]) -> str:
+        """Identifies everything which may affect every output.
+
+        This includes the settings, and the URL and metadata of all content,
+        since these may appear in menus, listings and links on any page.
+
+        Args:
+            context: The context shared by all outputs.
+
+        Returns:
+            The fingerprint, computed once per build.
+        """
+        if not self.current.fingerprint:
+            generated = context.get("generated_content", {})
+            metadata = sorted(
+                (
+                    _content_metadata(content)
+                    for content in generated.values()
+                    if isinstance(content, Content)
+                ),
+                key=lambda item: str(item[0]),
+            )
+            self.current.fingerprint = fingerprint([self.settings, metadata])
+        return self.current.fingerprint
+
+    def _hash_source(self, source_path: str) -> str | None:
+        """Hashes a content file, once per build.
+
+        Args:
+            source_path: The path to the content file.
+
+        Returns:
+            The hash, or None if the file does not exist.
+        """
+        if source_path not in self._source_hashes:
+            self._source_hashes[source_path] = hash_file(source_path)
+        return self._source_hashes[source_path]
+
+    def _template_dependencies(self, template: Template) -> dict[str, str | None]:
+        """Hashes a template along with every template it extends or includes.
+
+        Args:
+            template: The template used to render an output.
+
+        Returns:
+            The hash of each template, keyed by its name.
+        """
+        name = template.name
+        if name is None:
+            return {}
+        if name in self._template_hashes:
+            return self._template_hashes[name]
+
+        environment = template.environment
+        hashes: dict[str, str | None] = {}
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if f"template:{current}" in hashes:
+                continue
+            try:
+                source, _, _ = environment.loader.get_source(environment, current)  # type: ignore[union-attr]
+            except TemplateNotFound:
+                hashes[f"template:{current}"] = None
+                continue
+            hashes[f"template:{current}"] = hashlib.sha256(source.encode()).hexdigest()
+            referenced = list(meta.find_referenced_templates(environment.parse(source)))
+            # Templates chosen at render time could be any template at all.
+            if None in referenced:
+                pending.extend(environment.list_templates())
+            pending.extend(reference for reference in referenced if reference)
+
+        self._template_hashes[name] = hashes
+        return hashes
+
+    def _write_unit(  # noqa: PLR0913
+        self,
+        key: str,
+        context: dict[str, Any],
+        description: object,
+        dependencies: dict[str, str | None],
+        render: Callable[[], Any],
+        *,
+        override: bool,
+    ) -> Any:  # noqa: ANN401
+        """Renders a unit of output, unless it is unchanged since the last build.
+
+        Args:
+            key: Identifies the unit between builds.
+            context: The context shared by all outputs.
+            description: Describes everything passed to the template.
+            dependencies: The hash of every file the unit is rendered from.
+            render: Renders and writes the unit.
+            override: Whether the unit may overwrite other outputs, in which
+                case it is always rendered.
+
+        Returns:
+            The result of rendering, or None if the unit was skipped.
+        """
+        site_fingerprint = self._site_fingerprint(context)
+        signature = fingerprint(description)
+        previous = self.previous.units.get(key)
+        unit = self.current.units.setdefault(
+            key, _Unit(signature=signature, dependencies=dependencies)
+        )
+
+        if (
+            not override
+            and previous is not None
+            and self.previous.fingerprint == site_fingerprint
+            and previous.signature == signature
+            and previous.dependencies == dependencies
+            and self._unchanged(previous)
+        ):
+            for output in previous.outputs:
+                self._written_files.add(sanitised_join(self.output_path, output))
+            unit.outputs.extend(previous.outputs)
+            self.skipped.append(key)
+            return None
+
+        self._outputs = []
+        try:
+            result = render()
+        finally:
+            unit.outputs.extend(self._outputs)
+            self._outputs = None
+        self.rendered.append(key)
+        return result
+
+    def _unchanged(self, unit: _Unit) -> bool:
+        """Checks whether outputs from the previous build are still as written.
+
+        Outputs which have been modified since, for instance by a build with
+        other settings into the same output directory, must be written again.
+
+        Args:
+            unit: The unit of output from the previous build.
+
+        Returns:
+            True if every output exists and is unmodified.
+        """
+        for output in unit.outputs:
+            stamp = self._output_stamp(output)
+            if stamp is None or unit.stamps.get(output) != stamp:
+                return False
+        return True
+
+    def _output_stamp(self, output: str) -> int | None:
+        """Identifies the version of an output as it is now.
+
+        Args:
+            output: The path to the output, relative to the output directory.
+
+        Returns:
+            The modification time of the output in nanoseconds, or None if it
+            does not exist.
+        """
+        try:
+            return Path(self.output_path, output).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _remove_output(self, output: str) -> None:
+        """Removes an output which is no longer produced, and empty directories.
+
+        Args:
+            output: The path to the output, relative to the output directory.
+        """
+        output_path = Path(self.output_path)
+        path = output_path / output
+        path.unlink(missing_ok=True)
+        for parent in path.parents:
+            if parent == output_path or any(parent.iterdir()):
+                break
+            parent.rmdir()
+
+    def write_file(  # noqa: PLR0913, PLR0917
+        self,
+        name: str,
+        template: Template,
+        context: dict[str, Any],
+        relative_urls: bool = False,  # noqa: FBT001, FBT002
+        paginated: dict[str, Any] | None = None,
+        template_name: str | None = None,
+        override_output: bool = False,  # noqa: FBT001, FBT002
+        url: str | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Renders a template to a file, unless it is unchanged.
+
+        Args:
+            name: The path of the file, relative to the output directory.
+            template: The template to be rendered.
+            context: The context shared by all outputs.
+            relative_urls: Whether to use relative URLs.
+            paginated: The lists of content to be paginated.
+            template_name: The name of the template, used for pagination.
+            override_output: Whether the file may overwrite another output.
+            url: The URL of the file, used for pagination.
+            kwargs: The variables specific to this file.
+        """
+
+        def render() -> None:
+            super(IncrementalWriter, self).write_file(
+                name,
+                template,
+                context,
+                relative_urls,
+                paginated,
+                template_name,
+                override_output,
+                url,
+                **kwargs,
+            )
+
+        if not name:
+            render()
+            return
+
+        sources: set[str] = set()
+        description = [
+            template.name,
+            relative_urls,
+            template_name,
+            url,
+            _describe(paginated, sources),
+            _describe(kwargs, sources),
+        ]
+        dependencies = {
+            **self._template_dependencies(template),
+            **{source: self._hash_source(source) for source in sorted(sources)},
+        }
+        self._write_unit(
+            name,
+            context,
+            description,
+            dependencies,
+            render,
+            override=override_output,
+        )
+
+    def write_feed(  # noqa: PLR0913, PLR0917
+        self,
+        elements: list[Content],
+        context: dict[str, Any],
+        path: str | None = None,
+        url: str | None = None,
+        feed_type: str = "atom",
+        override_output: bool = False,  # noqa: FBT001, FBT002
+        feed_title: str | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Writes a feed, unless it is unchanged.
+
+        Args:
+            elements: The content to include in the feed.
+            context: The context shared by all outputs.
+            path: The path of the feed, relative to the output directory.
+            url: The URL of the feed.
+            feed_type: Either atom or rss.
+            override_output: Whether the feed may overwrite another output.
+            feed_title: The title of the feed.
+
+        Returns:
+            The feed, or None if it was unchanged.
+        """
+
+        def render() -> Any:  # noqa: ANN401
+            return super(IncrementalWriter, self).write_feed(
+                elements, context, path, url, feed_type, override_output, feed_title
+            )
+
+        if not path:
+            return render()
+
+        sources: set[str] = set()
+        elements = elements[: self.settings.get("FEED_MAX_ITEMS")]
+        description = [url, feed_type, feed_title, _describe(elements, sources)]
+        dependencies = {source: self._hash_source(source) for source in sorted(sources)}
+        return self._write_unit(
+            f"feed:{path}",
+            context,
+            description,
+            dependencies,
+            render,
+            override=override_output,
+        )
+
+    def finalize(self) -> None:
+        """Removes stale outputs and persists the graph for the next build."""
+        stale = self.previous.outputs() - self.current.outputs()
+        for output in sorted(stale):
+            self._remove_output(output)
+        for unit in self.current.units.values():
+            for output in unit.outputs:
+                stamp = self._output_stamp(output)
+                if stamp is not None:
+                    unit.stamps[output] = stamp
+        self.current.save(self.graph_path)
+        logger.info(
+            "Incremental build: rendered %d, skipped %d and removed %d outputs",
+            len(self.rendered),
+            len(self.skipped),
+            len(stale),
+        )
+
+
+class _ConcurrentIncrementalWriter(IncrementalWriter, ConcurrentWriter):
+    """Writes only the outputs whose dependencies have changed, in threads."""
+
+    def finalize(self) -> None:
+        """Finishes writing before the graph records the outputs."""
+        self.finish()
+        super().finalize()
+
+
+class _MemoryIncrementalWriter(IncrementalWriter, MemoryWriter):
+    """Keeps only the outputs whose dependencies have changed, in memory."""
+
+    def _output_stamp(self, output: str) -> int | None:
+        """Identifies the version of an output in memory.
+
+        Args:
+            output: The path to the output, relative to the output directory.
+
+        Returns:
+            The stamp of the output, or None if it is not in memory.
+        """
+        return self.store.stamp(output)
+
+    def _remove_output(self, output: str) -> None:
+        """Removes an output which is no longer produced from memory.
+
+        Args:
+            output: The path to the output, relative to the output directory.
+        """
+        self.store.remove(output)
+
+    def finalize(self) -> None:
+        """Removes outputs from memory before the graph records the outputs."""
+        self.finish()
+        super().finalize()
+
+
+_active_writers: dict[str, IncrementalWriter] = {}
+"""The writer of each build in progress, keyed by output directory."""
+
+
+def _keep_output_directory(pelican: Pelican) -> None:
+    """Prevents Pelican from deleting the outputs which may be reused.
+
+    Args:
+        pelican: The Pelican build.
+    """
+    if is_enabled(pelican.settings, PLUGIN_NAME) and pelican.delete_outputdir:
+        logger.info("Keeping the output directory for an incremental build")
+        pelican.delete_outputdir = False
+
+
+def _get_writer(pelican: Pelican) -> type[Writer] | None:
+    """Provides the incremental writer to Pelican.
+
+    Args:
+        pelican: The Pelican build.
+
+    Returns:
+        The writer class, if the plugin is enabled, which also keeps outputs
+        in memory or writes them in threads if the memory output or concurrent
+        writer plugin is enabled too.
+    """
+    if not is_enabled(pelican.settings, PLUGIN_NAME):
+        return None
+    if is_enabled(pelican.settings, MEMORY_PLUGIN_NAME):
+        return _MemoryIncrementalWriter
+    if is_enabled(pelican.settings, CONCURRENT_PLUGIN_NAME):
+        return _ConcurrentIncrementalWriter
+    return IncrementalWriter
+
+
+def _finalize(pelican: Pelican) -> None:
+    """Finishes the incremental build after every output has been written.
+
+    Args:
+        pelican: The Pelican build.
+    """
+    writer = _active_writers.pop(str(pelican.output_path), None)
+    if writer is not None:
+        writer.finalize()
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.initialized.connect(_keep_output_directory)
+    signals.get_writer.connect(_get_writer)
+    signals.finalized.connect(_finalize)
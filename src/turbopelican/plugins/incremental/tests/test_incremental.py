@@ -0,0 +1,195 @@
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from turbopelican.plugins.incremental.incremental import (
+    PLUGIN_NAME,
+    IncrementalWriter,
+    _describe,
+)
+
+
+@pytest.fixture
+def site(site: Path) -> Path:
+    """Creates a site with two articles and a minimal theme.
+
+    Args:
+        site: The root of a site without content.
+
+    Returns:
+        The root of the site.
+    """
+    templates = site / "theme" / "templates"
+    (templates / "base.html").write_text("<html>{% block content %}{% endblock %}")
+    (templates / "article.html").write_text(
+        "{% extends 'base.html' %}{% block content %}{{ article.content }}"
+        "{% endblock %}"
+    )
+    (templates / "index.html").write_text(
+        "{% for article in articles %}{{ article.title }}{% endfor %}"
+    )
+    for title in ["First", "Second"]:
+        (site / "content" / f"{title.lower()}.md").write_text(
+            f"Title: {title}\nDate: 2024-01-01\nTags: shared\n\n{title} body.\n"
+        )
+    return site
+
+
+@pytest.fixture
+def settings() -> dict[str, Any]:
+    """Provides the settings with which the site is built.
+
+    Returns:
+        The settings enabling the plugin.
+    """
+    return {
+        "PLUGINS": [PLUGIN_NAME],
+        "DELETE_OUTPUT_DIRECTORY": True,
+        "FEED_ALL_ATOM": "feeds/all.atom.xml",
+    }
+
+
+def _build(build: Callable[..., None]) -> IncrementalWriter:
+    """Builds the site incrementally.
+
+    Args:
+        build: Builds the site.
+
+    Returns:
+        The writer which built the site.
+    """
+    with mock.patch.object(
+        IncrementalWriter,
+        "finalize",
+        autospec=True,
+        side_effect=IncrementalWriter.finalize,
+    ) as finalize:
+        build()
+    return finalize.call_args.args[0]
+
+
+def test_describe() -> None:
+    """Tests that values passed to templates are described by their contents."""
+    sources: set[str] = set()
+    assert _describe({"page": [1, "a"], "b": (None,)}, sources) == {
+        "page": [1, "a"],
+        "b": [None],
+    }
+    assert sources == set()
+
+
+def test_unchanged(site: Path, build: Callable[..., None]) -> None:
+    """Tests that nothing is rendered again if nothing has changed.
+
+    Args:
+        site: The root of a site with two articles.
+        build: Builds the site.
+    """
+    first = _build(build)
+    assert not first.skipped
+    assert {"first.html", "second.html", "feed:feeds/all.atom.xml"} <= set(
+        first.rendered
+    )
+
+    second = _build(build)
+    assert not second.rendered
+    assert set(second.skipped) == set(first.rendered)
+    assert (site / "output" / "first.html").exists()
+    assert (site / "cache" / "turbopelican_incremental.json").exists()
+
+
+def test_content_changed(site: Path, build: Callable[..., None]) -> None:
+    """Tests that only the outputs depending on changed content are rendered.
+
+    Args:
+        site: The root of a site with two articles.
+        build: Builds the site.
+    """
+    _build(build)
+    (site / "content" / "first.md").write_text(
+        "Title: First\nDate: 2024-01-01\nTags: shared\n\nNew body.\n"
+    )
+    writer = _build(build)
+    assert "first.html" in writer.rendered
+    assert "feed:feeds/all.atom.xml" in writer.rendered
+    assert "second.html" in writer.skipped
+    assert "New body." in (site / "output" / "first.html").read_text()
+
+
+def test_template_changed(site: Path, build: Callable[..., None]) -> None:
+    """Tests that outputs are rendered again when a template they use changes.
+
+    Args:
+        site: The root of a site with two articles.
+        build: Builds the site.
+    """
+    _build(build)
+    base = site / "theme" / "templates" / "base.html"
+    base.write_text("<body>{% block content %}{% endblock %}")
+    writer = _build(build)
+    assert "first.html" in writer.rendered
+    assert "second.html" in writer.rendered
+    assert "index.html" in writer.skipped
+    assert "feed:feeds/all.atom.xml" in writer.skipped
+
+
+def test_missing_output(site: Path, build: Callable[..., None]) -> None:
+    """Tests that outputs removed since the last build are rendered again.
+
+    Args:
+        site: The root of a site with two articles.
+        build: Builds the site.
+    """
+    _build(build)
+    (site / "output" / "second.html").unlink()
+    writer = _build(build)
+    assert writer.rendered == ["second.html"]
+
+
+def test_modified_output(site: Path, build: Callable[..., None]) -> None:
+    """Tests that outputs modified since the last build are rendered again.
+
+    Args:
+        site: The root of a site with two articles.
+        build: Builds the site.
+    """
+    _build(build)
+    output = site / "output" / "second.html"
+    output.write_text("Written by another build")
+    stamp = output.stat().st_mtime_ns + 1
+    os.utime(output, ns=(stamp, stamp))
+    writer = _build(build)
+    assert writer.rendered == ["second.html"]
+    assert "Second body." in output.read_text()
+
+
+def test_stale_outputs_removed(site: Path, build: Callable[..., None]) -> None:
+    """Tests that outputs which are no longer produced are removed.
+
+    Args:
+        site: The root of a site with two articles.
+        build: Builds the site.
+    """
+    _build(build)
+    (site / "content" / "second.md").unlink()
+    _build(build)
+    assert (site / "output" / "first.html").exists()
+    assert not (site / "output" / "second.html").exists()
+
+
+def test_disabled(build: Callable[..., None]) -> None:
+    """Tests that the writer is not used by builds without the plugin.
+
+    Args:
+        build: Builds a site with two articles.
+    """
+    _build(build)
+    with mock.patch.object(IncrementalWriter, "write_file") as write_file:
+        build(PLUGINS=[])
+    write_file.assert_not_called()
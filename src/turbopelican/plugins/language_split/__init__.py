@@ -0,0 +1,16 @@
+"""A Pelican plugin which writes only the outputs of some languages.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "LANGUAGES_SETTING",
+    "pop_written",
+    "register",
+]
+
+from turbopelican.plugins.language_split.language_split import (
+    LANGUAGES_SETTING,
+    pop_written,
+    register,
+)
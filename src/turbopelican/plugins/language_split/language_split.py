@@ -0,0 +1,117 @@
+"""Writes only the outputs of some languages, for one of several builds.
+
+A multilingual website can be built by several Pelican builds at once, each
+of which reads all of the content, so that links between translations are
+the same as in a single build, but only writes the articles, pages and feeds
+in its own languages. The build of the default language also writes every
+output which is not in a single language, such as the index, listings and
+static files. The builds share the content cache, which they load without
+saving, since the content was read by the build which started them.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "LANGUAGES_SETTING",
+    "PLUGIN_NAME",
+    "pop_written",
+    "register",
+]
+
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from pelican.plugins import signals
+
+from turbopelican.plugins._utils import is_enabled
+from turbopelican.plugins._writers import restrict_outputs
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pelican.contents import Content
+    from pelican.generators import CachingGenerator, Generator
+
+PLUGIN_NAME = "turbopelican.plugins.language_split"
+"""The name by which the plugin is enabled in `plugins`."""
+
+LANGUAGES_SETTING = "TURBOPELICAN_LANGUAGES"
+"""The setting for the languages whose outputs the build writes."""
+
+logger = logging.getLogger(__name__)
+
+_written: dict[str, list[str]] = {}
+"""The outputs written by each build, keyed by output directory."""
+
+
+def pop_written(output_path: str) -> list[str]:
+    """Collects the outputs written by the last build into a directory.
+
+    Args:
+        output_path: The output directory of the build.
+
+    Returns:
+        The path of each page and feed written, relative to the directory.
+        Static files are not included.
+    """
+    return _written.pop(os.path.abspath(output_path), [])  # noqa: PTH100
+
+
+def _feed_language(elements: Iterable[Content]) -> str | None:
+    """Finds the language of a feed.
+
+    Args:
+        elements: The articles in the feed.
+
+    Returns:
+        The language of every article, or None if they differ or there are
+        none.
+    """
+    languages = {element.lang for element in elements}
+    return languages.pop() if len(languages) == 1 else None
+
+
+def _stop_saving_caches(generator: CachingGenerator) -> None:
+    """Keeps a generator from saving the content cache, which it only loads.
+
+    Args:
+        generator: The articles or pages generator.
+    """
+    if not is_enabled(generator.settings, PLUGIN_NAME):
+        return
+    generator._cache_data_policy = False  # noqa: SLF001
+    generator.readers._cache_data_policy = False  # noqa: SLF001
+
+
+def _split_outputs(generators: list[Generator]) -> None:
+    """Restricts the outputs of each generator to the languages of the build.
+
+    Args:
+        generators: The generators of the build.
+    """
+    if not generators or not is_enabled(generators[0].settings, PLUGIN_NAME):
+        return
+    settings = generators[0].settings
+    languages = frozenset(settings.get(LANGUAGES_SETTING) or ())
+    shared = settings["DEFAULT_LANG"] in languages
+
+    def writes(content: Content | None) -> bool:
+        return shared if content is None else content.lang in languages
+
+    def writes_feed(elements: list[Content]) -> bool:
+        language = _feed_language(elements)
+        return shared if language is None else language in languages
+
+    written = _written.setdefault(os.path.abspath(settings["OUTPUT_PATH"]), [])  # noqa: PTH100
+    restrict_outputs(generators, writes, writes_feed, written)
+    logger.info("Writing only the outputs in %s", ", ".join(sorted(languages)))
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.article_generator_init.connect(_stop_saving_caches)
+    signals.page_generator_init.connect(_stop_saving_caches)
+    signals.all_generators_finalized.connect(_split_outputs)
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from pelican import Pelican
+from pelican.settings import read_settings
+
+from turbopelican.plugins.language_split import LANGUAGES_SETTING, pop_written
+from turbopelican.plugins.language_split.language_split import PLUGIN_NAME
+
+_ARTICLES = {
+    "hello.md": ("Hello", "en"),
+    "bonjour.md": ("Bonjour", "fr"),
+}
+
+
+@pytest.fixture
+def site(tmp_path: Path) -> Path:
+    """Creates a site with an article in English translated into French.
+
+    Args:
+        tmp_path: A temporary directory in which to store the site.
+
+    Returns:
+        The root of the site.
+    """
+    content = tmp_path / "content"
+    content.mkdir()
+    for name, (title, lang) in _ARTICLES.items():
+        (content / name).write_text(
+            f"Title: {title}\nDate: 2024-01-01\nSlug: hello\nLang: {lang}\n\n"
+            f"{title}, world.\n"
+        )
+    return tmp_path
+
+
+def _build(site: Path, languages: list[str]) -> list[str]:
+    """Builds the outputs of some languages of the site.
+
+    Args:
+        site: The root of the site.
+        languages: The languages whose outputs are written.
+
+    Returns:
+        The pages and feeds written.
+    """
+    settings = read_settings(
+        override={
+            "PATH": str(site / "content"),
+            "OUTPUT_PATH": str(site / "output"),
+            "CACHE_PATH": str(site / "cache"),
+            "PLUGINS": [PLUGIN_NAME],
+            "TIMEZONE": "UTC",
+            "CACHE_CONTENT": True,
+            "LOAD_CONTENT_CACHE": True,
+            "TRANSLATION_FEED_ATOM": "feeds/all-{lang}.atom.xml",
+            LANGUAGES_SETTING: languages,
+        }
+    )
+    Pelican(settings).run()
+    return pop_written(settings["OUTPUT_PATH"])
+
+
+def test_translation_written_alone(site: Path) -> None:
+    """Tests that a translation is written without the shared outputs.
+
+    Args:
+        site: The root of a multilingual site.
+    """
+    written = _build(site, ["fr"])
+    output = site / "output"
+    assert sorted(written) == ["feeds/all-fr.atom.xml", "hello-fr.html"]
+    assert 'href="/hello.html" hreflang="en"' in (output / "hello-fr.html").read_text()
+    assert not (output / "index.html").exists()
+    assert not (output / "theme").exists()
+    assert not (site / "cache").exists()
+
+
+def test_default_language_writes_shared_outputs(site: Path) -> None:
+    """Tests that the default language's build writes the shared outputs.
+
+    Args:
+        site: The root of a multilingual site.
+    """
+    written = _build(site, ["en"])
+    output = site / "output"
+    assert "hello.html" in written
+    assert "index.html" in written
+    assert "feeds/all-en.atom.xml" in written
+    assert (output / "theme").is_dir()
+    assert not (output / "hello-fr.html").exists()
+    assert not (output / "feeds" / "all-fr.atom.xml").exists()
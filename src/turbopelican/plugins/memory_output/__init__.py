@@ -0,0 +1,18 @@
+"""A Pelican plugin which keeps outputs in memory rather than writing them.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "MemoryWriter",
+    "OutputStore",
+    "get_store",
+    "register",
+]
+
+from turbopelican.plugins.memory_output.memory_output import (
+    MemoryWriter,
+    OutputStore,
+    get_store,
+    register,
+)
@@ -0,0 +1,267 @@
+"""Keeps the outputs of Pelican in memory rather than writing them to disk.
+
+When a website is only viewed through `turbopelican serve`, writing every page
+to disk on each rebuild is wasted work. With this plugin enabled, each page
+and feed rendered by Pelican is kept in an `OutputStore` in memory, from which
+the pages are served. Static files are still copied to the output directory,
+since they are rarely changed between builds. The store can be flushed to
+disk, writing only the outputs whose bytes differ from those already there.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "PLUGIN_NAME",
+    "MemoryWriter",
+    "OutputStore",
+    "get_store",
+    "register",
+]
+
+import itertools
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pelican.plugins import signals
+
+from turbopelican.plugins._utils import is_enabled
+from turbopelican.plugins._writers import DeferringWriter, file_matches
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pelican import Pelican
+    from pelican.writers import Writer
+
+PLUGIN_NAME = "turbopelican.plugins.memory_output"
+"""The name by which the plugin is enabled in `plugins`."""
+
+_INCREMENTAL_PLUGIN = "turbopelican.plugins.incremental"
+"""The plugin whose writer also keeps outputs in memory, if enabled."""
+
+logger = logging.getLogger(__name__)
+
+
+class OutputStore:
+    """Holds the outputs of a website in memory, keyed by their relative paths.
+
+    Each output is stamped with a number which increases every time any output
+    is stored, so that incremental builds can tell whether it has changed.
+    """
+
+    def __init__(self) -> None:
+        """Creates an empty store."""
+        self._outputs: dict[str, tuple[bytes, int]] = {}
+        self._stamps = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Counts the outputs in the store.
+
+        Returns:
+            The number of outputs.
+        """
+        return len(self._outputs)
+
+    def paths(self) -> list[str]:
+        """Lists the outputs in the store.
+
+        Returns:
+            The path of every output, relative to the output directory.
+        """
+        with self._lock:
+            return sorted(self._outputs)
+
+    def get(self, path: str) -> bytes | None:
+        """Provides an output.
+
+        Args:
+            path: The path to the output, relative to the output directory.
+
+        Returns:
+            The bytes of the output, or None if it is not in the store.
+        """
+        entry = self._outputs.get(path)
+        return None if entry is None else entry[0]
+
+    def stamp(self, path: str) -> int | None:
+        """Identifies the version of an output.
+
+        Args:
+            path: The path to the output, relative to the output directory.
+
+        Returns:
+            The stamp of the output, or None if it is not in the store.
+        """
+        entry = self._outputs.get(path)
+        return None if entry is None else entry[1]
+
+    def put(self, path: str, data: bytes) -> None:
+        """Stores an output, replacing any previous version.
+
+        Args:
+            path: The path to the output, relative to the output directory.
+            data: The bytes of the output.
+        """
+        with self._lock:
+            self._outputs[path] = (data, next(self._stamps))
+
+    def remove(self, path: str) -> None:
+        """Removes an output, if it is in the store.
+
+        Args:
+            path: The path to the output, relative to the output directory.
+        """
+        with self._lock:
+            self._outputs.pop(path, None)
+
+    def retain(self, paths: Iterable[str]) -> None:
+        """Removes every output but some.
+
+        Args:
+            paths: The outputs to be kept.
+        """
+        kept = set(paths)
+        with self._lock:
+            for path in self._outputs.keys() - kept:
+                del self._outputs[path]
+
+    def flush(self, directory: Path) -> int:
+        """Writes every output to disk, unless already there.
+
+        Args:
+            directory: The output directory.
+
+        Returns:
+            The number of outputs written.
+        """
+        with self._lock:
+            outputs = {path: data for path, (data, _) in self._outputs.items()}
+        written = 0
+        for path, data in sorted(outputs.items()):
+            destination = directory / path
+            if file_matches(str(destination), data):
+                continue
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            destination.write_bytes(data)
+            written += 1
+        return written
+
+
+_stores: dict[str, OutputStore] = {}
+"""The store of each output directory built by this process."""
+
+
+def get_store(output_path: Path | str) -> OutputStore:
+    """Provides the store of an output directory, shared by every build.
+
+    Args:
+        output_path: The output directory.
+
+    Returns:
+        The store, which is empty until the directory is built.
+    """
+    key = os.path.abspath(output_path)  # noqa: PTH100
+    if key not in _stores:
+        _stores[key] = OutputStore()
+    return _stores[key]
+
+
+class MemoryWriter(DeferringWriter):
+    """Keeps outputs in memory, removing those no longer produced once done."""
+
+    def __init__(
+        self, output_path: str, settings: dict[str, Any] | None = None
+    ) -> None:
+        """Creates the writer.
+
+        Args:
+            output_path: The output directory.
+            settings: The settings of the Pelican build.
+        """
+        super().__init__(output_path, settings=settings)
+        self.store = get_store(output_path)
+        self.files_stored = 0
+        self.bytes_stored = 0
+        self._finished = False
+        _active_writers[str(output_path)] = self
+
+    def _relative(self, path: str) -> str:
+        """Finds the path of an output relative to the output directory.
+
+        Args:
+            path: The path to the output.
+
+        Returns:
+            The relative path, with forward slashes.
+        """
+        return Path(os.path.relpath(path, self.output_path)).as_posix()
+
+    def submit(self, path: str, data: bytes) -> None:
+        """Stores an output in memory.
+
+        Args:
+            path: The path to the output.
+            data: The bytes of the output.
+        """
+        self.store.put(self._relative(path), data)
+        self.files_stored += 1
+        self.bytes_stored += len(data)
+
+    def finish(self) -> None:
+        """Removes outputs which were not produced, then reports on the build."""
+        if self._finished:
+            return
+        self._finished = True
+        _active_writers.pop(str(self.output_path), None)
+        self.store.retain(self._relative(path) for path in self._written_files)
+        logger.info(
+            "Memory output: stored %d files (%d bytes), %d outputs in memory",
+            self.files_stored,
+            self.bytes_stored,
+            len(self.store),
+        )
+
+
+_active_writers: dict[str, MemoryWriter] = {}
+"""The writer of each build in progress, keyed by output directory."""
+
+
+def _get_writer(pelican: Pelican) -> type[Writer] | None:
+    """Provides the memory writer to Pelican.
+
+    Args:
+        pelican: The Pelican build.
+
+    Returns:
+        The writer class, if the plugin is enabled and the incremental plugin,
+        which then provides a writer which is both, is not.
+    """
+    settings = pelican.settings
+    if is_enabled(settings, PLUGIN_NAME) and not is_enabled(
+        settings, _INCREMENTAL_PLUGIN
+    ):
+        return MemoryWriter
+    return None
+
+
+def _finish(pelican: Pelican) -> None:
+    """Finishes the build once Pelican has rendered every output.
+
+    Args:
+        pelican: The Pelican build.
+    """
+    writer = _active_writers.get(str(pelican.output_path))
+    if writer is not None:
+        writer.finish()
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.get_writer.connect(_get_writer)
+    signals.finalized.connect(_finish)
@@ -0,0 +1,128 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from turbopelican.plugins.incremental.incremental import (
+    PLUGIN_NAME as INCREMENTAL_PLUGIN_NAME,
+)
+from turbopelican.plugins.memory_output.memory_output import (
+    PLUGIN_NAME,
+    OutputStore,
+    get_store,
+)
+
+_ARTICLES = 3
+
+
+@pytest.fixture
+def site(site: Path) -> Path:
+    """Creates a site with several articles, an image and a minimal theme.
+
+    Args:
+        site: The root of a site without content.
+
+    Returns:
+        The root of the site.
+    """
+    templates = site / "theme" / "templates"
+    (templates / "article.html").write_text("<p>{{ article.content }}</p>\n")
+    (templates / "index.html").write_text(
+        "{% for article in articles %}{{ article.title }}\n{% endfor %}"
+    )
+    (site / "content" / "images").mkdir()
+    (site / "content" / "images" / "logo.png").write_bytes(b"Logo")
+    for index in range(_ARTICLES):
+        (site / "content" / f"article{index}.md").write_text(
+            f"Title: Article {index}\nDate: 2024-01-01\n\nBody of article {index}.\n"
+        )
+    return site
+
+
+@pytest.fixture
+def settings() -> dict[str, Any]:
+    """Provides the settings with which the site is built.
+
+    Returns:
+        The settings copying the image, but not the theme, into the output.
+    """
+    return {"THEME_STATIC_PATHS": [], "STATIC_PATHS": ["images"]}
+
+
+def _build(site: Path, build: Callable[..., None], plugins: list[str]) -> OutputStore:
+    """Builds the site.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+        plugins: The plugins to be enabled.
+
+    Returns:
+        The store of the site's output directory.
+    """
+    build(PLUGINS=plugins)
+    return get_store(site / "output")
+
+
+@pytest.mark.parametrize(
+    "plugins", [[PLUGIN_NAME], [PLUGIN_NAME, INCREMENTAL_PLUGIN_NAME]]
+)
+def test_outputs_in_memory(
+    site: Path, build: Callable[..., None], plugins: list[str]
+) -> None:
+    """Check pages are kept in memory, and removed once no longer produced.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+        plugins: The plugins to be enabled.
+    """
+    store = _build(site, build, plugins)
+    assert store.get("article-0.html") == b"<p><p>Body of article 0.</p></p>"
+    assert b"Article 2" in (store.get("index.html") or b"")
+    assert not (site / "output" / "index.html").exists()
+    assert (site / "output" / "images" / "logo.png").read_bytes() == b"Logo"
+
+    (site / "content" / "article2.md").unlink()
+    store = _build(site, build, plugins)
+    assert store.get("article-2.html") is None
+    assert b"Article 2" not in (store.get("index.html") or b"")
+
+
+def test_incremental_in_memory(site: Path, build: Callable[..., None]) -> None:
+    """Check unchanged pages in memory are not rendered again.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+    """
+    plugins = [PLUGIN_NAME, INCREMENTAL_PLUGIN_NAME]
+    store = _build(site, build, plugins)
+    stamp = store.stamp("article-0.html")
+    _build(site, build, plugins)
+    assert store.stamp("article-0.html") == stamp
+
+    store.remove("article-0.html")
+    _build(site, build, plugins)
+    assert store.get("article-0.html") is not None
+
+
+def test_flush(tmp_path: Path) -> None:
+    """Check only outputs which differ from those on disk are written.
+
+    Args:
+        tmp_path: The output directory.
+    """
+    store = OutputStore()
+    store.put("index.html", b"Index")
+    store.put("blog/post.html", b"Post")
+    (tmp_path / "index.html").write_bytes(b"Index")
+    assert store.flush(tmp_path) == 1
+    assert (tmp_path / "blog" / "post.html").read_bytes() == b"Post"
+    assert not store.flush(tmp_path)
+
+    store.retain(["index.html"])
+    assert store.paths() == ["index.html"]
@@ -0,0 +1,14 @@
+"""A Pelican plugin which converts Markdown content in a process pool.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "ParallelMarkdownReader",
+    "register",
+]
+
+from turbopelican.plugins.parallel_reader.parallel_reader import (
+    ParallelMarkdownReader,
+    register,
+)
@@ -0,0 +1,385 @@
+"""Converts Markdown content in a pool of processes.
+
+Pelican converts each Markdown file one at a time, so large websites only use
+a single core while their content is read. Once the articles and pages
+generators have been created, every Markdown file they will read, and which
+is not already cached, is converted in a process pool. When Pelican reads
+each file, the converted content is collected and its metadata is processed
+as usual.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "PLUGIN_NAME",
+    "ParallelMarkdownReader",
+    "register",
+]
+
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import pickle
+import types
+from typing import TYPE_CHECKING, Any
+
+from markdown import Markdown
+from pelican.plugins import signals
+from pelican.readers import MarkdownReader
+from pelican.utils import pelican_open
+
+from turbopelican.plugins._utils import is_enabled, report
+
+if TYPE_CHECKING:
+    from pelican.generators import Generator
+    from pelican.readers import Readers
+
+PLUGIN_NAME = "turbopelican.plugins.parallel_reader"
+"""The name by which the plugin is enabled in `plugins`."""
+
+WORKERS_SETTING = "TURBOPELICAN_READ_WORKERS"
+"""The setting for the number of processes, which defaults to one per core."""
+
+_MINIMUM_FILES = 16
+"""The fewest files worth starting a process pool for."""
+
+_CHUNKS_PER_WORKER = 4
+"""How many batches of files each process is given, to balance the load."""
+
+logger = logging.getLogger(__name__)
+
+_Converted = tuple[str, dict[str, list[str]], dict[str, str]]
+"""The HTML, raw metadata and formatted metadata fields of a file."""
+
+_worker_markdown: Markdown | None = None
+"""The Markdown instance of a worker process, for content."""
+
+_worker_formatter: Markdown | None = None
+"""The Markdown instance of a worker process, for formatted metadata."""
+
+
+def _init_worker(markdown_settings: dict[str, Any]) -> None:
+    """Prepares a worker process to convert Markdown.
+
+    Args:
+        markdown_settings: The `MARKDOWN` setting.
+    """
+    global _worker_markdown, _worker_formatter  # noqa: PLW0603
+    _worker_markdown = Markdown(**markdown_settings)
+    _worker_formatter = Markdown(**markdown_settings)
+    # Pelican prevents metadata being extracted from formatted fields.
+    _worker_formatter.preprocessors.deregister("meta")
+
+
+def _convert(source_path: str, formatted_fields: list[str]) -> _Converted:
+    """Converts a Markdown file in a worker process.
+
+    Args:
+        source_path: The path to the file.
+        formatted_fields: The metadata fields which are themselves Markdown.
+
+    Returns:
+        The HTML, the raw metadata, and the HTML of each formatted field keyed
+        by its Markdown.
+    """
+    if _worker_markdown is None or _worker_formatter is None:
+        raise RuntimeError("The worker process has not been initialised.")
+    _worker_markdown.reset()
+    with pelican_open(source_path) as text:
+        content = _worker_markdown.convert(text)
+    meta: dict[str, list[str]] = getattr(_worker_markdown, "Meta", {})
+
+    formatted = {}
+    for name, value in meta.items():
+        if name.lower() in formatted_fields:
+            text = "\n".join(value)
+            _worker_formatter.reset()
+            formatted[text] = _worker_formatter.convert(text)
+    return content, meta, formatted
+
+
+def _convert_many(
+    source_paths: list[str], formatted_fields: list[str]
+) -> list[_Converted | None]:
+    """Converts a batch of Markdown files in a worker process.
+
+    Args:
+        source_paths: The paths to the files.
+        formatted_fields: The metadata fields which are themselves Markdown.
+
+    Returns:
+        The result for each file, or None if it could not be converted, in
+        which case Pelican reads it itself and reports the error.
+    """
+    results: list[_Converted | None] = []
+    for source_path in source_paths:
+        try:
+            results.append(_convert(source_path, formatted_fields))
+        except Exception:  # noqa: BLE001
+            results.append(None)
+    return results
+
+
+class _ConvertedMarkdown:
+    """Stands in for a Markdown instance once a worker has done the work.
+
+    Pelican converts formatted metadata fields, such as `summary`, with the
+    reader's Markdown instance, so this returns what the worker converted.
+    """
+
+    def __init__(self, formatted: dict[str, str]) -> None:
+        """Creates the stand-in.
+
+        Args:
+            formatted: The HTML of each formatted field, keyed by its Markdown.
+        """
+        self._formatted = formatted
+        self.preprocessors = types.SimpleNamespace(deregister=lambda _: None)
+
+    def reset(self) -> _ConvertedMarkdown:
+        """Does nothing, as there is no state to be reset.
+
+        Returns:
+            The stand-in.
+        """
+        return self
+
+    def convert(self, source: str) -> str:
+        """Provides the HTML of a formatted field.
+
+        Args:
+            source: The Markdown of the field.
+
+        Returns:
+            The HTML.
+        """
+        return self._formatted[source]
+
+
+class _Prefetcher:
+    """Converts the Markdown files of a single build in a process pool."""
+
+    def __init__(self, settings: dict[str, Any], workers: int) -> None:
+        """Starts the process pool.
+
+        Args:
+            settings: The settings of the Pelican build.
+            workers: The number of processes.
+        """
+        self.workers = workers
+        self.formatted_fields = list(settings["FORMATTED_FIELDS"])
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings["MARKDOWN"],),
+        )
+        self.pending: dict[
+            str, tuple[concurrent.futures.Future[list[_Converted | None]], int]
+        ] = {}
+        self.converted = 0
+        self.fallbacks = 0
+
+    def submit(self, source_paths: list[str]) -> None:
+        """Starts converting files, in batches shared between the processes.
+
+        Args:
+            source_paths: The absolute paths to the files.
+        """
+        batch_size = max(len(source_paths) // (self.workers * _CHUNKS_PER_WORKER), 1)
+        for start in range(0, len(source_paths), batch_size):
+            batch = source_paths[start : start + batch_size]
+            future = self.executor.submit(_convert_many, batch, self.formatted_fields)
+            for index, source_path in enumerate(batch):
+                self.pending[source_path] = (future, index)
+
+    def take(self, source_path: str) -> _Converted | None:
+        """Collects a converted file.
+
+        Args:
+            source_path: The absolute path to the file.
+
+        Returns:
+            The converted file, or None if it was not or could not be
+            converted.
+        """
+        entry = self.pending.pop(source_path, None)
+        if entry is None:
+            return None
+        future, index = entry
+        try:
+            result = future.result()[index]
+        except Exception:  # noqa: BLE001
+            result = None
+        if result is None:
+            self.fallbacks += 1
+        else:
+            self.converted += 1
+        return result
+
+    def shutdown(self) -> None:
+        """Stops the process pool."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+_prefetchers: dict[str, _Prefetcher] = {}
+"""The prefetcher of each build in progress, keyed by output directory."""
+
+
+def _build_key(settings: dict[str, Any]) -> str:
+    """Identifies the build to which some settings belong.
+
+    Args:
+        settings: The settings of the Pelican build.
+
+    Returns:
+        The output directory of the build.
+    """
+    return str(settings.get("OUTPUT_PATH"))
+
+
+class ParallelMarkdownReader(MarkdownReader):
+    """Reads Markdown converted in advance by a process pool, if possible."""
+
+    def read(self, source_path: str) -> tuple[str, dict[str, Any]]:
+        """Parses the content and metadata of a Markdown file.
+
+        Args:
+            source_path: The absolute path to the file.
+
+        Returns:
+            The HTML of the content and the processed metadata.
+        """
+        prefetcher = _prefetchers.get(_build_key(self.settings))
+        converted = prefetcher.take(source_path) if prefetcher else None
+        if converted is None:
+            return super().read(source_path)
+
+        content, meta, formatted = converted
+        self._source_path = source_path
+        self._md = _ConvertedMarkdown(formatted)
+        return content, self._parse_metadata(meta)
+
+
+def _use_parallel_reader(readers: Readers) -> None:
+    """Reads Markdown with the parallel reader.
+
+    Args:
+        readers: The readers of a generator.
+    """
+    if not is_enabled(readers.settings, PLUGIN_NAME):
+        return
+    for extension, reader_class in readers.reader_classes.items():
+        if reader_class is MarkdownReader:
+            readers.reader_classes[extension] = ParallelMarkdownReader
+
+
+def _is_cached(generator: Generator, path: str) -> bool:
+    """Checks whether Pelican will read a file from its cache.
+
+    Args:
+        generator: The generator which will read the file.
+        path: The path to the file, relative to the content directory.
+
+    Returns:
+        Whether either the generator or its readers have cached the file.
+    """
+    if generator.get_cached_data(path, None) is not None:  # type: ignore[attr-defined]
+        return True
+    absolute_path = os.path.abspath(os.path.join(generator.path, path))  # noqa: PTH100, PTH118
+    content, _ = generator.readers.get_cached_data(absolute_path, (None, None))
+    return content is not None
+
+
+def _prefetch(generator: Generator, paths_setting: str, excludes_setting: str) -> None:
+    """Starts converting the Markdown files which a generator will read.
+
+    Args:
+        generator: The articles or pages generator.
+        paths_setting: The setting listing the paths of its content.
+        excludes_setting: The setting listing the paths it excludes.
+    """
+    settings = generator.settings
+    if not is_enabled(settings, PLUGIN_NAME):
+        return
+    workers = settings.get(WORKERS_SETTING) or os.cpu_count() or 1
+    if workers < 2:  # noqa: PLR2004
+        return
+
+    extensions = {
+        extension
+        for extension, reader in generator.readers.readers.items()
+        if isinstance(reader, ParallelMarkdownReader)
+    }
+    source_paths = [
+        os.path.abspath(os.path.join(generator.path, path))  # noqa: PTH100, PTH118
+        for path in sorted(
+            generator.get_files(
+                settings[paths_setting], exclude=settings[excludes_setting]
+            )
+        )
+        if path.rpartition(".")[2] in extensions and not _is_cached(generator, path)
+    ]
+    if len(source_paths) < _MINIMUM_FILES:
+        return
+
+    key = _build_key(settings)
+    if key not in _prefetchers:
+        try:
+            pickle.dumps(settings["MARKDOWN"])
+        except (pickle.PicklingError, TypeError, AttributeError):
+            logger.warning(
+                "Reading content in one process, as MARKDOWN cannot be shared "
+                "with other processes"
+            )
+            return
+        _prefetchers[key] = _Prefetcher(settings, workers)
+    _prefetchers[key].submit(source_paths)
+
+
+def _prefetch_articles(generator: Generator) -> None:
+    """Starts converting the Markdown of articles.
+
+    Args:
+        generator: The articles generator.
+    """
+    _prefetch(generator, "ARTICLE_PATHS", "ARTICLE_EXCLUDES")
+
+
+def _prefetch_pages(generator: Generator) -> None:
+    """Starts converting the Markdown of pages.
+
+    Args:
+        generator: The pages generator.
+    """
+    _prefetch(generator, "PAGE_PATHS", "PAGE_EXCLUDES")
+
+
+def _finish(generators: list[Generator]) -> None:
+    """Stops the process pool once every generator has read its content.
+
+    Args:
+        generators: The generators of the build.
+    """
+    if not generators:
+        return
+    prefetcher = _prefetchers.pop(_build_key(generators[0].settings), None)
+    if prefetcher is None:
+        return
+    prefetcher.shutdown()
+    report(
+        generators[0].settings,
+        f"Parallel reading: converted {prefetcher.converted} files in "
+        f"{prefetcher.workers} processes, {prefetcher.fallbacks} read directly",
+    )
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.readers_init.connect(_use_parallel_reader)
+    signals.article_generator_init.connect(_prefetch_articles)
+    signals.page_generator_init.connect(_prefetch_pages)
+    signals.all_generators_finalized.connect(_finish)
@@ -0,0 +1,125 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from turbopelican._utils.config.config import _default_markdown
+from turbopelican.plugins._utils import pop_reports
+from turbopelican.plugins.parallel_reader.parallel_reader import (
+    _MINIMUM_FILES,
+    PLUGIN_NAME,
+    WORKERS_SETTING,
+    _ConvertedMarkdown,
+    _Prefetcher,
+)
+
+
+@pytest.fixture
+def site(site: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Creates a site with enough articles to be read in parallel.
+
+    Args:
+        site: The root of a site without content.
+        monkeypatch: Changes into the site, where highlighted code is cached.
+
+    Returns:
+        The root of the site.
+    """
+    monkeypatch.chdir(site)
+    (site / "theme" / "templates" / "article.html").write_text(
+        "{{ article.title }}|{{ article.date }}|{{ article.tags }}|"
+        "{{ article.summary }}|{{ article.content }}"
+    )
+    for index in range(_MINIMUM_FILES):
+        (site / "content" / f"article{index}.md").write_text(
+            f"Title: Article {index}\nDate: 2024-01-{index + 1:02}\n"
+            f"Tags: a, b\nSummary: The *summary* of {index}.\n\n"
+            f"Some **text**.\n\n    :::python\n    print({index})\n"
+        )
+    (site / "content" / "invalid.md").write_bytes(b"Title: \xff\n\nText")
+    return site
+
+
+@pytest.fixture
+def settings() -> dict[str, Any]:
+    """Provides the settings with which the site is built.
+
+    Returns:
+        The settings shared by every build, whichever plugins are enabled.
+    """
+    return {
+        "MARKDOWN": _default_markdown(),
+        "AUTHOR_FEED_ATOM": None,
+        "AUTHOR_FEED_RSS": None,
+        WORKERS_SETTING: 2,
+    }
+
+
+def _build(
+    build: Callable[..., None], output: Path, plugins: list[str]
+) -> list[_Prefetcher]:
+    """Builds the site.
+
+    Args:
+        build: Builds the site.
+        output: The output directory.
+        plugins: The plugins to be enabled.
+
+    Returns:
+        The prefetchers used by the build.
+    """
+    with mock.patch.object(
+        _Prefetcher, "shutdown", autospec=True, side_effect=_Prefetcher.shutdown
+    ) as shutdown:
+        build(OUTPUT_PATH=str(output), PLUGINS=plugins)
+    return [call.args[0] for call in shutdown.call_args_list]
+
+
+def test_converted_markdown() -> None:
+    """Tests that formatted fields are provided from the worker's results."""
+    converted = _ConvertedMarkdown({"*a*": "<p><em>a</em></p>"})
+    converted.preprocessors.deregister("meta")
+    assert converted.reset().convert("*a*") == "<p><em>a</em></p>"
+
+
+def test_same_output(site: Path, build: Callable[..., None]) -> None:
+    """Tests that content read in parallel is the same as when read directly.
+
+    Args:
+        site: The root of a site with many articles.
+        build: Builds the site.
+    """
+    assert not _build(build, site / "sequential", [])
+    prefetchers = _build(build, site / "parallel", [PLUGIN_NAME])
+    assert len(prefetchers) == 1
+    assert prefetchers[0].converted == _MINIMUM_FILES
+    assert prefetchers[0].fallbacks == 1
+    assert pop_reports(str(site / "parallel")) == [
+        (
+            f"Parallel reading: converted {_MINIMUM_FILES} files in 2 processes, "
+            "1 read directly"
+        )
+    ]
+
+    sequential = sorted((site / "sequential").rglob("*.html"))
+    parallel = sorted((site / "parallel").rglob("*.html"))
+    assert [path.name for path in sequential] == [path.name for path in parallel]
+    for sequential_path, parallel_path in zip(sequential, parallel, strict=True):
+        assert sequential_path.read_text() == parallel_path.read_text()
+    assert "<em>summary</em>" in (site / "parallel" / "article-0.html").read_text()
+
+
+def test_too_few_files(site: Path, build: Callable[..., None]) -> None:
+    """Tests that no process pool is started for small sites.
+
+    Args:
+        site: The root of a site with many articles.
+        build: Builds the site.
+    """
+    for path in list((site / "content").glob("article*.md"))[1:]:
+        path.unlink()
+    assert not _build(build, site / "output", [PLUGIN_NAME])
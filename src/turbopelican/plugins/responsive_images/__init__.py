@@ -0,0 +1,18 @@
+"""A Pelican plugin which resizes static images into several widths.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "IMAGES_SETTING",
+    "WIDTHS_SETTING",
+    "register",
+    "variant_path",
+]
+
+from turbopelican.plugins.responsive_images.responsive_images import (
+    IMAGES_SETTING,
+    WIDTHS_SETTING,
+    register,
+    variant_path,
+)
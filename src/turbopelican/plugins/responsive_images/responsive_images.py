@@ -0,0 +1,469 @@
+"""Resizes static images into several widths, for responsive `<img>` tags.
+
+Each JPEG, PNG and WebP static file is recompressed at its own width and
+resized to each narrower width of `TURBOPELICAN_IMAGE_WIDTHS`, as
+`images/photo-480w.jpg` alongside `images/photo.jpg`, in a pool of processes.
+Templates find the widths and dimensions of an image, including those of SVG
+images, with the `image_variants` global, from which the `srcset`, `width`
+and `height` attributes of an `<img>` tag can be written. Resized images are
+stored in `cache_path`, named by the hash of their source, so that images are
+only resized again once they change. Raster images are resized with Pillow,
+and are only copied as they are if it is not installed.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "IMAGES_SETTING",
+    "PLUGIN_NAME",
+    "WIDTHS_SETTING",
+    "ResponsiveImageGenerator",
+    "register",
+    "variant_path",
+]
+
+import concurrent.futures
+import contextlib
+import importlib.util
+import logging
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pydantic
+from jinja2 import pass_context
+from pelican.generators import Generator, StaticGenerator
+from pelican.plugins import signals
+
+from turbopelican._utils.shared import hash_file
+from turbopelican.plugins._utils import is_enabled
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from jinja2.runtime import Context
+    from pelican import Pelican
+    from pelican.writers import Writer
+
+PLUGIN_NAME = "turbopelican.plugins.responsive_images"
+"""The name by which the plugin is enabled in `plugins`."""
+
+WIDTHS_SETTING = "TURBOPELICAN_IMAGE_WIDTHS"
+"""The setting for the widths in pixels to which images are resized."""
+
+IMAGES_SETTING = "TURBOPELICAN_IMAGES"
+"""The setting for the dimensions and widths of each image, so that every
+output is rendered again by incremental builds once an image changes."""
+
+_DEFAULT_WIDTHS = (480, 960, 1440)
+"""The widths to which images are resized by default."""
+
+_QUALITY = 82
+"""The quality at which JPEG and WebP images are recompressed."""
+
+_RASTER_SUFFIXES = frozenset({".jpeg", ".jpg", ".png", ".webp"})
+"""The suffixes of the images which are resized."""
+
+_CACHE_DIRECTORY = "turbopelican_images"
+"""The directory in `cache_path` in which resized images are stored."""
+
+_MANIFEST_FILE = "turbopelican_images.json"
+"""The name of the file in `cache_path` in which the manifest is stored."""
+
+_SVG_TAG = re.compile(r"<svg\b[^>]*>", re.IGNORECASE)
+"""The root element of an SVG image."""
+
+_SVG_LENGTH = re.compile(r"^\s*([\d.]+)\s*(?:px)?\s*$")
+"""A length in an SVG image, in pixels."""
+
+logger = logging.getLogger(__name__)
+
+
+class _Source(pydantic.BaseModel):
+    """The hash and dimensions of an image, as of its size and modification time."""
+
+    hash: str
+    size: int
+    mtime_ns: int
+    width: int
+    height: int
+
+
+class _Manifest(pydantic.BaseModel):
+    """Records every image and the resized images written to the output."""
+
+    version: int = 1
+    sources: dict[str, _Source] = pydantic.Field(default_factory=dict)
+    outputs: list[str] = pydantic.Field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> _Manifest:
+        """Loads the manifest persisted by the previous build.
+
+        Args:
+            path: The file in which the manifest is stored.
+
+        Returns:
+            The manifest, or an empty manifest if none could be read.
+        """
+        try:
+            return cls.model_validate_json(path.read_bytes())
+        except (OSError, pydantic.ValidationError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Persists the manifest for the next build.
+
+        Args:
+            path: The file in which the manifest is to be stored.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.model_dump_json())
+
+
+@dataclass
+class _Image:
+    """An image, and the resized images written from it."""
+
+    width: int
+    height: int
+    # The path in the output and in the cache of each resized image, by width.
+    variants: dict[int, tuple[str, str]] = field(default_factory=dict)
+
+
+def variant_path(path: str, width: int) -> str:
+    """Names an image resized to a width.
+
+    Args:
+        path: The path to the image in the output directory.
+        width: The width of the resized image.
+
+    Returns:
+        The path, with the width before its suffix.
+    """
+    stem, suffix = os.path.splitext(path)  # noqa: PTH122
+    return f"{stem}-{width}w{suffix}"
+
+
+def _svg_size(path: str) -> tuple[int, int] | None:
+    """Finds the dimensions of an SVG image.
+
+    Args:
+        path: The path to the image.
+
+    Returns:
+        The width and height given by the root element, or else by its
+        `viewBox`, or None if neither is given in pixels.
+    """
+    try:
+        with open(path, encoding="utf-8", errors="replace") as file:  # noqa: PTH123
+            match = _SVG_TAG.search(file.read(8192))
+    except OSError:
+        return None
+    if match is None:
+        return None
+    attributes = dict(re.findall(r"""([\w:-]+)\s*=\s*["']([^"']*)["']""", match[0]))
+    width = _SVG_LENGTH.match(attributes.get("width", ""))
+    height = _SVG_LENGTH.match(attributes.get("height", ""))
+    if width and height:
+        return round(float(width[1])), round(float(height[1]))
+    view_box = attributes.get("viewBox", "").replace(",", " ").split()
+    with contextlib.suppress(ValueError):
+        if len(view_box) == 4:  # noqa: PLR2004
+            return round(float(view_box[2])), round(float(view_box[3]))
+    return None
+
+
+def _raster_size(path: str) -> tuple[int, int] | None:
+    """Finds the dimensions of a raster image, reading only its header.
+
+    Args:
+        path: The path to the image.
+
+    Returns:
+        The width and height, or None if the image cannot be read.
+    """
+    from PIL import (  # type: ignore[import-not-found]  # noqa: PLC0415
+        Image,
+        UnidentifiedImageError,
+    )
+
+    try:
+        with Image.open(path) as image:
+            return image.size
+    except (OSError, UnidentifiedImageError):
+        return None
+
+
+def _resize(source: str, destination: str, width: int) -> None:
+    """Resizes and recompresses an image, in a worker process.
+
+    Args:
+        source: The path to the image.
+        destination: The path to which the resized image is written.
+        width: The width of the resized image.
+    """
+    from PIL import Image  # type: ignore[import-not-found]  # noqa: PLC0415
+
+    with Image.open(source) as image:
+        height = max(round(image.height * width / image.width), 1)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        suffix = os.path.splitext(destination)[1].lower()  # noqa: PTH122
+        options: dict[str, Any] = {"optimize": True}
+        if suffix in {".jpeg", ".jpg"}:
+            resized = resized.convert("RGB")
+            options.update(quality=_QUALITY, progressive=True)
+        elif suffix == ".webp":
+            options.update(quality=_QUALITY, method=6)
+        descriptor, partial = tempfile.mkstemp(
+            dir=os.path.dirname(destination),  # noqa: PTH120
+            suffix=suffix,
+        )
+        os.close(descriptor)
+        try:
+            resized.save(partial, **options)
+            # An image is kept as it is if recompressing it makes it larger.
+            larger = os.stat(partial).st_size > os.stat(source).st_size  # noqa: PTH116
+            if width == image.width and larger:
+                shutil.copyfile(source, partial)
+            os.replace(partial, destination)  # noqa: PTH105
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(partial)  # noqa: PTH108
+            raise
+
+
+def _image_variants(images: dict[str, _Image]) -> Callable[..., dict | None]:
+    """Makes the `image_variants` global of the templates.
+
+    Args:
+        images: Every image, keyed by its path in the output directory.
+
+    Returns:
+        The global, which describes an image by the `src`, `srcset`, `width`
+        and `height` attributes of its `<img>` tag, or returns None if it is
+        not a static image.
+    """
+
+    @pass_context
+    def image_variants(context: Context, path: str) -> dict | None:
+        path = path.lstrip("/")
+        image = images.get(path)
+        if image is None:
+            return None
+        siteurl = context.get("SITEURL", "")
+        variants = sorted(image.variants.items())
+        return {
+            "src": f"{siteurl}/{variants[-1][1][0] if variants else path}",
+            "srcset": ", ".join(
+                f"{siteurl}/{output} {width}w" for width, (output, _) in variants
+            ),
+            "width": image.width,
+            "height": image.height,
+        }
+
+    return image_variants
+
+
+class ResponsiveImageGenerator(Generator):
+    """Writes the resized images of every static image."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Creates the generator, loading the manifest of the previous build.
+
+        Args:
+            args: The positional arguments of every generator.
+            kwargs: The keyword arguments of every generator.
+        """
+        super().__init__(*args, **kwargs)
+        cache_path = Path(self.settings["CACHE_PATH"])
+        self.cache_directory = cache_path / _CACHE_DIRECTORY
+        self.manifest_path = cache_path / _MANIFEST_FILE
+        self.previous = _Manifest.load(self.manifest_path)
+        self.current = _Manifest()
+        self.images: dict[str, _Image] = {}
+        self.sources: dict[str, str] = {}
+
+    def _describe(self, source: str) -> _Source | None:
+        """Hashes an image and finds its dimensions, unless it is unchanged.
+
+        Args:
+            source: The path to the image.
+
+        Returns:
+            The hash and dimensions of the image, or None if they cannot be
+            found.
+        """
+        try:
+            status = os.stat(source)  # noqa: PTH116
+        except OSError:
+            return None
+        entry = self.previous.sources.get(source)
+        if entry is None or (entry.size, entry.mtime_ns) != (
+            status.st_size,
+            status.st_mtime_ns,
+        ):
+            is_raster = os.path.splitext(source)[1].lower() in _RASTER_SUFFIXES  # noqa: PTH122
+            size = _raster_size(source) if is_raster else _svg_size(source)
+            digest = hash_file(source)
+            if size is None or digest is None:
+                return None
+            entry = _Source(
+                hash=digest,
+                size=status.st_size,
+                mtime_ns=status.st_mtime_ns,
+                width=size[0],
+                height=size[1],
+            )
+        self.current.sources[source] = entry
+        return entry
+
+    def _variants(
+        self, path: str, entry: _Source, widths: Iterable[int]
+    ) -> dict[int, tuple[str, str]]:
+        """Names the resized copies of a raster image.
+
+        Args:
+            path: The path to the image in the output directory.
+            entry: The hash and dimensions of the image.
+            widths: The widths to which images are resized.
+
+        Returns:
+            The path of each copy in the output directory and in the cache,
+            keyed by its width, including the width of the image itself.
+        """
+        suffix = os.path.splitext(path)[1].lower()  # noqa: PTH122
+        variants: dict[int, tuple[str, str]] = {}
+        for width in {*widths, entry.width}:
+            if width <= entry.width:
+                cached = self.cache_directory / f"{entry.hash[:24]}-{width}w{suffix}"
+                variants[width] = (variant_path(path, width), str(cached))
+        return variants
+
+    def plan(self, generators: list[Generator]) -> None:
+        """Finds the widths of every static image, once the content has been read.
+
+        Args:
+            generators: The generators of the build.
+        """
+        can_resize = importlib.util.find_spec("PIL") is not None
+        widths = self.settings.get(WIDTHS_SETTING) or _DEFAULT_WIDTHS
+        unresized = 0
+        for generator in generators:
+            if not isinstance(generator, StaticGenerator):
+                continue
+            for staticfile in generator.staticfiles:
+                suffix = os.path.splitext(staticfile.save_as)[1].lower()  # noqa: PTH122
+                if suffix not in _RASTER_SUFFIXES and suffix != ".svg":
+                    continue
+                if suffix != ".svg" and not can_resize:
+                    unresized += 1
+                    continue
+                source = os.path.join(self.path, str(staticfile.source_path))  # noqa: PTH118
+                entry = self._describe(source)
+                if entry is None:
+                    continue
+                image = _Image(width=entry.width, height=entry.height)
+                if suffix != ".svg":
+                    image.variants = self._variants(staticfile.save_as, entry, widths)
+                self.images[staticfile.save_as] = image
+                self.sources[staticfile.save_as] = source
+        if unresized:
+            logger.warning("Install Pillow to resize %d images", unresized)
+
+    def generate_output(self, writer: Writer) -> None:  # noqa: ARG002
+        """Resizes the images not already in the cache, and copies every image.
+
+        Resized images from previous builds which are no longer needed are
+        removed.
+
+        Args:
+            writer: The writer of the build, which is not used.
+        """
+        pending = [
+            (self.sources[path], cached, width)
+            for path, image in self.images.items()
+            for width, (_, cached) in image.variants.items()
+            if not os.path.exists(cached)  # noqa: PTH110
+        ]
+        if pending:
+            self.cache_directory.mkdir(parents=True, exist_ok=True)
+        workers = min(len(pending), os.cpu_count() or 1)
+        if workers <= 1:
+            for arguments in pending:
+                _resize(*arguments)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+                for future in [pool.submit(_resize, *args) for args in pending]:
+                    future.result()
+
+        for image in self.images.values():
+            for output, cached in image.variants.values():
+                destination = Path(self.output_path, output)
+                if (
+                    not destination.exists()
+                    or destination.stat().st_size != Path(cached).stat().st_size
+                ):
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(cached, destination)
+                self.current.outputs.append(output)
+        for output in set(self.previous.outputs) - set(self.current.outputs):
+            Path(self.output_path, output).unlink(missing_ok=True)
+        self.current.save(self.manifest_path)
+        logger.info(
+            "Responsive images: resized %d and reused %d",
+            len(pending),
+            len(self.current.outputs) - len(pending),
+        )
+
+
+def _get_generators(pelican: Pelican) -> type[Generator] | None:
+    """Adds the generator which resizes images, if enabled.
+
+    Args:
+        pelican: The Pelican build.
+
+    Returns:
+        The generator class, or None if the plugin is not enabled.
+    """
+    if not is_enabled(pelican.settings, PLUGIN_NAME):
+        return None
+    return ResponsiveImageGenerator
+
+
+def _plan_images(generators: list[Generator]) -> None:
+    """Finds the widths of every image and adds `image_variants` to templates.
+
+    Args:
+        generators: The generators of the build.
+    """
+    image_generator = next(
+        (
+            generator
+            for generator in generators
+            if isinstance(generator, ResponsiveImageGenerator)
+        ),
+        None,
+    )
+    if image_generator is None:
+        return
+    image_generator.plan(generators)
+    image_generator.settings[IMAGES_SETTING] = {
+        path: [image.width, image.height, sorted(image.variants)]
+        for path, image in image_generator.images.items()
+    }
+    image_variants = _image_variants(image_generator.images)
+    for generator in generators:
+        generator.env.globals["image_variants"] = image_variants
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.get_generators.connect(_get_generators)
+    signals.all_generators_finalized.connect(_plan_images)
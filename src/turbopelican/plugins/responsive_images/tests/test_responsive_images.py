@@ -0,0 +1,138 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from turbopelican.plugins.responsive_images.responsive_images import (
+    PLUGIN_NAME,
+    WIDTHS_SETTING,
+    _svg_size,
+    variant_path,
+)
+
+
+@pytest.fixture
+def site(site: Path) -> Path:
+    """Creates a site whose index describes its images.
+
+    Args:
+        site: The root of a site without content.
+
+    Returns:
+        The root of the site.
+    """
+    (site / "theme" / "templates" / "index.html").write_text(
+        "{{ image_variants('images/logo.svg') | tojson }}\n"
+        "{{ image_variants('/images/photo.png') | tojson }}\n"
+        "{{ image_variants('images/missing.png') | tojson }}"
+    )
+    images = site / "content" / "images"
+    images.mkdir()
+    (images / "logo.svg").write_text('<svg viewBox="0 0 200 100"></svg>')
+    return site
+
+
+@pytest.fixture
+def settings() -> dict[str, Any]:
+    """Provides the settings with which the site is built.
+
+    Returns:
+        The settings enabling the plugin.
+    """
+    return {
+        "PLUGINS": [PLUGIN_NAME],
+        WIDTHS_SETTING: [100, 200, 1000],
+        "SITEURL": "https://example.com",
+        "STATIC_PATHS": ["images"],
+    }
+
+
+def _build(site: Path, build: Callable[..., None]) -> list[dict | None]:
+    """Builds the site.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+
+    Returns:
+        The description of each image by the index.
+    """
+    build()
+    index = (site / "output" / "index.html").read_text()
+    return [json.loads(line) for line in index.splitlines()]
+
+
+def test_variant_path() -> None:
+    """Check the width is inserted before the suffix of a path."""
+    assert variant_path("images/photo.jpg", 480) == "images/photo-480w.jpg"
+    assert variant_path("photo.min.png", 960) == "photo.min-960w.png"
+
+
+def test_svg_size(tmp_path: Path) -> None:
+    """Check the dimensions of SVG images are read from their root element.
+
+    Args:
+        tmp_path: A temporary directory in which to store the images.
+    """
+    image = tmp_path / "image.svg"
+    image.write_text('<?xml version="1.0"?>\n<svg width="30px" height="20">')
+    assert _svg_size(str(image)) == (30, 20)
+    image.write_text('<svg width="100%" viewBox="0, 0, 64.4, 48">')
+    assert _svg_size(str(image)) == (64, 48)
+    image.write_text('<svg width="10em" height="5em">')
+    assert _svg_size(str(image)) is None
+
+
+def test_image_variants_svg(site: Path, build: Callable[..., None]) -> None:
+    """Check SVG images are described by their dimensions alone.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+    """
+    logo, _, missing = _build(site, build)
+    assert logo == {
+        "src": "https://example.com/images/logo.svg",
+        "srcset": "",
+        "width": 200,
+        "height": 100,
+    }
+    assert missing is None
+
+
+def test_image_variants_raster(site: Path, build: Callable[..., None]) -> None:
+    """Check raster images are resized once, into each narrower width.
+
+    Args:
+        site: The root of the site.
+        build: Builds the site.
+    """
+    image = pytest.importorskip("PIL.Image")
+    image.new("RGB", (400, 300), "red").save(site / "content" / "images" / "photo.png")
+
+    _, photo, _ = _build(site, build)
+    assert photo == {
+        "src": "https://example.com/images/photo-400w.png",
+        "srcset": (
+            "https://example.com/images/photo-100w.png 100w, "
+            "https://example.com/images/photo-200w.png 200w, "
+            "https://example.com/images/photo-400w.png 400w"
+        ),
+        "width": 400,
+        "height": 300,
+    }
+    output = site / "output" / "images"
+    with image.open(output / "photo-100w.png") as resized:
+        assert resized.size == (100, 75)
+    assert not (output / "photo-1000w.png").exists()
+
+    cached = sorted((site / "cache" / "turbopelican_images").iterdir())
+    mtimes = [path.stat().st_mtime_ns for path in cached]
+    (output / "photo-200w.png").unlink()
+    _build(site, build)
+    assert [path.stat().st_mtime_ns for path in cached] == mtimes
+    assert (output / "photo-200w.png").exists()
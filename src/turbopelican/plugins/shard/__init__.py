@@ -0,0 +1,12 @@
+"""A Pelican plugin which writes only the outputs of one shard of a website.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "SHARD_SETTING",
+    "register",
+    "shard_of",
+]
+
+from turbopelican.plugins.shard.shard import SHARD_SETTING, register, shard_of
@@ -0,0 +1,90 @@
+"""Writes only the outputs of one shard of a website, or those it shares.
+
+A large website can be built by several independent jobs, such as those of
+a CI matrix, each of which reads all of the content, so that links between
+content are the same as in a single build, but only writes the articles and
+pages of its shard. Content is assigned to a shard by a hash of its path, so
+that every job agrees on the shards without coordinating. Once every shard
+has been built, a final build writes only the outputs shared between shards,
+such as the index, listings, feeds and static files.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "PLUGIN_NAME",
+    "SHARD_SETTING",
+    "register",
+    "shard_of",
+]
+
+import logging
+import zlib
+from typing import TYPE_CHECKING
+
+from pelican.plugins import signals
+
+from turbopelican.plugins._utils import is_enabled
+from turbopelican.plugins._writers import restrict_outputs
+
+if TYPE_CHECKING:
+    from pelican.contents import Content
+    from pelican.generators import Generator
+
+PLUGIN_NAME = "turbopelican.plugins.shard"
+"""The name by which the plugin is enabled in `plugins`."""
+
+SHARD_SETTING = "TURBOPELICAN_SHARD"
+"""The setting for the shard written by the build and the number of shards.
+
+A shard of 0 writes only the outputs shared between shards.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def shard_of(content: Content, count: int) -> int:
+    """Assigns an article or page to a shard.
+
+    Args:
+        content: The article or page.
+        count: The number of shards.
+
+    Returns:
+        The shard, from 1 to `count`, given by a hash of the path of the
+        content relative to the content directory.
+    """
+    path = (content.relative_source_path or "").replace("\\", "/")
+    return zlib.crc32(path.encode()) % count + 1
+
+
+def _shard_outputs(generators: list[Generator]) -> None:
+    """Restricts the outputs of each generator to the shard of the build.
+
+    Args:
+        generators: The generators of the build.
+    """
+    if not generators or not is_enabled(generators[0].settings, PLUGIN_NAME):
+        return
+    shard, count = generators[0].settings[SHARD_SETTING]
+
+    def writes(content: Content | None) -> bool:
+        if content is None:
+            return shard == 0
+        return shard_of(content, count) == shard
+
+    def writes_feed(elements: list[Content]) -> bool:  # noqa: ARG001
+        return shard == 0
+
+    restrict_outputs(generators, writes, writes_feed, [])
+    if shard:
+        logger.info("Writing only the articles and pages of shard %d/%d", shard, count)
+    else:
+        logger.info("Writing only the outputs shared between %d shards", count)
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.all_generators_finalized.connect(_shard_outputs)
@@ -0,0 +1,88 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from pelican import Pelican
+from pelican.settings import read_settings
+
+from turbopelican.plugins.shard import SHARD_SETTING, shard_of
+from turbopelican.plugins.shard.shard import PLUGIN_NAME
+
+_ARTICLES = 6
+
+_SHARDS = 2
+
+
+@pytest.fixture
+def site(tmp_path: Path) -> Path:
+    """Creates a site with several articles.
+
+    Args:
+        tmp_path: A temporary directory in which to store the site.
+
+    Returns:
+        The root of the site.
+    """
+    content = tmp_path / "content"
+    content.mkdir()
+    for number in range(_ARTICLES):
+        (content / f"article-{number}.md").write_text(
+            f"Title: Article {number}\nDate: 2024-01-01\n\nArticle {number}.\n"
+        )
+    return tmp_path
+
+
+def _build(site: Path, shard: int) -> set[str]:
+    """Builds a shard of the site.
+
+    Args:
+        site: The root of the site.
+        shard: The shard, or 0 for the outputs shared between shards.
+
+    Returns:
+        The files written, relative to the output directory.
+    """
+    output = site / f"output-{shard}"
+    settings = read_settings(
+        override={
+            "PATH": str(site / "content"),
+            "OUTPUT_PATH": str(output),
+            "CACHE_PATH": str(site / "cache"),
+            "PLUGINS": [PLUGIN_NAME],
+            "TIMEZONE": "UTC",
+            "FEED_ALL_ATOM": None,
+            "CATEGORY_FEED_ATOM": None,
+            SHARD_SETTING: [shard, _SHARDS],
+        }
+    )
+    Pelican(settings).run()
+    return {
+        str(path.relative_to(output)) for path in output.rglob("*") if path.is_file()
+    }
+
+
+def test_shard_of() -> None:
+    """Tests that content is assigned to a shard by its path alone."""
+    first = SimpleNamespace(relative_source_path="posts/first.md")
+    windows = SimpleNamespace(relative_source_path="posts\\first.md")
+    assert shard_of(first, 4) == shard_of(windows, 4)  # type: ignore[arg-type]
+    assert 1 <= shard_of(first, 4) <= 4  # type: ignore[arg-type]  # noqa: PLR2004
+
+
+def test_shards_partition_articles(site: Path) -> None:
+    """Tests that each article is written by exactly one shard.
+
+    Args:
+        site: The root of a site with several articles.
+    """
+    shards = [_build(site, shard) for shard in range(1, _SHARDS + 1)]
+    articles = {f"article-{number}.html" for number in range(_ARTICLES)}
+    assert set.union(*shards) == articles
+    assert sum(map(len, shards)) == _ARTICLES
+
+    shared = _build(site, 0)
+    assert "index.html" in shared
+    assert not shared & articles
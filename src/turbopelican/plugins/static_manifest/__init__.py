@@ -0,0 +1,10 @@
+"""A Pelican plugin which skips copying static files already in the output.
+
+Author: Elliot Simpson.
+"""
+
+__all__ = [
+    "register",
+]
+
+from turbopelican.plugins.static_manifest.static_manifest import register
@@ -0,0 +1,346 @@
+"""Skips copying static files whose contents are already in the output.
+
+Pelican decides whether to copy a static file by comparing modification times,
+which are those of the checkout after cloning a repository, so every static
+file is copied again on each build in CI. Instead, the hash of each static
+file, including those given a destination by `extra_path_metadata`, is
+compared with that of the file already in the output, as recorded in a
+manifest in `cache_path`. Files which must be copied are cloned where the
+file system supports it, and files identical to another static file are
+hard linked to its copy. Builds with `--minify` minify each file as it is
+copied, and compare the output with the hash of the minified file instead.
+
+Author: Elliot Simpson.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "PLUGIN_NAME",
+    "register",
+]
+
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+import pydantic
+from pelican.generators import StaticGenerator
+from pelican.plugins import signals
+
+from turbopelican._utils.shared import hash_file
+from turbopelican.plugins._utils import (
+    MINIFY_SETTING,
+    copy_static_file,
+    is_enabled,
+    minified_static_file,
+    report,
+)
+
+if TYPE_CHECKING:
+    from pelican.contents import Static
+    from pelican.writers import Writer
+
+PLUGIN_NAME = "turbopelican.plugins.static_manifest"
+"""The name by which the plugin is enabled in `plugins`."""
+
+_MANIFEST_FILE = "turbopelican_static.json"
+"""The name of the file in `cache_path` in which the manifest is stored."""
+
+_FICLONE = 0x40049409
+"""The Linux `ioctl` request which clones a file, sharing its blocks."""
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry(pydantic.BaseModel):
+    """The hash of a file, as of its last known size and modification time."""
+
+    hash: str
+    size: int
+    mtime_ns: int
+    minified: str | None = None
+    """The hash of the static file once minified, if the build minified it."""
+
+    @classmethod
+    def of(cls, path: str, digest: str, minified: str | None = None) -> _Entry:
+        """Records the hash of a file alongside its current status.
+
+        Args:
+            path: The path to the file.
+            digest: The hash of the file.
+            minified: The hash of the file once minified, if it is minified.
+
+        Returns:
+            The entry.
+        """
+        status = os.stat(path)  # noqa: PTH116
+        return cls(
+            hash=digest,
+            size=status.st_size,
+            mtime_ns=status.st_mtime_ns,
+            minified=minified,
+        )
+
+    def matches(self, status: os.stat_result) -> bool:
+        """Checks whether a file is unchanged since its hash was recorded.
+
+        Args:
+            status: The current status of the file.
+
+        Returns:
+            Whether its size and modification time are as recorded.
+        """
+        return self.size == status.st_size and self.mtime_ns == status.st_mtime_ns
+
+
+class _Manifest(pydantic.BaseModel):
+    """Records the hash of every static file and of its copy in the output."""
+
+    version: int = 1
+    output_path: str = ""
+    sources: dict[str, _Entry] = pydantic.Field(default_factory=dict)
+    outputs: dict[str, _Entry] = pydantic.Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> _Manifest:
+        """Loads the manifest persisted by the previous build.
+
+        Args:
+            path: The file in which the manifest is stored.
+
+        Returns:
+            The manifest, or an empty manifest if none could be read.
+        """
+        try:
+            return cls.model_validate_json(path.read_bytes())
+        except (OSError, pydantic.ValidationError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Persists the manifest for the next build.
+
+        Args:
+            path: The file in which the manifest is to be stored.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.model_dump_json())
+
+
+def _hash(path: str, entry: _Entry | None) -> str | None:
+    """Hashes a file, unless it is unchanged since it was last hashed.
+
+    Args:
+        path: The path to the file.
+        entry: The entry recorded for the file by the previous build, if any.
+
+    Returns:
+        The hash, or None if the file does not exist.
+    """
+    try:
+        status = os.stat(path)  # noqa: PTH116
+    except OSError:
+        return None
+    if entry is not None and entry.matches(status):
+        return entry.hash
+    return hash_file(path)
+
+
+def _reflink(source: str, destination: str) -> bool:
+    """Clones a file, such that both share their blocks until either changes.
+
+    Args:
+        source: The path to the file.
+        destination: The path to the clone.
+
+    Returns:
+        Whether the file system supports cloning the file.
+    """
+    if sys.platform != "linux":
+        return False
+    import fcntl  # noqa: PLC0415
+
+    try:
+        with open(source, "rb") as original, open(destination, "wb") as clone:  # noqa: PTH123
+            fcntl.ioctl(clone.fileno(), _FICLONE, original.fileno())
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(destination)  # noqa: PTH108
+        return False
+    shutil.copystat(source, destination)
+    return True
+
+
+class _HashingStaticGenerator(StaticGenerator):
+    """Copies only the static files whose contents are not already in the output."""
+
+    def _prepare(self) -> None:
+        """Loads the manifest of the previous build."""
+        self.manifest_path = Path(self.settings["CACHE_PATH"]) / _MANIFEST_FILE
+        self.previous = _Manifest.load(self.manifest_path)
+        if self.previous.output_path != str(self.output_path):
+            self.previous.outputs.clear()
+        self.current = _Manifest(output_path=str(self.output_path))
+        self.copies_by_hash: dict[str, str] = {}
+        self.minified: dict[str, bytes | None] = {}
+        self.can_reflink = True
+        self.copied = 0
+        self.linked = 0
+        self.skipped = 0
+
+    def generate_output(self, writer: Writer) -> None:
+        """Copies the static files, then persists the manifest.
+
+        Args:
+            writer: The writer of the build, which is not used.
+        """
+        super().generate_output(writer)
+        if self.settings["STATIC_CREATE_LINKS"]:
+            return
+        self.current.save(self.manifest_path)
+        report(
+            self.settings,
+            f"Static files: copied {self.copied}, linked {self.linked} and "
+            f"skipped {self.skipped} unchanged",
+        )
+
+    def _locate(self, staticfile: Static) -> tuple[str, str]:
+        """Finds a static file and its copy in the output.
+
+        Args:
+            staticfile: The static file.
+
+        Returns:
+            The path to the file and the path to its copy.
+        """
+        source_path = os.path.join(self.path, str(staticfile.source_path))  # noqa: PTH118
+        return source_path, os.path.join(self.output_path, staticfile.save_as)  # noqa: PTH118
+
+    def _minified_hash(self, source_path: str, digest: str) -> str | None:
+        """Hashes a static file once minified, if the build minifies it.
+
+        Args:
+            source_path: The path to the file.
+            digest: The hash of the file.
+
+        Returns:
+            The hash of the minified file, or None if it is copied as it is.
+        """
+        if self.settings.get(MINIFY_SETTING) is None:
+            return None
+        previous = self.previous.sources.get(source_path)
+        if previous is not None and previous.hash == digest and previous.minified:
+            return previous.minified
+        minified = minified_static_file(self.settings, source_path)
+        self.minified[source_path] = minified
+        return digest if minified is None else hashlib.sha256(minified).hexdigest()
+
+    def _file_update_required(self, staticfile: Static) -> bool:
+        """Checks whether a static file differs from its copy in the output.
+
+        Args:
+            staticfile: The static file.
+
+        Returns:
+            Whether the file must be copied.
+        """
+        if self.settings["STATIC_CREATE_LINKS"]:
+            return super()._file_update_required(staticfile)
+        source_path, save_as = self._locate(staticfile)
+        digest = _hash(source_path, self.previous.sources.get(source_path))
+        if digest is None:
+            return True
+        minified = self._minified_hash(source_path, digest)
+        self.current.sources[source_path] = _Entry.of(source_path, digest, minified)
+
+        expected = minified or digest
+        previous = self.previous.outputs.get(staticfile.save_as)
+        if _hash(save_as, previous) != expected:
+            return True
+        self.current.outputs[staticfile.save_as] = _Entry.of(save_as, expected)
+        self.copies_by_hash.setdefault(expected, save_as)
+        self.skipped += 1
+        return False
+
+    def _link_or_copy_staticfile(self, sc: Static) -> None:
+        """Copies a static file, by cloning or hard linking it if possible.
+
+        Args:
+            sc: The static file.
+        """
+        source_path, save_as = self._locate(sc)
+        entry = self.current.sources.get(source_path)
+        if self.settings["STATIC_CREATE_LINKS"] or entry is None:
+            super()._link_or_copy_staticfile(sc)
+            return
+        self._mkdir(os.path.dirname(save_as))  # noqa: PTH120
+        # The output is replaced rather than overwritten, as it may be linked.
+        if os.path.lexists(save_as):
+            os.unlink(save_as)  # noqa: PTH108
+
+        digest = entry.minified or entry.hash
+        minify = digest != entry.hash
+        identical = self.copies_by_hash.get(digest)
+        if self.can_reflink and not minify:
+            self.can_reflink = _reflink(source_path, save_as)
+        if minify:
+            minified = self.minified.get(source_path) or minified_static_file(
+                self.settings, source_path
+            )
+            copy_static_file(source_path, save_as, minified)
+            logger.info("Minifying %s to %s", sc.source_path, sc.save_as)
+            self.copied += 1
+        elif self.can_reflink:
+            logger.info("Cloning %s to %s", sc.source_path, sc.save_as)
+            self.copied += 1
+        elif identical is not None and self._hard_link(identical, save_as):
+            logger.info("Linking %s to identical %s", sc.save_as, identical)
+            self.linked += 1
+        else:
+            shutil.copy2(source_path, save_as)
+            logger.info("Copying %s to %s", sc.source_path, sc.save_as)
+            self.copied += 1
+        self.current.outputs[sc.save_as] = _Entry.of(save_as, digest)
+        self.copies_by_hash.setdefault(digest, save_as)
+
+    @staticmethod
+    def _hard_link(existing: str, save_as: str) -> bool:
+        """Links a copy in the output to another identical copy.
+
+        Args:
+            existing: The path to the identical copy.
+            save_as: The path to the new copy.
+
+        Returns:
+            Whether the link could be created.
+        """
+        try:
+            os.link(existing, save_as)
+        except OSError:
+            return False
+        return True
+
+
+def _hash_static_files(generator: StaticGenerator) -> None:
+    """Makes the static generator compare static files by their hashes.
+
+    Pelican does not allow the static generator to be replaced, so the class
+    of the generator is changed once it has been created.
+
+    Args:
+        generator: The static generator.
+    """
+    if not is_enabled(generator.settings, PLUGIN_NAME):
+        return
+    generator.__class__ = _HashingStaticGenerator
+    cast("_HashingStaticGenerator", generator)._prepare()  # noqa: SLF001
+
+
+def register() -> None:
+    """Registers the plugin with Pelican."""
+    signals.static_generator_init.connect(_hash_static_files)
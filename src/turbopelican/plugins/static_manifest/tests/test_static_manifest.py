@@ -0,0 +1,124 @@
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("pelican")
+
+from turbopelican.plugins._utils import pop_reports
+from turbopelican.plugins.static_manifest.static_manifest import (
+    PLUGIN_NAME,
+    _HashingStaticGenerator,
+)
+
+_STATIC_FILES = 4
+
+
+@pytest.fixture
+def site(site: Path) -> Path:
+    """Creates a site with static files, two of which are identical.
+
+    Args:
+        site: The root of a site without content.
+
+    Returns:
+        The root of the site.
+    """
+    images = site / "content" / "images"
+    images.mkdir()
+    (images / "first.png").write_bytes(b"First image")
+    (images / "second.png").write_bytes(b"Second image")
+    (images / "copy.png").write_bytes(b"First image")
+    (site / "content" / "extra").mkdir()
+    (site / "content" / "extra" / "robots.txt").write_text("User-agent: *\n")
+    return site
+
+
+@pytest.fixture
+def settings() -> dict[str, Any]:
+    """Provides the settings with which the site is built.
+
+    Returns:
+        The settings enabling the plugin, without the static files of the theme.
+    """
+    return {
+        "THEME_STATIC_PATHS": [],
+        "PLUGINS": [PLUGIN_NAME],
+        "STATIC_PATHS": ["images", "extra/robots.txt"],
+        "EXTRA_PATH_METADATA": {"extra/robots.txt": {"path": "robots.txt"}},
+    }
+
+
+def _build(build: Callable[..., None]) -> _HashingStaticGenerator:
+    """Builds the site.
+
+    Args:
+        build: Builds the site.
+
+    Returns:
+        The static generator of the build.
+    """
+    with mock.patch.object(
+        _HashingStaticGenerator,
+        "generate_output",
+        autospec=True,
+        side_effect=_HashingStaticGenerator.generate_output,
+    ) as generate_output:
+        build()
+    return generate_output.call_args.args[0]
+
+
+def test_unchanged_files_skipped(site: Path, build: Callable[..., None]) -> None:
+    """Tests that files are skipped by their hashes, not modification times.
+
+    Args:
+        site: The root of a site with static files.
+        build: Builds the site.
+    """
+    first = _build(build)
+    assert first.copied + first.linked == _STATIC_FILES
+    assert (site / "output" / "robots.txt").read_text() == "User-agent: *\n"
+    output = site / "output" / "images" / "second.png"
+    modified = output.stat().st_mtime_ns
+
+    # A fresh checkout gives every source a new modification time.
+    for path in (site / "content").rglob("*.*"):
+        os.utime(path, ns=(modified + 10**9, modified + 10**9))
+    pop_reports(str(site / "output"))
+    second = _build(build)
+    assert second.skipped == _STATIC_FILES
+    assert pop_reports(str(site / "output")) == [
+        f"Static files: copied 0, linked 0 and skipped {_STATIC_FILES} unchanged"
+    ]
+    assert not second.copied
+    assert output.stat().st_mtime_ns == modified
+
+    (site / "content" / "images" / "second.png").write_bytes(b"Changed image")
+    third = _build(build)
+    assert third.copied == 1
+    assert output.read_bytes() == b"Changed image"
+
+
+def test_identical_files_linked(site: Path, build: Callable[..., None]) -> None:
+    """Tests that identical files are hard linked if they cannot be cloned.
+
+    Args:
+        site: The root of a site with static files.
+        build: Builds the site.
+    """
+    with mock.patch(
+        "turbopelican.plugins.static_manifest.static_manifest._reflink",
+        return_value=False,
+    ):
+        generator = _build(build)
+        assert generator.linked == 1
+        images = site / "output" / "images"
+        assert (images / "copy.png").samefile(images / "first.png")
+
+        (site / "content" / "images" / "copy.png").write_bytes(b"Changed image")
+        _build(build)
+    assert (images / "copy.png").read_bytes() == b"Changed image"
+    assert (images / "first.png").read_bytes() == b"First image"
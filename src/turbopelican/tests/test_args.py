@@ -2,7 +2,11 @@ from argparse import Namespace
 
 from turbopelican._args import get_raw_args, get_raw_args_without_subcommand
 from turbopelican._commands.adorn import adorn
+from turbopelican._commands.build import build
 from turbopelican._commands.init import init
+from turbopelican._commands.merge import merge
+from turbopelican._commands.mtimes import mtimes
+from turbopelican._commands.serve import serve
 
 
 def test_get_raw_args_without_subcommand() -> None:
@@ -63,3 +67,65 @@ def test_get_raw_args_adorn() -> None:
         minimal_install=False,
         func=adorn.command,
     )
+
+
+def test_get_raw_args_build() -> None:
+    """Check namespace contains expected values for `build` subcommand."""
+    args = get_raw_args(inputs=["build", "mysite", "--incremental"])
+    assert args == Namespace(
+        directory="mysite",
+        config_type=None,
+        only=None,
+        incremental=True,
+        split_by_lang=False,
+        shard=None,
+        shards_dir="shards",
+        inline_css=False,
+        minify=None,
+        precompress=False,
+        precompress_format=[],
+        cache=None,
+        cache_dir=None,
+        cache_include=[],
+        quiet=False,
+        func=build.command,
+    )
+
+
+def test_get_raw_args_merge_shards() -> None:
+    """Check namespace contains expected values for `merge-shards` subcommand."""
+    args = get_raw_args(inputs=["merge-shards", "--shards-dir", "downloaded"])
+    assert args == Namespace(
+        directory=".",
+        config_type=None,
+        shards_dir="downloaded",
+        inline_css=False,
+        minify=None,
+        precompress=False,
+        precompress_format=[],
+        quiet=False,
+        func=merge.command,
+    )
+
+
+def test_get_raw_args_restore_mtimes() -> None:
+    """Check namespace contains expected values for `restore-mtimes` subcommand."""
+    args = get_raw_args(inputs=["restore-mtimes", "--quiet"])
+    assert args == Namespace(directory=".", quiet=True, func=mtimes.command)
+
+
+def test_get_raw_args_serve() -> None:
+    """Check namespace contains expected values for `serve` subcommand."""
+    args = get_raw_args(inputs=["serve", "mysite", "--port", "8080"])
+    assert args == Namespace(
+        directory="mysite",
+        config_type=None,
+        only=None,
+        bind=None,
+        port=8080,
+        debounce=0.1,
+        in_memory=False,
+        flush_on_exit=False,
+        quiet=False,
+        func=serve.command,
+    )